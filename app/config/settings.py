@@ -42,6 +42,7 @@ WEBHOOK_URL = os.getenv("WEBHOOK_URL")
 WEBHOOK_PATH = os.getenv("WEBHOOK_PATH", f"/webhook/{BOT_TOKEN}" if BOT_TOKEN else "/webhook")
 WEBHOOK_HOST = os.getenv("WEBHOOK_HOST", "0.0.0.0")
 WEBHOOK_PORT = int(os.getenv("PORT", os.getenv("WEBHOOK_PORT", "8000")))
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET")                               # X-Telegram-Bot-Api-Secret-Token
 
 # Налаштування polling (для development)
 POLLING_TIMEOUT = int(os.getenv("POLLING_TIMEOUT", "30"))
@@ -56,12 +57,23 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 
 # SQLite (fallback для розробки)
 SQLITE_DB_PATH = os.getenv("SQLITE_DB_PATH", "data/bot.db")
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))    # Байт файлу БД, що читаються через mmap
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))           # Кеш сторінок на з'єднання
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))        # Очікування блокування запису
+SQLITE_WRITE_BATCH = int(os.getenv("SQLITE_WRITE_BATCH", "500"))                 # Записів писаря в одній транзакції
 
 # Налаштування connection pool
 DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
 DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
 DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "3600"))
 DB_ECHO = os.getenv("DB_ECHO", "false").lower() in ("true", "1", "yes")
+DB_QUERY_CACHE_SIZE = int(os.getenv("DB_QUERY_CACHE_SIZE", "1200"))       # Скомпільованих запитів у кеші engine
+DB_PREPARE_THRESHOLD = int(os.getenv("DB_PREPARE_THRESHOLD", "5"))        # psycopg 3: виконань до серверного PREPARE
+
+# Репліка для читання (опціонально): звіти, топи, аудиторії розсилок
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "10"))    # Більше відставання - читання з основної
+REPLICA_CHECK_INTERVAL = int(os.getenv("REPLICA_CHECK_INTERVAL", "15"))         # Секунд між перевірками відставання
 
 # Timeout'и
 DB_CONNECT_TIMEOUT = int(os.getenv("DB_CONNECT_TIMEOUT", "10"))
@@ -94,6 +106,8 @@ MONTHLY_SUMMARY_TIME = {"day": 1, "hour": 12, "minute": 0}
 DUEL_CHECK_INTERVAL = int(os.getenv("DUEL_CHECK_INTERVAL", "1"))
 DUEL_REMINDER_INTERVAL = int(os.getenv("DUEL_REMINDER_INTERVAL", "15"))
 ACHIEVEMENT_CHECK_INTERVAL = int(os.getenv("ACHIEVEMENT_CHECK_INTERVAL", "30"))
+TRENDING_RECALC_INTERVAL = int(os.getenv("TRENDING_RECALC_INTERVAL", "15"))
+ROLLUP_FLUSH_INTERVAL = int(os.getenv("ROLLUP_FLUSH_INTERVAL", "5"))
 
 logger.info(f"🤖 Автоматизація: {'Активна' if AUTOMATION_ENABLED else 'Вимкнена'}")
 
@@ -144,9 +158,20 @@ AUTO_MODERATION_ENABLED = os.getenv("AUTO_MODERATION_ENABLED", "false").lower()
 AUTO_REJECT_PROFANITY = os.getenv("AUTO_REJECT_PROFANITY", "true").lower() in ("true", "1", "yes")
 AUTO_REJECT_SPAM = os.getenv("AUTO_REJECT_SPAM", "true").lower() in ("true", "1", "yes")
 
+# Дублікати (точні завжди відхиляються, перефразовані - за налаштуванням)
+DUPLICATE_DETECTION_ENABLED = os.getenv("DUPLICATE_DETECTION_ENABLED", "true").lower() in ("true", "1", "yes")
+DUPLICATE_SIMILARITY_THRESHOLD = float(os.getenv("DUPLICATE_SIMILARITY_THRESHOLD", "0.8"))
+AUTO_REJECT_NEAR_DUPLICATES = os.getenv("AUTO_REJECT_NEAR_DUPLICATES", "false").lower() in ("true", "1", "yes")
+
 # Час очікування модерації (години)
 MODERATION_TIMEOUT_HOURS = int(os.getenv("MODERATION_TIMEOUT_HOURS", "24"))
 
+# Скільки секунд модератор "тримає" контент, поки інші його не бачать
+MODERATION_LEASE_SECONDS = int(os.getenv("MODERATION_LEASE_SECONDS", "300"))
+
+# Мінімальна репутація автора для кнопки "Схвалити від довірених"
+TRUSTED_AUTHOR_REPUTATION = float(os.getenv("TRUSTED_AUTHOR_REPUTATION", "3.0"))
+
 logger.info(f"📝 Контент: {len(CONTENT_TYPES)} типів, макс {MAX_SUBMISSIONS_PER_DAY} подач/день")
 
 # ===== ДУЕЛІ ТА ЗМАГАННЯ =====
@@ -191,6 +216,8 @@ logger.info(f"📢 Розсилки: {'Активні' if BROADCAST_ENABLED else
 # Захист від спаму
 RATE_LIMITING_ENABLED = os.getenv("RATE_LIMITING_ENABLED", "true").lower() in ("true", "1", "yes")
 MAX_MESSAGES_PER_MINUTE = int(os.getenv("MAX_MESSAGES_PER_MINUTE", "10"))  # Максимум повідомлень від користувача
+MAX_CALLBACKS_PER_MINUTE = int(os.getenv("MAX_CALLBACKS_PER_MINUTE", "30")) # Максимум натискань кнопок
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "redis" if os.getenv("REDIS_URL") else "memory")  # memory / redis
 SPAM_DETECTION_ENABLED = os.getenv("SPAM_DETECTION_ENABLED", "true").lower() in ("true", "1", "yes")
 
 # Система попереджень
@@ -201,6 +228,8 @@ AUTO_BAN_DURATION_HOURS = int(os.getenv("AUTO_BAN_DURATION_HOURS", "24"))
 # Фільтрація контенту
 CONTENT_FILTER_ENABLED = os.getenv("CONTENT_FILTER_ENABLED", "true").lower() in ("true", "1", "yes")
 PROFANITY_FILTER_ENABLED = os.getenv("PROFANITY_FILTER_ENABLED", "true").lower() in ("true", "1", "yes")
+PROFANITY_WORDLIST_PATH = os.getenv("PROFANITY_WORDLIST_PATH")  # None = вбудований словник
+PROFANITY_EXTRA_WORDS = [word.strip() for word in os.getenv("PROFANITY_EXTRA_WORDS", "").split(",") if word.strip()]
 
 logger.info(f"🛡️ Безпека: Rate limiting {'ON' if RATE_LIMITING_ENABLED else 'OFF'}, {MAX_WARNINGS_BEFORE_BAN} попереджень до бану")
 
@@ -217,6 +246,12 @@ MEMORY_CACHE_SIZE = int(os.getenv("MEMORY_CACHE_SIZE", "1000"))            # М
 # Налаштування продуктивності
 ASYNC_WORKERS = int(os.getenv("ASYNC_WORKERS", "4"))                      # Кількість async worker'ів
 MAX_CONCURRENT_REQUESTS = int(os.getenv("MAX_CONCURRENT_REQUESTS", "100"))
+LOOP_WATCHDOG_ENABLED = os.getenv("LOOP_WATCHDOG_ENABLED", "true").lower() in ("true", "1", "yes")
+LOOP_LAG_THRESHOLD_MS = int(os.getenv("LOOP_LAG_THRESHOLD_MS", "100"))    # Затримка event loop, що вважається блокуванням
+EXECUTOR_IO_WORKERS = int(os.getenv("EXECUTOR_IO_WORKERS", "4"))          # Потоків для блокуючого I/O (БД, файли)
+EXECUTOR_CPU_WORKERS = int(os.getenv("EXECUTOR_CPU_WORKERS", "2"))        # Процесів для важких експортів (0 = потік)
+EXECUTOR_QUEUE_SIZE = int(os.getenv("EXECUTOR_QUEUE_SIZE", "16"))         # Задач у черзі пулу понад воркерів
+LAZY_HANDLERS = os.getenv("LAZY_HANDLERS", "true").lower() in ("true", "1", "yes")  # Імпорт модулів хендлерів при першому використанні
 
 logger.info(f"⚡ Продуктивність: {ASYNC_WORKERS} worker'ів, кеш {'Redis' if REDIS_URL else 'Memory'}")
 
@@ -249,6 +284,26 @@ LOGS_DIR = DATA_DIR / "logs"
 for directory in [DATA_DIR, MEDIA_DIR, BACKUP_DIR, LOGS_DIR]:
     directory.mkdir(parents=True, exist_ok=True)
 
+# Бекапи
+BACKUP_FORMAT = os.getenv("BACKUP_FORMAT", "ndjson")                       # ndjson або csv
+BACKUP_COMPRESSION = os.getenv("BACKUP_COMPRESSION", "gzip")               # gzip або zstd
+BACKUP_BATCH_SIZE = int(os.getenv("BACKUP_BATCH_SIZE", "1000"))            # Рядків на батч курсора
+
+# Стани діалогів (FSM)
+FSM_STORAGE = os.getenv("FSM_STORAGE", "redis" if REDIS_URL else "sqlite")  # sqlite / redis / memory
+FSM_STORAGE_PATH = Path(os.getenv("FSM_STORAGE_PATH", str(DATA_DIR / "fsm.sqlite3")))
+FSM_STATE_TTL = int(os.getenv("FSM_STATE_TTL", "86400"))                  # Покинуті стани видаляються через добу
+
+# Фонові задачі на кількох репліках: виконує тільки лідер
+JOB_LOCK_BACKEND = os.getenv("JOB_LOCK_BACKEND", "auto")                   # auto / postgres / file / none
+JOB_LOCK_PATH = Path(os.getenv("JOB_LOCK_PATH", str(DATA_DIR / "scheduler.lock")))
+LEADER_RETRY_SECONDS = int(os.getenv("LEADER_RETRY_SECONDS", "15"))        # Як часто резервна репліка пробує стати лідером
+
+# Масштабування: webhook-ingress розподіляє оновлення між процесами за user_id
+RUN_MODE = os.getenv("RUN_MODE", "polling")                                # polling / scaled
+SCALE_WORKERS = int(os.getenv("SCALE_WORKERS", str(os.cpu_count() or 2)))  # Процесів-воркерів (партицій)
+SCALE_IPC_DIR = Path(os.getenv("SCALE_IPC_DIR", str(DATA_DIR / "ipc")))     # Unix-сокети воркерів
+
 # Ліміти файлів
 MAX_FILE_SIZE_MB = int(os.getenv("MAX_FILE_SIZE_MB", "20"))               # Максимальний розмір файлу
 ALLOWED_MEDIA_TYPES = os.getenv("ALLOWED_MEDIA_TYPES", "photo,video,document").split(",")
@@ -450,10 +505,8 @@ def get_points_for_action(action: str) -> int:
 
 def get_rank_for_points(points: int) -> str:
     """Отримати ранг для кількості балів"""
-    for rank, min_points in reversed(list(RANK_REQUIREMENTS.items())):
-        if points >= min_points:
-            return rank
-    return "🤡 Новачок"
+    from utils.ranks import rank_for
+    return rank_for(points)
 
 # ===== ЕКСПОРТ =====
 __all__ = [
@@ -461,10 +514,12 @@ __all__ = [
     "ENVIRONMENT", "DEBUG", "BOT_TOKEN", "BOT_USERNAME", "ALL_ADMIN_IDS",
     
     # База даних
-    "DATABASE_URL", "DB_POOL_SIZE", "DB_ECHO",
+    "DATABASE_URL", "DB_POOL_SIZE", "DB_ECHO", "DB_QUERY_CACHE_SIZE", "DB_PREPARE_THRESHOLD",
+    "DATABASE_REPLICA_URL", "REPLICA_MAX_LAG_SECONDS", "REPLICA_CHECK_INTERVAL",
+    "SQLITE_DB_PATH", "SQLITE_MMAP_SIZE", "SQLITE_CACHE_SIZE_KB", "SQLITE_BUSY_TIMEOUT_MS", "SQLITE_WRITE_BATCH",
     
     # Автоматизація
-    "AUTOMATION_ENABLED", "TIMEZONE", 
+    "AUTOMATION_ENABLED", "TIMEZONE", "TRENDING_RECALC_INTERVAL", "ROLLUP_FLUSH_INTERVAL",
     "MORNING_BROADCAST_TIME", "EVENING_STATS_TIME", "WEEKLY_TOURNAMENT_TIME",
     
     # Гейміфікація
@@ -473,12 +528,30 @@ __all__ = [
     
     # Контент
     "CONTENT_TYPES", "MAX_CONTENT_LENGTH", "MAX_SUBMISSIONS_PER_DAY",
+    "DUPLICATE_DETECTION_ENABLED", "DUPLICATE_SIMILARITY_THRESHOLD", "AUTO_REJECT_NEAR_DUPLICATES",
+    "MODERATION_LEASE_SECONDS", "TRUSTED_AUTHOR_REPUTATION",
     
     # Дуелі
     "DUEL_ENABLED", "DUEL_DURATION_HOURS", "DUEL_MIN_VOTES",
     
     # Безпека
-    "RATE_LIMITING_ENABLED", "MAX_MESSAGES_PER_MINUTE", "MAX_WARNINGS_BEFORE_BAN",
+    "RATE_LIMITING_ENABLED", "MAX_MESSAGES_PER_MINUTE", "MAX_CALLBACKS_PER_MINUTE",
+    "RATE_LIMIT_BACKEND", "MAX_WARNINGS_BEFORE_BAN",
+    "CONTENT_FILTER_ENABLED", "PROFANITY_FILTER_ENABLED",
+    "PROFANITY_WORDLIST_PATH", "PROFANITY_EXTRA_WORDS",
+    
+    # Бекапи
+    "BACKUP_DIR", "BACKUP_FORMAT", "BACKUP_COMPRESSION", "BACKUP_BATCH_SIZE",
+    
+    # FSM та старт
+    "FSM_STORAGE", "FSM_STORAGE_PATH", "FSM_STATE_TTL", "LAZY_HANDLERS",
+    "JOB_LOCK_BACKEND", "JOB_LOCK_PATH", "LEADER_RETRY_SECONDS",
+    "RUN_MODE", "SCALE_WORKERS", "SCALE_IPC_DIR", "WEBHOOK_SECRET",
+    
+    # HTTP клієнт Bot API
+    "MAX_CONCURRENT_REQUESTS", "BROADCAST_RATE_LIMIT",
+    "LOOP_WATCHDOG_ENABLED", "LOOP_LAG_THRESHOLD_MS",
+    "EXECUTOR_IO_WORKERS", "EXECUTOR_CPU_WORKERS", "EXECUTOR_QUEUE_SIZE",
     
     # Утиліти
     "CONFIG", "get_config", "is_admin", "get_points_for_action", "get_rank_for_points",
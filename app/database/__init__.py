@@ -35,8 +35,8 @@ except ImportError as e:
 if MODELS_LOADED:
     try:
         from .database import (
-            init_db, get_or_create_user, get_random_approved_content,
-            DATABASE_AVAILABLE as DB_AVAILABLE
+            init_db, get_or_create_user, get_user_by_id, get_random_approved_content,
+            add_content_for_moderation, update_user_points, DATABASE_AVAILABLE as DB_AVAILABLE
         )
         FUNCTIONS_LOADED = True
         DATABASE_AVAILABLE = DB_AVAILABLE
@@ -53,6 +53,15 @@ if not FUNCTIONS_LOADED:
     async def get_or_create_user(telegram_id, **kwargs):
         return None
     
+    async def get_user_by_id(user_id):
+        return None
+    
+    async def add_content_for_moderation(author_id, text, content_type="joke", **kwargs):
+        return None
+    
+    async def update_user_points(user_id, points, reason=""):
+        return False
+    
     async def get_random_approved_content(**kwargs):
         import types
         obj = types.SimpleNamespace()
@@ -61,7 +70,8 @@ if not FUNCTIONS_LOADED:
 
 # Експорт
 __all__ = [
-    'init_db', 'get_or_create_user', 'get_random_approved_content',
+    'init_db', 'get_or_create_user', 'get_user_by_id', 'get_random_approved_content', 'add_content_for_moderation',
+    'update_user_points',
     'ContentType', 'ContentStatus', 'DuelStatus',
     'MODELS_LOADED', 'FUNCTIONS_LOADED', 'DATABASE_AVAILABLE'
 ]
@@ -17,8 +17,8 @@ from enum import Enum
 from typing import Optional
 
 from sqlalchemy import (
-    BigInteger, Boolean, Column, DateTime, Float, ForeignKey, 
-    Integer, String, Text, Index, UniqueConstraint
+    BigInteger, Boolean, Column, Date, DateTime, Float, ForeignKey, 
+    Integer, String, Text, Index, UniqueConstraint, text as sql_text
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
@@ -83,6 +83,9 @@ class User(Base):
     duels_participated = Column(Integer, default=0)
     duels_won = Column(Integer, default=0)
     duels_lost = Column(Integer, default=0)
+    duel_rating = Column(Integer, default=1000)
+    duel_win_streak = Column(Integer, default=0)
+    duel_best_streak = Column(Integer, default=0)
     
     # ⚙️ НАЛАШТУВАННЯ
     daily_subscription = Column(Boolean, default=False)
@@ -97,16 +100,16 @@ class User(Base):
     last_daily_claim = Column(DateTime, nullable=True)
     
     # 🔄 ЗВ'ЯЗКИ
-    content = relationship("Content", back_populates="author", lazy="dynamic")
+    # content.moderated_by теж посилається на users - зв'язок лише через author_id
+    content = relationship("Content", back_populates="author", lazy="dynamic", foreign_keys="Content.author_id")
     ratings = relationship("Rating", back_populates="user", lazy="dynamic")
-    duel_votes = relationship("DuelVote", back_populates="voter", lazy="dynamic")
-    admin_actions = relationship("AdminAction", back_populates="admin", lazy="dynamic")
     
     # 📈 ІНДЕКСИ
     __table_args__ = (
         Index('idx_user_points', 'points'),
         Index('idx_user_activity', 'last_activity'),
         Index('idx_user_created', 'created_at'),
+        Index('idx_user_duel_rating', 'duel_rating'),
     )
 
     def __repr__(self):
@@ -121,18 +124,20 @@ class Content(Base):
     
     # 📝 ОСНОВНИЙ КОНТЕНТ
     text = Column(Text, nullable=False)
+    content_hash = Column(String(32), nullable=True)  # MD5 нормалізованого тексту
     content_type = Column(String(20), default="joke", index=True)  # ✅ String замість enum
     status = Column(String(20), default="pending", index=True)     # ✅ String замість enum
     
     # 👤 АВТОР
     author_id = Column(BigInteger, ForeignKey('users.id'), nullable=False, index=True)
-    author = relationship("User", back_populates="content")
+    author = relationship("User", back_populates="content", foreign_keys=[author_id])
     
     # 📊 СТАТИСТИКА
     views = Column(Integer, default=0)
     likes = Column(Integer, default=0)
     dislikes = Column(Integer, default=0)
     shares = Column(Integer, default=0)
+    reports = Column(Integer, default=0)  # Скарги користувачів (піднімають пріоритет модерації)
     rating_score = Column(Float, default=0.0)
     
     # 🛡️ МОДЕРАЦІЯ
@@ -152,6 +157,116 @@ class Content(Base):
         Index('idx_content_status_type', 'status', 'content_type'),
         Index('idx_content_rating', 'rating_score'),
         Index('idx_content_created', 'created_at'),
+        Index('idx_content_moderated', 'moderation_date'),
+        # Унікальність хешу - серед не відхиленого: відхилений текст можна подати знову
+        Index('idx_content_hash', 'content_hash', unique=True,
+              postgresql_where=sql_text("status != 'rejected'"),
+              sqlite_where=sql_text("status != 'rejected'")),
+        # Частковий індекс: черга модерації не сканує схвалений/відхилений контент
+        Index('idx_content_pending', 'created_at',
+              postgresql_where=sql_text("status = 'pending'"),
+              sqlite_where=sql_text("status = 'pending'")),
+    )
+
+# ⭐ МОДЕЛЬ ОЦІНОК
+class Rating(Base):
+    """Реакція користувача на контент або запис нарахування балів"""
+    __tablename__ = "ratings"
+    
+    id = Column(Integer, primary_key=True)
+    user_id = Column(BigInteger, ForeignKey('users.id'), nullable=False)
+    content_id = Column(Integer, ForeignKey('content.id'), nullable=True, index=True)  # NULL для бонусів
+    rating_type = Column(String(20), nullable=True)    # like / dislike / love
+    action_type = Column(String(50), nullable=True)    # bonus_* для нарахувань
+    points_awarded = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    
+    # 🔄 ЗВ'ЯЗКИ
+    user = relationship("User", back_populates="ratings")
+    content = relationship("Content", back_populates="ratings")
+    
+    # 📈 ІНДЕКСИ
+    __table_args__ = (
+        # Одна реакція користувача на контент (NULL content_id не конфліктують)
+        Index('idx_rating_user_content', 'user_id', 'content_id', unique=True),
+    )
+
+    def __repr__(self):
+        return f"<Rating(user_id={self.user_id}, content_id={self.content_id}, type='{self.rating_type}')>"
+
+# ⚔️ МОДЕЛЬ ДУЕЛІ
+class Duel(Base):
+    """Дуель двох схвалених жартів з голосуванням користувачів"""
+    __tablename__ = "duels"
+    
+    id = Column(Integer, primary_key=True)
+    content1_id = Column(Integer, ForeignKey('content.id'), nullable=False)
+    content2_id = Column(Integer, ForeignKey('content.id'), nullable=False)
+    content1_votes = Column(Integer, default=0)
+    content2_votes = Column(Integer, default=0)
+    status = Column(String(20), default="active")     # ✅ String замість enum
+    min_votes = Column(Integer, default=3)
+    winner_content_id = Column(Integer, ForeignKey('content.id'), nullable=True)
+    
+    # 📅 МЕТАДАНІ
+    created_at = Column(DateTime, default=datetime.utcnow)
+    voting_ends_at = Column(DateTime, nullable=True)
+    completed_at = Column(DateTime, nullable=True)
+    
+    # 📈 ІНДЕКСИ
+    __table_args__ = (
+        Index('idx_duel_status_ends', 'status', 'voting_ends_at'),
+        Index('idx_duel_completed', 'completed_at'),
+    )
+
+    def __repr__(self):
+        return f"<Duel(id={self.id}, status='{self.status}', votes={self.content1_votes}:{self.content2_votes})>"
+
+class DuelVote(Base):
+    """Голос користувача в дуелі (один на дуель)"""
+    __tablename__ = "duel_votes"
+    
+    id = Column(Integer, primary_key=True)
+    duel_id = Column(Integer, ForeignKey('duels.id'), nullable=False)
+    user_id = Column(BigInteger, ForeignKey('users.id'), nullable=False)
+    side = Column(String(10), nullable=False)  # content1 / content2
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    
+    # 📈 ІНДЕКСИ
+    __table_args__ = (
+        UniqueConstraint('duel_id', 'user_id', name='uq_duel_vote_user'),
+    )
+
+# 📊 ЗВЕДЕНА СТАТИСТИКА (ROLLUPS)
+class DailyStats(Base):
+    """Агрегати бота за день (нічний перерахунок + дельти протягом дня)"""
+    __tablename__ = "daily_stats"
+    
+    day = Column(Date, primary_key=True)
+    active_users = Column(Integer, default=0)
+    new_users = Column(Integer, default=0)
+    content_submitted = Column(Integer, default=0)
+    content_approved = Column(Integer, default=0)
+    content_rejected = Column(Integer, default=0)
+    reactions = Column(Integer, default=0)
+    duels_completed = Column(Integer, default=0)
+    duel_votes = Column(Integer, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class UserDailyStats(Base):
+    """Агрегати користувача за день (топи тижня/місяця без сканування історії)"""
+    __tablename__ = "user_daily_stats"
+    
+    day = Column(Date, primary_key=True)
+    user_id = Column(BigInteger, primary_key=True)
+    content_submitted = Column(Integer, default=0)
+    content_approved = Column(Integer, default=0)
+    reactions_given = Column(Integer, default=0)
+    duel_wins = Column(Integer, default=0)
+    
+    # 📈 ІНДЕКСИ
+    __table_args__ = (
+        Index('idx_user_daily_user', 'user_id', 'day'),
     )
 
 # Інші моделі скорочені для простоти...
@@ -163,4 +278,4 @@ CONTENT_STATUSES = ["pending", "approved", "rejected"]
 DUEL_STATUSES = ["active", "completed", "cancelled"]
 
 # Список всіх моделей для експорту
-ALL_MODELS = [User, Content]  # В реальному файлі всі моделі
+ALL_MODELS = [User, Content, Rating, Duel, DuelVote, DailyStats, UserDailyStats]  # В реальному файлі всі моделі
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⚡ РЕЄСТР ГАРЯЧИХ ЗАПИТІВ ⚡
+
+Найчастіші запити визначені один раз замість нового ORM Query на кожен виклик:
+✅ lambda_stmt: конструкція та ключ кешу будуються один раз на місце в коді,
+   далі з замикання беруться лише значення параметрів
+✅ Core-запити по таблицях: рядки без identity map, поля доступні як атрибути (row.text)
+✅ Скомпільований SQL береться з кешу engine (query_cache_size = DB_QUERY_CACHE_SIZE)
+✅ Вставка реакцій - готова конструкція на діалект (executemany)
+✅ psycopg 3 (postgresql+psycopg://) готує запит на сервері після DB_PREPARE_THRESHOLD викликів
+✅ Лічильник викликів і CPU на запит - для бенчмарку (python -m utils.query_benchmark)
+"""
+
+import time
+import logging
+import functools
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import func, lambda_stmt, select
+
+from . import models
+
+logger = logging.getLogger(__name__)
+
+users = models.User.__table__
+content = models.Content.__table__
+ratings = models.Rating.__table__
+duels = models.Duel.__table__
+
+# ===== РЕЄСТР =====
+
+QUERIES: Dict[str, Callable[..., Any]] = {}
+_stats: Dict[str, List[float]] = {}
+
+def hot_query(name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Реєстрація побудови запиту під іменем"""
+    def decorator(builder: Callable[..., Any]) -> Callable[..., Any]:
+        QUERIES[name] = builder
+        _stats[name] = [0, 0.0]
+        return builder
+    return decorator
+
+def run_query(session, name: str, **params: Any):
+    """Виконання зареєстрованого запиту в сесії (з обліком CPU на виклик)"""
+    started = time.process_time()
+    try:
+        return session.execute(QUERIES[name](**params))
+    finally:
+        entry = _stats[name]
+        entry[0] += 1
+        entry[1] += time.process_time() - started
+
+def get_query_stats() -> Dict[str, Dict[str, float]]:
+    return {
+        name: {"calls": int(calls), "cpu_us": round(total / calls * 1e6, 1) if calls else 0.0}
+        for name, (calls, total) in _stats.items()
+    }
+
+def reset_query_stats() -> None:
+    for entry in _stats.values():
+        entry[0], entry[1] = 0, 0.0
+
+# ===== ЗАПИТИ =====
+
+@hot_query("user_by_id")
+def user_by_id(user_id: int):
+    return lambda_stmt(lambda: select(users).where(users.c.id == user_id))
+
+@hot_query("random_content")
+def random_content(content_type: Optional[str] = None):
+    """Випадковий схвалений контент (idx_content_status_type)"""
+    statement = lambda_stmt(lambda: select(content).where(content.c.status == "approved"))
+    if content_type:
+        statement += lambda s: s.where(content.c.content_type == content_type)
+    statement += lambda s: s.order_by(func.random()).limit(1)
+    return statement
+
+@hot_query("content_by_id")
+def content_by_id(content_id: int):
+    return lambda_stmt(lambda: select(content).where(content.c.id == content_id))
+
+@hot_query("recent_submissions")
+def recent_submissions(author_id: int, limit: int = 5):
+    """Останні подачі автора (індекс author_id)"""
+    return lambda_stmt(
+        lambda: select(content.c.text).where(content.c.author_id == author_id)
+        .order_by(content.c.created_at.desc()).limit(limit)
+    )
+
+@hot_query("leaderboard")
+def leaderboard(limit: int = 10):
+    """Топ за балами (idx_user_points)"""
+    return lambda_stmt(lambda: select(users).order_by(users.c.points.desc()).limit(limit))
+
+@hot_query("duel_by_id")
+def duel_by_id(duel_id: int):
+    return lambda_stmt(lambda: select(duels).where(duels.c.id == duel_id))
+
+@functools.lru_cache(maxsize=None)
+def insert_ratings_statement(dialect: str):
+    """
+    INSERT реакцій ... ON CONFLICT DO NOTHING RETURNING - одна конструкція на діалект
+
+    Ключ кешу компіляції рахується один раз, executemany отримує лише параметри.
+    """
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    return (
+        insert(ratings)
+        .on_conflict_do_nothing(index_elements=["user_id", "content_id"])
+        .returning(ratings.c.user_id, ratings.c.content_id, ratings.c.rating_type)
+    )
+
+# ===== ЕКСПОРТ =====
+__all__ = [
+    'QUERIES', 'hot_query', 'run_query', 'get_query_stats', 'reset_query_stats',
+    'user_by_id', 'random_content', 'content_by_id', 'leaderboard', 'duel_by_id',
+    'insert_ratings_statement'
+]
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+📚 РЕПЛІКА ДЛЯ ЧИТАННЯ 📚
+
+Важкі звіти не навантажують основну БД, що обслуговує голоси та бали:
+✅ DATABASE_REPLICA_URL - друга БД (PostgreSQL streaming replica або копія SQLite)
+✅ @read_only на функції звітів: усі get_db_session() всередині йдуть на репліку
+✅ Все інше (і read-your-writes: профіль, голоси, бали) - на основну; use_primary() закріплює її явно
+✅ Запобіжник відставання: репліка, що відстала більше REPLICA_MAX_LAG_SECONDS,
+   недоступна чи не відповідає - читання тимчасово йдуть на основну
+✅ Відставання: PostgreSQL - час останньої відтвореної транзакції,
+   інші БД - мітка replica_heartbeat, записана на основній
+✅ Перевірка - фонова задача (запити в потоці); get_db_session читає лише кешований прапорець
+"""
+
+import time
+import asyncio
+import logging
+import functools
+from contextlib import ContextDecorator
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    from config.settings import DATABASE_REPLICA_URL, REPLICA_MAX_LAG_SECONDS, REPLICA_CHECK_INTERVAL
+except ImportError:
+    import os
+    DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+    REPLICA_MAX_LAG_SECONDS, REPLICA_CHECK_INTERVAL = 10.0, 15
+
+HEARTBEAT_TABLE = "replica_heartbeat"
+
+# Контекст виклику: asyncio-задача або потік (asyncio.to_thread копіює контекст)
+_read_only: ContextVar[bool] = ContextVar("db_read_only", default=False)
+_pinned_primary: ContextVar[bool] = ContextVar("db_pinned_primary", default=False)
+
+# ===== ПОЗНАЧКИ =====
+
+def read_only(func: Callable) -> Callable:
+    """Функція тільки читає і терпить відставання репліки - її сесії йдуть на репліку"""
+    if asyncio.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            token = _read_only.set(True)
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                _read_only.reset(token)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        token = _read_only.set(True)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _read_only.reset(token)
+    return wrapper
+
+class use_primary(ContextDecorator):
+    """
+    Основна БД навіть усередині @read_only
+
+    with use_primary(): ... або @use_primary() - для записів у звітах
+    (скидання дельт) та читань, що мають бачити щойно записане.
+    """
+
+    def _recreate_cm(self):
+        return type(self)()  # Окремий токен на кожен виклик декорованої функції
+
+    def __enter__(self):
+        self._token = _pinned_primary.set(True)
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        _pinned_primary.reset(self._token)
+        return False
+
+# ===== МАРШРУТИЗАТОР =====
+
+class ReplicaRouter:
+    """
+    Engine репліки та запобіжник відставання
+
+    Мітку та відставання перевіряє фонова задача раз на check_interval
+    (запити - в потоці, не в event loop). До першої перевірки і без
+    задачі (процеси пулу) репліка вважається неактуальною - читання з основної.
+    """
+
+    def __init__(self, url: str, max_lag: float = REPLICA_MAX_LAG_SECONDS,
+                 check_interval: float = REPLICA_CHECK_INTERVAL):
+        from sqlalchemy.orm import sessionmaker
+        from .database import create_db_engine
+
+        self.url = url
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.engine = create_db_engine(url)
+        self.SessionLocal = sessionmaker(bind=self.engine, expire_on_commit=False)
+        self.is_postgres = self.engine.dialect.name == "postgresql"
+
+        self.lag: Optional[float] = None
+        self.healthy = False
+        self.checked_at = 0.0
+        self.replica_reads = 0
+        self.primary_fallbacks = 0
+        self._task: Optional[asyncio.Task] = None
+
+    # ===== ВІДСТАВАННЯ =====
+
+    def _postgres_lag(self) -> float:
+        from sqlalchemy import text
+
+        with self.engine.connect() as connection:
+            # Немає нового WAL для відтворення - репліка актуальна, хоч остання транзакція і давня
+            return float(connection.execute(text(
+                "SELECT CASE"
+                " WHEN NOT pg_is_in_recovery() THEN 0"
+                " WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0"
+                " ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)"
+                " END"
+            )).scalar())
+
+    def _heartbeat_lag(self) -> Optional[float]:
+        """
+        Мітка на основній -> чи дійшла до репліки
+
+        Репліка бачить останню записану мітку - відставання 0,
+        інакше - час від запису цієї мітки. None - міток ще не було.
+        """
+        from sqlalchemy import text
+        from . import database
+
+        now = time.time()
+        with database.engine.begin() as connection:
+            primary_beat = connection.execute(text(f"SELECT beat_at FROM {HEARTBEAT_TABLE} WHERE id = 1")).scalar()
+            if connection.execute(text(f"UPDATE {HEARTBEAT_TABLE} SET beat_at = :now WHERE id = 1"),
+                                  {"now": now}).rowcount == 0:
+                connection.execute(text(f"INSERT INTO {HEARTBEAT_TABLE} (id, beat_at) VALUES (1, :now)"), {"now": now})
+
+        if primary_beat is None:
+            return None
+
+        with self.engine.connect() as connection:
+            replica_beat = connection.execute(text(f"SELECT beat_at FROM {HEARTBEAT_TABLE} WHERE id = 1")).scalar()
+        if replica_beat is not None and replica_beat >= primary_beat:
+            return 0.0
+        return now - primary_beat
+
+    def ensure_heartbeat_table(self) -> None:
+        """Таблиця міток на основній (PostgreSQL обходиться без неї)"""
+        if self.is_postgres:
+            return
+        from sqlalchemy import text
+        from . import database
+
+        with database.engine.begin() as connection:
+            connection.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {HEARTBEAT_TABLE} (id INTEGER PRIMARY KEY, beat_at FLOAT NOT NULL)"
+            ))
+
+    def check(self) -> bool:
+        """Поточне відставання; False - читати з основної"""
+        try:
+            lag = self._postgres_lag() if self.is_postgres else self._heartbeat_lag()
+        except Exception as e:
+            lag = None
+            if self.healthy or self.checked_at == 0:
+                logger.warning(f"⚠️ Репліка недоступна - читання з основної БД: {e}")
+            healthy = False
+        else:
+            healthy = lag is not None and lag <= self.max_lag
+            if healthy and not self.healthy:
+                logger.info(f"📚 Репліка актуальна (відставання {lag:.1f} с) - звіти читаються з неї")
+            elif not healthy and (self.healthy or self.checked_at == 0):
+                lag_text = f"{lag:.1f}" if lag is not None else "?"
+                logger.warning(f"⚠️ Репліка відстає ({lag_text} с) - читання з основної БД")
+
+        self.lag = lag
+        self.healthy = healthy
+        self.checked_at = time.monotonic()
+        return healthy
+
+    def is_usable(self) -> bool:
+        """Кешований результат останньої фонової перевірки (без запитів до БД)"""
+        return self.healthy
+
+    # ===== ФОНОВА ПЕРЕВІРКА =====
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Запуск фонової перевірки з event loop"""
+        if self.running:
+            return
+        self._task = asyncio.get_running_loop().create_task(self._monitor(), name="replica_monitor")
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _monitor(self) -> None:
+        while True:
+            await asyncio.to_thread(self.check)
+            await asyncio.sleep(self.check_interval)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.engine.dialect.name,
+            "healthy": self.healthy,
+            "lag_seconds": round(self.lag, 1) if self.lag is not None else None,
+            "max_lag_seconds": self.max_lag,
+            "replica_reads": self.replica_reads,
+            "primary_fallbacks": self.primary_fallbacks,
+        }
+
+    def dispose(self) -> None:
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        self.engine.dispose()
+
+# ===== ГЛОБАЛЬНИЙ МАРШРУТИЗАТОР =====
+
+_router: Optional[ReplicaRouter] = None
+
+def connect_replica(url: Optional[str] = DATABASE_REPLICA_URL) -> Optional[ReplicaRouter]:
+    """Підключення репліки (викликається з connect_engine); без URL - тільки основна БД"""
+    global _router
+    if _router is not None:
+        _router.dispose()
+        _router = None
+    if not url:
+        return None
+
+    if url.startswith("postgres://"):
+        url = url.replace("postgres://", "postgresql://", 1)
+    try:
+        router = ReplicaRouter(url)
+        router.ensure_heartbeat_table()
+    except Exception as e:
+        logger.error(f"❌ Репліка не підключена, всі читання з основної БД: {e}")
+        return None
+
+    _router = router
+    logger.info(f"📚 Репліка для читання: {router.engine.dialect.name}, "
+                f"допустиме відставання {router.max_lag:.0f} с")
+    return router
+
+def get_replica_router() -> Optional[ReplicaRouter]:
+    return _router
+
+async def start_replica_monitor() -> Optional[ReplicaRouter]:
+    """Фонова перевірка відставання (з init_db)"""
+    if _router is not None:
+        _router.start()
+    return _router
+
+async def stop_replica_monitor() -> None:
+    if _router is not None:
+        await _router.stop()
+
+def replica_session_factory():
+    """Фабрика сесій репліки для поточного виклику; None - основна БД"""
+    if _router is None or not _read_only.get() or _pinned_primary.get():
+        return None
+    if _router.is_usable():
+        _router.replica_reads += 1
+        return _router.SessionLocal
+    _router.primary_fallbacks += 1
+    return None
+
+def get_replica_stats() -> Optional[Dict[str, Any]]:
+    return _router.get_stats() if _router is not None else None
+
+# ===== ЕКСПОРТ =====
+__all__ = [
+    'read_only', 'use_primary', 'ReplicaRouter', 'connect_replica',
+    'get_replica_router', 'start_replica_monitor', 'stop_replica_monitor',
+    'replica_session_factory', 'get_replica_stats'
+]
@@ -1,5 +1,28 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🗄️ СЕРВІСИ БД: РОЗСИЛКИ, СТАТИСТИКА, ДУЕЛІ 🗄️
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from .database import (
+    get_db_session, get_or_create_user, get_user_by_id, update_user_points, get_random_approved_content
+)
+from .replica import read_only
+
+logger = logging.getLogger(__name__)
+
+# Окремого is_active у users немає: отримувач розсилок - notifications_enabled,
+# mark_user_inactive (бот заблоковано) вимикає сповіщення
+
+def _display_name(user) -> str:
+    return " ".join(part for part in (user.first_name, user.last_name) if part) or f"ID {user.id}"
+
 # ===== РОЗСИЛКИ ТА АВТОМАТИЗАЦІЯ =====
 
+@read_only
 async def get_active_users_for_broadcast(days: int = 7) -> List[Dict[str, Any]]:
     """Отримання активних користувачів для розсилки"""
     try:
@@ -11,7 +34,7 @@ async def get_active_users_for_broadcast(days: int = 7) -> List[Dict[str, Any]]:
         with get_db_session() as session:
             users = session.query(User).filter(
                 User.last_activity >= cutoff_date,
-                User.is_active == True
+                User.notifications_enabled == True
             ).all()
             
             result = []
@@ -19,9 +42,9 @@ async def get_active_users_for_broadcast(days: int = 7) -> List[Dict[str, Any]]:
                 result.append({
                     'id': user.id,
                     'username': user.username,
-                    'full_name': user.full_name,
+                    'full_name': _display_name(user),
                     'last_activity': user.last_activity,
-                    'total_points': user.total_points
+                    'total_points': user.points or 0
                 })
             
             return result
@@ -30,6 +53,7 @@ async def get_active_users_for_broadcast(days: int = 7) -> List[Dict[str, Any]]:
         logger.error(f"Error getting active users for broadcast: {e}")
         return []
 
+@read_only
 async def get_all_users_for_broadcast() -> List[Dict[str, Any]]:
     """Отримання всіх користувачів для розсилки"""
     try:
@@ -37,7 +61,7 @@ async def get_all_users_for_broadcast() -> List[Dict[str, Any]]:
         
         with get_db_session() as session:
             users = session.query(User).filter(
-                User.is_active == True
+                User.notifications_enabled == True
             ).all()
             
             result = []
@@ -45,9 +69,9 @@ async def get_all_users_for_broadcast() -> List[Dict[str, Any]]:
                 result.append({
                     'id': user.id,
                     'username': user.username,
-                    'full_name': user.full_name,
+                    'full_name': _display_name(user),
                     'created_at': user.created_at,
-                    'total_points': user.total_points
+                    'total_points': user.points or 0
                 })
             
             return result
@@ -56,6 +80,7 @@ async def get_all_users_for_broadcast() -> List[Dict[str, Any]]:
         logger.error(f"Error getting all users for broadcast: {e}")
         return []
 
+@read_only
 async def get_duel_participants_for_broadcast() -> List[Dict[str, Any]]:
     """Отримання користувачів що брали участь у дуелях"""
     try:
@@ -69,7 +94,7 @@ async def get_duel_participants_for_broadcast() -> List[Dict[str, Any]]:
                 Duel, 
                 (Duel.content1_id == Content.id) | (Duel.content2_id == Content.id)
             ).filter(
-                User.is_active == True
+                User.notifications_enabled == True
             ).distinct().all()
             
             result = []
@@ -77,8 +102,8 @@ async def get_duel_participants_for_broadcast() -> List[Dict[str, Any]]:
                 result.append({
                     'id': user.id,
                     'username': user.username,
-                    'full_name': user.full_name,
-                    'total_points': user.total_points
+                    'full_name': _display_name(user),
+                    'total_points': user.points or 0
                 })
             
             return result
@@ -99,7 +124,7 @@ async def get_users_who_can_vote(duel_id: int) -> List[Dict[str, Any]]:
             ).subquery()
             
             eligible_users = session.query(User).filter(
-                User.is_active == True,
+                User.notifications_enabled == True,
                 User.id.notin_(users_who_voted)
             ).all()
             
@@ -108,7 +133,7 @@ async def get_users_who_can_vote(duel_id: int) -> List[Dict[str, Any]]:
                 result.append({
                     'id': user.id,
                     'username': user.username,
-                    'full_name': user.full_name
+                    'full_name': _display_name(user)
                 })
             
             return result
@@ -117,59 +142,32 @@ async def get_users_who_can_vote(duel_id: int) -> List[Dict[str, Any]]:
         logger.error(f"Error getting users who can vote: {e}")
         return []
 
+@read_only
 async def get_daily_best_content() -> Optional[Dict[str, Any]]:
-    """Отримання кращого контенту за день"""
+    """Отримання кращого контенту за день (за збереженим rating_score)"""
     try:
-        from .models import Content, Rating, ContentStatus
-        from datetime import datetime, timedelta
+        from .models import Content
         from sqlalchemy import func
+        from services.trending import get_trending_content
         
-        yesterday = datetime.utcnow() - timedelta(days=1)
+        # rating_score перераховується планувальником, idx_content_rating дає топ без GROUP BY
+        best = get_trending_content(limit=1)
+        if best:
+            return best[0]
         
+        # Якщо немає контенту за добу, беремо випадковий схвалений
         with get_db_session() as session:
-            # Знаходимо контент з найбільшою кількістю лайків за останню добу
-            best_content = session.query(
-                Content,
-                func.count(Rating.id).label('likes_count')
-            ).outerjoin(
-                Rating, 
-                (Rating.content_id == Content.id) & (Rating.rating_type == 'like')
-            ).filter(
-                Content.status == ContentStatus.APPROVED,
-                Content.created_at >= yesterday
-            ).group_by(Content.id).order_by(
-                func.count(Rating.id).desc()
-            ).first()
-            
-            if best_content:
-                content, likes_count = best_content
-                return {
-                    'id': content.id,
-                    'text': content.text,
-                    'type': content.content_type,
-                    'author_id': content.author_id,
-                    'likes': likes_count,
-                    'created_at': content.created_at
-                }
-            
-            # Якщо немає контенту за добу, беремо випадковий схвалений
             random_content = session.query(Content).filter(
-                Content.status == ContentStatus.APPROVED
+                Content.status == "approved"
             ).order_by(func.random()).first()
             
             if random_content:
-                # Підраховуємо лайки для випадкового контенту
-                likes_count = session.query(Rating).filter(
-                    Rating.content_id == random_content.id,
-                    Rating.rating_type == 'like'
-                ).count()
-                
                 return {
                     'id': random_content.id,
                     'text': random_content.text,
                     'type': random_content.content_type,
                     'author_id': random_content.author_id,
-                    'likes': likes_count,
+                    'likes': random_content.likes or 0,
                     'created_at': random_content.created_at
                 }
             
@@ -179,83 +177,34 @@ async def get_daily_best_content() -> Optional[Dict[str, Any]]:
         logger.error(f"Error getting daily best content: {e}")
         return None
 
+@read_only
 async def generate_weekly_stats() -> Dict[str, Any]:
-    """Генерація тижневої статистики"""
+    """Генерація тижневої статистики (з rollup-таблиць, 7 рядків daily_stats)"""
     try:
-        from .models import User, Content, Duel, DuelVote, DuelStatus
+        import asyncio
         from datetime import datetime, timedelta
-        from sqlalchemy import func
+        from services.rollups import get_period_stats, get_top_users
+        from services.trending import get_trending_content
         
-        week_ago = datetime.utcnow() - timedelta(days=7)
+        period = await asyncio.to_thread(get_period_stats, 7)
+        top_duelists = await asyncio.to_thread(get_top_users, 7, "duel_wins", 1)
+        top_content_items = await asyncio.to_thread(get_trending_content, timedelta(days=7), 1)
         
-        with get_db_session() as session:
-            # Дуелі за тиждень
-            duels_completed = session.query(Duel).filter(
-                Duel.status == DuelStatus.FINISHED,
-                Duel.completed_at >= week_ago
-            ).count()
-            
-            # Голоси за тиждень
-            total_votes = session.query(DuelVote).filter(
-                DuelVote.created_at >= week_ago
-            ).count()
-            
-            # Новий контент за тиждень
-            new_content = session.query(Content).filter(
-                Content.created_at >= week_ago
-            ).count()
-            
-            # Активні користувачі
-            active_users = session.query(User).filter(
-                User.last_activity >= week_ago
-            ).count()
-            
-            # Топ дуеліст (найбільше перемог за тиждень)
-            top_duelist_data = session.query(
-                User.full_name,
-                func.count(Duel.id).label('wins_count')
-            ).join(
-                Content, User.id == Content.author_id
-            ).join(
-                Duel, Duel.winner_content_id == Content.id
-            ).filter(
-                Duel.completed_at >= week_ago
-            ).group_by(User.id, User.full_name).order_by(
-                func.count(Duel.id).desc()
-            ).first()
-            
-            top_duelist = "Невідомо"
-            top_wins = 0
-            if top_duelist_data:
-                top_duelist, top_wins = top_duelist_data
-            
-            # Найпопулярніший контент
-            top_content_data = session.query(
-                Content.text,
-                func.count(DuelVote.id).label('votes_count')
-            ).join(
-                DuelVote, DuelVote.content_id == Content.id
-            ).filter(
-                DuelVote.created_at >= week_ago
-            ).group_by(Content.id, Content.text).order_by(
-                func.count(DuelVote.id).desc()
-            ).first()
-            
-            top_content = "Завантаження..."
-            if top_content_data:
-                top_content, _ = top_content_data
-            
-            return {
-                'duels_completed': duels_completed,
-                'total_votes': total_votes,
-                'new_content': new_content,
-                'active_users': active_users,
-                'top_duelist': top_duelist,
-                'top_wins': top_wins,
-                'top_content': top_content,
-                'period': 'week',
-                'generated_at': datetime.utcnow().isoformat()
-            }
+        top_duelist, top_wins = "Невідомо", 0
+        if top_duelists:
+            top_duelist, top_wins = top_duelists[0]["name"], top_duelists[0]["total"]
+        
+        return {
+            'duels_completed': period['duels_completed'],
+            'total_votes': period['duel_votes'],
+            'new_content': period['content_submitted'],
+            'active_users': period['avg_active_users'],
+            'top_duelist': top_duelist,
+            'top_wins': top_wins,
+            'top_content': top_content_items[0]['text'] if top_content_items else "Завантаження...",
+            'period': 'week',
+            'generated_at': datetime.utcnow().isoformat()
+        }
             
     except Exception as e:
         logger.error(f"Error generating weekly stats: {e}")
@@ -270,6 +219,7 @@ async def generate_weekly_stats() -> Dict[str, Any]:
             'error': str(e)
         }
 
+@read_only
 async def get_recent_achievements(hours: int = 24) -> List[Dict[str, Any]]:
     """Отримання недавніх досягнень користувачів"""
     try:
@@ -285,12 +235,12 @@ async def get_recent_achievements(hours: int = 24) -> List[Dict[str, Any]]:
             # Знаходимо користувачів які досягли нових рангів
             users_with_high_points = session.query(User).filter(
                 User.last_activity >= cutoff_time,
-                User.total_points >= 100  # Приклад досягнення
+                User.points >= 100  # Приклад досягнення
             ).all()
             
             for user in users_with_high_points:
                 # Перевіряємо чи це нове досягнення
-                if user.total_points >= 1000 and user.total_points < 1100:  # Недавно досяг 1000
+                if 1000 <= (user.points or 0) < 1100:  # Недавно досяг 1000
                     achievements.append({
                         'id': f"milestone_1000_{user.id}",
                         'user_id': user.id,
@@ -306,6 +256,7 @@ async def get_recent_achievements(hours: int = 24) -> List[Dict[str, Any]]:
         logger.error(f"Error getting recent achievements: {e}")
         return []
 
+@read_only
 async def get_recent_rank_ups(hours: int = 24) -> List[Dict[str, Any]]:
     """Отримання недавніх підвищень рангу"""
     try:
@@ -323,7 +274,7 @@ async def get_recent_rank_ups(hours: int = 24) -> List[Dict[str, Any]]:
             
             for user in recent_users:
                 # Визначаємо поточний ранг
-                points = user.total_points
+                points = user.points or 0
                 current_rank = get_rank_by_points(points)
                 
                 # Перевіряємо чи це нове досягнення рангу
@@ -351,32 +302,14 @@ async def get_recent_rank_ups(hours: int = 24) -> List[Dict[str, Any]]:
 
 def get_rank_by_points(points: int) -> str:
     """Визначення рангу за балами"""
-    if points >= 5000:
-        return "🚀 Гумористичний Геній"
-    elif points >= 3000:
-        return "🌟 Легенда Мемів"
-    elif points >= 1500:
-        return "🏆 Король Гумору"
-    elif points >= 750:
-        return "👑 Мастер Рофлу"
-    elif points >= 350:
-        return "🎭 Комік"
-    elif points >= 150:
-        return "😂 Гуморист"
-    elif points >= 50:
-        return "😄 Сміхун"
-    else:
-        return "🤡 Новачок"
+    from utils.ranks import rank_for
+    return rank_for(points)
 
 def get_next_rank_points(current_points: int) -> int:
     """Отримання балів для наступного рангу"""
-    rank_thresholds = [50, 150, 350, 750, 1500, 3000, 5000]
-    
-    for threshold in rank_thresholds:
-        if current_points < threshold:
-            return threshold
-    
-    return 10000  # Максимальний рівень
+    from utils.ranks import POINT_RANKS
+    next_rank = POINT_RANKS.next_rank(current_points)
+    return current_points + next_rank[1] if next_rank else POINT_RANKS.thresholds[-1]
 
 async def mark_user_inactive(user_id: int):
     """Позначити користувача як неактивного"""
@@ -386,22 +319,23 @@ async def mark_user_inactive(user_id: int):
         with get_db_session() as session:
             user = session.query(User).filter(User.id == user_id).first()
             if user:
-                user.is_active = False
+                user.notifications_enabled = False
                 session.commit()
                 logger.info(f"User {user_id} marked as inactive")
                 
     except Exception as e:
         logger.error(f"Error marking user inactive: {e}")
 
+@read_only
 async def get_broadcast_statistics() -> Dict[str, Any]:
     """Статистика для розсилок"""
     try:
-        from .models import User, Content, Duel
+        from .models import User, Content, Duel, DuelStatus
         from datetime import datetime, timedelta
         
         with get_db_session() as session:
             # Загальна статистика
-            total_users = session.query(User).filter(User.is_active == True).count()
+            total_users = session.query(User).filter(User.notifications_enabled == True).count()
             
             # Активність за різні періоди
             day_ago = datetime.utcnow() - timedelta(days=1)
@@ -410,23 +344,23 @@ async def get_broadcast_statistics() -> Dict[str, Any]:
             
             active_today = session.query(User).filter(
                 User.last_activity >= day_ago,
-                User.is_active == True
+                User.notifications_enabled == True
             ).count()
             
             active_week = session.query(User).filter(
                 User.last_activity >= week_ago,
-                User.is_active == True
+                User.notifications_enabled == True
             ).count()
             
             active_month = session.query(User).filter(
                 User.last_activity >= month_ago,
-                User.is_active == True
+                User.notifications_enabled == True
             ).count()
             
             # Контент статистика
             total_content = session.query(Content).count()
             active_duels = session.query(Duel).filter(
-                Duel.status == 'ACTIVE'
+                Duel.status == DuelStatus.ACTIVE.value
             ).count()
             
             return {
@@ -451,4 +385,159 @@ async def get_broadcast_statistics() -> Dict[str, Any]:
             'total_content': 0,
             'active_duels': 0,
             'error': str(e)
-        }
\ No newline at end of file
+        }
+# ===== ДУЕЛІ =====
+
+DUEL_SIDES = ("content1", "content2")
+
+def _duel_dict(row, texts: Optional[Dict[int, str]] = None) -> Dict[str, Any]:
+    """Рядок duels -> словник для хендлерів (статус як DuelStatus)"""
+    from .models import DuelStatus
+    texts = texts or {}
+    return {
+        'id': row.id,
+        'status': DuelStatus(row.status),
+        'content1': {'id': row.content1_id, 'text': texts.get(row.content1_id)},
+        'content2': {'id': row.content2_id, 'text': texts.get(row.content2_id)},
+        'content1_votes': row.content1_votes or 0,
+        'content2_votes': row.content2_votes or 0,
+        'min_votes': row.min_votes or 3,
+        'winner_content_id': row.winner_content_id,
+        'created_at': row.created_at,
+        'ends_at': row.voting_ends_at,
+    }
+
+async def create_duel(content1_id: int, content2_id: int, ends_at=None, min_votes: int = 3) -> Optional[Dict[str, Any]]:
+    """Нова активна дуель двох схвалених жартів"""
+    try:
+        from sqlalchemy import insert
+        from .models import Duel, DuelStatus
+        
+        duels = Duel.__table__
+        with get_db_session() as session:
+            row = session.execute(
+                insert(duels).values(
+                    content1_id=content1_id, content2_id=content2_id, status=DuelStatus.ACTIVE.value,
+                    min_votes=min_votes, voting_ends_at=ends_at
+                ).returning(*duels.c)
+            ).first()
+        return _duel_dict(row)
+    except Exception as e:
+        logger.error(f"Error creating duel: {e}")
+        return None
+
+async def get_duel_by_id(duel_id: int) -> Optional[Dict[str, Any]]:
+    """Дуель з текстами обох жартів"""
+    try:
+        from sqlalchemy import select
+        from .models import Content
+        from .queries import run_query
+        
+        with get_db_session() as session:
+            row = run_query(session, "duel_by_id", duel_id=duel_id).first()
+            if row is None:
+                return None
+            texts = dict(session.execute(
+                select(Content.id, Content.text).where(Content.id.in_([row.content1_id, row.content2_id]))
+            ).all())
+        return _duel_dict(row, texts)
+    except Exception as e:
+        logger.error(f"Error getting duel {duel_id}: {e}")
+        return None
+
+async def get_active_duels(limit: int = 10) -> List[Dict[str, Any]]:
+    """Активні дуелі, найновіші першими (idx_duel_status_ends)"""
+    try:
+        from sqlalchemy import select
+        from .models import Duel, DuelStatus
+        
+        duels = Duel.__table__
+        with get_db_session() as session:
+            rows = session.execute(
+                select(duels).where(duels.c.status == DuelStatus.ACTIVE.value)
+                .order_by(duels.c.id.desc()).limit(limit)
+            ).all()
+        return [_duel_dict(row) for row in rows]
+    except Exception as e:
+        logger.error(f"Error getting active duels: {e}")
+        return []
+
+async def get_user_active_duels(user_id: int) -> List[Dict[str, Any]]:
+    """Активні дуелі з контентом користувача"""
+    try:
+        from sqlalchemy import or_, select
+        from .models import Content, Duel, DuelStatus
+        
+        duels = Duel.__table__
+        own_content = select(Content.id).where(Content.author_id == user_id)
+        with get_db_session() as session:
+            rows = session.execute(
+                select(duels).where(
+                    duels.c.status == DuelStatus.ACTIVE.value,
+                    or_(duels.c.content1_id.in_(own_content), duels.c.content2_id.in_(own_content))
+                )
+            ).all()
+        return [_duel_dict(row) for row in rows]
+    except Exception as e:
+        logger.error(f"Error getting active duels of {user_id}: {e}")
+        return []
+
+async def vote_in_duel(duel_id: int, user_id: int, side: str) -> Dict[str, Any]:
+    """
+    Голос у дуелі
+    
+    Унікальний (duel_id, user_id) у duel_votes відсікає повторний голос навіть у гонці;
+    лічильник збільшується умовним UPDATE тільки поки дуель активна.
+    
+    Returns:
+        {'success': True} або {'success': False, 'error': already_voted / duel_finished / not_found / ...}
+    """
+    if side not in DUEL_SIDES:
+        return {'success': False, 'error': 'invalid_side'}
+    
+    try:
+        from sqlalchemy import insert, select, update
+        from sqlalchemy.exc import IntegrityError
+        from .models import Duel, DuelStatus, DuelVote
+        
+        duels = Duel.__table__
+        votes = duels.c[f"{side}_votes"]
+        try:
+            with get_db_session() as session:
+                counted = session.execute(
+                    update(duels)
+                    .where(duels.c.id == duel_id, duels.c.status == DuelStatus.ACTIVE.value)
+                    .values({votes: votes + 1})
+                ).rowcount
+                if not counted:
+                    exists = session.execute(select(duels.c.id).where(duels.c.id == duel_id)).first()
+                    return {'success': False, 'error': 'duel_finished' if exists else 'not_found'}
+                session.execute(insert(DuelVote.__table__).values(duel_id=duel_id, user_id=user_id, side=side))
+        except IntegrityError:
+            # Повторний голос - транзакція разом з +1 скасована
+            return {'success': False, 'error': 'already_voted'}
+        
+        from services.rollups import record_event
+        record_event("duel_votes")
+        return {'success': True}
+    except Exception as e:
+        logger.error(f"Error voting in duel {duel_id}: {e}")
+        return {'success': False, 'error': str(e)}
+
+async def finish_duel(duel_id: int) -> Optional[Dict[str, Any]]:
+    """Завершення дуелі з оновленням лічильників учасників одним UPDATE"""
+    try:
+        from services.duel_stats import finish_duel as finish_duel_sync
+        return finish_duel_sync(duel_id)
+    except Exception as e:
+        logger.error(f"Error finishing duel {duel_id}: {e}")
+        return None
+
+async def get_user_duel_stats(user_id: int) -> Dict[str, Any]:
+    """Статистика дуеліста - готові лічильники з рядка користувача"""
+    try:
+        from services.duel_stats import get_user_duel_stats as get_stats_sync
+        return get_stats_sync(user_id)
+    except Exception as e:
+        logger.error(f"Error getting duel stats for {user_id}: {e}")
+        return {}
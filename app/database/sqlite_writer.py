@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🪶 ВБУДОВАНИЙ SQLITE: ПРАГМИ ТА ЄДИНИЙ ПИСАР 🪶
+
+SQLite як повноцінне сховище для невеликих розгортань (без DATABASE_URL):
+✅ WAL: читачі не блокують писаря і навпаки
+✅ synchronous=NORMAL (у WAL - без fsync на кожен commit), mmap, кеш сторінок, busy_timeout
+✅ Ті самі прагми для engine SQLAlchemy та з'єднання писаря (aiosqlite)
+✅ Єдиний писар: дрібні записи (бали, активність) стають у чергу
+   і виконуються пачкою в одній транзакції - один commit на сотні записів
+✅ Кожен запис у пачці - під SAVEPOINT: помилка одного не скасовує інших
+"""
+
+import time
+import asyncio
+import logging
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    from config.settings import (
+        SQLITE_MMAP_SIZE, SQLITE_CACHE_SIZE_KB, SQLITE_BUSY_TIMEOUT_MS, SQLITE_WRITE_BATCH
+    )
+except ImportError:
+    SQLITE_MMAP_SIZE, SQLITE_CACHE_SIZE_KB, SQLITE_BUSY_TIMEOUT_MS, SQLITE_WRITE_BATCH = 268435456, 65536, 5000, 500
+
+# aiosqlite опціональний - без нього записи йдуть через engine SQLAlchemy
+try:
+    import aiosqlite
+    AIOSQLITE_AVAILABLE = True
+except ImportError:
+    aiosqlite = None
+    AIOSQLITE_AVAILABLE = False
+
+WRITER_QUEUE_SIZE = 10000      # Записів у черзі до зворотного тиску
+
+WriteOp = Callable[[Any], Awaitable[Any]]
+
+# ===== ПРАГМИ =====
+
+def sqlite_pragmas() -> List[str]:
+    """Прагми кожного з'єднання з файлом БД"""
+    return [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}",
+        f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}",
+        f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}",
+        "PRAGMA temp_store=MEMORY",
+    ]
+
+def apply_pragmas(dbapi_connection, connection_record=None) -> None:
+    """Обробник події connect engine SQLAlchemy"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in sqlite_pragmas():
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+def sqlite_path(url: str) -> Optional[Path]:
+    """Шлях до файлу з sqlite URL; None - БД у пам'яті"""
+    database = url.split(":///", 1)[1] if ":///" in url else ""
+    database = database.split("?", 1)[0]
+    if not database or database == ":memory:":
+        return None
+    return Path(database)
+
+def utc_timestamp() -> str:
+    """datetime.utcnow() у форматі, в якому SQLAlchemy зберігає DateTime у SQLite"""
+    from datetime import datetime
+    return datetime.utcnow().isoformat(sep=" ")
+
+# ===== ПИСАР =====
+
+class SQLiteWriter:
+    """Одне з'єднання на запис; черга записів виконується пачками в транзакції"""
+
+    def __init__(self, path: Path, batch_size: int = SQLITE_WRITE_BATCH, queue_size: int = WRITER_QUEUE_SIZE):
+        self.path = Path(path)
+        self.batch_size = max(1, batch_size)
+        self.queue_size = queue_size
+
+        self._db = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+        self.writes = 0
+        self.failed = 0
+        self.batches = 0
+        self.commit_total = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # isolation_level=None: транзакції відкриває писар (BEGIN IMMEDIATE)
+        self._db = await aiosqlite.connect(str(self.path), isolation_level=None)
+        for pragma in sqlite_pragmas():
+            await self._db.execute(pragma)
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._task = asyncio.create_task(self._run(), name="sqlite_writer")
+        logger.info(f"🪶 SQLite писар: {self.path} (WAL, пачки до {self.batch_size})")
+
+    async def submit(self, op: WriteOp) -> Any:
+        """
+        Запис у черзі писаря; результат op(connection) після commit пачки
+
+        op виконується в транзакції пачки - не робить commit/rollback сам.
+        """
+        if not self.running:
+            raise RuntimeError("SQLite писар не запущений")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((op, future))
+        return await future
+
+    async def execute(self, sql: str, params: Tuple = ()) -> int:
+        """Один SQL-запис; повертає кількість змінених рядків"""
+        async def op(db) -> int:
+            cursor = await db.execute(sql, params)
+            return cursor.rowcount
+        return await self.submit(op)
+
+    async def _run(self) -> None:
+        """None у черзі - зупинка після запису всього, що стояло перед ним"""
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                return
+            batch, stopping = [item], False
+            while len(batch) < self.batch_size and not self._queue.empty():
+                item = self._queue.get_nowait()
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._commit(batch)
+            if stopping:
+                return
+
+    async def _commit(self, batch: List[Tuple[WriteOp, asyncio.Future]]) -> None:
+        started = time.perf_counter()
+        outcomes: List[Tuple[asyncio.Future, bool, Any]] = []
+        try:
+            await self._db.execute("BEGIN IMMEDIATE")
+            for op, future in batch:
+                await self._db.execute("SAVEPOINT write_op")
+                try:
+                    result = await op(self._db)
+                    await self._db.execute("RELEASE write_op")
+                    outcomes.append((future, True, result))
+                except Exception as e:
+                    await self._db.execute("ROLLBACK TO write_op")
+                    await self._db.execute("RELEASE write_op")
+                    outcomes.append((future, False, e))
+            await self._db.execute("COMMIT")
+        except Exception as e:
+            logger.error(f"❌ SQLite писар: пачка з {len(batch)} записів не збережена: {e}")
+            try:
+                await self._db.execute("ROLLBACK")
+            except Exception:
+                pass
+            outcomes = [(future, False, e) for _, future in batch]
+
+        self.batches += 1
+        self.commit_total += time.perf_counter() - started
+        for future, ok, value in outcomes:
+            if ok:
+                self.writes += 1
+            else:
+                self.failed += 1
+            if future.done():
+                continue  # Той, хто чекав, скасований
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+    async def stop(self) -> None:
+        """Дозапис черги та закриття з'єднання"""
+        if self._task is not None:
+            if not self._task.done():
+                await self._queue.put(None)
+            await self._task
+            self._task = None
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        batches = self.batches or 1
+        return {
+            "path": str(self.path),
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "writes": self.writes,
+            "failed": self.failed,
+            "batches": self.batches,
+            "avg_batch": round((self.writes + self.failed) / batches, 1),
+            "avg_commit_ms": round(self.commit_total / batches * 1000, 2),
+        }
+
+# ===== ГЛОБАЛЬНИЙ ПИСАР =====
+
+_writer: Optional[SQLiteWriter] = None
+
+def get_sqlite_writer() -> Optional[SQLiteWriter]:
+    """Запущений писар процесу; None - не SQLite, немає aiosqlite або не запущено"""
+    if _writer is not None and _writer.running:
+        return _writer
+    return None
+
+async def start_sqlite_writer(url: str) -> Optional[SQLiteWriter]:
+    """Запуск писаря для файлової SQLite (з init_db)"""
+    global _writer
+    path = sqlite_path(url)
+    if path is None:
+        return None
+    if not AIOSQLITE_AVAILABLE:
+        logger.warning("⚠️ aiosqlite не встановлено - записи SQLite без черги писаря")
+        return None
+
+    if _writer is None:
+        _writer = SQLiteWriter(path)
+    await _writer.start()
+    return _writer
+
+async def stop_sqlite_writer() -> None:
+    global _writer
+    if _writer is not None:
+        await _writer.stop()
+        _writer = None
+
+# ===== ЕКСПОРТ =====
+__all__ = [
+    'SQLiteWriter', 'sqlite_pragmas', 'apply_pragmas', 'sqlite_path', 'utc_timestamp',
+    'get_sqlite_writer', 'start_sqlite_writer', 'stop_sqlite_writer', 'AIOSQLITE_AVAILABLE'
+]
@@ -5,7 +5,7 @@
 """
 
 import logging
-from aiogram import Dispatcher, F
+from aiogram import Dispatcher, F, Router
 from aiogram.types import Message, CallbackQuery
 from aiogram.filters import Command, CommandStart
 
@@ -15,8 +15,21 @@ def register_all_handlers(dp: Dispatcher):
     """🔥 РЕЄСТРАЦІЯ ВСІХ HANDLERS З ПОВНИМ ФУНКЦІОНАЛОМ БД"""
     logger.info("🔥 Початок реєстрації повнофункціональних handlers...")
     
+    # Модулі хендлерів - заглушки, імпорт при першому використанні.
+    # Раніше реєструвався лише core-роутер нижче; тепер контент, гейміфікація,
+    # модерація, дуелі та адмін-панель працюють через handlers.lazy
+    from .lazy import register_lazy_handlers
+    try:
+        from config.settings import LAZY_HANDLERS
+    except ImportError:
+        LAZY_HANDLERS = True
+    register_lazy_handlers(dp, preload=not LAZY_HANDLERS)
+    
+    # Базові handlers - після модулів, як запасний варіант
+    router = Router(name="core")
+    
     # Команда /start з реальною БД
-    @dp.message(CommandStart())
+    @router.message(CommandStart())
     async def start_handler(message: Message):
         user = message.from_user
         
@@ -63,7 +76,7 @@ def register_all_handlers(dp: Dispatcher):
         )
     
     # Команда /profile з реальними даними з БД
-    @dp.message(Command("profile"))
+    @router.message(Command("profile"))
     async def profile_handler(message: Message):
         user = message.from_user
         
@@ -123,7 +136,7 @@ def register_all_handlers(dp: Dispatcher):
         )
     
     # Команда /top з реальними даними з БД
-    @dp.message(Command("top"))
+    @router.message(Command("top"))
     async def top_handler(message: Message):
         try:
             from database import get_leaderboard
@@ -177,7 +190,7 @@ def register_all_handlers(dp: Dispatcher):
         await message.answer(text)
     
     # Команда /meme з реальним нарахуванням балів
-    @dp.message(Command("meme"))
+    @router.message(Command("meme"))
     async def meme_handler(message: Message):
         user = message.from_user
         
@@ -219,7 +232,7 @@ def register_all_handlers(dp: Dispatcher):
         await message.answer(f"🎭 <b>Ось ваш мем:</b>\n\n{meme_text}{bonus_text}\n\n{source_info}")
     
     # Команда /anekdot з реальним нарахуванням балів
-    @dp.message(Command("anekdot"))
+    @router.message(Command("anekdot"))
     async def anekdot_handler(message: Message):
         user = message.from_user
         
@@ -259,7 +272,7 @@ def register_all_handlers(dp: Dispatcher):
         await message.answer(f"🎭 <b>Ось ваш анекдот:</b>\n\n{anekdot_text}{bonus_text}\n\n{source_info}")
     
     # Команда /submit з реальним збереженням в БД
-    @dp.message(Command("submit"))
+    @router.message(Command("submit"))
     async def submit_handler(message: Message):
         try:
             from database import add_content_for_moderation
@@ -286,7 +299,7 @@ def register_all_handlers(dp: Dispatcher):
             )
     
     # Команда /admin з реальною статистикою з БД
-    @dp.message(Command("admin"))
+    @router.message(Command("admin"))
     async def admin_handler(message: Message):
         try:
             import os
@@ -342,7 +355,7 @@ def register_all_handlers(dp: Dispatcher):
             await message.answer(f"❌ Помилка панелі адміністратора: {e}")
     
     # Команда /help
-    @dp.message(Command("help"))
+    @router.message(Command("help"))
     async def help_handler(message: Message):
         await message.answer(
             "❓ <b>ПОВНА ДОВІДКА ПО БОТУ</b>\n\n"
@@ -365,7 +378,7 @@ def register_all_handlers(dp: Dispatcher):
         )
     
     # Обробка всіх текстових повідомлень
-    @dp.message(F.text & ~F.text.startswith('/'))
+    @router.message(F.text & ~F.text.startswith('/'))
     async def text_handler(message: Message):
         await message.answer(
             "🤖 Привіт! Я розумію команди.\n\n"
@@ -379,7 +392,7 @@ def register_all_handlers(dp: Dispatcher):
         )
     
     # Error handler
-    @dp.error()
+    @router.error()
     async def error_handler(event, exception):
         logger.error(f"❌ Unhandled error: {exception}")
         try:
@@ -392,16 +405,17 @@ def register_all_handlers(dp: Dispatcher):
             pass
     
     # Реєстрація інших handlers (placeholder)
-    @dp.callback_query()
+    @router.callback_query()
     async def callback_handler(callback: CallbackQuery):
         await callback.answer("🔧 Функція в активній розробці!")
     
-    @dp.message()
+    @router.message()
     async def other_handler(message: Message):
         await message.answer(
             "🤖 Надішліть текстове повідомлення або використовуйте /help для списку команд."
         )
     
+    dp.include_router(router)
     logger.info("🔥 Повнофункціональні handlers з БД зареєстровано успішно!")
 
 # Експорт
@@ -218,7 +218,7 @@ async def cmd_approve(message: Message):
             return
         
         # Схвалюємо контент
-        result = await approve_content(content_id, message.from_user.id)
+        result = await approve_content(content_id, message.from_user.id, bot=message.bot)
         
         if result:
             await message.answer(f"✅ Контент ID {content_id} схвалено!")
@@ -251,7 +251,7 @@ async def cmd_reject(message: Message):
         reason = " ".join(parts[2:]) if len(parts) > 2 else "Не вказано"
         
         # Відхиляємо контент
-        result = await reject_content(content_id, message.from_user.id, reason)
+        result = await reject_content(content_id, message.from_user.id, reason, bot=message.bot)
         
         if result:
             await message.answer(f"❌ Контент ID {content_id} відхилено!\nПричина: {reason}")
@@ -262,92 +262,25 @@ async def cmd_reject(message: Message):
         logger.error(f"Error in reject command: {e}")
         await message.answer("❌ Помилка команди відхилення.")
 
-async def approve_content(content_id: int, admin_id: int) -> bool:
-    """Схвалення контенту"""
+async def approve_content(content_id: int, admin_id: int, bot=None) -> bool:
+    """Схвалення контенту (той самий шлях, що й масова модерація)"""
     try:
-        from database.services import get_db_session, update_user_points
-        from database.models import Content, ContentStatus, AdminAction
+        from services.moderation_queue import bulk_resolve_content
         
-        with get_db_session() as session:
-            content = session.query(Content).filter(Content.id == content_id).first()
-            
-            if not content:
-                return False
-            
-            if content.status != ContentStatus.PENDING.value:
-                return False
-            
-            # Схвалюємо контент
-            content.status = ContentStatus.APPROVED.value
-            content.moderated_by = admin_id
-            content.moderated_at = datetime.now()
-            
-            # Нараховуємо бали автору
-            update_user_points(content.author_user_id, 20, f"схвалення контенту ID {content_id}")
-            
-            # Оновлюємо статистику автора
-            from database.models import User
-            author = session.query(User).filter(User.id == content.author_id).first()
-            if author:
-                author.total_approvals += 1
-            
-            # Записуємо дію адміна
-            admin_action = AdminAction(
-                admin_id=admin_id,
-                action_type="approve_content",
-                target_type="content",
-                target_id=content_id,
-                description=f"Схвалено контент типу {content.content_type}",
-                created_at=datetime.now()
-            )
-            session.add(admin_action)
-            
-            session.commit()
-            
-            logger.info(f"Admin {admin_id} approved content {content_id}")
-            return True
+        result = await bulk_resolve_content([content_id], admin_id, True, bot=bot)
+        return result["processed"] > 0
             
     except Exception as e:
         logger.error(f"Error approving content {content_id}: {e}")
         return False
 
-async def reject_content(content_id: int, admin_id: int, reason: str = "") -> bool:
-    """Відхилення контенту"""
+async def reject_content(content_id: int, admin_id: int, reason: str = "", bot=None) -> bool:
+    """Відхилення контенту (той самий шлях, що й масова модерація)"""
     try:
-        from database.services import get_db_session
-        from database.models import Content, ContentStatus, AdminAction
+        from services.moderation_queue import bulk_resolve_content
         
-        with get_db_session() as session:
-            content = session.query(Content).filter(Content.id == content_id).first()
-            
-            if not content:
-                return False
-            
-            if content.status != ContentStatus.PENDING.value:
-                return False
-            
-            # Відхиляємо контент
-            content.status = ContentStatus.REJECTED.value
-            content.moderated_by = admin_id
-            content.moderated_at = datetime.now()
-            content.rejection_reason = reason
-            
-            # Записуємо дію адміна
-            admin_action = AdminAction(
-                admin_id=admin_id,
-                action_type="reject_content",
-                target_type="content",
-                target_id=content_id,
-                description=f"Відхилено контент типу {content.content_type}",
-                reason=reason,
-                created_at=datetime.now()
-            )
-            session.add(admin_action)
-            
-            session.commit()
-            
-            logger.info(f"Admin {admin_id} rejected content {content_id}: {reason}")
-            return True
+        result = await bulk_resolve_content([content_id], admin_id, False, reason or None, bot=bot)
+        return result["processed"] > 0
             
     except Exception as e:
         logger.error(f"Error rejecting content {content_id}: {e}")
@@ -403,7 +336,7 @@ async def handle_admin_callbacks(callback: CallbackQuery, state: FSMContext):
             # Схвалення контенту
             content_id = int(data.split("_")[-1])
             
-            result = await approve_content(content_id, callback.from_user.id)
+            result = await approve_content(content_id, callback.from_user.id, bot=callback.bot)
             
             if result:
                 await callback.answer("✅ Контент схвалено!", show_alert=True)
@@ -457,7 +390,7 @@ async def handle_rejection_reason(message: Message, state: FSMContext):
         reason = message.text.strip() if message.text else "Не вказано"
         
         # Відхиляємо контент
-        result = await reject_content(content_id, message.from_user.id, reason)
+        result = await reject_content(content_id, message.from_user.id, reason, bot=message.bot)
         
         if result:
             await message.answer(f"❌ Контент ID {content_id} відхилено!\nПричина: {reason}")
@@ -480,7 +413,7 @@ async def cmd_skip_rejection(message: Message, state: FSMContext):
         content_id = data.get('reject_content_id')
         
         if content_id:
-            result = await reject_content(content_id, message.from_user.id, "Причина не вказана")
+            result = await reject_content(content_id, message.from_user.id, "Причина не вказана", bot=message.bot)
             
             if result:
                 await message.answer(f"❌ Контент ID {content_id} відхилено без вказання причини.")
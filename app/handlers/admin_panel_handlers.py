@@ -25,6 +25,10 @@ from aiogram.types import (
 )
 from aiogram import Dispatcher
 
+from utils.callback_data import CallbackRoute, CallbackRouter
+from utils.executors import PoolBusyError, run_in_pool
+from utils.keyboards import cached_keyboard
+
 logger = logging.getLogger(__name__)
 
 def is_admin(user_id: int) -> bool:
@@ -66,6 +70,7 @@ def get_admin_static_menu() -> ReplyKeyboardMarkup:
         persistent=True
     )
 
+@cached_keyboard
 def get_admin_inline_menu() -> InlineKeyboardMarkup:
     """Inline меню для адмін панелі"""
     keyboard = [
@@ -128,26 +133,29 @@ async def get_bot_statistics() -> Dict[str, Any]:
             "database_status": "❌ Помилка"
         }
 
-async def get_system_info() -> Dict[str, Any]:
-    """Системна інформація"""
+def collect_system_info() -> Dict[str, Any]:
+    """Замір psutil (блокуючий виклик - виконується в пулі io)"""
     import psutil
     import sys
     
+    memory = psutil.virtual_memory()
+    disk = psutil.disk_usage('/')
+    
+    return {
+        "python_version": f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}",
+        "memory_total": f"{memory.total / (1024**3):.1f} GB",
+        "memory_used": f"{memory.used / (1024**3):.1f} GB", 
+        "memory_percent": f"{memory.percent:.1f}%",
+        "disk_total": f"{disk.total / (1024**3):.1f} GB",
+        "disk_used": f"{disk.used / (1024**3):.1f} GB",
+        "disk_percent": f"{(disk.used/disk.total)*100:.1f}%",
+        "uptime": str(datetime.now() - datetime.fromtimestamp(psutil.boot_time())).split('.')[0]
+    }
+
+async def get_system_info() -> Dict[str, Any]:
+    """Системна інформація"""
     try:
-        # Інформація про систему
-        memory = psutil.virtual_memory()
-        disk = psutil.disk_usage('/')
-        
-        return {
-            "python_version": f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}",
-            "memory_total": f"{memory.total / (1024**3):.1f} GB",
-            "memory_used": f"{memory.used / (1024**3):.1f} GB", 
-            "memory_percent": f"{memory.percent:.1f}%",
-            "disk_total": f"{disk.total / (1024**3):.1f} GB",
-            "disk_used": f"{disk.used / (1024**3):.1f} GB",
-            "disk_percent": f"{(disk.used/disk.total)*100:.1f}%",
-            "uptime": str(datetime.now() - datetime.fromtimestamp(psutil.boot_time())).split('.')[0]
-        }
+        return await run_in_pool("io", collect_system_info)
     except Exception as e:
         logger.error(f"❌ Помилка системної інформації: {e}")
         return {"error": str(e)}
@@ -203,6 +211,46 @@ async def cmd_admin_menu(message: Message):
         parse_mode="HTML"
     )
 
+async def cmd_loop_stats(message: Message):
+    """Затримка event loop, місця синхронних блокувань і пули (/loopstats, /loopstats reset)"""
+    if not is_admin(message.from_user.id):
+        await message.answer("❌ Доступ заборонено.")
+        return
+    
+    from utils.loop_watchdog import get_loop_watchdog
+    watchdog = get_loop_watchdog()
+    
+    if message.text and message.text.split()[-1] == "reset":
+        watchdog.reset()
+        await message.answer("🐕 Статистику event loop скинуто")
+        return
+    
+    text = watchdog.format_report()
+    if not watchdog.running:
+        text += "\n\n⚠️ Сторож не запущено (LOOP_WATCHDOG_ENABLED)"
+    
+    from utils.executors import get_executor_stats
+    pools = get_executor_stats()
+    if pools:
+        text += "\n\n🏭 <b>Пули:</b>"
+        for pool in pools.values():
+            text += (
+                f"\n• {pool['name']} ({pool['kind']}): в роботі {pool['in_flight']}/{pool['capacity']}, "
+                f"виконано {pool['completed']}, помилок {pool['failed']}, відмов {pool['rejected']}, "
+                f"черга {pool['avg_wait_ms']} мс, виконання {pool['avg_run_ms']} мс"
+            )
+    
+    from database.replica import get_replica_stats
+    replica = get_replica_stats()
+    if replica:
+        lag = f"{replica['lag_seconds']} с" if replica['lag_seconds'] is not None else "невідомо"
+        text += (
+            f"\n\n📚 <b>Репліка ({replica['backend']}):</b> {'✅' if replica['healthy'] else '⚠️ основна БД'}, "
+            f"відставання {lag} (макс {replica['max_lag_seconds']:.0f} с), "
+            f"читань з репліки {replica['replica_reads']}, з основної {replica['primary_fallbacks']}"
+        )
+    await message.answer(text, parse_mode="HTML")
+
 # ===== ОБРОБКА СТАТИЧНИХ КНОПОК =====
 
 async def handle_admin_static_buttons(message: Message):
@@ -380,6 +428,35 @@ async def show_trending_content(message: Message):
     
     await message.answer(text, reply_markup=keyboard, parse_mode="HTML")
 
+TRENDING_PERIODS = {
+    "trending_today": ("за сьогодні", timedelta(days=1)),
+    "trending_week": ("за тиждень", timedelta(days=7)),
+    "trending_month": ("за місяць", timedelta(days=30)),
+}
+
+async def show_trending_period(message: Message, period_key: str):
+    """Топ контенту за rating_score за період"""
+    from services.trending import get_trending_content
+    
+    title, period = TRENDING_PERIODS[period_key]
+    try:
+        items = await run_in_pool("io", get_trending_content, period, 10)
+    except Exception as e:
+        logger.error(f"❌ Помилка трендового контенту: {e}")
+        await message.answer("❌ Трендовий контент недоступний")
+        return
+    
+    if not items:
+        await message.answer(f"📭 Немає схваленого контенту {title}")
+        return
+    
+    text = f"🔥 <b>ТРЕНДОВЕ {title.upper()}</b>\n\n"
+    for position, item in enumerate(items, 1):
+        preview = item['text'][:60] + ("..." if len(item['text']) > 60 else "")
+        text += f"{position}. #{item['id']} ⭐ {item['rating_score']:.1f} 👍 {item['likes']}\n{preview}\n\n"
+    
+    await message.answer(text, parse_mode="HTML")
+
 async def show_bot_settings(message: Message):
     """Налаштування бота"""
     text = "⚙️ <b>НАЛАШТУВАННЯ БОТА</b>\n\n"
@@ -405,6 +482,7 @@ async def show_mass_actions(message: Message):
     
     keyboard = InlineKeyboardMarkup(inline_keyboard=[
         [InlineKeyboardButton(text="📢 Розсилка", callback_data="mass_broadcast")],
+        [InlineKeyboardButton(text="🏆 Перерахувати ранги", callback_data="mass_ranks")],
         [InlineKeyboardButton(text="🧹 Очистка", callback_data="mass_cleanup")],
         [InlineKeyboardButton(text="💾 Бекап", callback_data="mass_backup")]
     ])
@@ -418,33 +496,170 @@ async def show_backup_options(message: Message):
     
     keyboard = InlineKeyboardMarkup(inline_keyboard=[
         [InlineKeyboardButton(text="💾 Створити бекап", callback_data="backup_create")],
+        [InlineKeyboardButton(text="➕ Інкрементальний бекап", callback_data="backup_incremental")],
         [InlineKeyboardButton(text="📥 Завантажити бекап", callback_data="backup_download")],
         [InlineKeyboardButton(text="🔄 Відновити дані", callback_data="backup_restore")]
     ])
     
     await message.answer(text, reply_markup=keyboard, parse_mode="HTML")
 
+async def run_backup(message: Message, incremental: bool = False):
+    """Запуск потокового бекапу з оновленням прогресу в повідомленні"""
+    import asyncio
+    
+    status = await message.answer("💾 Підготовка бекапу...")
+    loop = asyncio.get_running_loop()
+    last_update = [0.0]
+    
+    async def edit_status(text: str):
+        try:
+            await status.edit_text(text)
+        except Exception:
+            pass  # Той самий текст або повідомлення видалено
+    
+    def on_progress(report):
+        # Викликається з робочого потоку; оновлюємо не частіше ніж раз на 2 с
+        now = loop.time()
+        if now - last_update[0] < 2:
+            return
+        last_update[0] = now
+        text = f"💾 {report.table}: {report.table_rows}/{report.table_total} ({report.percent:.0f}%)"
+        asyncio.run_coroutine_threadsafe(edit_status(text), loop)
+    
+    try:
+        from services.admin_services import BackupService
+        
+        # Серіалізація та стиснення - у пулі процесів, бот не зупиняється
+        manifest = await run_in_pool("cpu", BackupService.create_backup, incremental, progress=on_progress)
+    except PoolBusyError:
+        await edit_status("⏳ Бекап вже виконується, спробуйте пізніше")
+        return
+    except Exception as e:
+        logger.error(f"❌ Помилка бекапу: {e}")
+        await edit_status(f"❌ Помилка бекапу: {e}")
+        return
+    
+    text = f"✅ <b>{'Інкрементальний бекап' if incremental else 'Бекап'} створено</b>\n\n"
+    for name, info in manifest["tables"].items():
+        text += f"• {name}: {info['rows']} рядків\n"
+    text += f"\n📁 <code>{manifest['path']}</code>"
+    try:
+        await status.edit_text(text, parse_mode="HTML")
+    except Exception:
+        await message.answer(text, parse_mode="HTML")
+
+async def recalculate_ranks(message: Message):
+    """Перерахунок рангів та сповіщення про підвищення"""
+    try:
+        from services.admin_services import BulkActionService
+        from services.broadcast_system import get_broadcast_system
+        
+        result = await run_in_pool("io", BulkActionService.recalculate_user_ranks)
+    except PoolBusyError:
+        await message.answer("⏳ Сервер зайнятий, спробуйте пізніше")
+        return
+    except Exception as e:
+        logger.error(f"❌ Помилка перерахунку рангів: {e}")
+        await message.answer(f"❌ Помилка перерахунку рангів: {e}")
+        return
+    
+    broadcast_system = get_broadcast_system(message.bot)
+    if broadcast_system and result["rank_ups"]:
+        broadcast_system.schedule_personal_messages(
+            BulkActionService.build_rank_up_notifications(result["rank_ups"])
+        )
+    
+    await message.answer(
+        f"🏆 <b>Ранги перераховано</b>\n\n"
+        f"👥 Користувачів: {result['total_users']}\n"
+        f"🔄 Змінено рангів: {result['updated_ranks']}\n"
+        f"🎖️ Підвищень: {len(result['rank_ups'])}",
+        parse_mode="HTML"
+    )
+
+async def show_restore_instructions(message: Message):
+    """Доступні бекапи та команда відновлення"""
+    from services.backup_restore import find_backup_chain
+    try:
+        from config.settings import BACKUP_DIR
+    except ImportError:
+        from pathlib import Path
+        BACKUP_DIR = Path("data/backups")
+    
+    chain = find_backup_chain(BACKUP_DIR)
+    if not chain:
+        await message.answer("📭 Бекапів для відновлення ще немає")
+        return
+    
+    text = "🔄 <b>ВІДНОВЛЕННЯ ДАНИХ</b>\n\n"
+    text += "Ланцюжок для відновлення:\n"
+    for path in chain:
+        text += f"• <code>{path.name}</code>\n"
+    text += "\n⚠️ Відновлення замінює дані в БД, тому запускається вручну при зупиненому боті:\n"
+    text += "<code>python -m services.backup_restore --latest</code>"
+    
+    await message.answer(text, parse_mode="HTML")
+
 # ===== CALLBACK ОБРОБНИКИ =====
 
-async def handle_admin_callbacks(callback_query: CallbackQuery):
+admin_callbacks = CallbackRouter("admin")
+
+# Кнопки адмінки без окремого маршруту - заглушки "в розробці"
+ADMIN_CALLBACK_PREFIXES = (
+    "admin_", "moderate_", "users_", "content_", "settings_", "mass_", "backup_", "trending_"
+)
+
+@admin_callbacks.exact("admin_refresh_stats")
+async def callback_refresh_stats(callback_query: CallbackQuery):
+    await callback_query.answer("🔄 Оновлення статистики...")
+    await show_detailed_statistics(callback_query.message)
+
+@admin_callbacks.exact("moderate_pending")
+async def callback_moderate_pending(callback_query: CallbackQuery):
+    await callback_query.answer("📝 Завантаження контенту...")
+    await callback_query.message.answer("📝 Тут буде список контенту на модерації")
+
+@admin_callbacks.exact("backup_create", "backup_incremental")
+async def callback_backup(callback_query: CallbackQuery):
+    await callback_query.answer("💾 Бекап запущено...")
+    await run_backup(callback_query.message, incremental=callback_query.data == "backup_incremental")
+
+@admin_callbacks.exact(*TRENDING_PERIODS)
+async def callback_trending(callback_query: CallbackQuery):
+    await callback_query.answer("🔥 Завантаження...")
+    await show_trending_period(callback_query.message, callback_query.data)
+
+@admin_callbacks.exact("mass_ranks")
+async def callback_mass_ranks(callback_query: CallbackQuery):
+    await callback_query.answer("🏆 Перерахунок рангів...")
+    await recalculate_ranks(callback_query.message)
+
+@admin_callbacks.exact("backup_restore")
+async def callback_backup_restore(callback_query: CallbackQuery):
+    await callback_query.answer()
+    await show_restore_instructions(callback_query.message)
+
+def admin_callback_filter(callback_query: CallbackQuery):
+    """Маршрут з словника або заглушка для решти кнопок адмінки"""
+    route = admin_callbacks.resolve(callback_query.data)
+    if route is not None:
+        return {"route": route}
+    if callback_query.data and callback_query.data.startswith(ADMIN_CALLBACK_PREFIXES):
+        return {"route": None}
+    return False
+
+async def handle_admin_callbacks(callback_query: CallbackQuery, route: Optional[CallbackRoute] = None):
     """Обробка всіх адмін callback'ів"""
     if not is_admin(callback_query.from_user.id):
         await callback_query.answer("❌ Доступ заборонено", show_alert=True)
         return
     
-    data = callback_query.data
-    
-    if data == "admin_refresh_stats":
-        await callback_query.answer("🔄 Оновлення статистики...")
-        await show_detailed_statistics(callback_query.message)
-    
-    elif data == "moderate_pending":
-        await callback_query.answer("📝 Завантаження контенту...")
-        await callback_query.message.answer("📝 Тут буде список контенту на модерації")
+    if route is not None:
+        await route(callback_query)
     
-    elif data.startswith("admin_"):
+    elif callback_query.data.startswith("admin_"):
         await callback_query.answer("⚙️ Функція в розробці")
-        await callback_query.message.answer(f"🔧 Функція '{data}' буде додана в наступному оновленні")
+        await callback_query.message.answer(f"🔧 Функція '{callback_query.data}' буде додана в наступному оновленні")
     
     else:
         await callback_query.answer("❓ Невідома команда")
@@ -457,6 +672,7 @@ def register_admin_handlers(dp: Dispatcher):
     # Команди
     dp.message.register(cmd_admin, Command("admin"))
     dp.message.register(cmd_admin_menu, Command("adminmenu"))
+    dp.message.register(cmd_loop_stats, Command("loopstats"))
     
     # Статичні кнопки
     dp.message.register(
@@ -468,20 +684,13 @@ def register_admin_handlers(dp: Dispatcher):
         ])
     )
     
-    # Callback запити
-    dp.callback_query.register(handle_admin_callbacks, F.data.startswith("admin_"))
-    dp.callback_query.register(handle_admin_callbacks, F.data.startswith("moderate_"))
-    dp.callback_query.register(handle_admin_callbacks, F.data.startswith("users_"))
-    dp.callback_query.register(handle_admin_callbacks, F.data.startswith("content_"))
-    dp.callback_query.register(handle_admin_callbacks, F.data.startswith("settings_"))
-    dp.callback_query.register(handle_admin_callbacks, F.data.startswith("mass_"))
-    dp.callback_query.register(handle_admin_callbacks, F.data.startswith("backup_"))
-    dp.callback_query.register(handle_admin_callbacks, F.data.startswith("trending_"))
+    # Callback запити - один хендлер, маршрут зі словника
+    dp.callback_query.register(handle_admin_callbacks, admin_callback_filter)
     
     logger.info("✅ Адмін хендлери з статичним меню зареєстровано")
 
 # ===== ЕКСПОРТ =====
 __all__ = [
     'register_admin_handlers', 'is_admin', 'get_admin_static_menu',
-    'cmd_admin', 'cmd_admin_menu'
+    'cmd_admin', 'cmd_admin_menu', 'cmd_loop_stats'
 ]
\ No newline at end of file
@@ -12,6 +12,7 @@ from aiogram.filters import Command, CommandStart
 from aiogram.types import Message, InlineKeyboardMarkup, InlineKeyboardButton, CallbackQuery
 
 from config.settings import settings, EMOJI, TEXTS
+from utils.keyboards import cached_keyboard
 
 logger = logging.getLogger(__name__)
 
@@ -95,6 +96,7 @@ async def cmd_start(message: Message):
     # Логування нового користувача
     logger.info(f"🎉 Користувач {user_id} ({first_name}) запустив бота")
 
+@cached_keyboard
 def get_main_menu_keyboard() -> InlineKeyboardMarkup:
     """Головне меню бота (✅ ВИПРАВЛЕНО)"""
     return InlineKeyboardMarkup(inline_keyboard=[
@@ -15,13 +15,18 @@
 import logging
 import random
 from datetime import datetime
-from typing import Optional, List, Dict, Any, Union
+from typing import Optional, List, Dict, Any, Union, Tuple
 from aiogram import Dispatcher, F
 from aiogram.filters import Command
 from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 
+from utils.callback_data import (
+    CallbackRouter, CONTENT_DUEL, CONTENT_MORE, CONTENT_REACTION, CONTENT_SHARE, CONTENT_TYPE, SUBMIT_TYPE
+)
+from utils.keyboards import cached_keyboard
+
 logger = logging.getLogger(__name__)
 
 # ===== STATES ДЛЯ FSM =====
@@ -124,6 +129,7 @@ async def get_random_content(content_type: str = None, user_id: int = None) -> O
         logger.error(f"❌ Error getting content: {e}")
         return None
 
+@cached_keyboard
 def create_content_keyboard(content_id: int, content_type: str, 
                           likes: int = 0, dislikes: int = 0) -> InlineKeyboardMarkup:
     """Створення клавіатури для контенту"""
@@ -132,25 +138,25 @@ def create_content_keyboard(content_id: int, content_type: str,
         [
             InlineKeyboardButton(
                 text=f"{EMOJI['like']} {likes}", 
-                callback_data=f"like_content:{content_id}"
+                callback_data=CONTENT_REACTION.pack("like", content_id)
             ),
             InlineKeyboardButton(
                 text=f"{EMOJI['dislike']} {dislikes}", 
-                callback_data=f"dislike_content:{content_id}"
+                callback_data=CONTENT_REACTION.pack("dislike", content_id)
             ),
             InlineKeyboardButton(
                 text=f"{EMOJI['love']}", 
-                callback_data=f"love_content:{content_id}"
+                callback_data=CONTENT_REACTION.pack("love", content_id)
             )
         ],
         [
             InlineKeyboardButton(
                 text="🔄 Ще один", 
-                callback_data=f"more_content:{content_type}"
+                callback_data=CONTENT_MORE.pack(content_type)
             ),
             InlineKeyboardButton(
                 text="📤 Поділитися", 
-                callback_data=f"share_content:{content_id}"
+                callback_data=CONTENT_SHARE.pack(content_id)
             )
         ],
         [
@@ -160,13 +166,14 @@ def create_content_keyboard(content_id: int, content_type: str,
             ),
             InlineKeyboardButton(
                 text="⚔️ Дуель", 
-                callback_data=f"duel_with_content:{content_id}"
+                callback_data=CONTENT_DUEL.pack(content_id)
             )
         ]
     ])
     
     return keyboard
 
+@cached_keyboard
 def create_content_type_keyboard() -> InlineKeyboardMarkup:
     """Створення клавіатури вибору типу контенту"""
     
@@ -174,21 +181,21 @@ def create_content_type_keyboard() -> InlineKeyboardMarkup:
         [
             InlineKeyboardButton(
                 text=f"{EMOJI['joke']} Жарт", 
-                callback_data="content_type:joke"
+                callback_data=CONTENT_TYPE.pack("joke")
             ),
             InlineKeyboardButton(
                 text=f"{EMOJI['meme']} Мем", 
-                callback_data="content_type:meme"
+                callback_data=CONTENT_TYPE.pack("meme")
             )
         ],
         [
             InlineKeyboardButton(
                 text=f"{EMOJI['anekdot']} Анекдот", 
-                callback_data="content_type:anekdot"
+                callback_data=CONTENT_TYPE.pack("anekdot")
             ),
             InlineKeyboardButton(
                 text="🎲 Випадковий", 
-                callback_data="content_type:random"
+                callback_data=CONTENT_TYPE.pack("random")
             )
         ],
         [
@@ -289,8 +296,56 @@ async def cmd_content(message: Message):
     keyboard = create_content_type_keyboard()
     await message.answer(text, reply_markup=keyboard)
 
+SUBMISSION_PERIOD_SECONDS = 24 * 60 * 60
+
+async def check_submission_limit(user_id: int, commit: bool = False) -> Optional[str]:
+    """
+    Перевірка денного ліміту подач (MAX_SUBMISSIONS_PER_DAY)
+    
+    Args:
+        user_id: ID користувача
+        commit: Зарахувати подачу (False - тільки перевірити)
+    
+    Returns:
+        Текст відмови або None
+    """
+    try:
+        from config.settings import RATE_LIMITING_ENABLED, MAX_SUBMISSIONS_PER_DAY, ALL_ADMIN_IDS
+    except ImportError:
+        RATE_LIMITING_ENABLED, MAX_SUBMISSIONS_PER_DAY, ALL_ADMIN_IDS = True, 10, []
+    
+    if not RATE_LIMITING_ENABLED or user_id in ALL_ADMIN_IDS:
+        return None
+    
+    try:
+        from utils.rate_limiter import get_rate_limiter
+        limiter = get_rate_limiter()
+        key = f"submit:{user_id}"
+        if commit:
+            result = await limiter.hit(key, MAX_SUBMISSIONS_PER_DAY, SUBMISSION_PERIOD_SECONDS)
+        else:
+            result = await limiter.probe(key, MAX_SUBMISSIONS_PER_DAY, SUBMISSION_PERIOD_SECONDS)
+    except Exception as e:
+        logger.warning(f"⚠️ Submission limiter error: {e}")
+        return None
+    
+    if result.allowed:
+        return None
+    
+    hours = int(result.retry_after // 3600)
+    minutes = int(result.retry_after % 3600 // 60) + 1
+    return (
+        f"⏳ Ліміт подач вичерпано ({MAX_SUBMISSIONS_PER_DAY} на добу).\n"
+        f"Наступна подача через {hours} год {minutes} хв."
+    )
+
 async def cmd_submit(message: Message, state: FSMContext):
     """Команда подачі контенту"""
+    limit_text = await check_submission_limit(message.from_user.id)
+    if limit_text:
+        await message.answer(limit_text)
+        return
+    
     text = (
         f"📝 <b>ПОДАЧА КОНТЕНТУ</b>\n\n"
         f"🎯 Поділіться своїм гумором з спільнотою!\n\n"
@@ -307,6 +362,92 @@ async def cmd_submit(message: Message, state: FSMContext):
 
 # ===== FSM HANDLERS =====
 
+async def get_submission_history(user_id: int) -> List[str]:
+    """Останні подачі автора для фільтра спаму (порожньо, якщо БД недоступна)"""
+    try:
+        from utils.content_filter import SPAM_HISTORY_DEPTH
+        from database.database import get_recent_submissions
+        return await get_recent_submissions(user_id, limit=SPAM_HISTORY_DEPTH)
+    except Exception as e:
+        logger.warning(f"⚠️ Історія подач недоступна: {e}")
+        return []
+
+def check_content_filter(content_text: str, user_history: Optional[List[str]] = None) -> Optional[str]:
+    """
+    Перевірка контенту фільтром перед модерацією
+    
+    Args:
+        content_text: Текст подачі
+        user_history: Останні подачі автора (повтор - ознака спаму)
+    
+    Returns:
+        Текст відмови або None якщо контент пройшов перевірку
+    """
+    try:
+        from config.settings import (
+            PROFANITY_FILTER_ENABLED, AUTO_REJECT_PROFANITY,
+            SPAM_DETECTION_ENABLED, AUTO_REJECT_SPAM
+        )
+    except ImportError:
+        PROFANITY_FILTER_ENABLED = AUTO_REJECT_PROFANITY = True
+        SPAM_DETECTION_ENABLED = AUTO_REJECT_SPAM = True
+    
+    check_profanity = PROFANITY_FILTER_ENABLED and AUTO_REJECT_PROFANITY
+    check_spam = SPAM_DETECTION_ENABLED and AUTO_REJECT_SPAM
+    if not (check_profanity or check_spam):
+        return None
+    
+    try:
+        from utils.content_filter import get_content_filter
+        result = get_content_filter().check(content_text, user_history)
+    except Exception as e:
+        logger.error(f"❌ Помилка фільтра контенту: {e}")
+        return None
+    
+    if check_profanity and result.has_profanity:
+        return "❌ Контент містить ненормативну лексику! Спробуйте інакше 🙂"
+    
+    if check_spam and result.is_spam:
+        return "❌ Контент схожий на спам (посилання, капс, повтори символів або повторна подача)."
+    
+    return None
+
+def check_duplicate_content(content_text: str) -> Tuple[Optional[str], Optional[int]]:
+    """
+    Пошук дублікатів в індексі перед модерацією
+    
+    Returns:
+        (текст відмови або None, ID схожого контенту для позначки модератору)
+    """
+    try:
+        from config.settings import DUPLICATE_DETECTION_ENABLED, AUTO_REJECT_NEAR_DUPLICATES
+    except ImportError:
+        DUPLICATE_DETECTION_ENABLED, AUTO_REJECT_NEAR_DUPLICATES = True, False
+    
+    if not DUPLICATE_DETECTION_ENABLED:
+        return None, None
+    
+    try:
+        from utils.duplicate_index import get_duplicate_index
+        match = get_duplicate_index().check(content_text)
+    except Exception as e:
+        logger.error(f"❌ Помилка індексу дублікатів: {e}")
+        return None, None
+    
+    if not match:
+        return None, None
+    
+    if match.exact:
+        return f"❌ Такий контент вже є в базі (#{match.content_id})!", match.content_id
+    
+    if AUTO_REJECT_NEAR_DUPLICATES:
+        return (
+            f"❌ Дуже схожий контент вже є в базі (#{match.content_id}, "
+            f"{match.similarity:.0%} збігу)!"
+        ), match.content_id
+    
+    return None, match.content_id
+
 async def process_content_submission(message: Message, state: FSMContext):
     """Обробка тексту контенту"""
     content_text = message.text.strip()
@@ -320,8 +461,20 @@ async def process_content_submission(message: Message, state: FSMContext):
         await message.answer("❌ Контент занадто довгий! Максимум 2000 символів.")
         return
     
+    # Автоматичний фільтр лексики та спаму (з історією подач автора)
+    rejection = check_content_filter(content_text, await get_submission_history(message.from_user.id))
+    if rejection:
+        await message.answer(rejection)
+        return
+    
+    # Перевірка дублікатів (точних та перефразованих)
+    rejection, duplicate_of = check_duplicate_content(content_text)
+    if rejection:
+        await message.answer(rejection)
+        return
+    
     # Збереження контенту в стані
-    await state.update_data(content_text=content_text)
+    await state.update_data(content_text=content_text, duplicate_of=duplicate_of)
     
     # Вибір типу контенту
     text = (
@@ -333,11 +486,11 @@ async def process_content_submission(message: Message, state: FSMContext):
     
     keyboard = InlineKeyboardMarkup(inline_keyboard=[
         [
-            InlineKeyboardButton(text=f"{EMOJI['joke']} Жарт", callback_data="submit_type:joke"),
-            InlineKeyboardButton(text=f"{EMOJI['meme']} Мем", callback_data="submit_type:meme")
+            InlineKeyboardButton(text=f"{EMOJI['joke']} Жарт", callback_data=SUBMIT_TYPE.pack("joke")),
+            InlineKeyboardButton(text=f"{EMOJI['meme']} Мем", callback_data=SUBMIT_TYPE.pack("meme"))
         ],
         [
-            InlineKeyboardButton(text=f"{EMOJI['anekdot']} Анекдот", callback_data="submit_type:anekdot")
+            InlineKeyboardButton(text=f"{EMOJI['anekdot']} Анекдот", callback_data=SUBMIT_TYPE.pack("anekdot"))
         ],
         [
             InlineKeyboardButton(text="❌ Скасувати", callback_data="cancel_submission")
@@ -349,11 +502,14 @@ async def process_content_submission(message: Message, state: FSMContext):
 
 # ===== CALLBACK HANDLERS =====
 
-async def callback_content_type(callback: CallbackQuery):
+content_callbacks = CallbackRouter("content")
+
+@content_callbacks.route(CONTENT_TYPE)
+async def callback_content_type(callback: CallbackQuery, choice):
     """Callback вибору типу контенту для перегляду"""
     await callback.answer()
     
-    content_type = callback.data.split(':')[1]
+    content_type = choice.content_type
     
     if content_type == 'random':
         content = await get_random_content(None, callback.from_user.id)
@@ -379,51 +535,55 @@ async def callback_content_type(callback: CallbackQuery):
     
     await callback.message.edit_text(text, reply_markup=keyboard)
 
-async def callback_like_content(callback: CallbackQuery):
-    """Callback лайку контенту"""
-    await callback.answer("👍 Лайк зараховано!")
-    
-    content_id = int(callback.data.split(':')[1])
-    
-    # Спроба оновлення в БД
-    try:
-        from database import DATABASE_AVAILABLE
-        if DATABASE_AVAILABLE and content_id > 0:
-            # Тут буде логіка оновлення лайків в БД
-            pass
-    except:
-        pass
-    
-    # Оновлення клавіатури з новою кількістю лайків
-    current_text = callback.message.text
-    await callback.message.edit_text(
-        current_text + f"\n\n👍 Ви поставили лайк!"
-    )
+REACTION_TEXTS = {
+    "like": ("👍 Лайк зараховано!", "👍 Ви поставили лайк!"),
+    "dislike": ("👎 Дизлайк зараховано!", "👎 Ви поставили дизлайк."),
+    "love": ("❤️ Дуже сподобалось!", "❤️ Ви покохали цей контент!"),
+}
 
-async def callback_dislike_content(callback: CallbackQuery):
-    """Callback дизлайку контенту"""
-    await callback.answer("👎 Дизлайк зараховано!")
-    
-    # Аналогічна логіка для дизлайків
-    current_text = callback.message.text
-    await callback.message.edit_text(
-        current_text + f"\n\n👎 Ви поставили дизлайк."
-    )
+def _legacy_reaction(reaction: str):
+    """Кнопки старого формату (like_content:123) у вже надісланих повідомленнях"""
+    return lambda payload: CONTENT_REACTION.struct(reaction, int(payload))
 
-async def callback_love_content(callback: CallbackQuery):
-    """Callback любові до контенту"""
-    await callback.answer("❤️ Дуже сподобалось!")
+async def register_reaction(callback: CallbackQuery, content_id: int, reaction: str):
+    """Спільна обробка лайку/дизлайку/любові"""
+    answer, note = REACTION_TEXTS[reaction]
+    
+    if content_id > 0:
+        try:
+            from database.database import DATABASE_AVAILABLE
+            if DATABASE_AVAILABLE:
+                from services.reactions import get_reaction_service
+                accepted = await get_reaction_service().react(callback.from_user.id, content_id, reaction)
+                if not accepted:
+                    await callback.answer("😉 Ви вже оцінили цей контент")
+                    return
+        except Exception as e:
+            logger.warning(f"⚠️ Реакцію не збережено: {e}")
     
+    await callback.answer(answer)
+    
+    # Оновлення повідомлення з позначкою реакції
     current_text = callback.message.text
-    await callback.message.edit_text(
-        current_text + f"\n\n❤️ Ви покохали цей контент!"
-    )
+    await callback.message.edit_text(current_text + f"\n\n{note}")
+
+@content_callbacks.route(CONTENT_REACTION)
+@content_callbacks.parsed("like_content", _legacy_reaction("like"))
+@content_callbacks.parsed("dislike_content", _legacy_reaction("dislike"))
+@content_callbacks.parsed("love_content", _legacy_reaction("love"))
+async def callback_react_content(callback: CallbackQuery, reaction):
+    """Callback лайку/дизлайку/любові до контенту"""
+    if reaction.reaction not in REACTION_TEXTS:
+        await callback.answer("❓ Невідома реакція")
+        return
+    await register_reaction(callback, reaction.content_id, reaction.reaction)
 
-async def callback_more_content(callback: CallbackQuery):
+@content_callbacks.route(CONTENT_MORE)
+async def callback_more_content(callback: CallbackQuery, more):
     """Callback для отримання ще одного контенту"""
     await callback.answer()
     
-    content_type = callback.data.split(':')[1]
+    content_type = more.content_type
     content = await get_random_content(content_type, callback.from_user.id)
     
     if not content:
@@ -444,16 +604,23 @@ async def callback_more_content(callback: CallbackQuery):
     
     await callback.message.edit_text(text, reply_markup=keyboard)
 
-async def callback_share_content(callback: CallbackQuery):
+@content_callbacks.route(CONTENT_SHARE)
+async def callback_share_content(callback: CallbackQuery, share):
     """Callback поділитися контентом"""
     await callback.answer("📤 Функція поділитися в розробці!")
     
     # Тут може бути логіка створення посилання для шерінгу
 
+@content_callbacks.exact("submit_content")
 async def callback_submit_content(callback: CallbackQuery, state: FSMContext):
     """Callback початку подачі контенту"""
     await callback.answer()
     
+    limit_text = await check_submission_limit(callback.from_user.id)
+    if limit_text:
+        await callback.message.edit_text(limit_text)
+        return
+    
     text = (
         f"📝 <b>ПОДАЧА КОНТЕНТУ</b>\n\n"
         f"🎯 Поділіться своїм гумором з спільнотою!\n\n"
@@ -468,11 +635,12 @@ async def callback_submit_content(callback: CallbackQuery, state: FSMContext):
     await state.set_state(ContentSubmissionStates.waiting_for_content)
     await callback.message.edit_text(text)
 
-async def callback_submit_type(callback: CallbackQuery, state: FSMContext):
+@content_callbacks.route(SUBMIT_TYPE)
+async def callback_submit_type(callback: CallbackQuery, choice, state: FSMContext):
     """Callback вибору типу для подачі"""
     await callback.answer()
     
-    content_type = callback.data.split(':')[1]
+    content_type = choice.content_type
     data = await state.get_data()
     content_text = data.get('content_text')
     
@@ -500,6 +668,7 @@ async def callback_submit_type(callback: CallbackQuery, state: FSMContext):
     await state.set_state(ContentSubmissionStates.waiting_for_confirmation)
     await callback.message.edit_text(text, reply_markup=keyboard)
 
+@content_callbacks.exact("confirm_submission")
 async def callback_confirm_submission(callback: CallbackQuery, state: FSMContext):
     """Callback підтвердження подачі"""
     await callback.answer()
@@ -508,14 +677,22 @@ async def callback_confirm_submission(callback: CallbackQuery, state: FSMContext
     content_text = data.get('content_text')
     content_type = data.get('content_type')
     
+    # Облік подачі в денному ліміті
+    limit_text = await check_submission_limit(callback.from_user.id, commit=True)
+    if limit_text:
+        await state.clear()
+        await callback.message.edit_text(limit_text)
+        return
+    
     # Спроба додавання в БД
     try:
-        from database import add_content_for_moderation, DATABASE_AVAILABLE
+        from database.database import add_content_for_moderation, DATABASE_AVAILABLE
         if DATABASE_AVAILABLE:
             content = await add_content_for_moderation(
                 author_id=callback.from_user.id,
                 text=content_text,
-                content_type=content_type
+                content_type=content_type,
+                duplicate_of=data.get('duplicate_of')
             )
             
             if content:
@@ -553,6 +730,7 @@ async def callback_confirm_submission(callback: CallbackQuery, state: FSMContext
     await state.clear()
     await callback.message.edit_text(success_text)
 
+@content_callbacks.exact("cancel_submission")
 async def callback_cancel_submission(callback: CallbackQuery, state: FSMContext):
     """Callback скасування подачі"""
     await callback.answer()
@@ -561,6 +739,7 @@ async def callback_cancel_submission(callback: CallbackQuery, state: FSMContext)
     text = "❌ Подачу контенту скасовано."
     await callback.message.edit_text(text)
 
+@content_callbacks.exact("content_stats")
 async def callback_content_stats(callback: CallbackQuery):
     """Callback статистики контенту"""
     await callback.answer()
@@ -595,7 +774,8 @@ async def callback_content_stats(callback: CallbackQuery):
     
     await callback.message.edit_text(stats_text)
 
-async def callback_duel_with_content(callback: CallbackQuery):
+@content_callbacks.route(CONTENT_DUEL)
+async def callback_duel_with_content(callback: CallbackQuery, duel):
     """Callback початку дуелі з контентом"""
     await callback.answer("⚔️ Дуелі в розробці!")
     
@@ -619,55 +799,8 @@ def register_content_handlers(dp: Dispatcher):
         ContentSubmissionStates.waiting_for_content
     )
     
-    # Callback хендлери
-    dp.callback_query.register(
-        callback_content_type, 
-        F.data.startswith("content_type:")
-    )
-    dp.callback_query.register(
-        callback_like_content, 
-        F.data.startswith("like_content:")
-    )
-    dp.callback_query.register(
-        callback_dislike_content, 
-        F.data.startswith("dislike_content:")
-    )
-    dp.callback_query.register(
-        callback_love_content, 
-        F.data.startswith("love_content:")
-    )
-    dp.callback_query.register(
-        callback_more_content, 
-        F.data.startswith("more_content:")
-    )
-    dp.callback_query.register(
-        callback_share_content, 
-        F.data.startswith("share_content:")
-    )
-    dp.callback_query.register(
-        callback_submit_content, 
-        F.data == "submit_content"
-    )
-    dp.callback_query.register(
-        callback_submit_type, 
-        F.data.startswith("submit_type:")
-    )
-    dp.callback_query.register(
-        callback_confirm_submission, 
-        F.data == "confirm_submission"
-    )
-    dp.callback_query.register(
-        callback_cancel_submission, 
-        F.data == "cancel_submission"
-    )
-    dp.callback_query.register(
-        callback_content_stats, 
-        F.data == "content_stats"
-    )
-    dp.callback_query.register(
-        callback_duel_with_content, 
-        F.data.startswith("duel_with_content:")
-    )
+    # Callback хендлери - один маршрутизатор на всі кнопки контенту
+    content_callbacks.attach(dp)
     
     logger.info("✅ Content handlers зареєстровано!")
 
@@ -22,13 +22,14 @@ from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 
 # Імпорти проекту
-from config.settings import settings
 from database.services import (
-    get_or_create_user, update_user_points, get_user_by_id,
-    create_duel, get_active_duels, get_duel_by_id, vote_in_duel,
+    get_or_create_user, update_user_points,
+    create_duel, get_active_duels, get_user_active_duels, get_duel_by_id, vote_in_duel,
     finish_duel, get_user_duel_stats, get_random_approved_content
 )
 from database.models import DuelStatus, ContentType
+from utils.callback_data import CallbackRoute, CallbackRouter, DUEL_REFRESH, DUEL_VIEW, DUEL_VOTE
+from utils.keyboards import cached_keyboard
 
 logger = logging.getLogger(__name__)
 
@@ -84,7 +85,7 @@ async def cmd_duel(message: Message):
     """Головна команда /duel - показ меню дуелів"""
     try:
         user_id = message.from_user.id
-        await get_or_create_user(user_id, message.from_user.username, message.from_user.full_name)
+        await get_or_create_user(user_id, username=message.from_user.username, first_name=message.from_user.first_name)
         
         # Отримуємо статистику користувача
         stats = await get_user_duel_stats(user_id)
@@ -108,7 +109,7 @@ async def cmd_duel(message: Message):
         if active_duels:
             text += f"🔥 <b>Активні дуелі ({len(active_duels)}):</b>\n"
             for duel in active_duels[:2]:  # Показуємо топ 2
-                votes_total = duel.get('challenger_votes', 0) + duel.get('opponent_votes', 0)
+                votes_total = duel['content1_votes'] + duel['content2_votes']
                 text += f"• Дуель #{duel['id']} ({votes_total} голосів)\n"
             text += "\n"
         else:
@@ -163,7 +164,7 @@ async def cmd_active_duels(message: Message):
         text = f"{DUEL_EMOJI['fire']} <b>АКТИВНІ ДУЕЛІ</b>\n\n"
         
         for i, duel in enumerate(active_duels, 1):
-            votes_total = duel.get('challenger_votes', 0) + duel.get('opponent_votes', 0)
+            votes_total = duel['content1_votes'] + duel['content2_votes']
             time_left = calculate_time_left(duel.get('ends_at'))
             
             text += f"{i}. Дуель #{duel['id']}\n"
@@ -181,45 +182,23 @@ async def cmd_active_duels(message: Message):
 
 # ===== CALLBACK ОБРОБНИКИ =====
 
-async def handle_duel_callbacks(callback: CallbackQuery):
-    """Обробка всіх callback'ів пов'язаних з дуелями"""
+duel_callbacks = CallbackRouter("duels")
+
+async def handle_duel_callbacks(callback: CallbackQuery, route: CallbackRoute):
+    """Обробка всіх callback'ів пов'язаних з дуелями (маршрут знайдено фільтром)"""
     try:
-        data = callback.data
         user_id = callback.from_user.id
         
         # Гарантуємо що користувач існує
-        await get_or_create_user(user_id, callback.from_user.username, callback.from_user.full_name)
+        await get_or_create_user(user_id, username=callback.from_user.username, first_name=callback.from_user.first_name)
+        
+        await route(callback)
         
-        if data == "create_duel":
-            await handle_create_duel_callback(callback)
-            
-        elif data == "view_duels":
-            await handle_view_duels_callback(callback)
-            
-        elif data == "duel_stats":
-            await handle_duel_stats_callback(callback)
-            
-        elif data == "duel_rules":
-            await handle_duel_rules_callback(callback)
-            
-        elif data.startswith("view_duel_"):
-            duel_id = int(data.split("_")[2])
-            await handle_view_specific_duel(callback, duel_id)
-            
-        elif data.startswith("vote_"):
-            await handle_vote_callback(callback)
-            
-        elif data.startswith("duel_refresh_"):
-            duel_id = int(data.split("_")[2])
-            await handle_refresh_duel(callback, duel_id)
-            
-        else:
-            await callback.answer("❓ Невідома дія")
-            
     except Exception as e:
         logger.error(f"Error in duel callback: {e}")
         await callback.answer("❌ Помилка обробки дії")
 
+@duel_callbacks.exact("create_duel")
 async def handle_create_duel_callback(callback: CallbackQuery):
     """Обробка створення дуелі через callback"""
     try:
@@ -238,13 +217,12 @@ async def handle_create_duel_callback(callback: CallbackQuery):
         logger.error(f"Error in create duel callback: {e}")
         await callback.answer("❌ Помилка створення дуелі")
 
-async def handle_vote_callback(callback: CallbackQuery):
+@duel_callbacks.route(DUEL_VOTE)
+async def handle_vote_callback(callback: CallbackQuery, vote):
     """Обробка голосування в дуелі"""
     try:
-        # Парсимо дані: vote_duelID_side (challenger/opponent)
-        parts = callback.data.split("_")
-        duel_id = int(parts[1])
-        side = parts[2]  # 'challenger' або 'opponent'
+        duel_id = vote.duel_id
+        side = vote.side  # 'content1' або 'content2'
         
         user_id = callback.from_user.id
         
@@ -277,6 +255,19 @@ async def handle_vote_callback(callback: CallbackQuery):
         logger.error(f"Error in vote callback: {e}")
         await callback.answer("❌ Помилка голосування")
 
+@duel_callbacks.route(DUEL_VIEW)
+async def handle_view_specific_duel(callback: CallbackQuery, view):
+    """Показ конкретної дуелі зі списку"""
+    await show_duel_in_message(callback.message, view.duel_id, edit=True)
+    await callback.answer()
+
+@duel_callbacks.route(DUEL_REFRESH)
+async def handle_refresh_duel(callback: CallbackQuery, refresh):
+    """Оновлення рахунку дуелі"""
+    await show_duel_in_message(callback.message, refresh.duel_id, edit=True)
+    await callback.answer("🔄 Оновлено")
+
+@duel_callbacks.exact("view_duels")
 async def handle_view_duels_callback(callback: CallbackQuery):
     """Показ списку активних дуелів"""
     try:
@@ -289,7 +280,7 @@ async def handle_view_duels_callback(callback: CallbackQuery):
         text = f"{DUEL_EMOJI['fire']} <b>АКТИВНІ ДУЕЛІ</b>\n\n"
         
         for i, duel in enumerate(active_duels, 1):
-            votes_total = duel.get('challenger_votes', 0) + duel.get('opponent_votes', 0)
+            votes_total = duel['content1_votes'] + duel['content2_votes']
             time_left = calculate_time_left(duel.get('ends_at'))
             
             text += f"{i}. Дуель #{duel['id']} ({votes_total} голосів)\n"
@@ -305,6 +296,7 @@ async def handle_view_duels_callback(callback: CallbackQuery):
         logger.error(f"Error in view duels callback: {e}")
         await callback.answer("❌ Помилка завантаження дуелів")
 
+@duel_callbacks.exact("duel_stats")
 async def handle_duel_stats_callback(callback: CallbackQuery):
     """Показ статистики дуелів користувача"""
     try:
@@ -355,18 +347,19 @@ async def handle_duel_stats_callback(callback: CallbackQuery):
 async def create_random_duel() -> Optional[Dict[str, Any]]:
     """Створення випадкової дуелі між двома жартами"""
     try:
-        # Отримуємо два випадкові схвалені жарти
-        content1 = await get_random_approved_content(ContentType.JOKE)
-        content2 = await get_random_approved_content(ContentType.JOKE)
+        # Отримуємо два випадкові схвалені жарти (запасний жарт без id - не з БД)
+        content1 = await get_random_approved_content(ContentType.JOKE.value)
+        content2 = await get_random_approved_content(ContentType.JOKE.value)
         
-        if not content1 or not content2 or content1['id'] == content2['id']:
+        if not getattr(content1, 'id', None) or not getattr(content2, 'id', None) or content1.id == content2.id:
             # Пробуємо меми якщо жартів не вистачає
-            if not content1:
-                content1 = await get_random_approved_content(ContentType.MEME)
-            if not content2:
-                content2 = await get_random_approved_content(ContentType.MEME)
+            if not getattr(content1, 'id', None):
+                content1 = await get_random_approved_content(ContentType.MEME.value)
+            if not getattr(content2, 'id', None) or content2.id == getattr(content1, 'id', None):
+                content2 = await get_random_approved_content(ContentType.MEME.value)
         
-        if not content1 or not content2:
+        id1, id2 = getattr(content1, 'id', None), getattr(content2, 'id', None)
+        if not id1 or not id2 or id1 == id2:
             return None
         
         # Тривалість дуелі (5 хвилин)
@@ -375,8 +368,8 @@ async def create_random_duel() -> Optional[Dict[str, Any]]:
         
         # Створюємо дуель
         duel = await create_duel(
-            content1_id=content1['id'],
-            content2_id=content2['id'],
+            content1_id=id1,
+            content2_id=id2,
             ends_at=ends_at,
             min_votes=3
         )
@@ -444,7 +437,7 @@ def format_duel_text(duel: Dict[str, Any]) -> str:
         # Заголовок
         text = f"{DUEL_EMOJI['sword']} <b>ДУЕЛЬ #{duel_id}</b> {DUEL_EMOJI['sword']}\n\n"
         
-        if status == DuelStatus.FINISHED:
+        if status == DuelStatus.COMPLETED:
             # Завершена дуель
             winner_text = "🤝 Нічия!"
             if votes1 > votes2:
@@ -460,10 +453,10 @@ def format_duel_text(duel: Dict[str, Any]) -> str:
         
         # Контент дуелі
         text += f"🅰️ <b>Жарт A</b> ({votes1} {get_votes_word(votes1)}):\n"
-        text += f"<i>{content1.get('text', 'Завантаження...')}</i>\n\n"
+        text += f"<i>{content1.get('text') or 'Завантаження...'}</i>\n\n"
         
         text += f"🅱️ <b>Жарт B</b> ({votes2} {get_votes_word(votes2)}):\n"
-        text += f"<i>{content2.get('text', 'Завантаження...')}</i>\n\n"
+        text += f"<i>{content2.get('text') or 'Завантаження...'}</i>\n\n"
         
         # Підсумок голосування
         if total_votes > 0:
@@ -499,11 +492,11 @@ def create_duel_keyboard(duel: Dict[str, Any]) -> InlineKeyboardMarkup:
             buttons.append([
                 InlineKeyboardButton(
                     text=f"🅰️ Голосую за A", 
-                    callback_data=f"vote_{duel_id}_content1"
+                    callback_data=DUEL_VOTE.pack(duel_id, "content1")
                 ),
                 InlineKeyboardButton(
                     text=f"🅱️ Голосую за B", 
-                    callback_data=f"vote_{duel_id}_content2"
+                    callback_data=DUEL_VOTE.pack(duel_id, "content2")
                 )
             ])
             
@@ -511,7 +504,7 @@ def create_duel_keyboard(duel: Dict[str, Any]) -> InlineKeyboardMarkup:
             buttons.append([
                 InlineKeyboardButton(
                     text="🔄 Оновити", 
-                    callback_data=f"duel_refresh_{duel_id}"
+                    callback_data=DUEL_REFRESH.pack(duel_id)
                 )
             ])
         
@@ -529,6 +522,7 @@ def create_duel_keyboard(duel: Dict[str, Any]) -> InlineKeyboardMarkup:
         logger.error(f"Error creating duel keyboard: {e}")
         return InlineKeyboardMarkup(inline_keyboard=[])
 
+@cached_keyboard
 def create_duel_main_keyboard(has_active_duels: bool = False) -> InlineKeyboardMarkup:
     """Створення головної клавіатури дуелів"""
     buttons = [
@@ -558,7 +552,7 @@ def create_duels_list_keyboard(duels: List[Dict]) -> InlineKeyboardMarkup:
         buttons.append([
             InlineKeyboardButton(
                 text=button_text, 
-                callback_data=f"view_duel_{duel['id']}"
+                callback_data=DUEL_VIEW.pack(duel['id'])
             )
         ])
     
@@ -615,20 +609,8 @@ def get_votes_word(count: int) -> str:
 
 def get_duel_rank(rating: int) -> str:
     """Визначення рангу дуеліста за рейтингом"""
-    if rating >= 2000:
-        return f"{DUEL_EMOJI['crown']} Гранд-майстер"
-    elif rating >= 1800:
-        return f"{DUEL_EMOJI['trophy']} Майстер"
-    elif rating >= 1600:
-        return f"{DUEL_EMOJI['star']} Експерт"
-    elif rating >= 1400:
-        return f"{DUEL_EMOJI['lightning']} Професіонал"
-    elif rating >= 1200:
-        return f"{DUEL_EMOJI['fire']} Досвідчений"
-    elif rating >= 1000:
-        return f"{DUEL_EMOJI['target']} Новачок"
-    else:
-        return "🥉 Стажер"
+    from utils.ranks import duel_rank_for
+    return duel_rank_for(rating)
 
 async def check_and_finish_duel(duel_id: int):
     """Перевірка та автоматичне завершення дуелі"""
@@ -676,6 +658,7 @@ async def check_and_finish_duel(duel_id: int):
 
 # ===== ДОДАТКОВІ ХЕНДЛЕРИ =====
 
+@duel_callbacks.exact("duel_rules")
 async def handle_duel_rules_callback(callback: CallbackQuery):
     """Показ правил дуелів"""
     text = f"{DUEL_EMOJI['sword']} <b>ПРАВИЛА ДУЕЛІВ ЖАРТІВ</b>\n\n"
@@ -715,14 +698,7 @@ def register_duel_handlers(dp: Dispatcher):
     dp.message.register(cmd_active_duels, Command("duels"))
     
     # Callback'и
-    dp.callback_query.register(
-        handle_duel_callbacks,
-        lambda c: c.data and (
-            c.data.startswith("duel_") or
-            c.data.startswith("vote_") or
-            c.data in ["create_duel", "view_duels", "duel_stats", "duel_rules", "back_to_duels"]
-        )
-    )
+    dp.callback_query.register(handle_duel_callbacks, duel_callbacks.filter)
     
     logger.info("✅ Duel handlers registered")
 
@@ -19,17 +19,13 @@ from aiogram import Dispatcher, F
 from aiogram.filters import Command
 from aiogram.types import Message, InlineKeyboardMarkup, InlineKeyboardButton, CallbackQuery
 
+from utils.ranks import POINT_RANKS, rank_for, next_rank
+
 logger = logging.getLogger(__name__)
 
 # ===== РАНГИ ТА КОНСТАНТИ =====
-RANKS = {
-    0: "🥚 Новачок",
-    50: "🐣 Початківець", 
-    150: "🐤 Весельчак",
-    300: "🐓 Жартівник",
-    500: "🦅 Майстер Гумору",
-    1000: "🦸 Легенда Жартів"
-}
+# Поріг -> назва (для сумісності; джерело - utils.ranks)
+RANKS = dict(zip(POINT_RANKS.thresholds, POINT_RANKS.names))
 
 EMOJI = {
     'profile': '👤',
@@ -189,26 +185,15 @@ async def update_user_points(user_id: int, points: int, reason: str = "") -> boo
 
 def get_rank_by_points(points: int) -> str:
     """Визначення рангу за балами"""
-    for min_points in sorted(RANKS.keys(), reverse=True):
-        if points >= min_points:
-            return RANKS[min_points]
-    return RANKS[0]
+    return rank_for(points)
 
 def get_next_rank_info(current_points: int) -> Dict[str, Any]:
     """Інформація про наступний ранг"""
-    current_rank = get_rank_by_points(current_points)
-    
-    for min_points in sorted(RANKS.keys()):
-        if min_points > current_points:
-            return {
-                "next_rank": RANKS[min_points],
-                "points_needed": min_points - current_points,
-                "current_points": current_points
-            }
+    upcoming = next_rank(current_points)
     
     return {
-        "next_rank": None,
-        "points_needed": 0,
+        "next_rank": upcoming[0] if upcoming else None,
+        "points_needed": upcoming[1] if upcoming else 0,
         "current_points": current_points
     }
 
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+💤 ЛІНИВЕ ЗАВАНТАЖЕННЯ ХЕНДЛЕРІВ 💤
+
+Модулі хендлерів не імпортуються при старті:
+✅ Для кожного модуля реєструється легкий роутер-заглушка (команди, префікси кнопок, стани FSM)
+✅ Перше підходяще оновлення імпортує модуль і реєструє його хендлери
+✅ Оновлення передається справжнім хендлерам, далі - без повторного імпорту
+✅ Модуль, що не імпортується, пропускає оновлення далі (до базових хендлерів)
+"""
+
+import time
+import asyncio
+import logging
+import importlib
+from typing import Any, Dict, Iterable, List, Optional
+
+from aiogram import Dispatcher, Router
+from aiogram.dispatcher.event.bases import UNHANDLED, SkipHandler
+from aiogram.types import CallbackQuery, Message
+
+from utils.callback_data import (
+    CONTENT_DUEL, CONTENT_MORE, CONTENT_REACTION, CONTENT_SHARE, CONTENT_TYPE, SUBMIT_TYPE,
+    DUEL_REFRESH, DUEL_VIEW, DUEL_VOTE, MODERATION
+)
+
+logger = logging.getLogger(__name__)
+
+class LazyRouter(Router):
+    """Заглушка модуля хендлерів: імпорт при першому використанні"""
+
+    def __init__(self, module: str, register: str, commands: Iterable[str] = (),
+                 command_prefixes: Iterable[str] = (), texts: Iterable[str] = (),
+                 callbacks: Iterable[str] = (), callback_prefixes: Iterable[str] = (),
+                 states: Iterable[str] = ()):
+        super().__init__(name=f"lazy:{module}")
+        self.module = module
+        self.register_name = register
+        self.commands = frozenset(commands)
+        self.command_prefixes = tuple(command_prefixes)
+        self.texts = frozenset(texts)
+        self.callbacks = frozenset(callbacks)
+        self.callback_prefixes = tuple(callback_prefixes)
+        self.states = tuple(f"{group}:" for group in states)
+
+        self.target: Optional[Router] = None
+        self.failed = False
+        self._lock = asyncio.Lock()
+
+        self.message.register(self._dispatch_message, self._match_message)
+        self.callback_query.register(self._dispatch_callback, self._match_callback)
+
+    # ===== ФІЛЬТРИ =====
+
+    def _match_message(self, message: Message, raw_state: Optional[str] = None) -> bool:
+        if raw_state and self.states and raw_state.startswith(self.states):
+            return True
+
+        text = message.text
+        if not text:
+            return False
+        if text[0] == "/":
+            command = text[1:].split(maxsplit=1)[0].split("@", 1)[0].lower()
+            return command in self.commands or bool(self.command_prefixes and command.startswith(self.command_prefixes))
+        return text in self.texts
+
+    def _match_callback(self, callback: CallbackQuery) -> bool:
+        data = callback.data
+        if not data:
+            return False
+        return data in self.callbacks or bool(self.callback_prefixes and data.startswith(self.callback_prefixes))
+
+    # ===== ЗАВАНТАЖЕННЯ =====
+
+    def load(self) -> Optional[Router]:
+        """Імпорт модуля та реєстрація його хендлерів на окремому роутері"""
+        if self.target is not None or self.failed:
+            return self.target
+
+        started = time.perf_counter()
+        try:
+            module = importlib.import_module(self.module)
+            target = Router(name=self.module)
+            getattr(module, self.register_name)(target)
+        except Exception as e:
+            self.failed = True
+            logger.error(f"❌ Модуль {self.module} не завантажено: {e}")
+            return None
+
+        self.target = target
+        logger.info(f"💤 {self.module} завантажено за {(time.perf_counter() - started) * 1000:.0f} мс")
+        return target
+
+    async def _dispatch(self, update_type: str, event, data: Dict[str, Any]) -> Any:
+        target = self.target
+        if target is None:
+            async with self._lock:
+                target = self.load()
+        if target is None:
+            raise SkipHandler()
+
+        data.pop("handler", None)
+        result = await target.propagate_event(update_type, event, **data)
+        if result is UNHANDLED:
+            raise SkipHandler()
+        return result
+
+    async def _dispatch_message(self, message: Message, **data: Any) -> Any:
+        return await self._dispatch("message", message, data)
+
+    async def _dispatch_callback(self, callback: CallbackQuery, **data: Any) -> Any:
+        return await self._dispatch("callback_query", callback, data)
+
+# ===== МОДУЛІ =====
+
+# Порядок важливий: перший роутер, що обробив оновлення, зупиняє пошук.
+# handlers.basic_commands тут немає: /start, /help, /stats обробляє core-роутер
+# з handlers/__init__.py, а сам модуль не імпортується (config.settings без settings)
+LAZY_MODULES: List[Dict[str, Any]] = [
+    {
+        "module": "handlers.content_handlers",
+        "register": "register_content_handlers",
+        "commands": ["joke", "meme", "anekdot", "content", "submit"],
+        "callbacks": ["submit_content", "confirm_submission", "cancel_submission", "content_stats"],
+        "callback_prefixes": [codec.token for codec in (CONTENT_REACTION, CONTENT_MORE, CONTENT_SHARE,
+                                                        CONTENT_DUEL, CONTENT_TYPE, SUBMIT_TYPE)]
+                             + ["like_content:", "dislike_content:", "love_content:"],
+        "states": ["ContentSubmissionStates"],
+    },
+    {
+        "module": "handlers.gamification_handlers",
+        "register": "register_gamification_handlers",
+        "commands": ["profile", "top", "daily"],
+        "callbacks": ["earn_points_info", "refresh_leaderboard"],
+    },
+    {
+        "module": "handlers.moderation_handlers",
+        "register": "register_moderation_handlers",
+        "commands": ["pending", "moderate", "admin_stats", "approve_many", "reject_many", "approve_trusted"],
+        "command_prefixes": ["approve_", "reject_"],
+        "callbacks": ["approve_trusted", "finish_moderation", "next_moderation", "refresh_admin_stats",
+                      "start_moderation"],
+        "callback_prefixes": [MODERATION.token, "approve:", "reject:", "skip:"],
+    },
+    {
+        "module": "handlers.duel_handlers",
+        "register": "register_duel_handlers",
+        "commands": ["duel", "create_duel", "duels"],
+        "callbacks": ["create_duel", "view_duels", "duel_stats", "duel_rules"],
+        "callback_prefixes": [DUEL_VOTE.token, DUEL_VIEW.token, DUEL_REFRESH.token],
+        "states": ["DuelStates"],
+    },
+    {
+        "module": "handlers.admin_panel_handlers",
+        "register": "register_admin_handlers",
+        "commands": ["admin", "adminmenu", "loopstats"],
+        "texts": ["📊 Статистика", "🛡️ Модерація", "👥 Користувачі", "📝 Контент", "🔥 Трендове",
+                  "⚙️ Налаштування", "🚀 Масові дії", "💾 Бекап", "❌ Вимкнути адмін меню"],
+        "callback_prefixes": ["admin_", "moderate_", "users_", "content_", "settings_", "mass_",
+                              "backup_", "trending_"],
+    },
+    {
+        "module": "handlers.admin_handlers",
+        "register": "register_admin_handlers",
+        "commands": ["approve", "reject", "skip"],
+        "states": ["ModerationStates"],
+    },
+]
+
+def register_lazy_handlers(dp: Dispatcher, preload: bool = False) -> List[LazyRouter]:
+    """
+    Реєстрація заглушок для всіх модулів хендлерів
+
+    Args:
+        preload: Імпортувати модулі одразу (перевірка збірки, локальна розробка)
+    """
+    routers = [LazyRouter(**spec) for spec in LAZY_MODULES]
+    for router in routers:
+        dp.include_router(router)
+        if preload:
+            router.load()
+
+    logger.info(f"💤 Зареєстровано {len(routers)} лінивих модулів хендлерів")
+    return routers
+
+# ===== ЕКСПОРТ =====
+__all__ = ['LazyRouter', 'LAZY_MODULES', 'register_lazy_handlers']
@@ -6,12 +6,19 @@
 
 import logging
 import re
+import itertools
 from datetime import datetime, timedelta
 
 from aiogram import Dispatcher, F
 from aiogram.filters import Command
 from aiogram.types import Message, InlineKeyboardMarkup, InlineKeyboardButton
 
+from utils.callback_data import CallbackRouter, MODERATION
+from services.moderation_queue import (
+    ModerationItem, get_moderation_queue, resolve_content,
+    bulk_resolve_content, approve_trusted_authors
+)
+
 logger = logging.getLogger(__name__)
 
 # Fallback імпорти
@@ -40,39 +47,19 @@ EMOJI = {
 }
 
 def is_admin(user_id: int) -> bool:
-    """Перевірка чи є користувач адміністратором"""
-    return user_id == settings.ADMIN_ID
-
-# Fallback для модерації без БД
-PENDING_CONTENT = []  # Тимчасове сховище
-CONTENT_COUNTER = 1
-
-class ContentItem:
-    def __init__(self, id, author_id, text, content_type="joke", author_name="Невідомий"):
-        self.id = id
-        self.author_id = author_id
-        self.text = text
-        self.content_type = content_type
-        self.author_name = author_name
-        self.created_at = datetime.now()
-
-async def get_pending_content():
-    """Отримання контенту на модерації"""
+    """Перевірка чи є користувач адміністратором (будь-який з ALL_ADMIN_IDS)"""
     try:
-        # Спроба отримання з БД
-        from database.database import get_pending_content as db_get_pending
-        return await db_get_pending()
+        from config.settings import ALL_ADMIN_IDS
+        return user_id in ALL_ADMIN_IDS
     except ImportError:
-        # Fallback - використовуємо пам'ять
-        return PENDING_CONTENT
+        return user_id == settings.ADMIN_ID
 
-async def update_user_points(user_id: int, points: int, reason: str):
-    """Нарахування балів користувачу"""
-    try:
-        from database.database import update_user_points as db_update_points
-        await db_update_points(user_id, points, reason)
-    except ImportError:
-        logger.info(f"👤 Користувач {user_id}: +{points} балів за {reason}")
+# ID для контенту без БД (в БД ID видає сама таблиця)
+_FALLBACK_IDS = itertools.count(1)
+
+async def get_pending_content():
+    """Контент на модерації у порядку пріоритету"""
+    return get_moderation_queue().pending()
 
 async def cmd_pending(message: Message):
     """Команда /pending - показати контент на модерації"""
@@ -96,7 +83,8 @@ async def cmd_pending(message: Message):
         f"{EMOJI['brain']} Анекдотів: {len(jokes)}\n"
         f"{EMOJI['laugh']} Мемів: {len(memes)}\n\n"
         f"{EMOJI['info']} Використовуй /moderate для перегляду по черзі\n"
-        f"або /approve_ID і /reject_ID для швидкої модерації"
+        f"або /approve_ID і /reject_ID для швидкої модерації\n"
+        f"Масово: /approve_many 1 2 3, /reject_many 4 5 [причина], /approve_trusted"
     )
     
     # Клавіатура швидких дій
@@ -104,6 +92,9 @@ async def cmd_pending(message: Message):
         [
             InlineKeyboardButton(text=f"{EMOJI['brain']} Почати модерацію", callback_data="start_moderation"),
             InlineKeyboardButton(text=f"{EMOJI['stats']} Статистика", callback_data="refresh_admin_stats")
+        ],
+        [
+            InlineKeyboardButton(text=f"{EMOJI['check']} Схвалити від довірених", callback_data="approve_trusted")
         ]
     ])
     
@@ -115,14 +106,13 @@ async def cmd_moderate(message: Message):
         await message.answer(f"{EMOJI['cross']} Ця команда доступна тільки адміністраторам!")
         return
     
-    pending_content = await get_pending_content()
+    # Модератор отримує елемент в оренду - інші адміни його не побачать
+    content = get_moderation_queue().claim(message.from_user.id)
     
-    if not pending_content:
+    if not content:
         await message.answer(f"{EMOJI['check']} Немає контенту на модерації!")
         return
     
-    # Показуємо перший елемент
-    content = pending_content[0]
     await show_content_for_moderation(message, content)
 
 async def show_content_for_moderation(message: Message, content):
@@ -136,34 +126,40 @@ async def show_content_for_moderation(message: Message, content):
     content_type_name = "Анекдот" if getattr(content, 'content_type', 'joke') == 'joke' else "Мем"
     
     # Час очікування
-    created_at = getattr(content, 'created_at', datetime.now())
-    waiting_time = datetime.now() - created_at
+    created_at = getattr(content, 'created_at', None) or datetime.utcnow()
+    waiting_time = datetime.utcnow() - created_at
     waiting_hours = int(waiting_time.total_seconds() // 3600)
     
     moderation_text = (
         f"{EMOJI['new']} <b>МОДЕРАЦІЯ КОНТЕНТУ #{content.id}</b>\n\n"
         f"{content_type_emoji} <b>Тип:</b> {content_type_name}\n"
         f"{EMOJI['profile']} <b>Автор:</b> {author_info} (ID: {author_id})\n"
-        f"{EMOJI['time']} <b>Очікує:</b> {waiting_hours} годин\n\n"
-        f"{EMOJI['fire']} <b>КОНТЕНТ:</b>\n{content.text}"
+        f"{EMOJI['star']} <b>Репутація автора:</b> {getattr(content, 'reputation', 0.0):.1f}\n"
+        f"{EMOJI['time']} <b>Очікує:</b> {waiting_hours} годин\n"
     )
     
+    reports = getattr(content, 'reports', 0)
+    if reports:
+        moderation_text += f"{EMOJI['warning']} <b>Скарг:</b> {reports}\n"
+    
+    moderation_text += f"\n{EMOJI['fire']} <b>КОНТЕНТ:</b>\n{content.text}"
+    
     # Клавіатура модерації з додатковими опціями
     keyboard = InlineKeyboardMarkup(inline_keyboard=[
         [
             InlineKeyboardButton(
                 text=f"{EMOJI['check']} Схвалити (+{settings.POINTS_FOR_APPROVAL})",
-                callback_data=f"approve:{content.id}"
+                callback_data=MODERATION.pack("approve", content.id)
             ),
             InlineKeyboardButton(
                 text=f"{EMOJI['cross']} Відхилити",
-                callback_data=f"reject:{content.id}"
+                callback_data=MODERATION.pack("reject", content.id)
             )
         ],
         [
             InlineKeyboardButton(
                 text=f"{EMOJI['thinking']} Пропустити",
-                callback_data=f"skip:{content.id}"
+                callback_data=MODERATION.pack("skip", content.id)
             ),
             InlineKeyboardButton(
                 text=f"{EMOJI['stats']} Наступний",
@@ -193,7 +189,7 @@ async def cmd_approve_content(message: Message):
         return
     
     content_id = int(match.group(1))
-    await approve_content(message, content_id, "Швидке схвалення через команду")
+    await approve_content(message, content_id, "Швидке схвалення через команду", message.from_user.id)
 
 async def cmd_reject_content(message: Message):
     """Команда /reject_ID - швидке відхилення контенту за ID"""
@@ -208,54 +204,44 @@ async def cmd_reject_content(message: Message):
         return
     
     content_id = int(match.group(1))
-    await reject_content(message, content_id, "Швидке відхилення через команду")
+    await reject_content(message, content_id, "Швидке відхилення через команду", message.from_user.id)
 
-async def approve_content(message: Message, content_id: int, comment: str = ""):
-    """Схвалення контенту з повним циклом нарахування балів"""
+async def take_content_for_decision(message: Message, content_id: int, admin_id: int,
+                                    approved: bool, comment: str = ""):
+    """
+    Остаточне рішення щодо контенту - спільний шлях схвалення та відхилення
+    
+    resolve_content іде через масову модерацію: статус і бали в одній транзакції,
+    сповіщення автору - через розсилку.
+    
+    Returns:
+        Елемент черги або None (з поясненням адміністратору)
+    """
+    content, status = await resolve_content(content_id, admin_id, approved, comment or None, bot=message.bot)
+    
+    if status == "locked":
+        await message.answer(f"{EMOJI['warning']} Контент #{content_id} зараз розглядає інший модератор!")
+    elif status == "processed":
+        await message.answer(f"{EMOJI['info']} Контент #{content_id} вже оброблено іншим модератором.")
+    elif status == "not_found":
+        await message.answer(f"{EMOJI['cross']} Контент #{content_id} не знайдений!")
+    
+    return content
+
+async def approve_content(message: Message, content_id: int, comment: str = "", admin_id: int = None):
+    """Схвалення контенту: бали автора - в одній транзакції зі статусом, сповіщення - через розсилку"""
+    admin_id = admin_id or message.from_user.id
     try:
-        # Пошук контенту в тимчасовому сховищі
-        global PENDING_CONTENT
-        content = None
-        for item in PENDING_CONTENT:
-            if item.id == content_id:
-                content = item
-                break
-        
+        content = await take_content_for_decision(message, content_id, admin_id, True, comment)
         if not content:
-            await message.answer(f"{EMOJI['cross']} Контент #{content_id} не знайдений!")
             return
-        
-        # Видалення з черги модерації
-        PENDING_CONTENT.remove(content)
-        
-        # Нарахування балів автору
-        await update_user_points(
-            content.author_id,
-            settings.POINTS_FOR_APPROVAL,
-            "схвалення контенту"
-        )
-        
-        # Повідомлення автору
-        try:
-            content_type_name = "анекдот" if getattr(content, 'content_type', 'joke') == 'joke' else "мем"
-            notification_text = (
-                f"{EMOJI['party']} <b>УРА! Твій {content_type_name} схвалено!</b>\n\n"
-                f"{EMOJI['star']} Він додано до загальної бази\n"
-                f"{EMOJI['fire']} Ти отримав +{settings.POINTS_FOR_APPROVAL} балів!\n\n"
-                f"{EMOJI['info']} При схваленні отримаєш ще більше балів!\n\n"
-                f"{EMOJI['star']} Переглянь свій профіль: /profile"
-            )
-            
-            await message.bot.send_message(content.author_id, notification_text)
-        except Exception as e:
-            logger.error(f"Не вдалося повідомити автора: {e}")
+        author_name = content.author_name
         
         # Відповідь адміністратору
-        success_text = (
-            f"{EMOJI['check']} <b>Контент #{content_id} схвалено!</b>\n\n"
-            f"{EMOJI['profile']} Автор: {content.author_name}\n"
-            f"{EMOJI['fire']} Автор отримав +{settings.POINTS_FOR_APPROVAL} балів"
-        )
+        success_text = f"{EMOJI['check']} <b>Контент #{content_id} схвалено!</b>\n\n"
+        if author_name:
+            success_text += f"{EMOJI['profile']} Автор: {author_name}\n"
+        success_text += f"{EMOJI['fire']} Автор отримав +{settings.POINTS_FOR_APPROVAL} балів"
         
         # Клавіатура для продовження модерації
         keyboard = InlineKeyboardMarkup(inline_keyboard=[
@@ -267,50 +253,20 @@ async def approve_content(message: Message, content_id: int, comment: str = ""):
         
         await message.answer(success_text, reply_markup=keyboard)
         
-        logger.info(f"✅ Адміністратор {message.from_user.id} схвалив контент {content_id}")
+        logger.info(f"✅ Адміністратор {admin_id} схвалив контент {content_id}")
         
     except Exception as e:
         await message.answer(f"{EMOJI['cross']} Помилка схвалення: {e}")
         logger.error(f"Помилка схвалення контенту {content_id}: {e}")
 
-async def reject_content(message: Message, content_id: int, comment: str = ""):
+async def reject_content(message: Message, content_id: int, comment: str = "", admin_id: int = None):
     """Відхилення контенту з поясненням"""
+    admin_id = admin_id or message.from_user.id
     try:
-        # Пошук контенту в тимчасовому сховищі
-        global PENDING_CONTENT
-        content = None
-        for item in PENDING_CONTENT:
-            if item.id == content_id:
-                content = item
-                break
-        
+        content = await take_content_for_decision(message, content_id, admin_id, False, comment)
         if not content:
-            await message.answer(f"{EMOJI['cross']} Контент #{content_id} не знайдений!")
             return
         
-        # Видалення з черги модерації
-        PENDING_CONTENT.remove(content)
-        
-        # Повідомлення автору
-        try:
-            content_type_name = "анекдот" if getattr(content, 'content_type', 'joke') == 'joke' else "мем"
-            rejection_text = (
-                f"{EMOJI['cross']} <b>Твій {content_type_name} не пройшов модерацію</b>\n\n"
-                f"{EMOJI['thinking']} Можливі причини:\n"
-                f"• Не відповідає правилам спільноти\n"
-                f"• Вже є в базі\n"
-                f"• Низька якість контенту\n\n"
-                f"{EMOJI['fire']} Спробуй надіслати інший!\n"
-                f"{EMOJI['info']} Бали за подачу залишаються у тебе"
-            )
-            
-            if comment:
-                rejection_text += f"\n\n{EMOJI['info']} <b>Коментар модератора:</b> {comment}"
-            
-            await message.bot.send_message(content.author_id, rejection_text)
-        except Exception as e:
-            logger.error(f"Не вдалося повідомити автора: {e}")
-        
         # Відповідь адміністратору
         rejection_response = (
             f"{EMOJI['cross']} <b>Контент #{content_id} відхилено</b>\n\n"
@@ -331,12 +287,80 @@ async def reject_content(message: Message, content_id: int, comment: str = ""):
         
         await message.answer(rejection_response, reply_markup=keyboard)
         
-        logger.info(f"❌ Адміністратор {message.from_user.id} відхилив контент {content_id}")
+        logger.info(f"❌ Адміністратор {admin_id} відхилив контент {content_id}")
         
     except Exception as e:
         await message.answer(f"{EMOJI['cross']} Помилка відхилення: {e}")
         logger.error(f"Помилка відхилення контенту {content_id}: {e}")
 
+def parse_bulk_command(text: str) -> tuple:
+    """
+    Розбір "/approve_many 1 2,3 5-8 [коментар]"
+    
+    Returns:
+        (список ID, коментар)
+    """
+    ids, comment_words = [], []
+    for token in re.split(r'[\s,]+', text.strip())[1:]:
+        if comment_words:
+            comment_words.append(token)
+        elif re.fullmatch(r'\d+-\d+', token):
+            start, end = map(int, token.split('-'))
+            ids.extend(range(start, end + 1))
+        elif token.isdigit():
+            ids.append(int(token))
+        elif token:
+            comment_words.append(token)
+    return ids, " ".join(comment_words)
+
+def format_bulk_result(result: dict, approved: bool) -> str:
+    """Звіт адміністратору про масову модерацію"""
+    action = "схвалено" if approved else "відхилено"
+    text = (
+        f"{EMOJI['check'] if approved else EMOJI['cross']} <b>Масово {action}: {result['processed']}</b>\n\n"
+        f"{EMOJI['profile']} Авторів повідомлено: {result['authors']}\n"
+    )
+    if result['locked']:
+        text += f"{EMOJI['warning']} Зайнято іншими модераторами: {result['locked']}\n"
+    if result['skipped']:
+        text += f"{EMOJI['info']} Вже оброблено або не знайдено: {result['skipped']}\n"
+    return text
+
+async def cmd_bulk_moderation(message: Message):
+    """Команди /approve_many та /reject_many - масова модерація списку ID"""
+    if not is_admin(message.from_user.id):
+        await message.answer(f"{EMOJI['cross']} Ця команда доступна тільки адміністраторам!")
+        return
+    
+    approved = message.text.startswith("/approve_many")
+    content_ids, comment = parse_bulk_command(message.text)
+    if not content_ids:
+        await message.answer(
+            f"{EMOJI['warning']} Використання: /approve_many 1 2 3 або /reject_many 10-20 причина"
+        )
+        return
+    
+    try:
+        result = await bulk_resolve_content(
+            content_ids, message.from_user.id, approved, comment or None, bot=message.bot
+        )
+        await message.answer(format_bulk_result(result, approved))
+    except Exception as e:
+        await message.answer(f"{EMOJI['cross']} Помилка масової модерації: {e}")
+
+async def cmd_approve_trusted(message: Message, admin_id: int = None):
+    """Команда /approve_trusted - схвалити весь контент від довірених авторів"""
+    admin_id = admin_id or message.from_user.id
+    if not is_admin(admin_id):
+        await message.answer(f"{EMOJI['cross']} Ця команда доступна тільки адміністраторам!")
+        return
+    
+    try:
+        result = await approve_trusted_authors(admin_id, bot=message.bot)
+        await message.answer(format_bulk_result(result, True))
+    except Exception as e:
+        await message.answer(f"{EMOJI['cross']} Помилка масової модерації: {e}")
+
 async def cmd_admin_stats(message: Message):
     """Команда /admin_stats - детальна статистика для адміністратора"""
     if not is_admin(message.from_user.id):
@@ -398,7 +422,7 @@ async def cmd_admin_stats(message: Message):
             
     except ImportError:
         # Fallback статистика
-        pending_count = len(PENDING_CONTENT)
+        pending_count = len(get_moderation_queue())
         
         stats_text = (
             f"{EMOJI['crown']} <b>ПАНЕЛЬ АДМІНІСТРАТОРА</b>\n\n"
@@ -423,56 +447,63 @@ async def cmd_admin_stats(message: Message):
 
 # ===== CALLBACK ОБРОБНИКИ =====
 
-async def callback_approve_content(callback_query):
+moderation_callbacks = CallbackRouter("moderation")
+
+async def callback_approve_content(callback_query, content_id: int):
     """Callback схвалення контенту"""
     if not is_admin(callback_query.from_user.id):
         await callback_query.answer("❌ Тільки для адміністраторів!")
         return
     
-    content_id = int(callback_query.data.split(':')[1])
-    await approve_content(callback_query.message, content_id, "Схвалено через інтерфейс модерації")
+    await approve_content(
+        callback_query.message, content_id, "Схвалено через інтерфейс модерації", callback_query.from_user.id
+    )
     await callback_query.answer(f"{EMOJI['check']} Контент схвалено!")
 
-async def callback_reject_content(callback_query):
+async def callback_reject_content(callback_query, content_id: int):
     """Callback відхилення контенту"""
     if not is_admin(callback_query.from_user.id):
         await callback_query.answer("❌ Тільки для адміністраторів!")
         return
     
-    content_id = int(callback_query.data.split(':')[1])
-    await reject_content(callback_query.message, content_id, "Відхилено через інтерфейс модерації")
+    await reject_content(
+        callback_query.message, content_id, "Відхилено через інтерфейс модерації", callback_query.from_user.id
+    )
     await callback_query.answer(f"{EMOJI['cross']} Контент відхилено!")
 
-async def callback_skip_content(callback_query):
+async def callback_skip_content(callback_query, content_id: int):
     """Callback пропуску контенту"""
     if not is_admin(callback_query.from_user.id):
         await callback_query.answer("❌ Тільки для адміністраторів!")
         return
     
+    # Повертаємо в чергу для інших модераторів, цьому більше не показуємо
+    get_moderation_queue().release(content_id, callback_query.from_user.id, skip=True)
+    
     await callback_query.answer("⏭️ Пропущено")
     await callback_next_moderation(callback_query)
 
+@moderation_callbacks.exact("next_moderation")
 async def callback_next_moderation(callback_query):
     """Callback показу наступного контенту на модерації"""
     if not is_admin(callback_query.from_user.id):
         await callback_query.answer("❌ Тільки для адміністраторів!")
         return
     
-    pending_content = await get_pending_content()
+    content = get_moderation_queue().claim(callback_query.from_user.id)
     
-    if not pending_content:
+    if not content:
         await callback_query.message.edit_text(
             f"{EMOJI['check']} <b>Модерацію завершено!</b>\n\n"
-            f"{EMOJI['fire']} Немає більше контенту на розгляді\n\n"
+            f"{EMOJI['fire']} Немає більше вільного контенту на розгляді\n\n"
             f"{EMOJI['stats']} Переглянь статистику: /admin_stats"
         )
         return
     
-    # Показуємо перший елемент зі списку
-    content = pending_content[0]
     await show_content_for_moderation(callback_query.message, content)
     await callback_query.answer()
 
+@moderation_callbacks.exact("start_moderation")
 async def callback_start_moderation(callback_query):
     """Callback початку модерації"""
     if not is_admin(callback_query.from_user.id):
@@ -481,6 +512,17 @@ async def callback_start_moderation(callback_query):
     
     await callback_next_moderation(callback_query)
 
+@moderation_callbacks.exact("approve_trusted")
+async def callback_approve_trusted(callback_query):
+    """Callback масового схвалення від довірених авторів"""
+    if not is_admin(callback_query.from_user.id):
+        await callback_query.answer("❌ Тільки для адміністраторів!")
+        return
+    
+    await callback_query.answer("⏳ Обробка...")
+    await cmd_approve_trusted(callback_query.message, callback_query.from_user.id)
+
+@moderation_callbacks.exact("refresh_admin_stats")
 async def callback_refresh_admin_stats(callback_query):
     """Callback оновлення статистики адміністратора"""
     if not is_admin(callback_query.from_user.id):
@@ -490,13 +532,20 @@ async def callback_refresh_admin_stats(callback_query):
     await cmd_admin_stats(callback_query.message)
     await callback_query.answer("🔄 Статистику оновлено!")
 
+@moderation_callbacks.exact("finish_moderation")
 async def callback_finish_moderation(callback_query):
     """Callback завершення модерації"""
     if not is_admin(callback_query.from_user.id):
         await callback_query.answer("❌ Тільки для адміністраторів!")
         return
     
-    pending_count = len(await get_pending_content())
+    # Повертаємо орендований елемент іншим модераторам (без нової оренди)
+    queue = get_moderation_queue()
+    current = queue.current_claim(callback_query.from_user.id)
+    if current:
+        queue.release(current.id, callback_query.from_user.id)
+    
+    pending_count = len(queue)
     
     finish_text = (
         f"{EMOJI['check']} <b>Сесію модерації завершено</b>\n\n"
@@ -507,21 +556,38 @@ async def callback_finish_moderation(callback_query):
     await callback_query.message.edit_text(finish_text)
     await callback_query.answer("✅ Модерацію завершено")
 
+MODERATION_ACTIONS = {
+    "approve": callback_approve_content,
+    "reject": callback_reject_content,
+    "skip": callback_skip_content,
+}
+
+def _legacy_moderation(action: str):
+    """Кнопки старого формату (approve:123) у вже надісланих повідомленнях"""
+    return lambda payload: MODERATION.struct(action, int(payload))
+
+@moderation_callbacks.route(MODERATION)
+@moderation_callbacks.parsed("approve", _legacy_moderation("approve"))
+@moderation_callbacks.parsed("reject", _legacy_moderation("reject"))
+@moderation_callbacks.parsed("skip", _legacy_moderation("skip"))
+async def callback_moderation_action(callback_query, action):
+    """Кнопки схвалення/відхилення/пропуску конкретного контенту"""
+    handler = MODERATION_ACTIONS.get(action.action)
+    if handler is None:
+        await callback_query.answer("❓ Невідома дія")
+        return
+    await handler(callback_query, action.content_id)
+
 # Функція для додавання контенту в чергу модерації (для fallback)
 def add_content_to_moderation(author_id: int, text: str, content_type: str = "joke", author_name: str = "Невідомий"):
     """Додавання контенту в чергу модерації (fallback функція)"""
-    global CONTENT_COUNTER, PENDING_CONTENT
-    
-    content = ContentItem(
-        id=CONTENT_COUNTER,
+    content = get_moderation_queue().add(ModerationItem(
+        id=next(_FALLBACK_IDS),
         author_id=author_id,
         text=text,
         content_type=content_type,
         author_name=author_name
-    )
-    
-    PENDING_CONTENT.append(content)
-    CONTENT_COUNTER += 1
+    ))
     
     logger.info(f"📝 Додано контент #{content.id} на модерацію від {author_name}")
     return content
@@ -534,17 +600,15 @@ def register_moderation_handlers(dp: Dispatcher):
     dp.message.register(cmd_moderate, Command("moderate"))
     dp.message.register(cmd_admin_stats, Command("admin_stats"))
     
+    # Масова модерація
+    dp.message.register(cmd_bulk_moderation, Command("approve_many", "reject_many"))
+    dp.message.register(cmd_approve_trusted, Command("approve_trusted"))
+    
     # Команди швидкого схвалення/відхилення
     dp.message.register(cmd_approve_content, F.text.regexp(r'/approve_\d+'))
     dp.message.register(cmd_reject_content, F.text.regexp(r'/reject_\d+'))
     
     # Callback запити
-    dp.callback_query.register(callback_approve_content, F.data.startswith("approve:"))
-    dp.callback_query.register(callback_reject_content, F.data.startswith("reject:"))
-    dp.callback_query.register(callback_skip_content, F.data.startswith("skip:"))
-    dp.callback_query.register(callback_next_moderation, F.data == "next_moderation")
-    dp.callback_query.register(callback_start_moderation, F.data == "start_moderation")
-    dp.callback_query.register(callback_refresh_admin_stats, F.data == "refresh_admin_stats")
-    dp.callback_query.register(callback_finish_moderation, F.data == "finish_moderation")
+    moderation_callbacks.attach(dp)
     
     logger.info("✅ Moderation handlers зареєстровані")
\ No newline at end of file
@@ -7,6 +7,7 @@
 import asyncio
 import logging
 import sys
+import time
 from typing import Optional, List, Dict, Any, Union
 
 # Налаштування логування
@@ -17,6 +18,9 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# Відлік холодного старту (детальніше: python -m utils.importtime)
+STARTED_AT = time.perf_counter()
+
 class AutomatedUkrainianTelegramBot:
     """🤖 УКРАЇНОМОВНИЙ ТЕЛЕГРАМ БОТ З АВТОМАТИЗАЦІЄЮ"""
     
@@ -25,6 +29,7 @@ class AutomatedUkrainianTelegramBot:
         self.dp = None
         self.scheduler = None
         self.db_available = False
+        self.partition = None
 
     async def setup_bot(self) -> bool:
         """Налаштування бота"""
@@ -32,6 +37,7 @@ class AutomatedUkrainianTelegramBot:
             from aiogram import Bot, Dispatcher
             from aiogram.client.default import DefaultBotProperties
             from aiogram.enums import ParseMode
+            from utils.bot_session import create_bot_session
             import os
             
             bot_token = os.getenv("BOT_TOKEN")
@@ -43,8 +49,12 @@ class AutomatedUkrainianTelegramBot:
                     logger.error("❌ BOT_TOKEN не знайдено!")
                     return False
             
-            self.bot = Bot(token=bot_token, default=DefaultBotProperties(parse_mode=ParseMode.HTML))
-            self.dp = Dispatcher()
+            self.bot = Bot(
+                token=bot_token,
+                session=create_bot_session(),
+                default=DefaultBotProperties(parse_mode=ParseMode.HTML)
+            )
+            self.dp = Dispatcher(storage=self.create_storage())
             
             bot_info = await self.bot.get_me()
             logger.info(f"✅ Бот підключено: @{bot_info.username}")
@@ -54,6 +64,16 @@ class AutomatedUkrainianTelegramBot:
             logger.error(f"❌ Помилка налаштування бота: {e}")
             return False
 
+    def create_storage(self):
+        """Сховище станів FSM (стани переживають перезапуск)"""
+        try:
+            from utils.fsm_storage import create_fsm_storage
+            return create_fsm_storage(partition=self.partition)
+        except Exception as e:
+            from aiogram.fsm.storage.memory import MemoryStorage
+            logger.warning(f"⚠️ FSM storage warning: {e}")
+            return MemoryStorage()
+
     async def setup_database(self) -> bool:
         """Налаштування БД"""
         try:
@@ -85,6 +105,48 @@ class AutomatedUkrainianTelegramBot:
             logger.warning(f"⚠️ Automation warning: {e}")
             return True
 
+    async def setup_content_filter(self) -> bool:
+        """Компіляція фільтра контенту (один раз при старті)"""
+        try:
+            from utils.content_filter import get_content_filter
+            get_content_filter()
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ Content filter warning: {e}")
+            return True
+
+    async def setup_reactions(self) -> bool:
+        """Фонове збереження реакцій пачками"""
+        if not self.db_available:
+            return True
+        try:
+            from services.reactions import get_reaction_service
+            get_reaction_service().start()
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ Reactions warning: {e}")
+            return True
+
+    async def setup_watchdog(self) -> bool:
+        """Сторож event loop: пошук синхронних викликів, що блокують бота"""
+        try:
+            from utils.loop_watchdog import start_loop_watchdog
+            start_loop_watchdog()
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ Loop watchdog warning: {e}")
+            return True
+
+    async def setup_middlewares(self) -> bool:
+        """Підключення middleware (rate limiting)"""
+        try:
+            from middlewares import setup_throttling
+            setup_throttling(self.dp)
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ Middleware warning: {e}")
+            return True
+
     async def setup_handlers(self):
         """Налаштування хендлерів"""
         try:
@@ -226,6 +288,49 @@ class AutomatedUkrainianTelegramBot:
             if self.scheduler:
                 await self.scheduler.stop()
             
+            # Незбережені реакції з буфера
+            if self.db_available:
+                try:
+                    from services.reactions import get_reaction_service
+                    await get_reaction_service().stop()
+                except Exception as e:
+                    logger.warning(f"⚠️ Reactions flush warning: {e}")
+            
+            # Черга писаря SQLite дозаписується до закриття
+            try:
+                from database.sqlite_writer import stop_sqlite_writer
+                await stop_sqlite_writer()
+            except Exception as e:
+                logger.warning(f"⚠️ SQLite writer stop warning: {e}")
+            
+            # Фонова перевірка репліки
+            try:
+                from database.replica import stop_replica_monitor
+                await stop_replica_monitor()
+            except Exception as e:
+                logger.warning(f"⚠️ Replica monitor stop warning: {e}")
+            
+            # Пули виконавців (бекап у процесі завершується, нові задачі не приймаються)
+            try:
+                from utils.executors import shutdown_executors
+                await asyncio.to_thread(shutdown_executors)
+            except Exception as e:
+                logger.warning(f"⚠️ Executors shutdown warning: {e}")
+            
+            # Сторож event loop
+            try:
+                from utils.loop_watchdog import get_loop_watchdog
+                await get_loop_watchdog().stop()
+            except Exception as e:
+                logger.warning(f"⚠️ Loop watchdog stop warning: {e}")
+            
+            # Сховище станів FSM
+            if self.dp:
+                try:
+                    await self.dp.storage.close()
+                except Exception as e:
+                    logger.warning(f"⚠️ FSM storage close warning: {e}")
+            
             # ✅ ВИПРАВЛЕНО: Правильна перевірка aiohttp сесії
             if self.bot:
                 try:
@@ -247,20 +352,48 @@ class AutomatedUkrainianTelegramBot:
         except Exception as e:
             logger.warning(f"⚠️ Cleanup warning: {e}")
 
+    async def initialize(self) -> bool:
+        """Поетапна ініціалізація (спільна для polling та воркера партиції)"""
+        if not await self.setup_bot():
+            return False
+        
+        await self.setup_watchdog()
+        await self.setup_database()
+        await self.setup_automation()
+        await self.setup_content_filter()
+        await self.setup_reactions()
+        await self.setup_middlewares()
+        await self.setup_handlers()
+        
+        logger.info("🎯 Bot fully initialized with automation support")
+        return True
+
+    async def run_partition_worker(self, index: int) -> bool:
+        """Воркер режиму scaled: оновлення своєї партиції від ingress замість polling"""
+        self.partition = index
+        try:
+            if not await self.initialize():
+                return False
+            
+            from utils.scale_out import serve_partition
+            logger.info(f"⏱️ Старт воркера {index}: {(time.perf_counter() - STARTED_AT) * 1000:.0f} мс")
+            await serve_partition(index, self.bot, self.dp)
+            return True
+        except Exception as e:
+            logger.error(f"❌ Critical error (worker {index}): {e}")
+            return False
+        finally:
+            await self.cleanup()
+
     async def run(self) -> bool:
         """Запуск бота"""
         logger.info("🚀 УКРАЇНОМОВНИЙ TELEGRAM-БОT З ГЕЙМІФІКАЦІЄЮ 🚀")
         
         try:
-            # Поетапна ініціалізація
-            if not await self.setup_bot():
+            if not await self.initialize():
                 return False
             
-            await self.setup_database()
-            await self.setup_automation()
-            await self.setup_handlers()
-            
-            logger.info("🎯 Bot fully initialized with automation support")
+            logger.info(f"⏱️ Старт до polling: {(time.perf_counter() - STARTED_AT) * 1000:.0f} мс")
             
             # Запуск polling
             try:
@@ -276,6 +409,17 @@ class AutomatedUkrainianTelegramBot:
 
 async def main():
     """Точка входу"""
+    try:
+        from config.settings import RUN_MODE
+    except ImportError:
+        RUN_MODE = "polling"
+    
+    if RUN_MODE == "scaled":
+        # Webhook-ingress + процеси-воркери за user_id
+        from utils.scale_out import run_scaled
+        await run_scaled()
+        return
+    
     bot = AutomatedUkrainianTelegramBot()
     await bot.run()
 
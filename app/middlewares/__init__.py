@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+"""
+🧠😂🔥 Middleware пакет для україномовного бота 🧠😂🔥
+"""
+
+from .throttling import ThrottlingMiddleware, setup_throttling
+
+__all__ = [
+    "ThrottlingMiddleware",
+    "setup_throttling"
+]
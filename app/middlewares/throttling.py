@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⏱️ THROTTLING MIDDLEWARE ⏱️
+
+Обмеження повідомлень (MAX_MESSAGES_PER_MINUTE) та натискань кнопок
+(MAX_CALLBACKS_PER_MINUTE) для всіх хендлерів.
+Ліміт подач (MAX_SUBMISSIONS_PER_DAY) перевіряється у content_handlers.
+"""
+
+import logging
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware, Dispatcher
+from aiogram.types import CallbackQuery, Message, TelegramObject
+
+from utils.rate_limiter import get_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+MESSAGE_PERIOD_SECONDS = 60
+
+
+class ThrottlingMiddleware(BaseMiddleware):
+    """Відкидання повідомлень понад ліміт (адміни без обмежень)"""
+
+    def __init__(self, limit: int, period: float = MESSAGE_PERIOD_SECONDS,
+                 admin_ids=(), key_prefix: str = "msg"):
+        self.limit = limit
+        self.key_prefix = key_prefix
+        self.period = period
+        self.admin_ids = set(admin_ids)
+        self.limiter = get_rate_limiter()
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        user = getattr(event, "from_user", None)
+        if user is None or user.id in self.admin_ids:
+            return await handler(event, data)
+
+        try:
+            result = await self.limiter.hit(f"{self.key_prefix}:{user.id}", self.limit, self.period)
+        except Exception as e:
+            # Збій бекенду не повинен блокувати бота
+            logger.warning(f"⚠️ Rate limiter error: {e}")
+            return await handler(event, data)
+
+        if result.allowed:
+            return await handler(event, data)
+
+        # Попереджаємо один раз за вікно, далі мовчки відкидаємо
+        if result.notify:
+            warning = f"⏳ Забагато повідомлень! Спробуйте через {int(result.retry_after) + 1} с."
+            if isinstance(event, Message):
+                await event.answer(warning)
+            elif isinstance(event, CallbackQuery):
+                await event.answer(warning, show_alert=False)
+
+        logger.debug(f"⏱️ Throttled user {user.id}, retry in {result.retry_after:.1f}s")
+        return None
+
+
+def setup_throttling(dp: Dispatcher) -> bool:
+    """
+    Підключення throttling до повідомлень та callback'ів
+
+    Returns:
+        True якщо middleware підключено
+    """
+    try:
+        from config.settings import (
+            RATE_LIMITING_ENABLED, MAX_MESSAGES_PER_MINUTE, MAX_CALLBACKS_PER_MINUTE, ALL_ADMIN_IDS
+        )
+    except ImportError:
+        RATE_LIMITING_ENABLED, MAX_MESSAGES_PER_MINUTE, MAX_CALLBACKS_PER_MINUTE = True, 10, 30
+        ALL_ADMIN_IDS = []
+
+    if not RATE_LIMITING_ENABLED:
+        logger.info("⏱️ Rate limiting вимкнено")
+        return False
+
+    dp.message.outer_middleware(
+        ThrottlingMiddleware(MAX_MESSAGES_PER_MINUTE, admin_ids=ALL_ADMIN_IDS, key_prefix="msg")
+    )
+    dp.callback_query.outer_middleware(
+        ThrottlingMiddleware(MAX_CALLBACKS_PER_MINUTE, admin_ids=ALL_ADMIN_IDS, key_prefix="cb")
+    )
+
+    logger.info(
+        f"⏱️ Throttling: {MAX_MESSAGES_PER_MINUTE} повідомлень/хв, "
+        f"{MAX_CALLBACKS_PER_MINUTE} кнопок/хв на користувача"
+    )
+    return True
+
+
+__all__ = ['ThrottlingMiddleware', 'setup_throttling']
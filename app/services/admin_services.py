@@ -7,164 +7,328 @@
 import logging
 import json
 import csv
+import gzip
 import io
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable
 from datetime import datetime, timedelta
+from enum import Enum
 from pathlib import Path
 
 from database.database import get_db_session
-from database.models import User, Content, Rating, Duel, ContentType, ContentStatus
+from database.replica import read_only
+from database.models import User, Content, Rating, ContentType, ContentStatus
 
 logger = logging.getLogger(__name__)
 
+# ===== ПОТОКОВЕ РЕЗЕРВНЕ КОПІЮВАННЯ =====
+
+# orjson швидший та серіалізує datetime сам; json - запасний варіант
+try:
+    import orjson
+    
+    def _dump_line(row: Dict[str, Any]) -> bytes:
+        return orjson.dumps(row, option=orjson.OPT_NAIVE_UTC | orjson.OPT_APPEND_NEWLINE)
+except ImportError:
+    orjson = None
+    
+    def _dump_line(row: Dict[str, Any]) -> bytes:
+        return (json.dumps(row, ensure_ascii=False, default=_json_default) + "\n").encode("utf-8")
+
+# zstd опціональний, gzip є завжди
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+BACKUP_BATCH_SIZE = 1000
+BACKUP_STATE_FILE = "backup_state.json"
+BACKUP_MANIFEST_FILE = "manifest.json"
+
+# Таблиці у порядку відновлення (спочатку ті, на які посилаються інші)
+BACKUP_TABLES = [User, Content, Rating]
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return str(value)
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, Enum)):
+        return _json_default(value)
+    return value
+
+def _backup_dir() -> Path:
+    try:
+        from config.settings import BACKUP_DIR
+        return Path(BACKUP_DIR)
+    except ImportError:
+        return Path("data/backups")
+
+def _open_compressed(path: Path, compression: str):
+    """Відкриття бінарного потоку з компресією"""
+    if compression == "zstd":
+        return zstandard.ZstdCompressor(level=3).stream_writer(open(path, "wb"), closefd=True)
+    return gzip.open(path, "wb", compresslevel=6)
+
+def _watermark_column(model):
+    """Колонка для інкрементального бекапу: updated_at, інакше created_at"""
+    table = model.__table__
+    if "updated_at" in table.c:
+        return table.c.updated_at
+    return table.c.created_at if "created_at" in table.c else None
+
+def _load_backup_state(backup_dir: Path) -> Dict[str, str]:
+    state_path = backup_dir / BACKUP_STATE_FILE
+    if not state_path.exists():
+        return {}
+    with open(state_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def _save_backup_state(backup_dir: Path, state: Dict[str, str]) -> None:
+    state_path = backup_dir / BACKUP_STATE_FILE
+    tmp_path = state_path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    tmp_path.replace(state_path)
+
+class BackupProgress:
+    """Стан бекапу для callback'а прогресу"""
+    
+    __slots__ = ("table", "table_rows", "table_total", "total_rows", "started_at")
+    
+    def __init__(self):
+        self.table = ""
+        self.table_rows = 0
+        self.table_total = 0
+        self.total_rows = 0
+        self.started_at = datetime.utcnow()
+    
+    @property
+    def percent(self) -> float:
+        return (self.table_rows / self.table_total * 100) if self.table_total else 100.0
+
 class BackupService:
     """Сервіс резервного копіювання"""
     
     @staticmethod
-    def create_json_backup() -> Dict[str, Any]:
-        """Створення JSON бекапу всіх даних"""
+    def stream_backup(fmt: str = "ndjson", compression: str = "gzip", incremental: bool = False,
+                      progress: Optional[Callable[[BackupProgress], None]] = None,
+                      batch_size: int = BACKUP_BATCH_SIZE) -> Dict[str, Any]:
+        """
+        Потоковий бекап усіх таблиць у BACKUP_DIR
+        
+        Рядки читаються серверним курсором (yield_per) і одразу пишуться
+        у стиснений файл, тому пам'ять не залежить від розміру таблиць.
+        
+        Args:
+            fmt: "ndjson" або "csv"
+            compression: "gzip" або "zstd"
+            incremental: Тільки рядки, змінені після попереднього бекапу
+            progress: Callback прогресу (викликається після кожного батчу)
+            batch_size: Розмір батчу курсора
+        
+        Returns:
+            Маніфест бекапу (шлях, таблиці, кількість рядків, watermark)
+        """
+        from sqlalchemy import func, select
+        
+        if fmt not in ("ndjson", "csv"):
+            raise ValueError(f"Невідомий формат бекапу: {fmt}")
+        if compression == "zstd" and not ZSTD_AVAILABLE:
+            logger.warning("⚠️ zstandard не встановлено, використовується gzip")
+            compression = "gzip"
+        
+        root = _backup_dir()
+        state = _load_backup_state(root) if incremental else {}
+        stamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        target = root / f"backup_{stamp}{'_incr' if incremental else ''}"
+        target.mkdir(parents=True, exist_ok=True)
+        
+        extension = f"{fmt}.{'zst' if compression == 'zstd' else 'gz'}"
+        report = BackupProgress()
+        manifest = {
+            "created_at": report.started_at.isoformat(),
+            "version": "3.0",
+            "format": fmt,
+            "compression": compression,
+            "incremental": incremental,
+            "since": state if incremental else {},
+            "tables": {},
+        }
+        new_state = dict(_load_backup_state(root))
+        
         with get_db_session() as session:
-            # Користувачі
-            users = session.query(User).all()
-            users_data = [
-                {
-                    "id": user.id,
-                    "first_name": user.first_name,
-                    "username": user.username,
-                    "points": user.points,
-                    "rank": user.rank,
-                    "is_active": user.is_active,
-                    "last_activity": user.last_activity.isoformat() if user.last_activity else None
-                }
-                for user in users
-            ]
-            
-            # Контент
-            content = session.query(Content).all()
-            content_data = [
-                {
-                    "id": c.id,
-                    "content_type": c.content_type.value,
-                    "text": c.text,
-                    "status": c.status.value,
-                    "author_id": c.author_id,
-                    "views": c.views,
-                    "likes": c.likes,
-                    "dislikes": c.dislikes,
-                    "created_at": c.created_at.isoformat()
-                }
-                for c in content
-            ]
-            
-            # Рейтинги
-            ratings = session.query(Rating).all()
-            ratings_data = [
-                {
-                    "id": r.id,
-                    "user_id": r.user_id,
-                    "content_id": r.content_id,
-                    "action_type": r.action_type,
-                    "points_awarded": r.points_awarded,
-                    "created_at": r.created_at.isoformat()
+            for model in BACKUP_TABLES:
+                table = model.__table__
+                name = table.name
+                columns = [column.name for column in table.columns]
+                watermark_column = _watermark_column(model)
+                
+                query = select(table)
+                count_query = select(func.count()).select_from(table)
+                since = state.get(name)
+                if incremental and since and watermark_column is not None:
+                    since_value = datetime.fromisoformat(since)
+                    query = query.where(watermark_column >= since_value)
+                    count_query = count_query.where(watermark_column >= since_value)
+                
+                report.table = name
+                report.table_rows = 0
+                report.table_total = session.execute(count_query).scalar() or 0
+                
+                path = target / f"{name}.{extension}"
+                max_watermark = None
+                result = session.execute(
+                    query.order_by(*table.primary_key.columns)
+                    .execution_options(yield_per=batch_size, stream_results=True)
+                )
+                
+                with _open_compressed(path, compression) as raw:
+                    if fmt == "csv":
+                        stream = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+                        writer = csv.writer(stream)
+                        writer.writerow(columns)
+                    
+                    for partition in result.partitions():
+                        for row in partition:
+                            mapping = row._mapping
+                            if fmt == "csv":
+                                writer.writerow([_csv_value(mapping[column]) for column in columns])
+                            else:
+                                raw.write(_dump_line(dict(mapping)))
+                            
+                            if watermark_column is not None:
+                                value = mapping[watermark_column.name]
+                                if value is not None and (max_watermark is None or value > max_watermark):
+                                    max_watermark = value
+                        
+                        report.table_rows += len(partition)
+                        report.total_rows += len(partition)
+                        if progress:
+                            progress(report)
+                    
+                    if fmt == "csv":
+                        stream.flush()
+                        stream.detach()
+                
+                if max_watermark is not None:
+                    new_state[name] = max_watermark.isoformat()
+                
+                manifest["tables"][name] = {
+                    "file": path.name,
+                    "rows": report.table_rows,
+                    "columns": columns,
+                    "watermark": new_state.get(name),
                 }
-                for r in ratings
-            ]
-            
-            return {
-                "backup_info": {
-                    "created_at": datetime.utcnow().isoformat(),
-                    "version": "2.0",
-                    "total_users": len(users_data),
-                    "total_content": len(content_data),
-                    "total_ratings": len(ratings_data)
-                },
-                "users": users_data,
-                "content": content_data,
-                "ratings": ratings_data
-            }
+                logger.info(f"💾 Бекап {name}: {report.table_rows} рядків")
+        
+        manifest["total_rows"] = report.total_rows
+        manifest["path"] = str(target)
+        with open(target / BACKUP_MANIFEST_FILE, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        
+        # Watermark оновлюється тільки після успішного запису всіх таблиць
+        _save_backup_state(root, new_state)
+        
+        logger.info(f"💾 Бекап завершено: {target} ({report.total_rows} рядків)")
+        return manifest
     
     @staticmethod
-    def create_csv_backup() -> Dict[str, str]:
-        """Створення CSV бекапів для кожної таблиці"""
-        backups = {}
-        
-        with get_db_session() as session:
-            # CSV для користувачів
-            users = session.query(User).all()
-            users_csv = io.StringIO()
-            users_writer = csv.writer(users_csv)
-            users_writer.writerow([
-                'id', 'first_name', 'username', 'points', 'rank', 
-                'is_active', 'last_activity'
-            ])
-            
-            for user in users:
-                users_writer.writerow([
-                    user.id, user.first_name or '', user.username or '', 
-                    user.points, user.rank, user.is_active,
-                    user.last_activity.isoformat() if user.last_activity else ''
-                ])
-            
-            backups['users.csv'] = users_csv.getvalue()
-            
-            # CSV для контенту
-            content = session.query(Content).all()
-            content_csv = io.StringIO()
-            content_writer = csv.writer(content_csv)
-            content_writer.writerow([
-                'id', 'content_type', 'text', 'status', 'author_id',
-                'views', 'likes', 'dislikes', 'created_at'
-            ])
-            
-            for c in content:
-                content_writer.writerow([
-                    c.id, c.content_type.value, c.text or '', c.status.value,
-                    c.author_id, c.views, c.likes, c.dislikes,
-                    c.created_at.isoformat()
-                ])
-            
-            backups['content.csv'] = content_csv.getvalue()
-            
-            return backups
+    def create_backup(incremental: bool = False,
+                      progress: Optional[Callable[[BackupProgress], None]] = None) -> Dict[str, Any]:
+        """Бекап з форматом та компресією з налаштувань"""
+        try:
+            from config import settings
+            fmt, compression = settings.BACKUP_FORMAT, settings.BACKUP_COMPRESSION
+            batch_size = settings.BACKUP_BATCH_SIZE
+        except (ImportError, AttributeError):
+            fmt, compression, batch_size = "ndjson", "gzip", BACKUP_BATCH_SIZE
+        return BackupService.stream_backup(fmt, compression, incremental, progress, batch_size)
+    
+    @staticmethod
+    def create_json_backup(incremental: bool = False,
+                           progress: Optional[Callable[[BackupProgress], None]] = None) -> Dict[str, Any]:
+        """Створення NDJSON бекапу всіх даних (gzip)"""
+        return BackupService.stream_backup("ndjson", "gzip", incremental, progress)
+    
+    @staticmethod
+    def create_csv_backup(incremental: bool = False,
+                          progress: Optional[Callable[[BackupProgress], None]] = None) -> Dict[str, Any]:
+        """Створення CSV бекапів для кожної таблиці (gzip)"""
+        return BackupService.stream_backup("csv", "gzip", incremental, progress)
 
 class BulkActionService:
     """Сервіс масових операцій"""
     
     @staticmethod
-    def recalculate_user_ranks() -> Dict[str, int]:
-        """Перерахунок рангів всіх користувачів"""
+    def recalculate_user_ranks() -> Dict[str, Any]:
+        """
+        Перерахунок рангів всіх користувачів одним UPDATE
+        
+        Ранг рахується в БД через CASE з таблиці utils.ranks; оновлюються
+        тільки рядки, де ранг змінився. PostgreSQL: self-join дає старий ранг
+        у RETURNING, щоб відрізнити підвищення від зниження. SQLite у RETURNING
+        бачить лише нові значення - старі ранги читаються перед UPDATE
+        у тій самій транзакції.
+        
+        Returns:
+            Кількість змінених рангів та підвищення {user_id: новий ранг}
+        """
+        from sqlalchemy import func, select, update
+        from utils.ranks import POINT_RANKS
+        
+        users = User.__table__
+        new_rank = POINT_RANKS.case(users.c.points)
+        rank_changed = users.c.rank.is_distinct_from(new_rank)
+        
         with get_db_session() as session:
-            users = session.query(User).all()
-            updated_count = 0
-            
-            rank_thresholds = [
-                (5000, "Гумористичний Геній"),
-                (3000, "Легенда Мемів"),
-                (1500, "Король Гумору"),
-                (750, "Мастер Рофлу"),
-                (350, "Комік"),
-                (150, "Гуморист"),
-                (50, "Сміхун"),
-                (0, "Новачок")
-            ]
-            
-            for user in users:
-                old_rank = user.rank
-                
-                for threshold, rank_name in rank_thresholds:
-                    if user.points >= threshold:
-                        user.rank = rank_name
-                        break
-                
-                if old_rank != user.rank:
-                    updated_count += 1
-            
-            session.commit()
-            
-            return {
-                "total_users": len(users),
-                "updated_ranks": updated_count
-            }
+            total_users = session.execute(select(func.count()).select_from(users)).scalar() or 0
+            
+            if session.get_bind().dialect.name == "postgresql":
+                previous = users.alias("previous")
+                changed = session.execute(
+                    update(users)
+                    .where(users.c.id == previous.c.id)
+                    .where(rank_changed)
+                    .values(rank=new_rank)
+                    .returning(users.c.id, previous.c.rank, users.c.rank)
+                ).all()
+            else:
+                old_ranks = dict(session.execute(select(users.c.id, users.c.rank).where(rank_changed)).all())
+                changed = [
+                    (user_id, old_ranks.get(user_id), rank)
+                    for user_id, rank in session.execute(
+                        update(users).where(rank_changed).values(rank=new_rank).returning(users.c.id, users.c.rank)
+                    ).all()
+                ]
+        
+        # Підвищення - тільки між відомими рангами (старі назви без емодзі не сповіщаємо)
+        rank_ups = {}
+        for user_id, old_rank, rank in changed:
+            old_position = POINT_RANKS.position_of(old_rank)
+            if old_position is not None and POINT_RANKS.position_of(rank) > old_position:
+                rank_ups[user_id] = rank
+        
+        logger.info(f"🏆 Перераховано ранги: {len(changed)} змін, {len(rank_ups)} підвищень")
+        return {
+            "total_users": total_users,
+            "updated_ranks": len(changed),
+            "rank_ups": rank_ups,
+        }
+    
+    @staticmethod
+    def build_rank_up_notifications(rank_ups: Dict[int, str]) -> Dict[int, str]:
+        """Повідомлення про підвищення рангу для BroadcastSystem.schedule_personal_messages"""
+        return {
+            user_id: f"🎖️ <b>Новий ранг!</b>\n\nТепер ти {rank}\n\n⭐ Переглянь свій профіль: /profile"
+            for user_id, rank in rank_ups.items()
+        }
     
     @staticmethod
     def cleanup_old_data(days: int = 90) -> Dict[str, int]:
@@ -236,6 +400,7 @@ class AnalyticsService:
     """Сервіс аналітики"""
     
     @staticmethod
+    @read_only
     def get_engagement_stats() -> Dict[str, Any]:
         """Статистика залученості користувачів"""
         with get_db_session() as session:
@@ -285,6 +450,7 @@ class AnalyticsService:
             }
     
     @staticmethod
+    @read_only
     def get_content_performance() -> Dict[str, Any]:
         """Аналіз ефективності контенту"""
         with get_db_session() as session:
@@ -339,6 +505,7 @@ class NotificationService:
     """Сервіс сповіщень адміністраторів"""
     
     @staticmethod
+    @read_only
     def get_pending_notifications() -> Dict[str, Any]:
         """Отримання списку очікуючих сповіщень"""
         with get_db_session() as session:
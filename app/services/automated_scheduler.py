@@ -4,10 +4,27 @@
 🤖 АВТОМАТИЗОВАНИЙ ПЛАНУВАЛЬНИК - ВИПРАВЛЕНІ АРГУМЕНТИ 🤖
 """
 
+import asyncio
 import logging
+from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# APScheduler опціональний - без нього бот працює без фонових задач
+try:
+    from apscheduler.schedulers.asyncio import AsyncIOScheduler
+    from apscheduler.triggers.cron import CronTrigger
+    from apscheduler.triggers.interval import IntervalTrigger
+    APSCHEDULER_AVAILABLE = True
+except ImportError:
+    AsyncIOScheduler = CronTrigger = IntervalTrigger = None
+    APSCHEDULER_AVAILABLE = False
+
+try:
+    from config.settings import TIMEZONE, TRENDING_RECALC_INTERVAL, ROLLUP_FLUSH_INTERVAL
+except ImportError:
+    TIMEZONE, TRENDING_RECALC_INTERVAL, ROLLUP_FLUSH_INTERVAL = "Europe/Kiev", 15, 5
+
 class AutomatedScheduler:
     """✅ ВИПРАВЛЕНА версія з правильними аргументами"""
     
@@ -22,12 +39,26 @@ class AutomatedScheduler:
         self.bot = bot
         self.db_available = db_available
         self.is_running = False
+        self.scheduler = None
+        self.leader = None
         
         logger.info(f"🤖 AutomatedScheduler ініціалізовано (БД: {'✅' if db_available else '❌'})")
 
     async def start(self) -> bool:
         """Запуск планувальника"""
         try:
+            if self.db_available and APSCHEDULER_AVAILABLE:
+                # Спільні задачі виконує тільки лідер серед реплік
+                from utils.job_locks import get_scheduler_leader
+                self.leader = get_scheduler_leader()
+                await self.leader.start()
+                
+                self.scheduler = AsyncIOScheduler(timezone=TIMEZONE)
+                self._register_jobs()
+                self.scheduler.start()
+            elif not APSCHEDULER_AVAILABLE:
+                logger.warning("⚠️ APScheduler не встановлено, фонові задачі вимкнені")
+            
             self.is_running = True
             logger.info("🚀 Автоматизований планувальник запущено!")
             return True
@@ -35,8 +66,90 @@ class AutomatedScheduler:
             logger.error(f"❌ Помилка запуску: {e}")
             return False
 
+    def _register_jobs(self):
+        """Реєстрація фонових задач"""
+        leader_only = self.leader.leader_only
+        
+        # Трендовий рейтинг: перший прохід одразу після старту
+        self.scheduler.add_job(
+            leader_only(self.recalculate_trending),
+            IntervalTrigger(minutes=TRENDING_RECALC_INTERVAL),
+            id='trending_scores',
+            name='Перерахунок трендового рейтингу',
+            max_instances=1,
+            coalesce=True,
+            next_run_time=datetime.now(self.scheduler.timezone)
+        )
+        
+        # Зведена статистика: дельти протягом дня та нічний перерахунок (дні - UTC)
+        # Навмисно БЕЗ leader_only: дельти накопичуються в пам'яті кожного процесу,
+        # тож кожна репліка зберігає свої (UPSERT додає їх, а не перезаписує).
+        # Під leader_only дельти резервних реплік губилися б до перезапуску.
+        self.scheduler.add_job(
+            self.flush_rollups,
+            IntervalTrigger(minutes=ROLLUP_FLUSH_INTERVAL),
+            id='rollup_flush',
+            name='Збереження дельт статистики',
+            max_instances=1,
+            coalesce=True
+        )
+        self.scheduler.add_job(
+            leader_only(self.nightly_rollup),
+            CronTrigger(hour=0, minute=10, timezone="UTC"),
+            id='rollup_nightly',
+            name='Нічний перерахунок статистики',
+            max_instances=1,
+            coalesce=True
+        )
+        
+        # Лічильники дуелей: контрольний перерахунок з історії раз на тиждень
+        self.scheduler.add_job(
+            leader_only(self.backfill_duel_stats),
+            CronTrigger(day_of_week='mon', hour=0, minute=40, timezone="UTC"),
+            id='duel_stats_backfill',
+            name='Перерахунок статистики дуелей',
+            max_instances=1,
+            coalesce=True
+        )
+
+    async def recalculate_trending(self):
+        """Пакетний перерахунок rating_score (синхронна БД - в окремому потоці)"""
+        from services.trending import recalculate_trending_scores
+        try:
+            await asyncio.to_thread(recalculate_trending_scores)
+        except Exception as e:
+            logger.error(f"❌ Помилка перерахунку трендового рейтингу: {e}")
+
+    async def flush_rollups(self):
+        """Збереження дельт зведеної статистики"""
+        from services.rollups import flush_deltas
+        try:
+            await asyncio.to_thread(flush_deltas)
+        except Exception as e:
+            logger.error(f"❌ Помилка збереження статистики: {e}")
+
+    async def nightly_rollup(self):
+        """Точний перерахунок агрегатів минулого дня"""
+        from services.rollups import run_nightly_rollup
+        try:
+            await asyncio.to_thread(run_nightly_rollup)
+        except Exception as e:
+            logger.error(f"❌ Помилка нічного перерахунку статистики: {e}")
+
+    async def backfill_duel_stats(self):
+        """Відновлення лічильників дуелей з історії"""
+        from services.duel_stats import backfill_duel_stats
+        try:
+            await asyncio.to_thread(backfill_duel_stats)
+        except Exception as e:
+            logger.error(f"❌ Помилка перерахунку статистики дуелей: {e}")
+
     async def stop(self):
         """Зупинка планувальника"""
+        if self.scheduler and self.scheduler.running:
+            self.scheduler.shutdown(wait=False)
+        if self.leader:
+            await self.leader.stop()
         self.is_running = False
         logger.info("⏹️ Планувальник зупинено")
 
@@ -0,0 +1,545 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🔄 ВІДНОВЛЕННЯ З БЕКАПУ 🔄
+
+Швидке завантаження бекапів BackupService назад у БД:
+✅ Потокове читання NDJSON/CSV з gzip/zstd без завантаження в пам'ять
+✅ PostgreSQL: COPY FROM STDIN через asyncpg copy_records_to_table
+✅ SQLite (та PostgreSQL без asyncpg): батчевий executemany
+✅ Неунікальні індекси (з моделей і SCHEMA_INDEXES) видаляються на час завантаження і перебудовуються
+✅ Інкрементальні бекапи зливаються через staging-таблицю (upsert)
+✅ Злиття не падає на idx_content_hash: хеш, що вже належить іншому рядку, очищається
+
+Запуск з директорії app:
+    python -m services.backup_restore data/backups/backup_20250101_030000
+    python -m services.backup_restore --latest
+"""
+
+import io
+import re
+import csv
+import gzip
+import json
+import time
+import asyncio
+import logging
+import argparse
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# orjson опціональний
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    orjson = None
+    _loads = json.loads
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+try:
+    import asyncpg
+    ASYNCPG_AVAILABLE = True
+except ImportError:
+    asyncpg = None
+    ASYNCPG_AVAILABLE = False
+
+RESTORE_BATCH_SIZE = 50000
+MANIFEST_FILE = "manifest.json"
+
+# Режими завантаження
+MODE_REPLACE = "replace"    # Очистити таблиці та завантажити
+MODE_MERGE = "merge"        # Upsert по первинному ключу
+MODE_APPEND = "append"      # Просто дописати рядки
+RESTORE_MODES = (MODE_REPLACE, MODE_MERGE, MODE_APPEND)
+
+# Унікальний хеш контенту (idx_content_hash) не є первинним ключем - ON CONFLICT (id) його не ловить
+HASH_TABLE = "content"
+HASH_COLUMN = "content_hash"
+HASH_LOOKUP_BATCH = 500     # Хешів в одному IN (ліміт параметрів SQLite)
+
+_SCHEMA_INDEX_RE = re.compile(r"CREATE\s+(UNIQUE\s+)?INDEX\s+(?:IF\s+NOT\s+EXISTS\s+)?(\w+)\s+ON\s+(\w+)", re.I)
+
+# ===== ЧИТАННЯ БЕКАПУ =====
+
+def read_manifest(backup_path: Path) -> Dict[str, Any]:
+    """Маніфест бекапу (manifest.json у директорії бекапу)"""
+    manifest_path = Path(backup_path) / MANIFEST_FILE
+    if not manifest_path.exists():
+        raise FileNotFoundError(f"Маніфест не знайдено: {manifest_path}")
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def find_backup_chain(backup_dir: Path) -> List[Path]:
+    """
+    Останній повний бекап та всі інкрементальні після нього
+
+    Імена директорій містять час створення, тож сортування за ім'ям
+    відповідає хронології.
+    """
+    backups = sorted(
+        path for path in Path(backup_dir).glob("backup_*")
+        if (path / MANIFEST_FILE).exists()
+    )
+    full = [path for path in backups if not path.name.endswith("_incr")]
+    if not full:
+        return []
+    base = full[-1]
+    return [base] + [path for path in backups if path.name > base.name and path.name.endswith("_incr")]
+
+def _open_text(path: Path, compression: str) -> io.TextIOWrapper:
+    if compression == "zstd":
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("Бекап стиснутий zstd, але пакет zstandard не встановлено")
+        raw = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+    else:
+        raw = gzip.open(path, "rb")
+    return io.TextIOWrapper(raw, encoding="utf-8", newline="")
+
+def _parse_datetime(value):
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return value
+    parsed = datetime.fromisoformat(value)
+    # Колонки DateTime в моделях naive UTC
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+def _column_decoder(column, from_csv: bool) -> Optional[Callable[[Any], Any]]:
+    """Перетворення збереженого значення назад у python-тип колонки"""
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        python_type = None
+
+    if python_type is datetime:
+        return _parse_datetime
+    if not from_csv:
+        return None
+
+    # У CSV усе рядки, None записаний як порожній рядок
+    if python_type is bool:
+        return lambda value: None if value == "" else value in ("True", "true", "1")
+    if python_type in (int, float):
+        return lambda value: None if value == "" else python_type(value)
+    if python_type in (dict, list):
+        return lambda value: None if value == "" else json.loads(value)
+    if column.nullable:
+        return lambda value: None if value == "" else value
+    return None
+
+def iter_table_records(backup_path: Path, manifest: Dict[str, Any], table,
+                       columns: List[str]) -> Iterator[tuple]:
+    """
+    Потокове читання рядків таблиці з бекапу
+
+    Args:
+        backup_path: Директорія бекапу
+        manifest: Маніфест бекапу
+        table: SQLAlchemy Table
+        columns: Колонки для завантаження (порядок кортежів)
+
+    Yields:
+        Кортежі значень у порядку columns
+    """
+    info = manifest["tables"][table.name]
+    from_csv = manifest["format"] == "csv"
+    decoders = [_column_decoder(table.c[name], from_csv) for name in columns]
+
+    with _open_text(Path(backup_path) / info["file"], manifest["compression"]) as stream:
+        if from_csv:
+            reader = csv.reader(stream)
+            header = next(reader, None) or []
+            positions = [header.index(name) for name in columns]
+            rows = ([row[i] for i in positions] for row in reader)
+        else:
+            rows = ([record.get(name) for name in columns] for record in map(_loads, stream) if record)
+
+        for values in rows:
+            yield tuple(
+                decode(value) if decode else value
+                for decode, value in zip(decoders, values)
+            )
+
+def _chunks(records: Iterable[tuple], size: int) -> Iterator[List[tuple]]:
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+# ===== ПЛАН ВІДНОВЛЕННЯ =====
+
+class TablePlan:
+    """Таблиця для відновлення: колонки, які є і в бекапі, і в поточній схемі"""
+
+    __slots__ = ("table", "columns", "rows")
+
+    def __init__(self, table, columns: List[str], rows: int):
+        self.table = table
+        self.columns = columns
+        self.rows = rows
+
+    @property
+    def name(self) -> str:
+        return self.table.name
+
+    @property
+    def primary_key(self) -> List[str]:
+        return [column.name for column in self.table.primary_key.columns]
+
+def build_plan(manifest: Dict[str, Any]) -> List[TablePlan]:
+    """Таблиці бекапу, які існують у metadata, у порядку маніфесту"""
+    from database.models import Base
+
+    plan = []
+    for name, info in manifest["tables"].items():
+        table = Base.metadata.tables.get(name)
+        if table is None:
+            logger.warning(f"⚠️ Таблиця {name} відсутня в моделях, пропускаємо")
+            continue
+
+        columns = [column for column in info["columns"] if column in table.c]
+        dropped = set(info["columns"]) - set(columns)
+        if dropped:
+            logger.warning(f"⚠️ {name}: колонки {sorted(dropped)} більше не існують")
+        plan.append(TablePlan(table, columns, info.get("rows", 0)))
+    return plan
+
+def _secondary_indexes(plan: List[TablePlan], dialect) -> List[Tuple[str, str]]:
+    """
+    Неунікальні індекси - їх дешевше перебудувати, ніж оновлювати на кожен рядок
+
+    Крім індексів моделей - індекси SCHEMA_INDEXES, що існують лише як SQL
+    (ensure_schema_upgrades), інакше вони оновлювались би на кожен рядок.
+
+    Returns:
+        (ім'я індексу, CREATE INDEX) для таблиць плану
+    """
+    from sqlalchemy.schema import CreateIndex
+    from database.database import SCHEMA_INDEXES
+
+    tables = {item.name for item in plan}
+    indexes: Dict[str, str] = {}
+    for item in plan:
+        for index in item.table.indexes:
+            if not index.unique:
+                indexes[index.name] = str(CreateIndex(index).compile(dialect=dialect))
+
+    for statement in SCHEMA_INDEXES:
+        match = _SCHEMA_INDEX_RE.match(statement)
+        if match is None:
+            continue
+        unique, name, table = match.groups()
+        if not unique and table in tables and name not in indexes:
+            indexes[name] = statement
+    return list(indexes.items())
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+# ===== POSTGRESQL: COPY =====
+
+def _asyncpg_dsn(url: str) -> str:
+    """postgresql+psycopg2://... -> postgresql://..."""
+    scheme, rest = url.split("://", 1)
+    return "postgresql://" + rest if scheme.startswith("postgres") else url
+
+async def _restore_postgres_copy(url: str, backup_path: Path, manifest: Dict[str, Any],
+                                 plan: List[TablePlan], mode: str, batch_size: int) -> Dict[str, int]:
+    """Завантаження через COPY FROM STDIN в одній транзакції"""
+    from sqlalchemy.dialects import postgresql
+
+    indexes = _secondary_indexes(plan, postgresql.dialect())
+    loaded: Dict[str, int] = {}
+
+    connection = await asyncpg.connect(_asyncpg_dsn(url))
+    try:
+        async with connection.transaction():
+            if mode == MODE_REPLACE:
+                names = ", ".join(_quote(item.name) for item in reversed(plan))
+                # CASCADE очищає й таблиці поза бекапом, що посилаються на ці (дуелі тощо)
+                await connection.execute(f"TRUNCATE {names} CASCADE")
+
+            for name, _ in indexes:
+                await connection.execute(f"DROP INDEX IF EXISTS {_quote(name)}")
+
+            for item in plan:
+                target = item.name
+                if mode == MODE_MERGE:
+                    target = f"restore_{item.name}"
+                    await connection.execute(
+                        f"CREATE TEMP TABLE {_quote(target)} "
+                        f"(LIKE {_quote(item.name)} INCLUDING DEFAULTS) ON COMMIT DROP"
+                    )
+
+                count = 0
+                records = iter_table_records(backup_path, manifest, item.table, item.columns)
+                for chunk in _chunks(records, batch_size):
+                    await connection.copy_records_to_table(target, records=chunk, columns=item.columns)
+                    count += len(chunk)
+                    logger.info(f"🔄 {item.name}: {count}/{item.rows}")
+
+                if mode == MODE_MERGE:
+                    if item.name == HASH_TABLE and HASH_COLUMN in item.columns:
+                        await _clear_conflicting_hashes_postgres(connection, item, target)
+
+                    column_list = ", ".join(_quote(column) for column in item.columns)
+                    updates = ", ".join(
+                        f"{_quote(column)} = EXCLUDED.{_quote(column)}"
+                        for column in item.columns if column not in item.primary_key
+                    )
+                    conflict = ", ".join(_quote(column) for column in item.primary_key)
+                    action = f"DO UPDATE SET {updates}" if updates else "DO NOTHING"
+                    await connection.execute(
+                        f"INSERT INTO {_quote(item.name)} ({column_list}) "
+                        f"SELECT {column_list} FROM {_quote(target)} "
+                        f"ON CONFLICT ({conflict}) {action}"
+                    )
+
+                loaded[item.name] = count
+
+            for _, create in indexes:
+                await connection.execute(create)
+
+            # Послідовності автоінкременту продовжуються після відновлених ID
+            for item in plan:
+                if len(item.primary_key) == 1:
+                    key = item.primary_key[0]
+                    await connection.execute(
+                        f"SELECT setval(pg_get_serial_sequence($1, $2), MAX({_quote(key)})) "
+                        f"FROM {_quote(item.name)} HAVING MAX({_quote(key)}) IS NOT NULL",
+                        item.name, key
+                    )
+    finally:
+        await connection.close()
+
+    return loaded
+
+async def _clear_conflicting_hashes_postgres(connection, item: TablePlan, staging: str) -> None:
+    """Хеш, який у БД вже має інший не відхилений рядок, очищається в staging до злиття"""
+    status = "r.status != 'rejected' AND " if "status" in item.columns else ""
+    result = await connection.execute(
+        f"UPDATE {_quote(staging)} AS r SET {HASH_COLUMN} = NULL "
+        f"WHERE r.{HASH_COLUMN} IS NOT NULL AND {status}EXISTS ("
+        f"SELECT 1 FROM {_quote(item.name)} AS c WHERE c.{HASH_COLUMN} = r.{HASH_COLUMN} "
+        f"AND c.status != 'rejected' AND c.id != r.id)"
+    )
+    cleared = int(result.split()[-1])
+    if cleared:
+        logger.warning(f"⚠️ {item.name}: {cleared} рядків з хешем, що вже є в БД - {HASH_COLUMN} очищено")
+
+# ===== SQLITE / FALLBACK: EXECUTEMANY =====
+
+def _merge_statement(engine, table, columns: List[str], primary_key: List[str]):
+    if engine.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    statement = insert(table)
+    updates = {column: statement.excluded[column] for column in columns if column not in primary_key}
+    if not updates:
+        return statement.on_conflict_do_nothing(index_elements=primary_key)
+    return statement.on_conflict_do_update(index_elements=primary_key, set_=updates)
+
+def _clear_conflicting_hashes(connection, table, rows: List[Dict[str, Any]]) -> int:
+    """
+    Очищення хешу в рядках бекапу, чий хеш у БД вже має інший не відхилений рядок
+
+    Так само як backfill_content_hashes лишає повтори з NULL: рядок відновлюється,
+    а злиття не падає на унікальному idx_content_hash.
+
+    Returns:
+        Кількість очищених хешів
+    """
+    from sqlalchemy import select
+
+    hashes = list({
+        row[HASH_COLUMN] for row in rows
+        if row.get(HASH_COLUMN) is not None and row.get("status") != "rejected"
+    })
+    owners: Dict[str, int] = {}
+    for start in range(0, len(hashes), HASH_LOOKUP_BATCH):
+        owners.update(connection.execute(
+            select(table.c[HASH_COLUMN], table.c.id).where(
+                table.c[HASH_COLUMN].in_(hashes[start:start + HASH_LOOKUP_BATCH]),
+                table.c.status != "rejected",
+            )
+        ).all())
+
+    cleared = 0
+    for row in rows:
+        owner = owners.get(row.get(HASH_COLUMN))
+        if owner is not None and owner != row.get("id") and row.get("status") != "rejected":
+            row[HASH_COLUMN] = None
+            cleared += 1
+    return cleared
+
+def _restore_executemany(engine, backup_path: Path, manifest: Dict[str, Any],
+                         plan: List[TablePlan], mode: str, batch_size: int) -> Dict[str, int]:
+    """Батчевий executemany в одній транзакції"""
+    from sqlalchemy import insert, text
+
+    indexes = _secondary_indexes(plan, engine.dialect)
+    loaded: Dict[str, int] = {}
+
+    with engine.begin() as connection:
+        if mode == MODE_REPLACE:
+            for item in reversed(plan):
+                connection.execute(item.table.delete())
+
+        for name, _ in indexes:
+            connection.execute(text(f"DROP INDEX IF EXISTS {_quote(name)}"))
+
+        for item in plan:
+            if mode == MODE_MERGE:
+                statement = _merge_statement(engine, item.table, item.columns, item.primary_key)
+            else:
+                statement = insert(item.table)
+
+            check_hashes = mode == MODE_MERGE and item.name == HASH_TABLE and HASH_COLUMN in item.columns
+            count = cleared = 0
+            records = iter_table_records(backup_path, manifest, item.table, item.columns)
+            for chunk in _chunks(records, batch_size):
+                rows = [dict(zip(item.columns, record)) for record in chunk]
+                if check_hashes:
+                    cleared += _clear_conflicting_hashes(connection, item.table, rows)
+                connection.execute(statement, rows)
+                count += len(chunk)
+                logger.info(f"🔄 {item.name}: {count}/{item.rows}")
+            if cleared:
+                logger.warning(f"⚠️ {item.name}: {cleared} рядків з хешем, що вже є в БД - {HASH_COLUMN} очищено")
+            loaded[item.name] = count
+
+        for _, create in indexes:
+            connection.execute(text(create))
+
+    return loaded
+
+# ===== ПУБЛІЧНИЙ API =====
+
+def _get_engine():
+    """Engine бота, або окремий для запуску з командного рядка"""
+    from database import database
+
+    if database.engine is not None:
+        return database.engine
+
+    from sqlalchemy import create_engine
+    from database.models import Base
+
+    engine = create_engine(database.get_database_url())
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+async def restore_backup(backup_path: Path, mode: Optional[str] = None,
+                         batch_size: int = RESTORE_BATCH_SIZE) -> Dict[str, Any]:
+    """
+    Відновлення одного бекапу
+
+    Args:
+        backup_path: Директорія бекапу з manifest.json
+        mode: replace / merge / append (за замовчуванням replace для повного
+              бекапу та merge для інкрементального)
+        batch_size: Рядків на один COPY / executemany
+
+    Returns:
+        Звіт: шлях, режим, метод, рядки по таблицях, час
+    """
+    backup_path = Path(backup_path)
+    manifest = read_manifest(backup_path)
+    mode = mode or (MODE_MERGE if manifest.get("incremental") else MODE_REPLACE)
+    if mode not in RESTORE_MODES:
+        raise ValueError(f"Невідомий режим відновлення: {mode}")
+
+    plan = build_plan(manifest)
+    engine = _get_engine()
+    started = time.perf_counter()
+
+    if engine.dialect.name == "postgresql" and ASYNCPG_AVAILABLE:
+        method = "copy"
+        loaded = await _restore_postgres_copy(
+            engine.url.render_as_string(hide_password=False),
+            backup_path, manifest, plan, mode, batch_size
+        )
+    else:
+        method = "executemany"
+        loaded = await asyncio.to_thread(
+            _restore_executemany, engine, backup_path, manifest, plan, mode, batch_size
+        )
+
+    elapsed = time.perf_counter() - started
+    total = sum(loaded.values())
+    logger.info(f"✅ Відновлено {total} рядків з {backup_path.name} за {elapsed:.1f} с ({method}, {mode})")
+
+    return {
+        "path": str(backup_path),
+        "mode": mode,
+        "method": method,
+        "tables": loaded,
+        "total_rows": total,
+        "seconds": round(elapsed, 2),
+    }
+
+async def restore_chain(paths: List[Path], batch_size: int = RESTORE_BATCH_SIZE) -> List[Dict[str, Any]]:
+    """Повний бекап і за ним інкрементальні по черзі"""
+    reports = []
+    for path in paths:
+        reports.append(await restore_backup(path, batch_size=batch_size))
+    return reports
+
+# ===== КОМАНДНИЙ РЯДОК =====
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Відновлення БД з бекапу BackupService")
+    parser.add_argument("paths", nargs="*", type=Path, help="Директорії бекапів (по черзі)")
+    parser.add_argument("--latest", action="store_true",
+                        help="Останній повний бекап з BACKUP_DIR та інкрементальні після нього")
+    parser.add_argument("--mode", choices=RESTORE_MODES, default=None,
+                        help="Режим завантаження (за замовчуванням за типом бекапу)")
+    parser.add_argument("--batch-size", type=int, default=RESTORE_BATCH_SIZE)
+    return parser.parse_args(argv)
+
+async def main(argv: Optional[List[str]] = None) -> int:
+    args = _parse_args(argv)
+    paths = list(args.paths)
+
+    if args.latest:
+        try:
+            from config.settings import BACKUP_DIR
+        except ImportError:
+            BACKUP_DIR = Path("data/backups")
+        paths = find_backup_chain(BACKUP_DIR)
+
+    if not paths:
+        logger.error("❌ Не вказано бекап для відновлення")
+        return 1
+
+    for path in paths:
+        await restore_backup(path, mode=args.mode, batch_size=args.batch_size)
+    return 0
+
+# ===== ЕКСПОРТ =====
+__all__ = [
+    'restore_backup', 'restore_chain', 'read_manifest', 'find_backup_chain',
+    'iter_table_records', 'build_plan', 'RESTORE_MODES'
+]
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    raise SystemExit(asyncio.run(main()))
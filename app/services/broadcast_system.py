@@ -20,8 +20,13 @@ import json
 import random
 from enum import Enum
 
+from utils.rate_limiter import MemoryRateLimiter
+
 logger = logging.getLogger(__name__)
 
+# Спільний екземпляр (створюється фабрикою або при першому зверненні)
+_broadcast_system: Optional["BroadcastSystem"] = None
+
 class BroadcastType(Enum):
     """Типи розсилок"""
     DAILY_CONTENT = "daily_content"          # Щоденний контент
@@ -94,8 +99,12 @@ class BroadcastSystem:
         # Шаблони повідомлень
         self.message_templates = self._load_message_templates()
         
-        # Семафор для rate limiting
+        # Семафор обмежує паралельність, GCRA - кількість повідомлень на секунду
         self.rate_semaphore = asyncio.Semaphore(self.rate_limit)
+        self._pacer = MemoryRateLimiter()
+        
+        # Фонові задачі персональних повідомлень (тримаємо посилання до завершення)
+        self._background_tasks: set = set()
         
         logger.info(f"📢 BroadcastSystem ініціалізовано (rate: {self.rate_limit}/sec, enabled: {self.enabled})")
 
@@ -110,13 +119,18 @@ class BroadcastSystem:
             "evening_stats": {
                 "emoji": "📊",
                 "title": "Вечірня статистика",
-                "format": "{emoji} <b>{title}</b>\n\n📈 Користувачів: {total_users}\n📝 Контенту: {total_content}\n⚔️ Активних дуелей: {active_duels}\n\n🌙 Гарної ночі!"
+                "format": "{emoji} <b>{title}</b>\n\n👥 Активних сьогодні: {active_users}\n🆕 Нових користувачів: {new_users}\n📝 Подано контенту: {content_submitted}\n✅ Схвалено: {content_approved}\n👍 Реакцій: {reactions}\n⚔️ Дуелей завершено: {duels_completed}\n\n🌙 Гарної ночі!"
             },
             "weekly_digest": {
                 "emoji": "📰",
                 "title": "Тижневий дайджест",
                 "format": "{emoji} <b>{title}</b>\n\n🔥 Топ контент тижня:\n{top_content}\n\n🏆 Переможці дуелей:\n{top_duelers}\n\n📈 Статистика:\n{weekly_stats}"
             },
+            "monthly_digest": {
+                "emoji": "🗓️",
+                "title": "Підсумки місяця",
+                "format": "{emoji} <b>{title}</b>\n\n🔥 Топ контент місяця:\n{top_content}\n\n🏆 Переможці дуелей:\n{top_duelers}\n\n📈 Статистика:\n{weekly_stats}"
+            },
             "tournament": {
                 "emoji": "🏆",
                 "title": "Турнір розпочався!",
@@ -241,6 +255,36 @@ class BroadcastSystem:
             logger.error(f"❌ Помилка тижневого дайджесту: {e}")
             return {"status": "error", "error": str(e), "sent": 0}
 
+    async def send_monthly_digest_broadcast(self) -> Dict[str, Any]:
+        """Місячна розсилка підсумків"""
+        if not self.enabled or not self.weekly_digest_enabled:
+            return {"status": "disabled", "sent": 0}
+        
+        logger.info("📢 Початок розсилки місячних підсумків...")
+        
+        try:
+            digest_data = await self._generate_monthly_digest()
+            users = await self._get_active_users_for_broadcast()
+            
+            if not users:
+                return {"status": "no_users", "sent": 0}
+            
+            broadcast_id = f"monthly_digest_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            result = await self._execute_broadcast(
+                broadcast_id=broadcast_id,
+                broadcast_type=BroadcastType.WEEKLY_DIGEST,
+                users=users,
+                message_template=self.message_templates["monthly_digest"],
+                message_data=digest_data
+            )
+            
+            logger.info(f"📢 Місячні підсумки надіслано: {result['sent']} користувачам")
+            return result
+            
+        except Exception as e:
+            logger.error(f"❌ Помилка місячних підсумків: {e}")
+            return {"status": "error", "error": str(e), "sent": 0}
+
     async def send_tournament_announcement(self) -> Dict[str, Any]:
         """Оголошення про турнір"""
         if not self.enabled:
@@ -470,10 +514,19 @@ class BroadcastSystem:
             self.active_broadcasts[broadcast_id]["status"] = BroadcastStatus.FAILED
             raise
 
+    async def _throttle(self):
+        """Очікування слоту відправки (не більше rate_limit повідомлень на секунду)"""
+        while True:
+            result = self._pacer.check("broadcast", self.rate_limit, 1)
+            if result.allowed:
+                return
+            await asyncio.sleep(result.retry_after)
+
     async def _execute_batch_with_rate_limit(self, tasks: List) -> List[bool]:
         """Виконання батчу з rate limiting"""
         async def rate_limited_task(task):
             async with self.rate_semaphore:
+                await self._throttle()
                 return await task
         
         # Виконання всіх задач з rate limiting
@@ -596,18 +649,20 @@ class BroadcastSystem:
             return None
 
     async def _get_bot_statistics(self) -> Dict[str, Any]:
-        """Отримання статистики бота"""
+        """Статистика за сьогодні (один рядок daily_stats)"""
         try:
             if self.db_available:
-                from database import get_bot_statistics
-                stats = await get_bot_statistics()
-                return stats
+                from services.rollups import get_day_stats
+                return await asyncio.to_thread(get_day_stats)
             
             # Fallback статистика
             return {
-                "total_users": "N/A",
-                "total_content": "N/A",
-                "active_duels": "N/A",
+                "active_users": "N/A",
+                "new_users": "N/A",
+                "content_submitted": "N/A",
+                "content_approved": "N/A",
+                "reactions": "N/A",
+                "duels_completed": "N/A",
                 "broadcasts_sent": self.stats["total_sent"]
             }
             
@@ -615,21 +670,126 @@ class BroadcastSystem:
             logger.error(f"❌ Помилка отримання статистики: {e}")
             return {}
 
+    async def _generate_digest(self, days: int) -> Dict[str, str]:
+        """
+        Дайджест за N днів з rollup-таблиць
+        
+        N рядків daily_stats + топ по user_daily_stats замість сканування історії
+        """
+        from services.rollups import get_period_stats, get_top_users
+        from services.trending import get_trending_content
+        
+        period = await asyncio.to_thread(get_period_stats, days)
+        top_duelers = await asyncio.to_thread(get_top_users, days, "duel_wins", 3)
+        top_content = await asyncio.to_thread(get_trending_content, timedelta(days=days), 3)
+        
+        medals = ["👑", "🥈", "🥉"]
+        content_lines = [
+            f"{position}. {item['text'][:80]}{'...' if len(item['text']) > 80 else ''} (👍 {item['likes']})"
+            for position, item in enumerate(top_content, 1)
+        ]
+        dueler_lines = [
+            f"{position}. {medals[position - 1]} {user['name']} - {user['total']} перемог"
+            for position, user in enumerate(top_duelers, 1)
+        ]
+        
+        return {
+            "top_content": "\n".join(content_lines) or "Поки немає схваленого контенту",
+            "top_duelers": "\n".join(dueler_lines) or "Поки немає переможців",
+            "weekly_stats": (
+                f"⚔️ Дуелей: {period['duels_completed']}\n"
+                f"📝 Нового контенту: {period['content_submitted']} (✅ {period['content_approved']})\n"
+                f"👍 Реакцій: {period['reactions']}\n"
+                f"👥 Нових користувачів: {period['new_users']}\n"
+                f"📈 Активних за день: ~{period['avg_active_users']}"
+            ),
+        }
+
     async def _generate_weekly_digest(self) -> Dict[str, str]:
         """Генерація тижневого дайджесту"""
         try:
-            # Тут буде логіка генерації дайджесту з БД
-            # Поки що заглушка
-            return {
-                "top_content": "1. 😂 Найпопулярніший жарт тижня\n2. 🔥 Найкращий мем\n3. 🎯 Найкумедніший анекдот",
-                "top_duelers": "1. 👑 @user1 - 15 перемог\n2. 🥈 @user2 - 12 перемог\n3. 🥉 @user3 - 10 перемог",
-                "weekly_stats": "📊 Загалом дуелей: 45\n📝 Нового контенту: 89\n👥 Нових користувачів: 23"
-            }
-            
+            return await self._generate_digest(7)
         except Exception as e:
             logger.error(f"❌ Помилка генерації дайджесту: {e}")
             return {}
 
+    async def _generate_monthly_digest(self) -> Dict[str, str]:
+        """Генерація місячних підсумків"""
+        try:
+            return await self._generate_digest(30)
+        except Exception as e:
+            logger.error(f"❌ Помилка генерації місячних підсумків: {e}")
+            return {}
+
+    async def send_personal_messages(self, messages: Dict[int, str],
+                                     broadcast_type: BroadcastType = BroadcastType.SYSTEM_ANNOUNCE) -> Dict[str, Any]:
+        """
+        Розсилка різних повідомлень різним користувачам (наприклад авторам після масової модерації)
+        
+        Args:
+            messages: user_id -> текст повідомлення
+            broadcast_type: Тип для статистики
+        
+        Returns:
+            Результат розсилки
+        """
+        if not messages:
+            return {"status": "no_users", "sent": 0}
+        
+        broadcast_id = f"{broadcast_type.value}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
+        self.active_broadcasts[broadcast_id] = {
+            "type": broadcast_type,
+            "status": BroadcastStatus.IN_PROGRESS,
+            "total_users": len(messages),
+            "sent": 0,
+            "failed": 0,
+            "started_at": datetime.now()
+        }
+        
+        items = list(messages.items())
+        sent_count = 0
+        
+        for i in range(0, len(items), self.chunk_size):
+            batch = items[i:i + self.chunk_size]
+            results = await self._execute_batch_with_rate_limit(
+                [self._send_message_to_user(user_id, text) for user_id, text in batch]
+            )
+            sent_count += sum(1 for success in results if success)
+        
+        failed_count = len(items) - sent_count
+        self.active_broadcasts[broadcast_id].update({
+            "status": BroadcastStatus.COMPLETED,
+            "sent": sent_count,
+            "failed": failed_count,
+            "completed_at": datetime.now()
+        })
+        self.stats["total_sent"] += sent_count
+        self.stats["total_failed"] += failed_count
+        
+        return {
+            "status": "completed",
+            "broadcast_id": broadcast_id,
+            "total": len(items),
+            "sent": sent_count,
+            "failed": failed_count
+        }
+
+    def schedule_personal_messages(self, messages: Dict[int, str],
+                                   broadcast_type: BroadcastType = BroadcastType.SYSTEM_ANNOUNCE) -> Optional[asyncio.Task]:
+        """
+        Фонова розсилка персональних повідомлень (не блокує хендлер)
+        
+        Сповіщення авторів і підвищення рангу - не масова розсилка,
+        тому BROADCAST_ENABLED їх не вимикає.
+        """
+        if not messages:
+            return None
+        
+        task = asyncio.create_task(self.send_personal_messages(messages, broadcast_type))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+
     def get_broadcast_status(self, broadcast_id: str) -> Optional[Dict]:
         """Отримання статусу розсилки"""
         return self.active_broadcasts.get(broadcast_id)
@@ -673,8 +833,10 @@ async def create_broadcast_system(bot, db_available: bool = False) -> Optional[B
     Returns:
         BroadcastSystem або None при помилці
     """
+    global _broadcast_system
     try:
         broadcast_system = BroadcastSystem(bot, db_available)
+        _broadcast_system = broadcast_system
         logger.info("✅ BroadcastSystem створено успішно")
         return broadcast_system
         
@@ -682,12 +844,29 @@ async def create_broadcast_system(bot, db_available: bool = False) -> Optional[B
         logger.error(f"❌ Помилка створення BroadcastSystem: {e}")
         return None
 
+def get_broadcast_system(bot=None) -> Optional[BroadcastSystem]:
+    """
+    Спільна система розсилок
+    
+    Args:
+        bot: Bot для створення, якщо фабрика ще не викликалась
+    """
+    global _broadcast_system
+    if _broadcast_system is None and bot is not None:
+        try:
+            from database.database import DATABASE_AVAILABLE
+        except ImportError:
+            DATABASE_AVAILABLE = False
+        _broadcast_system = BroadcastSystem(bot, DATABASE_AVAILABLE)
+    return _broadcast_system
+
 # ===== ЕКСПОРТ =====
 __all__ = [
     'BroadcastSystem',
     'BroadcastType', 
     'BroadcastStatus',
-    'create_broadcast_system'
+    'create_broadcast_system',
+    'get_broadcast_system'
 ]
 
 logger.info("✅ BroadcastSystem модуль завантажено")
\ No newline at end of file
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🥊 СТАТИСТИКА ДУЕЛІСТІВ 🥊
+
+Готові лічильники дуелей у рядку користувача замість агрегації по історії:
+✅ Завершення дуелі оновлює обох учасників одним UPDATE (перемоги, поразки, серії, рейтинг)
+✅ Дуель "захоплюється" умовним UPDATE - результат не зараховується двічі
+✅ Меню дуелей читає один рядок users за первинним ключем
+✅ Backfill перераховує всі лічильники з історії дуелей
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    from config.settings import POINTS_FOR_DUEL_WIN, POINTS_FOR_DUEL_PARTICIPATION
+except ImportError:
+    POINTS_FOR_DUEL_WIN, POINTS_FOR_DUEL_PARTICIPATION = 20, 2
+
+DEFAULT_DUEL_RATING = 1000
+ELO_K_FACTOR = 32
+BACKFILL_BATCH_SIZE = 5000
+
+# ===== РЕЙТИНГ =====
+
+def elo_delta(first_rating: int, second_rating: int, draw: bool = False, k: int = ELO_K_FACTOR) -> int:
+    """
+    Зміна рейтингу першого учасника (другий отримує протилежну)
+
+    Args:
+        first_rating: Рейтинг переможця (або першого учасника при нічиїй)
+        second_rating: Рейтинг суперника
+        draw: Нічия
+    """
+    expected = 1 / (1 + 10 ** ((second_rating - first_rating) / 400))
+    score = 0.5 if draw else 1.0
+    return round(k * (score - expected))
+
+def _result_statement(first_id: int, second_id: int, delta: int, draw: bool):
+    """
+    Один UPDATE для обох учасників
+
+    Значення в SET обчислюються зі старого рядка, тому серія, найкраща серія
+    та рейтинг узгоджені без додаткових читань.
+    """
+    from sqlalchemy import case, func, update
+    from database.models import User
+
+    users = User.__table__
+    is_first = users.c.id == first_id
+    won = func.coalesce(users.c.duels_won, 0)
+    lost = func.coalesce(users.c.duels_lost, 0)
+    streak = func.coalesce(users.c.duel_win_streak, 0)
+    best = func.coalesce(users.c.duel_best_streak, 0)
+
+    if draw:
+        new_streak = 0
+        new_best = best
+        points = POINTS_FOR_DUEL_PARTICIPATION
+    else:
+        # Перший учасник - переможець
+        won = won + case((is_first, 1), else_=0)
+        lost = lost + case((is_first, 0), else_=1)
+        new_streak = case((is_first, streak + 1), else_=0)
+        new_best = case((is_first & (streak + 1 > best), streak + 1), else_=best)
+        points = case((is_first, POINTS_FOR_DUEL_WIN), else_=POINTS_FOR_DUEL_PARTICIPATION)
+
+    return (
+        update(users)
+        .where(users.c.id.in_([first_id, second_id]))
+        .values(
+            duels_participated=func.coalesce(users.c.duels_participated, 0) + 1,
+            duels_won=won,
+            duels_lost=lost,
+            duel_win_streak=new_streak,
+            duel_best_streak=new_best,
+            duel_rating=func.coalesce(users.c.duel_rating, DEFAULT_DUEL_RATING)
+            + case((is_first, delta), else_=-delta),
+            points=func.coalesce(users.c.points, 0) + points,
+        )
+        .returning(users.c.id, users.c.duel_rating, users.c.duel_win_streak)
+    )
+
+def apply_duel_result(session, first_id: int, second_id: int, draw: bool = False) -> Dict[str, Any]:
+    """
+    Зарахування результату дуелі обом учасникам в поточній транзакції
+
+    Args:
+        first_id: Переможець (або перший учасник при нічиїй)
+        second_id: Переможений (або другий учасник)
+
+    Returns:
+        Зміна рейтингу та нові значення рейтингу/серії по учасниках
+    """
+    from sqlalchemy import select
+    from database.models import User
+
+    users = User.__table__
+    ratings = dict(session.execute(
+        select(users.c.id, users.c.duel_rating).where(users.c.id.in_([first_id, second_id]))
+    ).all())
+    delta = elo_delta(
+        ratings.get(first_id) or DEFAULT_DUEL_RATING,
+        ratings.get(second_id) or DEFAULT_DUEL_RATING,
+        draw
+    )
+
+    updated = session.execute(_result_statement(first_id, second_id, delta, draw)).all()
+    return {
+        "rating_change": delta,
+        "users": {row.id: {"rating": row.duel_rating, "win_streak": row.duel_win_streak} for row in updated},
+    }
+
+# ===== ЗАВЕРШЕННЯ ДУЕЛІ =====
+
+def finish_duel(duel_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Завершення дуелі та оновлення статистики учасників
+
+    Статус змінюється умовним UPDATE ... WHERE status = ACTIVE, тож повторний
+    виклик (планувальник + перевірка після голосу) нічого не зараховує.
+
+    Returns:
+        Результат дуелі або None, якщо дуель вже завершена чи не знайдена
+    """
+    from sqlalchemy import case, select, update
+    from database.database import get_db_session
+    from database.models import Content, Duel, DuelStatus
+
+    duels = Duel.__table__
+    winner_content = case(
+        (duels.c.content1_votes > duels.c.content2_votes, duels.c.content1_id),
+        (duels.c.content2_votes > duels.c.content1_votes, duels.c.content2_id),
+        else_=None
+    )
+
+    with get_db_session() as session:
+        duel = session.execute(
+            update(duels)
+            .where(duels.c.id == duel_id, duels.c.status == DuelStatus.ACTIVE.value)
+            .values(status=DuelStatus.COMPLETED.value, completed_at=datetime.utcnow(), winner_content_id=winner_content)
+            .returning(duels.c.content1_id, duels.c.content2_id, duels.c.content1_votes,
+                       duels.c.content2_votes, duels.c.winner_content_id)
+        ).first()
+        if duel is None:
+            return None
+
+        authors = dict(session.execute(
+            select(Content.id, Content.author_id).where(Content.id.in_([duel.content1_id, duel.content2_id]))
+        ).all())
+        author1, author2 = authors.get(duel.content1_id), authors.get(duel.content2_id)
+
+        result = {
+            "duel_id": duel_id,
+            "content1_votes": duel.content1_votes or 0,
+            "content2_votes": duel.content2_votes or 0,
+            "winner_content_id": duel.winner_content_id,
+            "winner_id": None,
+            "loser_id": None,
+            "rating_change": 0,
+        }
+        if not author1 or not author2 or author1 == author2:
+            return result
+
+        draw = duel.winner_content_id is None
+        if draw or duel.winner_content_id == duel.content1_id:
+            winner_id, loser_id = author1, author2
+        else:
+            winner_id, loser_id = author2, author1
+
+        outcome = apply_duel_result(session, winner_id, loser_id, draw)
+        result["rating_change"] = outcome["rating_change"]
+        if not draw:
+            result["winner_id"], result["loser_id"] = winner_id, loser_id
+
+    from services.rollups import record_event
+    record_event("duels_completed")
+    if result["winner_id"]:
+        record_event("duel_wins", result["winner_id"])
+    return result
+
+# ===== ЧИТАННЯ =====
+
+def get_user_duel_stats(user_id: int) -> Dict[str, Any]:
+    """Статистика дуеліста з одного рядка users (за первинним ключем)"""
+    from sqlalchemy import select
+    from database.database import get_db_session
+    from database.models import User
+    from utils.ranks import duel_rank_for
+
+    users = User.__table__
+    with get_db_session() as session:
+        row = session.execute(
+            select(users.c.duels_participated, users.c.duels_won, users.c.duels_lost,
+                   users.c.duel_rating, users.c.duel_win_streak, users.c.duel_best_streak)
+            .where(users.c.id == user_id)
+        ).first()
+
+    total = (row.duels_participated or 0) if row else 0
+    wins = (row.duels_won or 0) if row else 0
+    losses = (row.duels_lost or 0) if row else 0
+    rating = (row.duel_rating or DEFAULT_DUEL_RATING) if row else DEFAULT_DUEL_RATING
+    return {
+        'total_duels': total,
+        'wins': wins,
+        'losses': losses,
+        'draws': max(total - wins - losses, 0),
+        'win_rate': round(wins / total * 100, 1) if total else 0.0,
+        'rating': rating,
+        'rank': duel_rank_for(rating),
+        'win_streak': (row.duel_win_streak or 0) if row else 0,
+        'best_win_streak': (row.duel_best_streak or 0) if row else 0,
+    }
+
+# ===== BACKFILL =====
+
+def _new_state() -> List[int]:
+    # [участь, перемоги, поразки, серія, найкраща серія, рейтинг]
+    return [0, 0, 0, 0, 0, DEFAULT_DUEL_RATING]
+
+def _replay(first: List[int], second: List[int], draw: bool) -> None:
+    """Той самий результат, що й _result_statement, для стану в пам'яті"""
+    delta = elo_delta(first[5], second[5], draw)
+    first[0] += 1
+    second[0] += 1
+    first[5] += delta
+    second[5] -= delta
+    second[3] = 0
+    if draw:
+        first[3] = 0
+        return
+    first[1] += 1
+    second[2] += 1
+    first[3] += 1
+    first[4] = max(first[4], first[3])
+
+def backfill_duel_stats(batch_size: int = BACKFILL_BATCH_SIZE) -> Dict[str, int]:
+    """
+    Перерахунок лічильників дуелей з історії
+
+    Завершені дуелі читаються потоково в хронологічному порядку, серії та
+    рейтинг відтворюються в пам'яті, результат пишеться executemany в одній
+    транзакції з обнуленням лічильників. Бали не чіпаються - у них є інші джерела.
+
+    Returns:
+        Кількість дуелей та оновлених користувачів
+    """
+    from sqlalchemy import bindparam, select, update
+    from database.database import get_db_session
+    from database.models import Content, Duel, DuelStatus, User
+
+    duels = Duel.__table__
+    users = User.__table__
+    first_content = Content.__table__.alias("c1")
+    second_content = Content.__table__.alias("c2")
+
+    history = (
+        select(duels.c.content1_id, duels.c.winner_content_id,
+               first_content.c.author_id.label("author1"), second_content.c.author_id.label("author2"))
+        .join(first_content, first_content.c.id == duels.c.content1_id)
+        .join(second_content, second_content.c.id == duels.c.content2_id)
+        .where(duels.c.status == DuelStatus.COMPLETED.value)
+        .order_by(duels.c.completed_at, duels.c.id)
+        .execution_options(yield_per=batch_size, stream_results=True)
+    )
+
+    state: Dict[int, List[int]] = {}
+    replayed = 0
+
+    with get_db_session() as session:
+        for row in session.execute(history):
+            if not row.author1 or not row.author2 or row.author1 == row.author2:
+                continue
+            draw = row.winner_content_id is None
+            if draw or row.winner_content_id == row.content1_id:
+                winner_id, loser_id = row.author1, row.author2
+            else:
+                winner_id, loser_id = row.author2, row.author1
+            _replay(state.setdefault(winner_id, _new_state()), state.setdefault(loser_id, _new_state()), draw)
+            replayed += 1
+
+        session.execute(
+            update(users).values(duels_participated=0, duels_won=0, duels_lost=0,
+                                 duel_win_streak=0, duel_best_streak=0, duel_rating=DEFAULT_DUEL_RATING)
+        )
+
+        statement = (
+            update(users)
+            .where(users.c.id == bindparam("b_id"))
+            .values(
+                duels_participated=bindparam("b_participated"),
+                duels_won=bindparam("b_won"),
+                duels_lost=bindparam("b_lost"),
+                duel_win_streak=bindparam("b_streak"),
+                duel_best_streak=bindparam("b_best"),
+                duel_rating=bindparam("b_rating"),
+            )
+        )
+        params = [
+            {"b_id": user_id, "b_participated": s[0], "b_won": s[1], "b_lost": s[2],
+             "b_streak": s[3], "b_best": s[4], "b_rating": s[5]}
+            for user_id, s in state.items()
+        ]
+        for start in range(0, len(params), batch_size):
+            session.execute(statement, params[start:start + batch_size])
+
+    logger.info(f"🥊 Статистику дуелей перераховано: {replayed} дуелей, {len(state)} користувачів")
+    return {"duels": replayed, "users": len(state)}
+
+# ===== ЕКСПОРТ =====
+__all__ = [
+    'elo_delta', 'apply_duel_result', 'finish_duel', 'get_user_duel_stats',
+    'backfill_duel_stats', 'DEFAULT_DUEL_RATING'
+]
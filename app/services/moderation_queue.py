@@ -0,0 +1,740 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🛡️ ЧЕРГА МОДЕРАЦІЇ З ПРІОРИТЕТАМИ 🛡️
+
+Спільна черга для всіх адміністраторів (ALL_ADMIN_IDS):
+✅ O(1) пошук за ID контенту
+✅ Пріоритет: репутація автора, час очікування, кількість скарг
+✅ Claim/lease - кожен елемент бачить тільки один модератор
+✅ Прогрів з БД (частковий індекс idx_content_pending) після перезапуску
+✅ Умовний UPDATE ... WHERE status = 'pending' - без подвійної обробки
+✅ Масова модерація: один UPDATE на весь список, один UPDATE для балів і рангу - в одній транзакції
+✅ Одиночне рішення - той самий шлях, що й масове
+"""
+
+import heapq
+import math
+import time
+import logging
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# ===== КОНСТАНТИ =====
+
+DEFAULT_LEASE_SECONDS = 300          # Скільки модератор "тримає" елемент
+DEFAULT_TRUSTED_REPUTATION = 3.0     # Поріг "довіреного" автора для масового схвалення
+BULK_CHUNK_SIZE = 1000               # ID в одному UPDATE
+AGE_WEIGHT_PER_HOUR = 1.0            # +1 пріоритету за кожну годину очікування
+REPUTATION_WEIGHT = 4.0              # Надійні автори розглядаються швидше
+REPORT_WEIGHT = 6.0                  # Кожна скарга піднімає елемент у черзі
+
+
+def author_reputation(points: int = 0, submitted: int = 0, approved: int = 0) -> float:
+    """
+    Репутація автора 0..~10
+
+    Частка схвалених подач (зі згладжуванням Лапласа) масштабується
+    логарифмом балів, щоб новачки не потрапляли в кінець черги назавжди.
+    """
+    approval_ratio = (approved + 1) / (submitted + 2)
+    return approval_ratio * (1 + math.log1p(max(points, 0)))
+
+
+def _utc_naive(value: Optional[datetime]) -> datetime:
+    """Час у UTC без tzinfo - як created_at у БД (datetime.utcnow)"""
+    if value is None:
+        return datetime.utcnow()
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class ModerationItem:
+    """Елемент черги модерації"""
+
+    __slots__ = (
+        "id", "author_id", "author_name", "text", "content_type", "created_at",
+        "reputation", "reports", "lease_owner", "lease_expires", "skipped_by", "_version"
+    )
+
+    def __init__(self, id: int, author_id: int, text: str, content_type: str = "joke",
+                 author_name: str = "Невідомий", created_at: Optional[datetime] = None,
+                 reputation: float = 0.0, reports: int = 0):
+        self.id = id
+        self.author_id = author_id
+        self.author_name = author_name
+        self.text = text
+        self.content_type = content_type
+        self.created_at = _utc_naive(created_at)
+        self.reputation = reputation
+        self.reports = reports
+        self.lease_owner: Optional[int] = None
+        self.lease_expires = 0.0
+        self.skipped_by: Set[int] = set()
+        self._version = 0
+
+    def priority_key(self) -> float:
+        """
+        Ключ сортування (менший - раніше)
+
+        Вік дає однаковий внесок усім елементам у кожен момент часу,
+        тому пріоритет "вага*вік + статичні бали" впорядковує так само,
+        як і незмінний ключ "вага*created_at - статичні бали".
+        """
+        created_hours = self.created_at.replace(tzinfo=timezone.utc).timestamp() / 3600
+        static_score = self.reputation * REPUTATION_WEIGHT + self.reports * REPORT_WEIGHT
+        return created_hours * AGE_WEIGHT_PER_HOUR - static_score
+
+    def is_leased(self, now: float) -> bool:
+        return self.lease_owner is not None and self.lease_expires > now
+
+
+class ModerationQueue:
+    """
+    Черга з пріоритетами та орендою елементів
+
+    Словник id -> елемент дає O(1) пошук, купа - O(log n) вибір наступного.
+    Видалення та зміна пріоритету - ліниві (через версію елемента).
+    """
+
+    def __init__(self, lease_seconds: int = DEFAULT_LEASE_SECONDS):
+        self.lease_seconds = lease_seconds
+        self._items: Dict[int, ModerationItem] = {}
+        self._heap: List[Tuple[float, int, int]] = []          # (ключ, id, версія)
+        self._leases: List[Tuple[float, int, int]] = []        # (закінчення, id, версія)
+        self._claims: Dict[int, int] = {}                      # admin_id -> id
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, content_id: int) -> bool:
+        return content_id in self._items
+
+    def get(self, content_id: int) -> Optional[ModerationItem]:
+        return self._items.get(content_id)
+
+    def _push(self, item: ModerationItem) -> None:
+        item._version += 1
+        heapq.heappush(self._heap, (item.priority_key(), item.id, item._version))
+
+    def _clear_lease(self, item: ModerationItem) -> None:
+        if self._claims.get(item.lease_owner) == item.id:
+            del self._claims[item.lease_owner]
+        item.lease_owner = None
+
+    def _expire_leases(self, now: float) -> None:
+        while self._leases and self._leases[0][0] <= now:
+            _, content_id, version = heapq.heappop(self._leases)
+            item = self._items.get(content_id)
+            if item and item._version == version and item.lease_owner is not None:
+                logger.info(f"⏰ Оренда #{content_id} модератором {item.lease_owner} закінчилась")
+                self._clear_lease(item)
+                self._push(item)
+
+    # ===== НАПОВНЕННЯ =====
+
+    def add(self, item: ModerationItem) -> ModerationItem:
+        """Додавання або оновлення елемента"""
+        existing = self._items.get(item.id)
+        if existing and existing.lease_owner is not None:
+            # Елемент зараз у модератора - оновлюємо дані без повернення в купу
+            existing.reports = item.reports
+            existing.reputation = item.reputation
+            return existing
+
+        if existing is not None:
+            item._version = existing._version
+        self._items[item.id] = item
+        self._push(item)
+        return item
+
+    def report(self, content_id: int, count: int = 1) -> bool:
+        """Скарга на контент піднімає його в черзі"""
+        item = self._items.get(content_id)
+        if not item:
+            return False
+        item.reports += count
+        if item.lease_owner is None:
+            self._push(item)
+        return True
+
+    # ===== ОРЕНДА =====
+
+    def claim(self, admin_id: int, now: Optional[float] = None) -> Optional[ModerationItem]:
+        """
+        Видача наступного елемента модератору
+
+        Args:
+            admin_id: ID адміністратора
+
+        Returns:
+            Орендований елемент або None якщо черга порожня
+        """
+        now = time.monotonic() if now is None else now
+        self._expire_leases(now)
+
+        # Повторний запит - той самий елемент, що вже в оренді
+        current = self.current_claim(admin_id, now)
+        if current is not None:
+            return current
+
+        deferred = []
+        claimed = None
+        while self._heap:
+            key, content_id, version = heapq.heappop(self._heap)
+            item = self._items.get(content_id)
+            if item is None or item._version != version:
+                continue
+            if admin_id in item.skipped_by:
+                deferred.append((key, content_id, version))
+                continue
+            claimed = item
+            break
+
+        for entry in deferred:
+            heapq.heappush(self._heap, entry)
+
+        if claimed is None:
+            return None
+
+        claimed._version += 1
+        claimed.lease_owner = admin_id
+        claimed.lease_expires = now + self.lease_seconds
+        self._claims[admin_id] = claimed.id
+        heapq.heappush(self._leases, (claimed.lease_expires, claimed.id, claimed._version))
+        return claimed
+
+    def current_claim(self, admin_id: int, now: Optional[float] = None) -> Optional[ModerationItem]:
+        """Елемент, орендований модератором зараз; черга та оренди не змінюються"""
+        now = time.monotonic() if now is None else now
+        item = self._items.get(self._claims.get(admin_id))
+        if item is not None and item.lease_owner == admin_id and item.lease_expires > now:
+            return item
+        return None
+
+    def release(self, content_id: int, admin_id: int, skip: bool = False) -> bool:
+        """
+        Повернення елемента в чергу
+
+        Args:
+            content_id: ID контенту
+            admin_id: ID адміністратора
+            skip: Не показувати цьому модератору повторно
+
+        Returns:
+            True якщо елемент повернено
+        """
+        item = self._items.get(content_id)
+        if not item or item.lease_owner not in (None, admin_id):
+            return False
+
+        if skip:
+            item.skipped_by.add(admin_id)
+        if item.lease_owner is not None:
+            self._clear_lease(item)
+            self._push(item)
+        return True
+
+    def take(self, content_id: int, admin_id: int, now: Optional[float] = None) -> Optional[ModerationItem]:
+        """
+        Вилучення елемента для остаточного рішення
+
+        Дозволено власнику оренди або будь-кому, якщо елемент не орендований.
+
+        Returns:
+            Елемент або None якщо його вже обробляє інший модератор
+        """
+        now = time.monotonic() if now is None else now
+        item = self._items.get(content_id)
+        if item is None:
+            return None
+        if item.is_leased(now) and item.lease_owner != admin_id:
+            return None
+
+        del self._items[content_id]
+        if item.lease_owner is not None:
+            self._clear_lease(item)
+        return item
+
+    def take_many(self, content_ids: Iterable[int], admin_id: int,
+                  now: Optional[float] = None) -> Tuple[List[ModerationItem], List[int]]:
+        """
+        Вилучення кількох елементів за раз
+
+        Returns:
+            (вилучені елементи, ID зайняті іншими модераторами)
+        """
+        now = time.monotonic() if now is None else now
+        taken, locked = [], []
+        for content_id in content_ids:
+            item = self.take(content_id, admin_id, now)
+            if item is not None:
+                taken.append(item)
+            elif content_id in self._items:
+                locked.append(content_id)
+        return taken, locked
+
+    def trusted_ids(self, min_reputation: float, admin_id: int,
+                    now: Optional[float] = None) -> List[int]:
+        """ID вільних елементів від авторів з репутацією не нижче порогу"""
+        now = time.monotonic() if now is None else now
+        return [
+            item.id for item in self._items.values()
+            if item.reputation >= min_reputation
+            and (not item.is_leased(now) or item.lease_owner == admin_id)
+        ]
+
+    def restore(self, item: ModerationItem) -> None:
+        """Повернення елемента після невдалого рішення (наприклад помилки БД)"""
+        self._clear_lease(item)
+        self._items[item.id] = item
+        self._push(item)
+
+    def discard(self, content_id: int) -> Optional[ModerationItem]:
+        """Видалення елемента незалежно від оренди"""
+        item = self._items.pop(content_id, None)
+        if item is not None and item.lease_owner is not None:
+            self._clear_lease(item)
+        return item
+
+    # ===== ПЕРЕГЛЯД =====
+
+    def pending(self, limit: Optional[int] = None) -> List[ModerationItem]:
+        """Елементи у порядку пріоритету (без оренди)"""
+        items = sorted(self._items.values(), key=ModerationItem.priority_key)
+        return items[:limit] if limit else items
+
+    def get_stats(self) -> Dict[str, int]:
+        now = time.monotonic()
+        leased = sum(1 for item in self._items.values() if item.is_leased(now))
+        return {
+            "pending": len(self._items),
+            "leased": leased,
+            "available": len(self._items) - leased,
+        }
+
+
+# ===== СПІЛЬНА ЧЕРГА =====
+
+_moderation_queue: Optional[ModerationQueue] = None
+
+
+def get_moderation_queue() -> ModerationQueue:
+    """Спільна черга модерації"""
+    global _moderation_queue
+    if _moderation_queue is None:
+        try:
+            from config.settings import MODERATION_LEASE_SECONDS
+        except ImportError:
+            MODERATION_LEASE_SECONDS = DEFAULT_LEASE_SECONDS
+        _moderation_queue = ModerationQueue(MODERATION_LEASE_SECONDS)
+    return _moderation_queue
+
+
+def item_from_row(content, author=None) -> ModerationItem:
+    """ModerationItem з рядка Content (+ User автора)"""
+    if author is not None:
+        reputation = author_reputation(
+            author.points or 0,
+            (author.jokes_submitted or 0) + (author.memes_submitted or 0),
+            (author.jokes_approved or 0) + (author.memes_approved or 0)
+        )
+        author_name = author.first_name or author.username or "Невідомий"
+    else:
+        reputation, author_name = 0.0, "Невідомий"
+
+    return ModerationItem(
+        id=content.id,
+        author_id=content.author_id,
+        text=content.text,
+        content_type=content.content_type,
+        author_name=author_name,
+        created_at=content.created_at,
+        reputation=reputation,
+        reports=getattr(content, "reports", 0) or 0
+    )
+
+
+def load_pending_from_db(batch_size: int = 500) -> int:
+    """
+    Прогрів черги з БД після перезапуску
+
+    Запит іде по частковому індексу idx_content_pending.
+
+    Returns:
+        Кількість завантажених елементів
+    """
+    queue = get_moderation_queue()
+
+    try:
+        from database.database import get_db_session
+        from database.models import Content, User
+
+        with get_db_session() as session:
+            rows = (
+                session.query(Content, User)
+                .outerjoin(User, User.id == Content.author_id)
+                .filter(Content.status == "pending")
+                .order_by(Content.created_at)
+                .yield_per(batch_size)
+            )
+            for content, author in rows:
+                queue.add(item_from_row(content, author))
+
+        logger.info(f"🛡️ Черга модерації: {len(queue)} елементів з БД")
+    except Exception as e:
+        logger.warning(f"⚠️ Черга модерації без БД: {e}")
+
+    return len(queue)
+
+
+def load_item_from_db(content_id: int) -> Optional[ModerationItem]:
+    """Елемент з рядка БД (будь-який статус); None - контенту немає"""
+    from database.database import get_db_session
+    from database.models import Content, User
+
+    with get_db_session() as session:
+        row = (
+            session.query(Content, User)
+            .outerjoin(User, User.id == Content.author_id)
+            .filter(Content.id == content_id)
+            .first()
+        )
+        return item_from_row(*row) if row else None
+
+
+def forget_rejected(content_ids: Iterable[int]) -> None:
+    """Відхилений контент - з індексу дублікатів (idx_content_hash його теж не охоплює)"""
+    from utils.duplicate_index import get_duplicate_index
+
+    index = get_duplicate_index()
+    for content_id in content_ids:
+        index.remove(content_id)
+
+
+async def resolve_content(content_id: int, admin_id: int, approved: bool,
+                          comment: Optional[str] = None, bot=None) -> Tuple[Optional[ModerationItem], str]:
+    """
+    Остаточне рішення модератора щодо одного елемента
+
+    Той самий шлях, що й масова модерація (bulk_resolve_content): одна транзакція
+    на статус і бали, повернення в чергу при помилці, сповіщення через розсилку.
+
+    Елемента може не бути в пам'яті цього процесу: у масштабованому режимі
+    кожен воркер має власну чергу, а кнопка модерації приходить у будь-який.
+    Тоді рішення приймає умовний UPDATE у БД, а елемент читається з рядка.
+
+    Returns:
+        (елемент, статус): статус "ok", "not_found", "locked" або "processed"
+    """
+    try:
+        from database.database import DATABASE_AVAILABLE
+    except ImportError:
+        DATABASE_AVAILABLE = False
+
+    queued = get_moderation_queue().get(content_id)
+    result = await bulk_resolve_content([content_id], admin_id, approved, comment, bot=bot)
+    if result["locked"]:
+        return None, "locked"
+    if not result["processed"]:
+        if DATABASE_AVAILABLE and load_item_from_db(content_id) is not None:
+            return None, "processed"
+        return None, "not_found"
+    if queued is None and DATABASE_AVAILABLE:
+        queued = load_item_from_db(content_id)
+    return queued, "ok"
+
+
+# ===== МАСОВА МОДЕРАЦІЯ =====
+
+def _id_filter(session, column, ids: List[int]):
+    """id = ANY(:ids) для PostgreSQL (один параметр-масив), IN (...) для інших БД"""
+    if session.bind.dialect.name == "postgresql":
+        from sqlalchemy import any_, bindparam, Integer
+        from sqlalchemy.dialects.postgresql import ARRAY
+        return column == any_(bindparam("ids", ids, type_=ARRAY(Integer)))
+    return column.in_(ids)
+
+
+def _set_statuses(session, content_ids: List[int], status: str, admin_id: int,
+                  comment: Optional[str] = None) -> List[Tuple[int, int, str]]:
+    """Умовний UPDATE статусу чанками в переданій сесії (без commit)"""
+    from sqlalchemy import update
+    from database.models import Content
+
+    changed = []
+    moderation_date = datetime.utcnow()
+    for start in range(0, len(content_ids), BULK_CHUNK_SIZE):
+        chunk = content_ids[start:start + BULK_CHUNK_SIZE]
+        result = session.execute(
+            update(Content)
+            .where(_id_filter(session, Content.id, chunk), Content.status == "pending")
+            .values(
+                status=status,
+                moderated_by=admin_id,
+                moderation_comment=comment,
+                moderation_date=moderation_date
+            )
+            .returning(Content.id, Content.author_id, Content.content_type)
+            .execution_options(synchronize_session=False)
+        )
+        changed.extend(tuple(row) for row in result)
+    return changed
+
+
+def _reward_authors(session, approved_rows: List[Tuple[int, int, str]], points_per_item: int) -> int:
+    """UPDATE балів, лічильників схвалень і рангу авторів у переданій сесії (без commit)"""
+    if not approved_rows:
+        return 0
+
+    from sqlalchemy import case, func, update
+    from database.models import User
+    from utils.ranks import rank_case
+
+    jokes, memes = Counter(), Counter()
+    for _, author_id, content_type in approved_rows:
+        (memes if content_type == "meme" else jokes)[author_id] += 1
+
+    author_ids = sorted(set(jokes) | set(memes))
+    points = {author_id: (jokes[author_id] + memes[author_id]) * points_per_item for author_id in author_ids}
+
+    # SET рахується зі старого рядка - ранг береться від нових балів, як в update_user_points
+    new_points = func.coalesce(User.points, 0) + case(points, value=User.id, else_=0)
+    values = {
+        "points": new_points,
+        "rank": rank_case(new_points),
+        "updated_at": datetime.utcnow(),
+    }
+    if jokes:
+        values["jokes_approved"] = User.jokes_approved + case(dict(jokes), value=User.id, else_=0)
+    if memes:
+        values["memes_approved"] = User.memes_approved + case(dict(memes), value=User.id, else_=0)
+
+    result = session.execute(
+        update(User)
+        .where(User.id.in_(author_ids))
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+def _record_moderation_events(rows: List[Tuple[int, int, str]], status: str) -> None:
+    """Події для rollups - після commit, щоб не рахувати відкочене"""
+    from services.rollups import record_event
+    for _, author_id, _ in rows:
+        record_event(f"content_{status}", author_id)
+
+
+def bulk_set_content_status(content_ids: List[int], status: str, admin_id: int,
+                            comment: Optional[str] = None) -> List[Tuple[int, int, str]]:
+    """
+    Зміна статусу списку контенту одним запитом
+
+    UPDATE content SET status = ... WHERE id = ANY(:ids) AND status = 'pending'
+    RETURNING id, author_id, content_type
+
+    Returns:
+        Змінені рядки (id, author_id, content_type)
+    """
+    from database.database import get_db_session
+
+    with get_db_session() as session:
+        changed = _set_statuses(session, content_ids, status, admin_id, comment)
+    _record_moderation_events(changed, status)
+    return changed
+
+
+def apply_approval_rewards(approved_rows: List[Tuple[int, int, str]], points_per_item: int) -> int:
+    """
+    Нарахування балів, лічильників схвалень та рангу авторам одним UPDATE
+
+    UPDATE users SET points = points + CASE id WHEN ... END, rank = CASE ... END WHERE id IN (...)
+
+    Returns:
+        Кількість оновлених авторів
+    """
+    if not approved_rows:
+        return 0
+
+    from database.database import get_db_session
+
+    with get_db_session() as session:
+        return _reward_authors(session, approved_rows, points_per_item)
+
+
+def moderate_in_db(content_ids: List[int], approved: bool, admin_id: int, comment: Optional[str] = None,
+                   points_per_item: int = 0) -> List[Tuple[int, int, str]]:
+    """
+    Статус контенту та бали авторів в одній транзакції
+
+    Якщо нарахування падає, статуси теж відкочуються - контент лишається
+    pending і може повернутися в чергу без втрати балів автора.
+
+    Returns:
+        Змінені рядки (id, author_id, content_type)
+    """
+    from database.database import get_db_session
+
+    status = "approved" if approved else "rejected"
+    with get_db_session() as session:
+        rows = _set_statuses(session, content_ids, status, admin_id, comment)
+        if approved:
+            _reward_authors(session, rows, points_per_item)
+    _record_moderation_events(rows, status)
+    return rows
+
+
+def _single_notification(content_id: int, approved: bool, points_per_item: int,
+                         comment: Optional[str] = None) -> str:
+    if approved:
+        return (
+            f"🎉 <b>УРА! Твій контент #{content_id} схвалено!</b>\n\n"
+            f"🔥 Ти отримав +{points_per_item} балів!\n\n"
+            f"⭐ Переглянь свій профіль: /profile"
+        )
+    text = (
+        f"❌ <b>Твій контент #{content_id} не пройшов модерацію</b>\n\n"
+        f"🤔 Можливі причини:\n"
+        f"• Не відповідає правилам спільноти\n"
+        f"• Вже є в базі\n"
+        f"• Низька якість контенту\n\n"
+        f"🔥 Спробуй надіслати інший!\n"
+        f"ℹ️ Бали за подачу залишаються у тебе"
+    )
+    if comment:
+        text += f"\n\nℹ️ <b>Коментар модератора:</b> {comment}"
+    return text
+
+
+def build_author_notifications(rows: List[Tuple[int, int, str]], approved: bool,
+                               points_per_item: int = 0, comment: Optional[str] = None) -> Dict[int, str]:
+    """Одне зведене повідомлення на автора замість повідомлення на кожен елемент"""
+    per_author: Dict[int, List[int]] = defaultdict(list)
+    for content_id, author_id, _ in rows:
+        per_author[author_id].append(content_id)
+
+    messages = {}
+    for author_id, ids in per_author.items():
+        if len(ids) == 1:
+            messages[author_id] = _single_notification(ids[0], approved, points_per_item, comment)
+            continue
+
+        numbers = ", ".join(f"#{content_id}" for content_id in ids[:10])
+        if len(ids) > 10:
+            numbers += f" та ще {len(ids) - 10}"
+
+        if approved:
+            messages[author_id] = (
+                f"🎉 <b>УРА! Схвалено {len(ids)} ваших публікацій!</b>\n\n"
+                f"📝 {numbers}\n"
+                f"🔥 Ви отримали +{len(ids) * points_per_item} балів!\n\n"
+                f"⭐ Переглянь свій профіль: /profile"
+            )
+        else:
+            text = (
+                f"❌ <b>{len(ids)} ваших публікацій не пройшли модерацію</b>\n\n"
+                f"📝 {numbers}\n\n"
+                f"🔥 Спробуй надіслати інші!"
+            )
+            if comment:
+                text += f"\n\nℹ️ <b>Коментар модератора:</b> {comment}"
+            messages[author_id] = text
+    return messages
+
+
+async def bulk_resolve_content(content_ids: Iterable[int], admin_id: int, approved: bool,
+                               comment: Optional[str] = None, bot=None) -> Dict[str, object]:
+    """
+    Масове схвалення або відхилення
+
+    Args:
+        content_ids: ID контенту
+        admin_id: ID адміністратора
+        approved: Схвалити чи відхилити
+        comment: Коментар модератора
+        bot: Bot для сповіщень авторів (через rate-limited розсилку)
+
+    Returns:
+        Статистика: processed, locked, skipped, authors, notified
+    """
+    try:
+        from config.settings import POINTS_FOR_APPROVAL
+    except ImportError:
+        POINTS_FOR_APPROVAL = 15
+    try:
+        from database.database import DATABASE_AVAILABLE
+    except ImportError:
+        DATABASE_AVAILABLE = False
+
+    content_ids = list(dict.fromkeys(content_ids))
+    queue = get_moderation_queue()
+    items, locked = queue.take_many(content_ids, admin_id)
+    locked_set = set(locked)
+
+    if DATABASE_AVAILABLE:
+        # В БД можуть бути елементи, яких немає в пам'яті (інший процес) - умовний UPDATE розбереться
+        candidate_ids = [content_id for content_id in content_ids if content_id not in locked_set]
+        try:
+            rows = moderate_in_db(candidate_ids, approved, admin_id, comment, POINTS_FOR_APPROVAL)
+        except Exception as e:
+            logger.error(f"❌ Помилка масової модерації: {e}")
+            for item in items:
+                queue.restore(item)
+            raise
+    else:
+        rows = [(item.id, item.author_id, item.content_type) for item in items]
+        if approved:
+            for _, author_id, _ in rows:
+                logger.info(f"👤 Користувач {author_id}: +{POINTS_FOR_APPROVAL} балів за схвалення контенту")
+
+    if not approved:
+        forget_rejected(content_id for content_id, _, _ in rows)
+
+    notifications = build_author_notifications(rows, approved, POINTS_FOR_APPROVAL, comment)
+    if bot is not None and notifications:
+        from services.broadcast_system import get_broadcast_system
+        broadcast_system = get_broadcast_system(bot)
+        if broadcast_system:
+            broadcast_system.schedule_personal_messages(notifications)
+
+    processed = len(rows)
+    logger.info(
+        f"{'✅' if approved else '❌'} Адміністратор {admin_id}: масово оброблено {processed} "
+        f"(зайнято {len(locked)}), авторів {len(notifications)}"
+    )
+    return {
+        "processed": processed,
+        "locked": len(locked),
+        "skipped": len(content_ids) - processed - len(locked),
+        "authors": len(notifications),
+    }
+
+
+async def approve_trusted_authors(admin_id: int, min_reputation: Optional[float] = None,
+                                  bot=None) -> Dict[str, object]:
+    """Схвалення всього вільного контенту від довірених авторів"""
+    if min_reputation is None:
+        try:
+            from config.settings import TRUSTED_AUTHOR_REPUTATION as min_reputation
+        except ImportError:
+            min_reputation = DEFAULT_TRUSTED_REPUTATION
+
+    content_ids = get_moderation_queue().trusted_ids(min_reputation, admin_id)
+    return await bulk_resolve_content(
+        content_ids, admin_id, True, "Автоматичне схвалення: довірений автор", bot=bot
+    )
+
+
+# ===== ЕКСПОРТ =====
+__all__ = [
+    'ModerationItem', 'ModerationQueue', 'author_reputation',
+    'get_moderation_queue', 'item_from_row', 'load_pending_from_db', 'load_item_from_db',
+    'forget_rejected', 'resolve_content',
+    'bulk_set_content_status', 'apply_approval_rewards', 'moderate_in_db', 'build_author_notifications',
+    'bulk_resolve_content', 'approve_trusted_authors'
+]
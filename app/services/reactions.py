@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+👍 РЕАКЦІЇ НА КОНТЕНТ 👍
+
+Лайки/дизлайки без блокувань рядка на кожне натискання:
+✅ Дедуплікація (користувач, контент) за O(1) у пам'яті + унікальний індекс у БД
+✅ Реакції буферизуються та зберігаються пачкою (executemany в ratings)
+✅ Лічильники content.likes/dislikes оновлюються одним згрупованим UPDATE
+✅ Враховуються тільки реально вставлені рядки (ON CONFLICT DO NOTHING RETURNING)
+✅ Пачка, що постійно падає, ділиться навпіл - відкидаються лише зіпсовані рядки
+"""
+
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# ===== КОНСТАНТИ =====
+
+REACTION_LIKE = "like"
+REACTION_DISLIKE = "dislike"
+REACTION_LOVE = "love"
+
+# Яку колонку лічильника збільшує реакція
+REACTION_COUNTERS = {
+    REACTION_LIKE: "likes",
+    REACTION_LOVE: "likes",
+    REACTION_DISLIKE: "dislikes",
+}
+
+FLUSH_SIZE = 200               # Реакцій у буфері до примусового збереження
+FLUSH_INTERVAL = 2.0           # Секунд між фоновими збереженнями
+SEEN_LIMIT = 200000            # Пар (користувач, контент) у пам'яті
+MAX_FLUSH_ATTEMPTS = 3         # Спроб зберегти пачку цілком перед пошуком зіпсованих рядків
+
+Reaction = Tuple[int, int, str, datetime]
+
+# ===== ЗБЕРЕЖЕННЯ В БД =====
+
+def _insert_ratings(session, reactions: List[Reaction]) -> List[Tuple[int, int, str]]:
+    """
+    Вставка реакцій одним executemany
+
+    Returns:
+        Реально вставлені (user_id, content_id, rating_type) - дублікати
+        з попередніх запусків відсікає унікальний індекс
+    """
+    from database.queries import insert_ratings_statement
+
+    statement = insert_ratings_statement(session.get_bind().dialect.name)
+    params = [
+        {"user_id": user_id, "content_id": content_id, "rating_type": reaction,
+         "points_awarded": 0, "created_at": created_at}
+        for user_id, content_id, reaction, created_at in reactions
+    ]
+    return [tuple(row) for row in session.execute(statement, params)]
+
+def _grouped_increment(session, table, increments: Dict[int, Dict[str, int]], columns: List[str]) -> None:
+    """
+    Збільшення лічильників для багатьох рядків
+
+    PostgreSQL: UPDATE t SET c = c + v.c FROM (VALUES ...) v WHERE t.id = v.id
+    SQLite: executemany UPDATE (по одному на рядок, в одній транзакції)
+    """
+    from sqlalchemy import Integer, bindparam, column, update, values
+
+    if not increments:
+        return
+
+    if session.get_bind().dialect.name == "postgresql":
+        deltas = values(
+            column("id", Integer), *[column(name, Integer) for name in columns], name="v"
+        ).data([
+            (row_id, *[counters.get(name, 0) for name in columns])
+            for row_id, counters in increments.items()
+        ])
+        session.execute(
+            update(table)
+            .where(table.c.id == deltas.c.id)
+            .values({name: table.c[name] + deltas.c[name] for name in columns})
+        )
+        return
+
+    statement = (
+        update(table)
+        .where(table.c.id == bindparam("b_id"))
+        .values({name: table.c[name] + bindparam(f"b_{name}") for name in columns})
+    )
+    session.execute(statement, [
+        {"b_id": row_id, **{f"b_{name}": counters.get(name, 0) for name in columns}}
+        for row_id, counters in increments.items()
+    ])
+
+def persist_reactions(reactions: List[Reaction]) -> int:
+    """
+    Збереження пачки реакцій в одній транзакції
+
+    Returns:
+        Кількість нових реакцій
+    """
+    from database.database import get_db_session
+    from database.models import Content, User
+
+    with get_db_session() as session:
+        inserted = _insert_ratings(session, reactions)
+
+        content_counters: Dict[int, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        user_counters: Dict[int, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        for user_id, content_id, reaction in inserted:
+            content_counters[content_id][REACTION_COUNTERS[reaction]] += 1
+            user_counters[user_id]["reactions_given"] += 1
+
+        _grouped_increment(session, Content.__table__, content_counters, ["likes", "dislikes"])
+        _grouped_increment(session, User.__table__, user_counters, ["reactions_given"])
+
+    from services.rollups import record_event
+    for user_id, counters in user_counters.items():
+        record_event("reactions", user_id, counters["reactions_given"])
+    return len(inserted)
+
+# ===== СЕРВІС =====
+
+class ReactionService:
+    """Буфер реакцій з дедуплікацією"""
+
+    def __init__(self, flush_size: int = FLUSH_SIZE, flush_interval: float = FLUSH_INTERVAL,
+                 seen_limit: int = SEEN_LIMIT):
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.seen_limit = seen_limit
+
+        # dict як впорядкована множина: найстаріші пари витісняються першими
+        self._seen: Dict[Tuple[int, int], None] = {}
+        self._buffer: List[Reaction] = []
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._failures = 0
+        self.stats = {"accepted": 0, "duplicates": 0, "stored": 0, "flushes": 0, "dropped": 0}
+
+    def has_reacted(self, user_id: int, content_id: int) -> bool:
+        return (user_id, content_id) in self._seen
+
+    def _remember(self, key: Tuple[int, int]) -> None:
+        self._seen[key] = None
+        if len(self._seen) > self.seen_limit:
+            # Витіснена пара все одно не пройде унікальний індекс при збереженні
+            del self._seen[next(iter(self._seen))]
+
+    async def react(self, user_id: int, content_id: int, reaction: str) -> bool:
+        """
+        Реакція користувача
+
+        Returns:
+            False якщо користувач вже реагував на цей контент
+        """
+        if reaction not in REACTION_COUNTERS:
+            raise ValueError(f"Невідома реакція: {reaction}")
+
+        key = (user_id, content_id)
+        if key in self._seen:
+            self.stats["duplicates"] += 1
+            return False
+
+        self._remember(key)
+        self._buffer.append((user_id, content_id, reaction, datetime.utcnow()))
+        self.stats["accepted"] += 1
+
+        if len(self._buffer) >= self.flush_size and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.create_task(self.flush())
+        return True
+
+    async def flush(self) -> int:
+        """Збереження буфера (синхронна БД - в окремому потоці)"""
+        async with self._lock:
+            if not self._buffer:
+                return 0
+            batch, self._buffer = self._buffer, []
+
+            try:
+                stored = await asyncio.to_thread(persist_reactions, batch)
+            except Exception as e:
+                self._failures += 1
+                if self._failures < MAX_FLUSH_ATTEMPTS:
+                    logger.warning(f"⚠️ Помилка збереження {len(batch)} реакцій: {e}")
+                    # Повернути в буфер для наступної спроби
+                    self._buffer[:0] = batch
+                    return 0
+
+                # Пачка падає стабільно - шукаємо зіпсовані рядки
+                self._failures = 0
+                stored, dropped = await self._persist_isolated(batch)
+                for user_id, content_id, _, _ in dropped:
+                    # Реакція не збережена - користувач може поставити її знову
+                    self._seen.pop((user_id, content_id), None)
+                self.stats["dropped"] += len(dropped)
+                if dropped:
+                    logger.error(f"❌ Відкинуто {len(dropped)} з {len(batch)} реакцій: {e}")
+            else:
+                self._failures = 0
+
+            self.stats["stored"] += stored
+            self.stats["flushes"] += 1
+            if stored < len(batch):
+                logger.debug(f"👍 {len(batch) - stored} реакцій вже були в БД")
+            return stored
+
+    async def _persist_isolated(self, batch: List[Reaction]) -> Tuple[int, List[Reaction]]:
+        """
+        Збереження з поділом навпіл при помилці - до окремих рядків
+
+        Returns:
+            (збережено, відкинуті реакції)
+        """
+        try:
+            return await asyncio.to_thread(persist_reactions, batch), []
+        except Exception as e:
+            if len(batch) == 1:
+                logger.warning(f"⚠️ Реакція {batch[0][:3]} не зберігається: {e}")
+                return 0, batch
+
+        middle = len(batch) // 2
+        first_stored, first_dropped = await self._persist_isolated(batch[:middle])
+        second_stored, second_dropped = await self._persist_isolated(batch[middle:])
+        return first_stored + second_stored, first_dropped + second_dropped
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def start(self) -> None:
+        """Фонове збереження буфера"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flush_loop())
+            logger.info(f"👍 Сервіс реакцій запущено (кожні {self.flush_interval} с)")
+
+    async def stop(self) -> None:
+        """Зупинка з фінальним збереженням"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def get_stats(self) -> Dict[str, int]:
+        return {**self.stats, "buffered": len(self._buffer), "seen": len(self._seen)}
+
+# ===== СПІЛЬНИЙ ЕКЗЕМПЛЯР =====
+
+_reaction_service: Optional[ReactionService] = None
+
+def get_reaction_service() -> ReactionService:
+    """Спільний сервіс реакцій"""
+    global _reaction_service
+    if _reaction_service is None:
+        _reaction_service = ReactionService()
+    return _reaction_service
+
+# ===== ЕКСПОРТ =====
+__all__ = [
+    'ReactionService', 'get_reaction_service', 'persist_reactions',
+    'REACTION_LIKE', 'REACTION_DISLIKE', 'REACTION_LOVE'
+]
@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+📊 ЗВЕДЕНА СТАТИСТИКА (ROLLUPS) 📊
+
+Щоденні агрегати замість сканування історії:
+✅ daily_stats - один рядок на день (активні, подачі, схвалення, реакції, дуелі)
+✅ user_daily_stats - рядок на користувача за день (для топів тижня/місяця)
+✅ Дельти протягом дня накопичуються в пам'яті та додаються upsert'ом
+✅ Нічний перерахунок минулого дня з сирих таблиць (тільки один день по індексах)
+✅ Дайджести та вечірня статистика читають кілька готових рядків
+
+Всі дати - UTC, як і колонки created_at у моделях.
+"""
+
+import logging
+import threading
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from database.replica import read_only, use_primary
+
+logger = logging.getLogger(__name__)
+
+# ===== МЕТРИКИ =====
+
+# Колонки daily_stats, що накопичуються дельтами
+GLOBAL_METRICS = (
+    "new_users", "content_submitted", "content_approved", "content_rejected",
+    "reactions", "duels_completed", "duel_votes",
+)
+
+# Подія -> колонка user_daily_stats
+USER_METRICS = {
+    "content_submitted": "content_submitted",
+    "content_approved": "content_approved",
+    "reactions": "reactions_given",
+    "duel_wins": "duel_wins",
+}
+
+USER_COLUMNS = tuple(sorted(set(USER_METRICS.values())))
+
+def _today() -> date:
+    return datetime.utcnow().date()
+
+def _day_bounds(day: date) -> Tuple[datetime, datetime]:
+    start = datetime.combine(day, datetime.min.time())
+    return start, start + timedelta(days=1)
+
+def _dialect_insert(session):
+    if session.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
+
+# ===== ДЕЛЬТИ ПРОТЯГОМ ДНЯ =====
+
+class RollupCounters:
+    """Лічильники подій в пам'яті до наступного збереження"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._global: Dict[date, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._users: Dict[Tuple[date, int], Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    def record(self, metric: str, user_id: Optional[int] = None, amount: int = 1) -> None:
+        """
+        Облік події
+
+        Args:
+            metric: Назва метрики (GLOBAL_METRICS або USER_METRICS)
+            user_id: Користувач для user_daily_stats
+            amount: Кількість
+        """
+        day = _today()
+        with self._lock:
+            if metric in GLOBAL_METRICS:
+                self._global[day][metric] += amount
+            if user_id is not None and metric in USER_METRICS:
+                self._users[(day, user_id)][USER_METRICS[metric]] += amount
+
+    def drain(self):
+        """Забрати накопичені дельти (лічильники обнуляються)"""
+        with self._lock:
+            global_deltas, self._global = self._global, defaultdict(lambda: defaultdict(int))
+            user_deltas, self._users = self._users, defaultdict(lambda: defaultdict(int))
+        return global_deltas, user_deltas
+
+    def restore(self, global_deltas, user_deltas) -> None:
+        """Повернути дельти після невдалого збереження"""
+        with self._lock:
+            for day, counters in global_deltas.items():
+                for metric, amount in counters.items():
+                    self._global[day][metric] += amount
+            for key, counters in user_deltas.items():
+                for column, amount in counters.items():
+                    self._users[key][column] += amount
+
+_counters = RollupCounters()
+
+def record_event(metric: str, user_id: Optional[int] = None, amount: int = 1) -> None:
+    """Облік події в зведеній статистиці (дешево, без БД)"""
+    _counters.record(metric, user_id, amount)
+
+def _active_users(session, day: date) -> int:
+    """Активні за день користувачі (idx_user_activity)"""
+    from sqlalchemy import func, select
+    from database.models import User
+
+    start, end = _day_bounds(day)
+    return session.execute(
+        select(func.count()).select_from(User.__table__)
+        .where(User.last_activity >= start, User.last_activity < end)
+    ).scalar() or 0
+
+def _greatest(session, first, second):
+    """GREATEST у PostgreSQL, MAX з двома аргументами в SQLite"""
+    from sqlalchemy import func
+    if session.get_bind().dialect.name == "postgresql":
+        return func.greatest(first, second)
+    return func.max(first, second)
+
+@use_primary()
+def flush_deltas() -> int:
+    """
+    Додавання накопичених дельт до rollup-таблиць
+
+    INSERT ... ON CONFLICT (pk) DO UPDATE SET col = col + EXCLUDED.col
+
+    Returns:
+        Кількість збережених рядків
+    """
+    from database.database import get_db_session
+    from database.models import DailyStats, UserDailyStats
+
+    global_deltas, user_deltas = _counters.drain()
+    today = _today()
+    daily = DailyStats.__table__
+    users = UserDailyStats.__table__
+
+    try:
+        with get_db_session() as session:
+            insert = _dialect_insert(session)
+            days = set(global_deltas) | {today}
+
+            rows = []
+            for day in days:
+                counters = global_deltas.get(day, {})
+                row = {"day": day, "updated_at": datetime.utcnow(), "active_users": 0}
+                row.update({metric: counters.get(metric, 0) for metric in GLOBAL_METRICS})
+                if day == today:
+                    row["active_users"] = _active_users(session, day)
+                rows.append(row)
+
+            statement = insert(daily)
+            session.execute(
+                statement.on_conflict_do_update(
+                    index_elements=["day"],
+                    set_={
+                        **{metric: daily.c[metric] + statement.excluded[metric] for metric in GLOBAL_METRICS},
+                        # Активні - абсолютне значення, не дельта
+                        "active_users": _greatest(session, daily.c.active_users, statement.excluded.active_users),
+                        "updated_at": statement.excluded.updated_at,
+                    }
+                ),
+                rows
+            )
+
+            if user_deltas:
+                statement = insert(users)
+                session.execute(
+                    statement.on_conflict_do_update(
+                        index_elements=["day", "user_id"],
+                        set_={column: users.c[column] + statement.excluded[column] for column in USER_COLUMNS}
+                    ),
+                    [
+                        {"day": day, "user_id": user_id,
+                         **{column: counters.get(column, 0) for column in USER_COLUMNS}}
+                        for (day, user_id), counters in user_deltas.items()
+                    ]
+                )
+    except Exception:
+        _counters.restore(global_deltas, user_deltas)
+        raise
+
+    return len(rows) + len(user_deltas)
+
+# ===== НІЧНИЙ ПЕРЕРАХУНОК =====
+
+def rebuild_day(day: date) -> Dict[str, int]:
+    """
+    Точний перерахунок агрегатів дня з сирих таблиць
+
+    Кожен запит обмежений одним днем по індексованій колонці часу,
+    тож вартість не росте з історією. Результат замінює дельти дня.
+
+    Returns:
+        Рядок daily_stats
+    """
+    from sqlalchemy import delete, func, select
+    from database.database import get_db_session
+    from database.models import Content, DailyStats, Duel, DuelVote, Rating, User, UserDailyStats
+
+    start, end = _day_bounds(day)
+    daily = DailyStats.__table__
+    per_user: Dict[int, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    with get_db_session() as session:
+        stats = {metric: 0 for metric in GLOBAL_METRICS}
+
+        stats["new_users"] = session.execute(
+            select(func.count()).select_from(User.__table__)
+            .where(User.created_at >= start, User.created_at < end)
+        ).scalar() or 0
+
+        for author_id, count in session.execute(
+            select(Content.author_id, func.count())
+            .where(Content.created_at >= start, Content.created_at < end)
+            .group_by(Content.author_id)
+        ):
+            stats["content_submitted"] += count
+            per_user[author_id]["content_submitted"] = count
+
+        for author_id, status, count in session.execute(
+            select(Content.author_id, Content.status, func.count())
+            .where(Content.moderation_date >= start, Content.moderation_date < end,
+                   Content.status.in_(("approved", "rejected")))
+            .group_by(Content.author_id, Content.status)
+        ):
+            stats[f"content_{status}"] += count
+            if status == "approved":
+                per_user[author_id]["content_approved"] = count
+
+        for user_id, count in session.execute(
+            select(Rating.user_id, func.count())
+            .where(Rating.created_at >= start, Rating.created_at < end, Rating.content_id.isnot(None))
+            .group_by(Rating.user_id)
+        ):
+            stats["reactions"] += count
+            per_user[user_id]["reactions_given"] = count
+
+        # Дуелі
+        for winner_id, count in session.execute(
+            select(Content.author_id, func.count())
+            .select_from(Duel)
+            .join(Content, Content.id == Duel.winner_content_id)
+            .where(Duel.completed_at >= start, Duel.completed_at < end)
+            .group_by(Content.author_id)
+        ):
+            stats["duels_completed"] += count
+            per_user[winner_id]["duel_wins"] = count
+        stats["duel_votes"] = session.execute(
+            select(func.count()).select_from(DuelVote)
+            .where(DuelVote.created_at >= start, DuelVote.created_at < end)
+        ).scalar() or 0
+
+        # last_activity зберігає тільки останній візит - беремо більше з двох оцінок
+        existing = session.execute(select(daily.c.active_users).where(daily.c.day == day)).scalar()
+        stats["active_users"] = max(existing or 0, _active_users(session, day))
+
+        insert = _dialect_insert(session)
+        statement = insert(daily).values(day=day, updated_at=datetime.utcnow(), **stats)
+        session.execute(statement.on_conflict_do_update(
+            index_elements=["day"],
+            set_={column: statement.excluded[column] for column in (*stats, "updated_at")}
+        ))
+
+        user_table = UserDailyStats.__table__
+        session.execute(delete(user_table).where(user_table.c.day == day))
+        if per_user:
+            session.execute(user_table.insert(), [
+                {"day": day, "user_id": user_id,
+                 **{column: counters.get(column, 0) for column in USER_COLUMNS}}
+                for user_id, counters in per_user.items()
+            ])
+
+    logger.info(f"📊 Rollup за {day}: {stats}")
+    return stats
+
+def run_nightly_rollup(day: Optional[date] = None) -> Dict[str, int]:
+    """Нічна задача: зберегти дельти та перерахувати минулий день"""
+    flush_deltas()
+    return rebuild_day(day or _today() - timedelta(days=1))
+
+# ===== ЧИТАННЯ =====
+
+@read_only
+def get_day_stats(day: Optional[date] = None) -> Dict[str, int]:
+    """Агрегати одного дня (сьогодні - з урахуванням останніх дельт)"""
+    from sqlalchemy import select
+    from database.database import get_db_session
+    from database.models import DailyStats
+
+    day = day or _today()
+    if day == _today():
+        flush_deltas()
+
+    daily = DailyStats.__table__
+    with get_db_session() as session:
+        row = session.execute(select(daily).where(daily.c.day == day)).mappings().first()
+
+    result = {metric: 0 for metric in ("active_users",) + GLOBAL_METRICS}
+    if row:
+        result.update({key: row[key] or 0 for key in result})
+    return result
+
+@read_only
+def get_period_stats(days: int) -> Dict[str, Any]:
+    """
+    Сума агрегатів за останні N днів (N рядків daily_stats)
+
+    Returns:
+        Суми метрик, середня кількість активних за день, кількість днів з даними
+    """
+    from sqlalchemy import func, select
+    from database.database import get_db_session
+    from database.models import DailyStats
+
+    flush_deltas()
+    since = _today() - timedelta(days=days - 1)
+    daily = DailyStats.__table__
+
+    with get_db_session() as session:
+        row = session.execute(
+            select(
+                func.count(),
+                func.avg(daily.c.active_users),
+                *[func.coalesce(func.sum(daily.c[metric]), 0) for metric in GLOBAL_METRICS]
+            ).where(daily.c.day >= since)
+        ).first()
+
+    result = dict(zip(GLOBAL_METRICS, row[2:]))
+    result["days"] = row[0]
+    result["avg_active_users"] = int(round(row[1] or 0))
+    return result
+
+@read_only
+def get_top_users(days: int, column: str = "duel_wins", limit: int = 3) -> List[Dict[str, Any]]:
+    """Топ користувачів за метрикою user_daily_stats за N днів"""
+    from sqlalchemy import func, select
+    from database.database import get_db_session
+    from database.models import User, UserDailyStats
+
+    if column not in USER_COLUMNS:
+        raise ValueError(f"Невідома метрика: {column}")
+
+    since = _today() - timedelta(days=days - 1)
+    stats = UserDailyStats.__table__
+    total = func.sum(stats.c[column]).label("total")
+
+    with get_db_session() as session:
+        top = (
+            select(stats.c.user_id, total)
+            .where(stats.c.day >= since)
+            .group_by(stats.c.user_id)
+            .having(total > 0)
+            .order_by(total.desc())
+            .limit(limit)
+            .subquery()
+        )
+        rows = session.execute(
+            select(top.c.user_id, top.c.total, User.username, User.first_name)
+            .outerjoin(User, User.id == top.c.user_id)
+            .order_by(top.c.total.desc())
+        ).all()
+
+    return [
+        {"user_id": user_id, "total": int(total_value),
+         "name": f"@{username}" if username else (first_name or f"ID {user_id}")}
+        for user_id, total_value, username, first_name in rows
+    ]
+
+# ===== ЕКСПОРТ =====
+__all__ = [
+    'record_event', 'flush_deltas', 'rebuild_day', 'run_nightly_rollup',
+    'get_day_stats', 'get_period_stats', 'get_top_users',
+    'GLOBAL_METRICS', 'USER_METRICS'
+]
@@ -15,22 +15,57 @@ from apscheduler.triggers.cron import CronTrigger
 from config.settings import EMOJI, settings, TIME_GREETINGS
 from database.database import get_db_session, get_random_joke, get_random_meme, update_user_points
 from database.models import User, Content, ContentStatus, Duel, DuelStatus
+from utils.callback_data import CONTENT_REACTION
+from utils.job_locks import get_scheduler_leader
+from utils.keyboards import cached_keyboard
 
 logger = logging.getLogger(__name__)
 
+@cached_keyboard
+def create_daily_keyboard(content_id: int):
+    """Клавіатура щоденної розсилки (спільна для всіх підписників)"""
+    from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [
+            InlineKeyboardButton(
+                text=f"{EMOJI['like']} Подобається", 
+                callback_data=CONTENT_REACTION.pack("like", content_id)
+            ),
+            InlineKeyboardButton(
+                text=f"{EMOJI['laugh']} Ще мем", 
+                callback_data="get_meme"
+            )
+        ],
+        [
+            InlineKeyboardButton(
+                text=f"{EMOJI['fire']} Мій профіль", 
+                callback_data="show_profile"
+            ),
+            InlineKeyboardButton(
+                text=f"{EMOJI['vs']} Дуель", 
+                callback_data="start_duel"
+            )
+        ]
+    ])
+
 class SchedulerService:
     """Сервіс планувальника для автоматичних задач"""
     
     def __init__(self, bot):
         self.bot = bot
         self.scheduler = AsyncIOScheduler(timezone=settings.TIMEZONE)
+        self.leader = get_scheduler_leader()
         
     async def start(self):
         """Запуск планувальника з усіма задачами"""
         try:
+            # Усі задачі спільні для реплік - виконує лідер
+            await self.leader.start()
+            leader_only = self.leader.leader_only
+            
             # Щоденна розсилка підписникам
             self.scheduler.add_job(
-                self.daily_broadcast,
+                leader_only(self.daily_broadcast),
                 CronTrigger(
                     hour=settings.DAILY_BROADCAST_HOUR,
                     minute=settings.DAILY_BROADCAST_MINUTE
@@ -42,7 +77,7 @@ class SchedulerService:
             
             # Завершення просрочених дуелей (кожні 5 хвилин)
             self.scheduler.add_job(
-                self.finish_expired_duels,
+                leader_only(self.finish_expired_duels),
                 CronTrigger(minute='*/5'),
                 id='finish_duels',
                 name='Завершення просрочених дуелей',
@@ -51,7 +86,7 @@ class SchedulerService:
             
             # Щоденне нагадування неактивним користувачам (о 19:00)
             self.scheduler.add_job(
-                self.inactive_users_reminder,
+                leader_only(self.inactive_users_reminder),
                 CronTrigger(hour=19, minute=0),
                 id='inactive_reminder',
                 name='Нагадування неактивним користувачам',
@@ -60,7 +95,7 @@ class SchedulerService:
             
             # Тижневі нагороди топ-користувачам (неділя о 20:00)
             self.scheduler.add_job(
-                self.weekly_top_rewards,
+                leader_only(self.weekly_top_rewards),
                 CronTrigger(day_of_week=6, hour=20, minute=0),  # Неділя
                 id='weekly_rewards',
                 name='Тижневі нагороди',
@@ -79,6 +114,7 @@ class SchedulerService:
         if self.scheduler.running:
             self.scheduler.shutdown()
             logger.info("⏹️ Планувальник зупинено")
+        await self.leader.stop()
     
     async def daily_broadcast(self):
         """Щоденна розсилка контенту підписникам"""
@@ -115,6 +151,9 @@ class SchedulerService:
             # Статистика для мотивації
             stats_text = await self.get_motivation_stats()
             
+            # Клавіатура для швидких дій - одна на всю розсилку
+            keyboard = create_daily_keyboard(daily_joke.id) if daily_joke else None
+            
             success_count = 0
             for subscriber in subscribers:
                 try:
@@ -132,31 +171,6 @@ class SchedulerService:
                             f"{EMOJI['like']} Оціни та отримай +{settings.POINTS_FOR_REACTION} балів!"
                         )
                         
-                        # Клавіатура для швидких дій
-                        from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
-                        keyboard = InlineKeyboardMarkup(inline_keyboard=[
-                            [
-                                InlineKeyboardButton(
-                                    text=f"{EMOJI['like']} Подобається", 
-                                    callback_data=f"like_content:{daily_joke.id}"
-                                ),
-                                InlineKeyboardButton(
-                                    text=f"{EMOJI['laugh']} Ще мем", 
-                                    callback_data="get_meme"
-                                )
-                            ],
-                            [
-                                InlineKeyboardButton(
-                                    text=f"{EMOJI['fire']} Мій профіль", 
-                                    callback_data="show_profile"
-                                ),
-                                InlineKeyboardButton(
-                                    text=f"{EMOJI['vs']} Дуель", 
-                                    callback_data="start_duel"
-                                )
-                            ]
-                        ])
-                        
                         await self.bot.send_message(
                             subscriber.id,
                             joke_message,
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🔥 ТРЕНДОВИЙ РЕЙТИНГ КОНТЕНТУ 🔥
+
+Пакетний перерахунок rating_score для всього схваленого контенту:
+✅ Один векторний прохід по масивах likes/dislikes/views/shares/віку (numpy)
+✅ Та сама формула, що й utils.helpers.get_trending_score
+✅ У БД пишуться тільки змінені оцінки, батчами
+✅ "Трендове" та "краще за день" читаються через idx_content_rating
+"""
+
+import time
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+from database.replica import read_only
+
+logger = logging.getLogger(__name__)
+
+# numpy опціональний - без нього оцінки рахуються циклом
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+SCORE_BATCH_SIZE = 5000
+SCORE_EPSILON = 1e-6           # Менші зміни не записуються
+
+# ===== ФОРМУЛИ =====
+
+def trending_scores(likes: Sequence[int], views: Sequence[int], shares: Sequence[int],
+                    age_hours: Sequence[float]):
+    """
+    Векторна версія get_trending_score
+
+    activity = (likes * 2 + shares * 3) / max(views, 1)
+    freshness = max(0.1, 1 - age_hours / 24)
+
+    Returns:
+        Масив оцінок (numpy array або список)
+    """
+    if NUMPY_AVAILABLE:
+        likes = np.asarray(likes, dtype=np.float64)
+        views = np.asarray(views, dtype=np.float64)
+        shares = np.asarray(shares, dtype=np.float64)
+        age_hours = np.asarray(age_hours, dtype=np.float64)
+
+        activity = (likes * 2 + shares * 3) / np.maximum(views, 1)
+        freshness = np.maximum(0.1, 1.0 - age_hours / 24)
+        return activity * freshness * 100
+
+    return [
+        (l * 2 + s * 3) / max(v, 1) * max(0.1, 1.0 - h / 24) * 100
+        for l, v, s, h in zip(likes, views, shares, age_hours)
+    ]
+
+def _changed(ids: List[int], old_scores: List[float], new_scores) -> List[Dict[str, Any]]:
+    """Параметри UPDATE тільки для оцінок, що змінились"""
+    if NUMPY_AVAILABLE:
+        old = np.asarray(old_scores, dtype=np.float64)
+        mask = np.abs(new_scores - old) > SCORE_EPSILON
+        positions = np.flatnonzero(mask)
+        return [{"b_id": ids[i], "b_score": float(new_scores[i])} for i in positions]
+
+    return [
+        {"b_id": content_id, "b_score": float(new)}
+        for content_id, old, new in zip(ids, old_scores, new_scores)
+        if abs(new - old) > SCORE_EPSILON
+    ]
+
+# ===== ПЕРЕРАХУНОК =====
+
+def recalculate_trending_scores(batch_size: int = SCORE_BATCH_SIZE,
+                                now: Optional[datetime] = None) -> Dict[str, Any]:
+    """
+    Перерахунок rating_score для всього схваленого контенту
+
+    Колонки читаються потоково в масиви, оцінки рахуються одним векторним
+    проходом, змінені записуються executemany батчами.
+
+    Returns:
+        Статистика: оброблено, оновлено, час
+    """
+    from sqlalchemy import bindparam, select, update
+    from database.database import get_db_session
+    from database.models import Content
+
+    started = time.perf_counter()
+    now = now or datetime.utcnow()
+    content = Content.__table__
+
+    ids: List[int] = []
+    likes: List[int] = []
+    views: List[int] = []
+    shares: List[int] = []
+    age_hours: List[float] = []
+    old_scores: List[float] = []
+
+    query = (
+        select(content.c.id, content.c.likes, content.c.views, content.c.shares,
+               content.c.created_at, content.c.rating_score)
+        .where(content.c.status == "approved")
+        .execution_options(yield_per=batch_size, stream_results=True)
+    )
+
+    statement = (
+        update(content)
+        .where(content.c.id == bindparam("b_id"))
+        .values(rating_score=bindparam("b_score"))
+    )
+
+    with get_db_session() as session:
+        for row in session.execute(query):
+            ids.append(row.id)
+            likes.append(row.likes or 0)
+            views.append(row.views or 0)
+            shares.append(row.shares or 0)
+            created_at = row.created_at or now
+            age_hours.append((now - created_at).total_seconds() / 3600)
+            old_scores.append(row.rating_score or 0.0)
+
+        scores = trending_scores(likes, views, shares, age_hours)
+        changes = _changed(ids, old_scores, scores)
+
+        for start in range(0, len(changes), batch_size):
+            session.execute(statement, changes[start:start + batch_size])
+
+    elapsed = time.perf_counter() - started
+    logger.info(f"🔥 Трендовий рейтинг: {len(ids)} записів, {len(changes)} оновлено за {elapsed:.2f} с")
+    return {"processed": len(ids), "updated": len(changes), "seconds": round(elapsed, 3)}
+
+# ===== ЧИТАННЯ =====
+
+def _content_dict(content) -> Dict[str, Any]:
+    return {
+        'id': content.id,
+        'text': content.text,
+        'type': content.content_type,
+        'author_id': content.author_id,
+        'likes': content.likes or 0,
+        'rating_score': content.rating_score or 0.0,
+        'created_at': content.created_at
+    }
+
+@read_only
+def get_trending_content(period: timedelta = timedelta(days=1), limit: int = 10) -> List[Dict[str, Any]]:
+    """
+    Топ контенту за збереженим rating_score
+
+    ORDER BY rating_score DESC обслуговується idx_content_rating
+    без GROUP BY по рейтингах.
+    """
+    from database.database import get_db_session
+    from database.models import Content
+
+    since = datetime.utcnow() - period
+    with get_db_session() as session:
+        rows = (
+            session.query(Content)
+            .filter(Content.status == "approved", Content.created_at >= since)
+            .order_by(Content.rating_score.desc())
+            .limit(limit)
+            .all()
+        )
+        return [_content_dict(content) for content in rows]
+
+# ===== ЕКСПОРТ =====
+__all__ = [
+    'trending_scores', 'recalculate_trending_scores', 'get_trending_content', 'NUMPY_AVAILABLE'
+]
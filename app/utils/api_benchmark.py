@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+📊 БЕНЧМАРК HTTP СЕСІЇ БОТА (ОФЛАЙН) 📊
+
+Розсилка через локальний фейковий Bot API без мережі та токена:
+✅ Фейковий сервер в окремому процесі - CPU клієнта міряється окремо
+✅ Варіанти: AiohttpSession, + orjson, BotSession (orjson + JSON клавіатур з кешу)
+✅ Раунди по черзі для всіх варіантів, у звіті медіана та найкращий раунд -
+   один прогін на завантаженій машині розкидає результат на десятки відсотків
+✅ Окремо - CPU лише на підготовку запиту та розбір відповіді (без мережі),
+   саме цю частину змінює BotSession
+
+Використання:
+    python -m utils.api_benchmark
+    python -m utils.api_benchmark --messages 3000 --rounds 7
+"""
+
+import sys
+import time
+import statistics
+import socket
+import asyncio
+import argparse
+import multiprocessing
+from typing import Any, Callable, Dict, List, Tuple
+
+FAKE_TOKEN = "123456:BENCHMARK"
+BENCH_TEXT = "🧠 <b>АНЕКДОТ ДНЯ:</b>\n\n" + "Жарт для бенчмарку. " * 20
+FAKE_RESPONSE = (b'{"ok":true,"result":{"message_id":1,"date":0,'
+                 b'"chat":{"id":1,"type":"private"},"text":"ok"}}')
+
+# ===== ФЕЙКОВИЙ BOT API =====
+
+def _serve(port: int) -> None:
+    """Відповідь на будь-який метод як на sendMessage"""
+    from aiohttp import web
+
+    async def handle(request: "web.Request") -> "web.Response":
+        await request.read()
+        return web.Response(body=FAKE_RESPONSE, content_type="application/json")
+
+    app = web.Application()
+    app.router.add_route("POST", "/{tail:.*}", handle)
+    web.run_app(app, host="127.0.0.1", port=port, print=None, access_log=None)
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+async def _wait_for_port(port: int, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.05)
+    raise RuntimeError(f"Фейковий Bot API не запустився на порту {port}")
+
+# ===== ВИМІР =====
+
+def _keyboard(content_id: int):
+    from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [InlineKeyboardButton(text="👍 Подобається", callback_data=f"r:like:{content_id}"),
+         InlineKeyboardButton(text="😂 Ще мем", callback_data="get_meme")],
+        [InlineKeyboardButton(text="🔥 Мій профіль", callback_data="show_profile"),
+         InlineKeyboardButton(text="⚔️ Дуель", callback_data="start_duel")],
+    ])
+
+async def _run(session, messages: int, concurrency: int, keyboard: Callable[[], Any]) -> Dict[str, float]:
+    from aiogram import Bot
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with Bot(token=FAKE_TOKEN, session=session) as bot:
+        async def send(chat_id: int) -> None:
+            async with semaphore:
+                await bot.send_message(chat_id, BENCH_TEXT, reply_markup=keyboard())
+
+        await send(1)  # Прогрів: з'єднання, імпорти
+        cpu_started, wall_started = time.process_time(), time.perf_counter()
+        await asyncio.gather(*(send(chat_id) for chat_id in range(messages)))
+        cpu, wall = time.process_time() - cpu_started, time.perf_counter() - wall_started
+
+    return {"cpu": cpu, "wall": wall, "per_cpu_second": messages / cpu if cpu else 0.0,
+            "per_second": messages / wall if wall else 0.0}
+
+def _variants(api=None) -> Dict[str, Tuple[Callable[[], Any], Callable[[], Any]]]:
+    """Назва -> (фабрика сесії, клавіатура для кожного повідомлення)"""
+    from aiogram.client.session.aiohttp import AiohttpSession
+
+    from utils.bot_session import BotSession, get_json_codec
+    from utils.keyboards import keyboard_cache
+
+    # Обробник будує клавіатуру на кожне повідомлення; з кешем - та сама модель, JSON якої бере BotSession
+    built = lambda: _keyboard(1)
+    cached = lambda: keyboard_cache.get(("api_benchmark", 1), built)
+    options = {"api": api} if api is not None else {}
+    return {
+        "AiohttpSession": (lambda: AiohttpSession(**options), built),
+        "+ orjson": (lambda: AiohttpSession(**options, **get_json_codec()), built),
+        "BotSession": (lambda: BotSession(**options), cached),
+    }
+
+def _summary(runs: List[float]) -> Dict[str, Any]:
+    return {"median": statistics.median(runs), "best": max(runs), "runs": runs}
+
+def measure_serialization(messages: int = 5000, rounds: int = 5) -> Dict[str, Dict[str, Any]]:
+    """Підготовка форми запиту та розбір відповіді, відправок на CPU-секунду"""
+    from aiogram import Bot
+    from aiogram.methods import SendMessage
+
+    content = FAKE_RESPONSE.decode("utf-8")
+    results: Dict[str, List[float]] = {}
+    for _ in range(rounds):
+        for name, (make_session, keyboard) in _variants().items():
+            session = make_session()
+            bot = Bot(token=FAKE_TOKEN, session=session)
+            started = time.process_time()
+            for chat_id in range(messages):
+                method = SendMessage(chat_id=chat_id, text=BENCH_TEXT, reply_markup=keyboard())
+                session.build_form_data(bot, method)()
+                session.check_response(bot=bot, method=method, status_code=200, content=content)
+            results.setdefault(name, []).append(messages / (time.process_time() - started))
+    return {name: _summary(runs) for name, runs in results.items()}
+
+async def run_benchmark(messages: int = 2000, concurrency: int = 30, rounds: int = 5) -> Dict[str, Dict[str, Any]]:
+    """Фейковий API та всі варіанти по черзі в кожному раунді; відправок на CPU-секунду"""
+    from aiogram.client.telegram import TelegramAPIServer
+
+    port = _free_port()
+    server = multiprocessing.Process(target=_serve, args=(port,), daemon=True)
+    server.start()
+    try:
+        await _wait_for_port(port)
+        variants = _variants(TelegramAPIServer.from_base(f"http://127.0.0.1:{port}"))
+
+        results: Dict[str, List[float]] = {}
+        for _ in range(rounds):
+            for name, (make_session, keyboard) in variants.items():
+                result = await _run(make_session(), messages, concurrency, keyboard)
+                results.setdefault(name, []).append(result["per_cpu_second"])
+        return {name: _summary(runs) for name, runs in results.items()}
+    finally:
+        server.terminate()
+        server.join()
+
+def format_report(title: str, results: Dict[str, Dict[str, Any]]) -> str:
+    lines = [f"📊 {title}, відправок на CPU-секунду", "",
+             f"  {'варіант':<16}{'медіана':>10}{'найкращий':>11}{'виграш':>9}"]
+    base = next(iter(results.values()))
+    for name, result in results.items():
+        lines.append(
+            f"  {name:<16}{result['median']:>10.0f}{result['best']:>11.0f}"
+            f"{result['median'] / base['median']:>8.2f}x"
+        )
+    return "\n".join(lines)
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Офлайн бенчмарк HTTP сесії бота")
+    parser.add_argument("--messages", type=int, default=2000, help="Повідомлень на сесію")
+    parser.add_argument("--concurrency", type=int, default=30, help="Одночасних запитів")
+    parser.add_argument("--rounds", type=int, default=5, help="Раундів на варіант")
+    args = parser.parse_args()
+
+    try:
+        serialization = measure_serialization(args.messages, args.rounds)
+        end_to_end = asyncio.run(run_benchmark(args.messages, args.concurrency, args.rounds))
+    except ImportError as e:
+        print(f"❌ Потрібні aiogram та aiohttp: {e}")
+        return 1
+    print(format_report(f"{args.messages} sendMessage: підготовка запиту та розбір відповіді", serialization))
+    print()
+    print(format_report(f"{args.messages} sendMessage через фейковий Bot API", end_to_end))
+    return 0
+
+# ===== ЕКСПОРТ =====
+__all__ = ['run_benchmark', 'measure_serialization', 'format_report']
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🌐 HTTP СЕСІЯ БОТА 🌐
+
+AiohttpSession, налаштована під розсилки:
+✅ orjson для серіалізації запитів і розбору відповідей Bot API (stdlib json - fallback)
+✅ Клавіатура з utils.keyboards серіалізується один раз, а не на кожен запит
+✅ TCPConnector - як в aiogram: ліміт, keep-alive та кеш DNS за замовчуванням
+   не дали виграшу в бенчмарку, тому не змінюються
+
+Виміряти: python -m utils.api_benchmark
+"""
+
+import json
+import logging
+from typing import Any, Callable, Dict
+
+from aiohttp import FormData
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.types import InlineKeyboardMarkup
+
+from utils.keyboards import keyboard_cache
+
+logger = logging.getLogger(__name__)
+
+# orjson опціональний - без нього працює stdlib json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+# ===== JSON =====
+
+def orjson_dumps(value: Any) -> str:
+    return orjson.dumps(value).decode("utf-8")
+
+def get_json_codec() -> Dict[str, Callable]:
+    """json_dumps/json_loads для BaseSession"""
+    if ORJSON_AVAILABLE:
+        return {"json_dumps": orjson_dumps, "json_loads": orjson.loads}
+    return {"json_dumps": json.dumps, "json_loads": json.loads}
+
+# ===== СЕСІЯ =====
+
+class BotSession(AiohttpSession):
+    """Сесія бота: orjson та кешований JSON клавіатур; з'єднання - як в AiohttpSession"""
+
+    def __init__(self, **kwargs: Any):
+        for key, value in get_json_codec().items():
+            kwargs.setdefault(key, value)
+        super().__init__(**kwargs)
+
+    def build_form_data(self, bot: Any, method: Any) -> FormData:
+        """
+        Форма запиту з готовим JSON клавіатури з кешу
+
+        aiogram робить model_dump усього методу ще до prepare_value, тож
+        reply_markup доходить до серіалізації звичайним dict. Клавіатура з кешу
+        виключається з model_dump і додається вже серіалізованим JSON.
+        """
+        markup = getattr(method, "reply_markup", None)
+        if not isinstance(markup, InlineKeyboardMarkup):
+            return super().build_form_data(bot, method)
+
+        files: Dict[str, Any] = {}
+        data = keyboard_cache.serialized(
+            markup, lambda value: self.prepare_value(value.model_dump(warnings=False), bot=bot, files=files)
+        )
+        if data is None:
+            return super().build_form_data(bot, method)
+
+        form = FormData(quote_fields=False)
+        for key, value in method.model_dump(warnings=False, exclude={"reply_markup"}).items():
+            value = self.prepare_value(value, bot=bot, files=files)
+            if value:
+                form.add_field(key, value)
+        form.add_field("reply_markup", data)
+        for key, value in files.items():
+            form.add_field(key, value.read(bot), filename=value.filename or key)
+        return form
+
+def create_bot_session(**kwargs: Any) -> BotSession:
+    session = BotSession(**kwargs)
+    logger.info(
+        f"🌐 HTTP сесія: {'orjson' if ORJSON_AVAILABLE else 'json'}, "
+        f"з'єднань {session._connector_init['limit']}"
+    )
+    return session
+
+# ===== ЕКСПОРТ =====
+__all__ = ['BotSession', 'create_bot_session', 'get_json_codec', 'orjson_dumps', 'ORJSON_AVAILABLE']
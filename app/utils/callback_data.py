@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🔘 CALLBACK ДАНІ ТА МАРШРУТИЗАЦІЯ 🔘
+
+Єдиний формат callback_data і диспетчеризація без ланцюжків if/elif:
+✅ Типізовані формати: префікс + поля (int у base36), розбір у NamedTuple
+✅ Перевірка ліміту Telegram (64 байти) при пакуванні, навіть для int64 ID
+✅ Маршрути у словниках: точні значення та префікси - один пошук на callback
+✅ Розбір виконується один раз у фільтрі й передається хендлеру
+"""
+
+import inspect
+import logging
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MAX_CALLBACK_BYTES = 64        # Ліміт Telegram на callback_data
+SEPARATOR = ":"
+
+# Аргументи aiogram, які хендлер може отримати за назвою параметра
+INJECTABLE = ("state", "bot", "raw_state")
+
+_DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+# ===== ЧИСЛА =====
+
+def encode_int(value: int) -> str:
+    """int -> base36 (int64 займає не більше 13 символів)"""
+    if value < 0:
+        return "-" + encode_int(-value)
+    if value < 36:
+        return _DIGITS[value]
+    digits = []
+    while value:
+        value, remainder = divmod(value, 36)
+        digits.append(_DIGITS[remainder])
+    return "".join(reversed(digits))
+
+def decode_int(text: str) -> int:
+    return int(text, 36)
+
+# ===== ФОРМАТИ =====
+
+class CallbackCodec:
+    """
+    Формат callback_data: prefix:field1:field2
+
+    Останнє рядкове поле може містити роздільник - розбір обмежений
+    кількістю полів.
+    """
+
+    __slots__ = ("prefix", "struct", "_types")
+
+    def __init__(self, prefix: str, name: str, **fields: type):
+        if not prefix or SEPARATOR in prefix:
+            raise ValueError(f"Некоректний префікс callback: {prefix!r}")
+        for field, kind in fields.items():
+            if kind not in (int, str):
+                raise TypeError(f"Поле {field}: підтримуються тільки int та str")
+
+        self.prefix = prefix
+        self.struct = NamedTuple(name, list(fields.items()))
+        self._types: Tuple[type, ...] = tuple(fields.values())
+
+    @property
+    def token(self) -> str:
+        """Початок callback_data для фільтрів за префіксом"""
+        return self.prefix + SEPARATOR
+
+    def pack(self, *args: Any, **kwargs: Any) -> str:
+        values = self.struct(*args, **kwargs)
+        parts = [self.prefix]
+        for value, kind in zip(values, self._types):
+            if kind is int:
+                parts.append(encode_int(int(value)))
+            else:
+                parts.append(str(value))
+
+        data = SEPARATOR.join(parts)
+        if len(data.encode("utf-8")) > MAX_CALLBACK_BYTES:
+            raise ValueError(f"callback_data довший за {MAX_CALLBACK_BYTES} байти: {data!r}")
+        return data
+
+    def unpack(self, payload: str):
+        """Розбір частини після префікса"""
+        count = len(self._types)
+        values = payload.split(SEPARATOR, count - 1) if count else []
+        if len(values) != count or (count == 0 and payload):
+            raise ValueError(f"Некоректні дані {self.prefix}: {payload!r}")
+        return self.struct(*[
+            decode_int(value) if kind is int else value
+            for value, kind in zip(values, self._types)
+        ])
+
+# ===== МАРШРУТИЗАЦІЯ =====
+
+Handler = Callable[..., Awaitable[Any]]
+
+class CallbackRoute:
+    """Знайдений маршрут: хендлер + розібрані дані"""
+
+    __slots__ = ("handler", "payload", "inject")
+
+    def __init__(self, handler: Handler, payload: Any, inject: Tuple[str, ...]):
+        self.handler = handler
+        self.payload = payload
+        self.inject = inject
+
+    async def __call__(self, callback, **context: Any) -> Any:
+        extra = {name: context[name] for name in self.inject if name in context}
+        if self.payload is None:
+            return await self.handler(callback, **extra)
+        return await self.handler(callback, self.payload, **extra)
+
+def _injectable(handler: Handler) -> Tuple[str, ...]:
+    parameters = inspect.signature(handler).parameters
+    return tuple(name for name in INJECTABLE if name in parameters)
+
+class CallbackRouter:
+    """
+    Маршрутизатор callback'ів модуля
+
+    Точні значення - словник data -> хендлер; форматні - словник префікс -> (розбір, хендлер).
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._exact: Dict[str, Tuple[Handler, Tuple[str, ...]]] = {}
+        self._prefixed: Dict[str, Tuple[Callable[[str], Any], Handler, Tuple[str, ...]]] = {}
+
+    def exact(self, *values: str) -> Callable[[Handler], Handler]:
+        """Декоратор: хендлер для точних значень callback_data"""
+        def decorator(handler: Handler) -> Handler:
+            inject = _injectable(handler)
+            for value in values:
+                self._exact[value] = (handler, inject)
+            return handler
+        return decorator
+
+    def route(self, codec: CallbackCodec) -> Callable[[Handler], Handler]:
+        """Декоратор: хендлер формату, отримує розібраний NamedTuple"""
+        return self.parsed(codec.prefix, codec.unpack)
+
+    def parsed(self, prefix: str, parse: Callable[[str], Any]) -> Callable[[Handler], Handler]:
+        """Декоратор з власним розбором (старі формати кнопок у вже надісланих повідомленнях)"""
+        def decorator(handler: Handler) -> Handler:
+            self._prefixed[prefix] = (parse, handler, _injectable(handler))
+            return handler
+        return decorator
+
+    def resolve(self, data: Optional[str]) -> Optional[CallbackRoute]:
+        if not data:
+            return None
+
+        entry = self._exact.get(data)
+        if entry is not None:
+            return CallbackRoute(entry[0], None, entry[1])
+
+        prefix, separator, payload = data.partition(SEPARATOR)
+        if not separator:
+            return None
+        parsed = self._prefixed.get(prefix)
+        if parsed is None:
+            return None
+
+        parse, handler, inject = parsed
+        try:
+            return CallbackRoute(handler, parse(payload), inject)
+        except ValueError as e:
+            logger.warning(f"⚠️ {self.name}: {e}")
+            return None
+
+    def filter(self, callback) -> Any:
+        """Фільтр aiogram: маршрут передається хендлеру як аргумент route"""
+        route = self.resolve(callback.data)
+        return {"route": route} if route is not None else False
+
+    async def dispatch(self, callback, route: CallbackRoute, **context: Any) -> Any:
+        return await route(callback, **context)
+
+    def attach(self, router) -> None:
+        """Один хендлер aiogram на всі маршрути модуля"""
+        router.callback_query.register(self.dispatch, self.filter)
+
+# ===== ФОРМАТИ КНОПОК =====
+
+# Контент
+CONTENT_REACTION = CallbackCodec("r", "ContentReaction", reaction=str, content_id=int)
+CONTENT_MORE = CallbackCodec("more", "ContentMore", content_type=str)
+CONTENT_SHARE = CallbackCodec("sh", "ContentShare", content_id=int)
+CONTENT_DUEL = CallbackCodec("cd", "ContentDuel", content_id=int)
+CONTENT_TYPE = CallbackCodec("ct", "ContentTypeChoice", content_type=str)
+SUBMIT_TYPE = CallbackCodec("st", "SubmitTypeChoice", content_type=str)
+
+# Модерація
+MODERATION = CallbackCodec("mod", "ModerationAction", action=str, content_id=int)
+
+# Дуелі
+DUEL_VOTE = CallbackCodec("dv", "DuelVote", duel_id=int, side=str)
+DUEL_VIEW = CallbackCodec("dw", "DuelView", duel_id=int)
+DUEL_REFRESH = CallbackCodec("dr", "DuelRefresh", duel_id=int)
+
+# ===== ЕКСПОРТ =====
+__all__ = [
+    'CallbackCodec', 'CallbackRouter', 'CallbackRoute', 'encode_int', 'decode_int',
+    'MAX_CALLBACK_BYTES',
+    'CONTENT_REACTION', 'CONTENT_MORE', 'CONTENT_SHARE', 'CONTENT_DUEL', 'CONTENT_TYPE', 'SUBMIT_TYPE',
+    'MODERATION', 'DUEL_VOTE', 'DUEL_VIEW', 'DUEL_REFRESH'
+]
@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🛡️ ФІЛЬТР НЕНОРМАТИВНОЇ ЛЕКСИКИ ТА СПАМУ 🛡️
+
+Компільований мульти-патерн матчер (автомат Ахо–Корасік):
+✅ Будується один раз при старті зі словника (укр/англ)
+✅ Нормалізація leetspeak та гомогліфів (латиниця ↔ кирилиця)
+✅ Один прохід по тексту для всіх слів словника
+✅ Збіг зараховується лише з початку слова ("Ребане" не містить "ебан")
+✅ Спам-посилання - тільки справжні URL (http(s)://, www.домен, t.me/...)
+✅ Евристики спаму: капс, повтори символів, повтор недавніх подач автора
+"""
+
+import os
+import re
+import logging
+import unicodedata
+from itertools import groupby
+from pathlib import Path
+from typing import Dict, List, Optional, Iterable, Pattern, Tuple, Set
+
+logger = logging.getLogger(__name__)
+
+# ===== КОНСТАНТИ =====
+
+# Словник за замовчуванням (поруч з налаштуваннями)
+DEFAULT_WORDLIST_PATH = Path(__file__).resolve().parent.parent / "config" / "profanity_words.txt"
+
+# Рекламний спам - посилання. Шукаються в оригінальному тексті: нормалізація
+# прибирає крапки, і "www." перетворилось би на будь-яке "www".
+# Звичайні слова ("казино") не маркери - жарти про них не спам.
+SPAM_LINK_PATTERN = re.compile(
+    r"https?://\S+"
+    r"|\bwww\.[\w-]+(?:\.[\w-]+)*\.[a-z]{2,}\b"
+    r"|\b(?:t\.me|telegram\.me|bit\.ly|telegra\.ph)/\S+",
+    re.IGNORECASE,
+)
+
+# Категорії патернів
+CATEGORY_PROFANITY = "profanity"
+CATEGORY_SPAM = "spam"
+
+# Гомогліфи: латинські двійники кирилиці зводяться до кирилиці
+HOMOGLYPHS = {
+    "a": "а", "e": "е", "o": "о", "p": "р", "c": "с", "x": "х",
+    "y": "у", "k": "к", "i": "і", "m": "м", "t": "т", "h": "н",
+    "ё": "е", "ы": "и", "ѕ": "s",
+}
+
+# Leetspeak підстановки
+LEETSPEAK = {
+    "0": "о", "1": "і", "3": "е", "4": "а", "@": "а",
+    "$": "s", "5": "s", "7": "т", "!": "і", "|": "і",
+}
+
+# Символи, якими розбивають слова ("х.у.й", "f*ck") - пропускаються
+SKIPPED_CHARS = ".-_*~'`\"​‌‍⁠﻿­"
+
+# Пороги спам-евристик (як у попередній реалізації)
+SPAM_REPEAT_RUN = 6          # 6+ однакових символів підряд
+SPAM_UPPER_RATIO = 0.7       # Частка великих літер
+SPAM_MIN_LENGTH = 10         # Мінімальна довжина для перевірки капсу
+SPAM_HISTORY_DEPTH = 5       # Скільки попередніх повідомлень порівнювати
+
+
+def _build_fold_table() -> Dict[str, str]:
+    """Таблиця нормалізації символу: регістр + гомогліфи + leetspeak"""
+    table: Dict[str, str] = {}
+
+    for source, target in {**HOMOGLYPHS, **LEETSPEAK}.items():
+        table[source] = target
+        table[source.upper()] = target
+
+    for char in SKIPPED_CHARS:
+        table[char] = ""
+
+    return table
+
+
+FOLD_TABLE = _build_fold_table()
+
+
+def fold_char(char: str) -> str:
+    """
+    Нормалізація одного символу
+
+    Args:
+        char: Вхідний символ
+
+    Returns:
+        Канонічна форма символу ('' якщо символ треба пропустити)
+    """
+    folded = FOLD_TABLE.get(char)
+    if folded is not None:
+        return folded
+
+    lowered = char.lower()
+    folded = FOLD_TABLE.get(lowered)
+    if folded is not None:
+        return folded
+
+    # Діакритика та комбіновані знаки (наприклад "х̆") відкидаються
+    if unicodedata.combining(lowered):
+        return ""
+
+    return lowered
+
+
+def normalize_text(text: str) -> str:
+    """
+    Нормалізація тексту для порівняння зі словником
+
+    Args:
+        text: Оригінальний текст
+
+    Returns:
+        Текст у канонічній формі
+    """
+    return "".join(fold_char(char) for char in text)
+
+
+# ===== АВТОМАТ АХО–КОРАСІК =====
+
+class AhoCorasickMatcher:
+    """
+    Автомат Ахо–Корасік для пошуку багатьох патернів за один прохід
+
+    Переходи зберігаються як список словників (вузол -> {символ: вузол}),
+    вихідні патерни кожного вузла вже включають патерни за fail-посиланнями.
+    Знайдений патерн зараховується, лише якщо він починається з початку слова:
+    корені ловлять словоформи ("пизд" -> "пиздець"), але не середину
+    звичайних слів ("Ребане", "застрахуйте").
+    """
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[int, ...]] = [()]
+        self._patterns: List[Tuple[str, str]] = []  # (нормалізований патерн, категорія)
+        self._compiled = False
+
+    def add_pattern(self, pattern: str, category: str = CATEGORY_PROFANITY) -> bool:
+        """
+        Додавання патерну до автомату
+
+        Args:
+            pattern: Слово або корінь
+            category: Категорія патерну (profanity, spam)
+
+        Returns:
+            True якщо патерн додано
+        """
+        if self._compiled:
+            raise RuntimeError("Автомат вже скомпільовано")
+
+        normalized = normalize_text(pattern.strip())
+        if not normalized:
+            return False
+
+        node = 0
+        for char in normalized:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            node = next_node
+
+        pattern_index = len(self._patterns)
+        self._patterns.append((normalized, category))
+        self._output[node] = self._output[node] + (pattern_index,)
+        return True
+
+    def compile(self) -> "AhoCorasickMatcher":
+        """Побудова fail-посилань (BFS по бору)"""
+        queue = []
+
+        for child in self._goto[0].values():
+            self._fail[child] = 0
+            queue.append(child)
+
+        head = 0
+        while head < len(queue):
+            node = queue[head]
+            head += 1
+
+            for char, child in self._goto[node].items():
+                queue.append(child)
+
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+
+                fail_target = self._goto[fallback].get(char, 0)
+                self._fail[child] = fail_target if fail_target != child else 0
+
+                if self._output[self._fail[child]]:
+                    self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+        self._compiled = True
+        return self
+
+    @property
+    def pattern_count(self) -> int:
+        """Кількість патернів в автоматі"""
+        return len(self._patterns)
+
+    def step(self, node: int, char: str) -> int:
+        """
+        Один перехід автомату по вже нормалізованому символу
+
+        Args:
+            node: Поточний вузол
+            char: Нормалізований символ
+
+        Returns:
+            Наступний вузол
+        """
+        goto = self._goto
+        fail = self._fail
+
+        while node and char not in goto[node]:
+            node = fail[node]
+        return goto[node].get(char, 0)
+
+    def outputs(self, node: int) -> Tuple[int, ...]:
+        """Індекси патернів, що закінчуються в вузлі"""
+        return self._output[node]
+
+    def pattern(self, index: int) -> Tuple[str, str]:
+        """Патерн та його категорія за індексом"""
+        return self._patterns[index]
+
+    def starts_word(self, index: int, end: int, word_starts: Set[int]) -> bool:
+        """
+        Чи починається збіг патерну з початку слова
+
+        Args:
+            index: Індекс патерну
+            end: Позиція останнього символу збігу в нормалізованому тексті
+            word_starts: Позиції початків слів у нормалізованому тексті
+        """
+        return end - len(self._patterns[index][0]) + 1 in word_starts
+
+    def find_all(self, text: str) -> List[Tuple[str, str]]:
+        """
+        Пошук усіх входжень патернів у тексті
+
+        Args:
+            text: Оригінальний (ненормалізований) текст
+
+        Returns:
+            Список (патерн, категорія) у порядку знаходження
+        """
+        found = []
+        word_starts: Set[int] = set()
+        in_word = False
+        position = 0
+        node = 0
+
+        for raw_char in text:
+            char = fold_char(raw_char)
+            if not char:
+                continue
+            for folded in char:
+                is_word = folded.isalnum()
+                if is_word and not in_word:
+                    word_starts.add(position)
+                in_word = is_word
+
+                node = self.step(node, folded)
+                for index in self._output[node]:
+                    if self.starts_word(index, position, word_starts):
+                        found.append(self._patterns[index])
+                position += 1
+
+        return found
+
+
+# ===== РЕЗУЛЬТАТ ПЕРЕВІРКИ =====
+
+class FilterResult:
+    """Результат перевірки тексту фільтром"""
+
+    __slots__ = ("profanity", "spam_markers", "max_repeat", "upper_count", "length", "duplicate")
+
+    def __init__(self):
+        self.profanity: List[str] = []
+        self.spam_markers: List[str] = []
+        self.max_repeat = 0
+        self.upper_count = 0
+        self.length = 0
+        self.duplicate = False
+
+    @property
+    def has_profanity(self) -> bool:
+        return bool(self.profanity)
+
+    @property
+    def is_spam(self) -> bool:
+        if self.spam_markers or self.duplicate:
+            return True
+        if self.max_repeat >= SPAM_REPEAT_RUN:
+            return True
+        return self.length > SPAM_MIN_LENGTH and (self.upper_count / self.length) > SPAM_UPPER_RATIO
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "profanity": list(self.profanity),
+            "spam_markers": list(self.spam_markers),
+            "max_repeat": self.max_repeat,
+            "upper_ratio": (self.upper_count / self.length) if self.length else 0.0,
+            "duplicate": self.duplicate,
+            "has_profanity": self.has_profanity,
+            "is_spam": self.is_spam,
+        }
+
+
+# ===== ФІЛЬТР КОНТЕНТУ =====
+
+class ContentFilter:
+    """Фільтр ненормативної лексики та спаму на базі одного автомату"""
+
+    def __init__(self, profanity_words: Iterable[str] = (),
+                 spam_pattern: Optional[Pattern[str]] = SPAM_LINK_PATTERN):
+        self.matcher = AhoCorasickMatcher()
+        self.spam_pattern = spam_pattern
+
+        for word in profanity_words:
+            self.matcher.add_pattern(word, CATEGORY_PROFANITY)
+
+        self.matcher.compile()
+
+    def check(self, text: str, user_history: Optional[List[str]] = None) -> FilterResult:
+        """
+        Повна перевірка тексту за один прохід
+
+        Args:
+            text: Текст для перевірки
+            user_history: Історія повідомлень користувача
+
+        Returns:
+            FilterResult з усіма знахідками
+        """
+        result = FilterResult()
+        if not text:
+            return result
+
+        # Словник - тим самим пошуком з початку слова, що й find_all
+        for match in dict.fromkeys(self.matcher.find_all(text)):
+            pattern, category = match
+            if category == CATEGORY_SPAM:
+                result.spam_markers.append(pattern)
+            else:
+                result.profanity.append(pattern)
+
+        # Спам-евристики по оригінальних символах
+        result.max_repeat = max(sum(1 for _ in run) for _, run in groupby(text))
+        result.upper_count = sum(1 for char in text if char.isupper())
+        result.length = len(text)
+
+        if self.spam_pattern is not None:
+            result.spam_markers.extend(match.group(0) for match in self.spam_pattern.finditer(text))
+
+        if user_history:
+            folded_text = text.casefold()
+            recent = {prev.casefold() for prev in user_history[-SPAM_HISTORY_DEPTH:]}
+            result.duplicate = folded_text in recent
+
+        return result
+
+    def contains_profanity(self, text: str) -> bool:
+        """Чи містить текст ненормативну лексику"""
+        return self.check(text).has_profanity
+
+    def is_spam(self, text: str, user_history: Optional[List[str]] = None) -> bool:
+        """Чи схожий текст на спам"""
+        return self.check(text, user_history).is_spam
+
+
+# ===== ЗАВАНТАЖЕННЯ СЛОВНИКА =====
+
+def load_wordlist(path: Optional[os.PathLike] = None) -> List[str]:
+    """
+    Завантаження словника з файлу
+
+    Args:
+        path: Шлях до файлу (за замовчуванням - вбудований словник)
+
+    Returns:
+        Список слів без коментарів та порожніх рядків
+    """
+    wordlist_path = Path(path) if path else DEFAULT_WORDLIST_PATH
+
+    try:
+        with open(wordlist_path, "r", encoding="utf-8") as f:
+            return [
+                line.strip() for line in f
+                if line.strip() and not line.lstrip().startswith("#")
+            ]
+    except FileNotFoundError:
+        logger.warning(f"⚠️ Словник фільтра не знайдено: {wordlist_path}")
+        return []
+
+
+_content_filter: Optional[ContentFilter] = None
+
+
+def build_content_filter() -> ContentFilter:
+    """Побудова фільтра з налаштувань (словник + додаткові слова)"""
+    try:
+        from config.settings import PROFANITY_WORDLIST_PATH, PROFANITY_EXTRA_WORDS
+    except ImportError:
+        PROFANITY_WORDLIST_PATH = os.getenv("PROFANITY_WORDLIST_PATH")
+        PROFANITY_EXTRA_WORDS = [
+            word.strip() for word in os.getenv("PROFANITY_EXTRA_WORDS", "").split(",") if word.strip()
+        ]
+
+    words = load_wordlist(PROFANITY_WORDLIST_PATH) + list(PROFANITY_EXTRA_WORDS)
+    content_filter = ContentFilter(words)
+
+    logger.info(f"🛡️ Фільтр контенту скомпільовано: {content_filter.matcher.pattern_count} патернів")
+    return content_filter
+
+
+def get_content_filter() -> ContentFilter:
+    """Спільний екземпляр фільтра (будується один раз)"""
+    global _content_filter
+    if _content_filter is None:
+        _content_filter = build_content_filter()
+    return _content_filter
+
+
+def reload_content_filter() -> ContentFilter:
+    """Перебудова фільтра після зміни словника"""
+    global _content_filter
+    _content_filter = build_content_filter()
+    return _content_filter
+
+
+# ===== ЕКСПОРТ =====
+__all__ = [
+    'AhoCorasickMatcher', 'ContentFilter', 'FilterResult',
+    'normalize_text', 'load_wordlist',
+    'build_content_filter', 'get_content_filter', 'reload_content_filter',
+    'CATEGORY_PROFANITY', 'CATEGORY_SPAM', 'SPAM_LINK_PATTERN'
+]
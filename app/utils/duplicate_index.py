@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🔁 ІНДЕКС ДУБЛІКАТІВ КОНТЕНТУ 🔁
+
+Виявлення повторних жартів/анекдотів до потрапляння в модерацію:
+✅ Точні дублікати - content_hash (той самий MD5, що й у generate_content_hash)
+✅ Перефразовані копії - MinHash сигнатури + LSH бакети в пам'яті
+✅ Пошук без сканування таблиці: O(кількість бакетів) замість O(кількість жартів)
+✅ Прогрів з БД при старті, поповнення при кожній подачі
+"""
+
+import re
+import zlib
+import random
+import hashlib
+import logging
+from typing import Dict, List, Optional, Set, Tuple, Iterable
+
+logger = logging.getLogger(__name__)
+
+# ===== КОНСТАНТИ =====
+
+NUM_PERMUTATIONS = 64          # Довжина MinHash сигнатури
+LSH_BANDS = 16                 # Кількість бакетів (BANDS * ROWS = NUM_PERMUTATIONS)
+LSH_ROWS = NUM_PERMUTATIONS // LSH_BANDS
+SHINGLE_SIZE = 3               # Слів у шинглі
+DEFAULT_SIMILARITY_THRESHOLD = 0.8
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_BIN_BITS = NUM_PERMUTATIONS.bit_length() - 1          # 64 бінів = 6 біт
+_VALUE_BITS = 32 - _BIN_BITS
+_VALUE_MASK = (1 << _VALUE_BITS) - 1
+_EMPTY_BIN = 1 << _VALUE_BITS
+_WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# Фіксований seed - сигнатури однакові між перезапусками
+_rng = random.Random(0x5EED)
+_PERM_A = _rng.randrange(1, _MERSENNE_PRIME)
+_PERM_B = _rng.randrange(0, _MERSENNE_PRIME)
+
+
+def _hash_text(text: str) -> str:
+    """MD5 нормалізованого тексту (сумісно з utils.helpers.generate_content_hash)"""
+    from .helpers import clean_text
+    return hashlib.md5(clean_text(text.lower()).encode('utf-8')).hexdigest()
+
+
+def tokenize(text: str) -> List[str]:
+    """Слова тексту в нижньому регістрі без пунктуації"""
+    return _WORD_PATTERN.findall(text.lower())
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[int]:
+    """
+    Множина хешів словесних шинглів
+
+    Args:
+        text: Текст контенту
+        size: Кількість слів у шинглі
+
+    Returns:
+        Множина 32-бітних хешів
+    """
+    words = tokenize(text)
+    if not words:
+        return set()
+    if len(words) <= size:
+        return {zlib.crc32(" ".join(words).encode('utf-8'))}
+
+    return {
+        zlib.crc32(" ".join(words[i:i + size]).encode('utf-8'))
+        for i in range(len(words) - size + 1)
+    }
+
+
+def minhash_signature(shingle_hashes: Iterable[int]) -> Tuple[int, ...]:
+    """
+    MinHash сигнатура множини шинглів (one-permutation hashing)
+
+    Одна перестановка ділиться на NUM_PERMUTATIONS бінів, тож сигнатура
+    рахується за один прохід по шинглах; порожні біни заповнюються
+    з наступного непорожнього (densification).
+
+    Args:
+        shingle_hashes: Хеші шинглів
+
+    Returns:
+        Кортеж з NUM_PERMUTATIONS мінімумів
+    """
+    bins = [_EMPTY_BIN] * NUM_PERMUTATIONS
+
+    for h in shingle_hashes:
+        permuted = ((_PERM_A * h + _PERM_B) % _MERSENNE_PRIME) & 0xFFFFFFFF
+        bin_index = permuted >> _VALUE_BITS
+        value = permuted & _VALUE_MASK
+        if value < bins[bin_index]:
+            bins[bin_index] = value
+
+    filled = [i for i, value in enumerate(bins) if value != _EMPTY_BIN]
+    if not filled:
+        return ()
+
+    if len(filled) < NUM_PERMUTATIONS:
+        # Кругове заповнення: порожній бін бере значення наступного непорожнього
+        source = filled[0]
+        for i in range(NUM_PERMUTATIONS - 1, -1, -1):
+            if bins[i] != _EMPTY_BIN:
+                source = i
+            else:
+                bins[i] = bins[source] + (((source - i) % NUM_PERMUTATIONS) << _VALUE_BITS)
+
+    return tuple(bins)
+
+
+def estimate_similarity(first: Tuple[int, ...], second: Tuple[int, ...]) -> float:
+    """Оцінка схожості Жаккара за двома сигнатурами"""
+    if not first or not second:
+        return 0.0
+    matches = sum(1 for x, y in zip(first, second) if x == y)
+    return matches / NUM_PERMUTATIONS
+
+
+class DuplicateMatch:
+    """Знайдений дублікат"""
+
+    __slots__ = ("content_id", "similarity", "exact")
+
+    def __init__(self, content_id: int, similarity: float, exact: bool):
+        self.content_id = content_id
+        self.similarity = similarity
+        self.exact = exact
+
+    def __repr__(self) -> str:
+        kind = "exact" if self.exact else f"near {self.similarity:.2f}"
+        return f"<DuplicateMatch #{self.content_id} {kind}>"
+
+
+class DuplicateIndex:
+    """Індекс точних та майже-дублікатів в пам'яті"""
+
+    def __init__(self, threshold: float = DEFAULT_SIMILARITY_THRESHOLD):
+        self.threshold = threshold
+        self._by_hash: Dict[str, int] = {}
+        self._signatures: Dict[int, Tuple[int, ...]] = {}
+        self._hashes: Dict[int, str] = {}
+        self._buckets: List[Dict[Tuple[int, ...], Set[int]]] = [{} for _ in range(LSH_BANDS)]
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, content_id: int) -> bool:
+        return content_id in self._signatures
+
+    @staticmethod
+    def _bands(signature: Tuple[int, ...]) -> List[Tuple[int, ...]]:
+        return [signature[i * LSH_ROWS:(i + 1) * LSH_ROWS] for i in range(LSH_BANDS)]
+
+    def add(self, content_id: int, text: str, content_hash: Optional[str] = None) -> None:
+        """
+        Додавання контенту до індексу
+
+        Args:
+            content_id: ID контенту
+            text: Текст контенту
+            content_hash: Готовий хеш з БД (якщо є)
+        """
+        if content_id in self._signatures:
+            self.remove(content_id)
+
+        content_hash = content_hash or _hash_text(text)
+        signature = minhash_signature(shingles(text))
+
+        self._by_hash.setdefault(content_hash, content_id)
+        self._hashes[content_id] = content_hash
+        self._signatures[content_id] = signature
+
+        if signature:
+            for band, bucket in zip(self._bands(signature), self._buckets):
+                bucket.setdefault(band, set()).add(content_id)
+
+    def remove(self, content_id: int) -> None:
+        """Видалення контенту з індексу (наприклад після відхилення)"""
+        signature = self._signatures.pop(content_id, None)
+        content_hash = self._hashes.pop(content_id, None)
+
+        if content_hash and self._by_hash.get(content_hash) == content_id:
+            del self._by_hash[content_hash]
+
+        if signature:
+            for band, bucket in zip(self._bands(signature), self._buckets):
+                members = bucket.get(band)
+                if members:
+                    members.discard(content_id)
+                    if not members:
+                        del bucket[band]
+
+    def find_exact(self, text: str) -> Optional[int]:
+        """ID контенту з тим самим content_hash"""
+        return self._by_hash.get(_hash_text(text))
+
+    def find_similar(self, text: str, threshold: Optional[float] = None,
+                     limit: int = 5) -> List[DuplicateMatch]:
+        """
+        Пошук перефразованих копій через LSH бакети
+
+        Args:
+            text: Текст для перевірки
+            threshold: Мінімальна схожість (0-1)
+            limit: Максимум результатів
+
+        Returns:
+            Список DuplicateMatch, найсхожіші першими
+        """
+        threshold = self.threshold if threshold is None else threshold
+        signature = minhash_signature(shingles(text))
+        if not signature:
+            return []
+
+        candidates: Set[int] = set()
+        for band, bucket in zip(self._bands(signature), self._buckets):
+            members = bucket.get(band)
+            if members:
+                candidates.update(members)
+
+        matches = []
+        for content_id in candidates:
+            similarity = estimate_similarity(signature, self._signatures[content_id])
+            if similarity >= threshold:
+                matches.append(DuplicateMatch(content_id, similarity, exact=False))
+
+        matches.sort(key=lambda match: match.similarity, reverse=True)
+        return matches[:limit]
+
+    def check(self, text: str) -> Optional[DuplicateMatch]:
+        """
+        Повна перевірка: спочатку точний хеш, потім LSH
+
+        Returns:
+            Найкращий дублікат або None
+        """
+        content_id = self.find_exact(text)
+        if content_id is not None:
+            return DuplicateMatch(content_id, 1.0, exact=True)
+
+        similar = self.find_similar(text, limit=1)
+        return similar[0] if similar else None
+
+    def clear(self) -> None:
+        """Очищення індексу"""
+        self._by_hash.clear()
+        self._signatures.clear()
+        self._hashes.clear()
+        for bucket in self._buckets:
+            bucket.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Статистика індексу"""
+        return {
+            "documents": len(self._signatures),
+            "unique_hashes": len(self._by_hash),
+            "buckets": sum(len(bucket) for bucket in self._buckets),
+        }
+
+
+# ===== СПІЛЬНИЙ ЕКЗЕМПЛЯР =====
+
+_duplicate_index: Optional[DuplicateIndex] = None
+
+
+def get_duplicate_index() -> DuplicateIndex:
+    """Спільний індекс дублікатів"""
+    global _duplicate_index
+    if _duplicate_index is None:
+        try:
+            from config.settings import DUPLICATE_SIMILARITY_THRESHOLD
+        except ImportError:
+            DUPLICATE_SIMILARITY_THRESHOLD = DEFAULT_SIMILARITY_THRESHOLD
+        _duplicate_index = DuplicateIndex(DUPLICATE_SIMILARITY_THRESHOLD)
+    return _duplicate_index
+
+
+def warm_up_duplicate_index(batch_size: int = 1000) -> int:
+    """
+    Завантаження контенту з БД в індекс
+
+    Відхилений контент не індексується: idx_content_hash його не охоплює,
+    тож той самий текст можна подати знову (модерація відхилення прибирає з індексу).
+
+    Returns:
+        Кількість проіндексованих записів
+    """
+    index = get_duplicate_index()
+
+    try:
+        from database.database import get_db_session
+        from database.models import Content
+
+        with get_db_session() as session:
+            rows = (
+                session.query(Content.id, Content.text, Content.content_hash)
+                .filter(Content.status != "rejected")
+                .yield_per(batch_size)
+            )
+            for content_id, text, content_hash in rows:
+                index.add(content_id, text, content_hash)
+
+        logger.info(f"🔁 Індекс дублікатів: {len(index)} записів")
+    except Exception as e:
+        logger.warning(f"⚠️ Індекс дублікатів без прогріву: {e}")
+
+    return len(index)
+
+
+# ===== ЕКСПОРТ =====
+__all__ = [
+    'DuplicateIndex', 'DuplicateMatch',
+    'shingles', 'minhash_signature', 'estimate_similarity',
+    'get_duplicate_index', 'warm_up_duplicate_index'
+]
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🏭 КЕРОВАНІ ПУЛИ ВИКОНАВЦІВ 🏭
+
+Синхронна робота (запити БД, файли, серіалізація) - поза event loop:
+✅ Іменовані пули: "io" - потоки для блокуючого I/O, "cpu" - процеси для важких експортів
+✅ Обмежена черга: переповнений пул відмовляє одразу (PoolBusyError), а не накопичує задачі
+✅ Метрики пулу: в роботі, виконано, помилки, відмови, очікування в черзі та тривалість
+✅ Прогрес із воркера (і з іншого процесу) доставляється callback'у в батьківському процесі
+"""
+
+import time
+import asyncio
+import logging
+import functools
+import itertools
+import threading
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    from config.settings import EXECUTOR_IO_WORKERS, EXECUTOR_CPU_WORKERS, EXECUTOR_QUEUE_SIZE
+except ImportError:
+    EXECUTOR_IO_WORKERS, EXECUTOR_CPU_WORKERS, EXECUTOR_QUEUE_SIZE = 4, 2, 16
+
+class PoolBusyError(RuntimeError):
+    """Пул зайнятий: усі воркери працюють і черга заповнена"""
+
+# ===== ВИКОНАННЯ У ВОРКЕРІ =====
+
+def _timed_call(func: Callable, args: Tuple, kwargs: Dict[str, Any]) -> Tuple[float, Any]:
+    """Виконується у воркері: час старту (для очікування в черзі) + результат"""
+    started = time.time()
+    return started, func(*args, **kwargs)
+
+def _init_process_worker() -> None:
+    """Ініціалізація процесу пулу: логування та власний engine БД"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    try:
+        from database.database import connect_engine
+        connect_engine()
+    except Exception as e:
+        logger.warning(f"⚠️ Воркер без БД: {e}")
+
+class _ProgressRelay:
+    """Callback прогресу, який можна передати в інший процес (через чергу менеджера)"""
+
+    __slots__ = ("queue", "token")
+
+    def __init__(self, queue, token: int):
+        self.queue = queue
+        self.token = token
+
+    def __call__(self, report: Any) -> None:
+        self.queue.put((self.token, report))
+
+# ===== ПУЛ =====
+
+class ManagedPool:
+    """Іменований пул потоків або процесів з обмеженою чергою та метриками"""
+
+    def __init__(self, name: str, kind: str = "thread", workers: int = 4, queue_size: int = EXECUTOR_QUEUE_SIZE):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Невідомий тип пулу: {kind}")
+        self.name = name
+        self.kind = kind
+        self.workers = max(1, workers)
+        self.capacity = self.workers + max(0, queue_size)
+
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+        # Прогрес з процесів: черга менеджера + потік доставки
+        self._manager = None
+        self._progress_queue = None
+        self._progress_callbacks: Dict[int, Callable[[Any], None]] = {}
+        self._tokens = itertools.count(1)
+
+        self.in_flight = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.wait_total = 0.0
+        self.run_total = 0.0
+        self.run_max = 0.0
+
+    @property
+    def executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.kind == "process":
+                    # spawn: воркер не успадковує з'єднання БД та стан event loop
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                        initializer=_init_process_worker
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=f"pool-{self.name}")
+                logger.info(f"🏭 Пул {self.name}: {self.kind}, воркерів {self.workers}, місць {self.capacity}")
+            return self._executor
+
+    # ===== ПРОГРЕС =====
+
+    def _progress_relay(self, callback: Callable[[Any], None]) -> Callable[[Any], None]:
+        if self.kind == "thread":
+            return callback  # Той самий процес - callback викликається з потоку воркера
+
+        with self._lock:
+            if self._manager is None:
+                self._manager = multiprocessing.get_context("spawn").Manager()
+                self._progress_queue = self._manager.Queue()
+                threading.Thread(target=self._deliver_progress, name=f"pool-{self.name}-progress",
+                                 daemon=True).start()
+        token = next(self._tokens)
+        self._progress_callbacks[token] = callback
+        return _ProgressRelay(self._progress_queue, token)
+
+    def _deliver_progress(self) -> None:
+        while True:
+            try:
+                item = self._progress_queue.get()
+            except (EOFError, OSError):
+                return  # Менеджер зупинено
+            if item is None:
+                return
+            token, report = item
+            callback = self._progress_callbacks.get(token)
+            if callback is not None:
+                try:
+                    callback(report)
+                except Exception as e:
+                    logger.warning(f"⚠️ Пул {self.name}: помилка callback прогресу: {e}")
+
+    # ===== ВИКОНАННЯ =====
+
+    async def run(self, func: Callable, *args: Any, progress: Optional[Callable[[Any], None]] = None,
+                  **kwargs: Any) -> Any:
+        """
+        Виконання func у пулі
+
+        Args:
+            progress: Callback прогресу; передається у func як аргумент progress
+
+        Raises:
+            PoolBusyError: Немає вільних місць у черзі
+        """
+        if self.in_flight >= self.capacity:
+            self.rejected += 1
+            raise PoolBusyError(f"Пул {self.name} зайнятий ({self.in_flight}/{self.capacity})")
+
+        token = None
+        if progress is not None:
+            relay = self._progress_relay(progress)
+            token = getattr(relay, "token", None)
+            kwargs["progress"] = relay
+
+        self.in_flight += 1
+        self.submitted += 1
+        submitted_at = time.time()
+        loop = asyncio.get_running_loop()
+        try:
+            started_at, result = await loop.run_in_executor(
+                self.executor, functools.partial(_timed_call, func, args, kwargs)
+            )
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.in_flight -= 1
+            if token is not None:
+                self._progress_callbacks.pop(token, None)
+
+        finished_at = time.time()
+        self.completed += 1
+        self.wait_total += max(0.0, started_at - submitted_at)
+        duration = finished_at - started_at
+        self.run_total += duration
+        self.run_max = max(self.run_max, duration)
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        done = self.completed or 1
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "workers": self.workers,
+            "capacity": self.capacity,
+            "in_flight": self.in_flight,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "avg_wait_ms": round(self.wait_total / done * 1000, 1),
+            "avg_run_ms": round(self.run_total / done * 1000, 1),
+            "max_run_ms": round(self.run_max * 1000, 1),
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait, cancel_futures=not wait)
+                self._executor = None
+            if self._manager is not None:
+                try:
+                    self._progress_queue.put(None)
+                except Exception:
+                    pass
+                self._manager.shutdown()
+                self._manager = None
+
+# ===== РЕЄСТР ПУЛІВ =====
+
+_pools: Dict[str, ManagedPool] = {}
+
+def _default_pool(name: str) -> ManagedPool:
+    if name == "io":
+        return ManagedPool("io", "thread", EXECUTOR_IO_WORKERS)
+    if name == "cpu":
+        # EXECUTOR_CPU_WORKERS=0 - без окремих процесів (обмежене середовище)
+        if EXECUTOR_CPU_WORKERS > 0:
+            return ManagedPool("cpu", "process", EXECUTOR_CPU_WORKERS)
+        return ManagedPool("cpu", "thread", 1)
+    raise KeyError(f"Невідомий пул: {name}")
+
+def get_pool(name: str = "io") -> ManagedPool:
+    pool = _pools.get(name)
+    if pool is None:
+        pool = _pools[name] = _default_pool(name)
+    return pool
+
+def register_pool(pool: ManagedPool) -> ManagedPool:
+    """Додатковий іменований пул (наприклад, окремий для бекапів)"""
+    _pools[pool.name] = pool
+    return pool
+
+async def run_in_pool(name: str, func: Callable, *args: Any,
+                      progress: Optional[Callable[[Any], None]] = None, **kwargs: Any) -> Any:
+    return await get_pool(name).run(func, *args, progress=progress, **kwargs)
+
+def get_executor_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: pool.get_stats() for name, pool in _pools.items()}
+
+def shutdown_executors(wait: bool = True) -> None:
+    for pool in _pools.values():
+        try:
+            pool.shutdown(wait=wait)
+        except Exception as e:
+            logger.warning(f"⚠️ Пул {pool.name}: {e}")
+    _pools.clear()
+
+# ===== ЕКСПОРТ =====
+__all__ = [
+    'ManagedPool', 'PoolBusyError', 'get_pool', 'register_pool', 'run_in_pool',
+    'get_executor_stats', 'shutdown_executors'
+]
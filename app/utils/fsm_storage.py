@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+💾 СХОВИЩЕ FSM 💾
+
+Стани діалогів (подача контенту, дуелі, модерація) переживають перезапуск:
+✅ SQLite у режимі WAL - один файл, без окремого сервера
+✅ Кеш у пам'яті: читання стану без звернення до диска, запис - один upsert
+✅ Значення серіалізуються msgpack (якщо встановлено), інакше JSON
+✅ TTL: покинуті стани видаляються, активні подовжуються при читанні,
+   порожні записи не зберігаються
+✅ RUN_MODE=scaled: окремий файл на воркер, busy_timeout замість "database is locked"
+✅ Redis-бекенд для кількох worker'ів зі спільним станом
+"""
+
+import json
+import time
+import sqlite3
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+
+logger = logging.getLogger(__name__)
+
+# msgpack опціональний - без нього значення зберігаються як JSON
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    msgpack = None
+    MSGPACK_AVAILABLE = False
+
+DEFAULT_STATE_TTL = 86400       # Секунд до видалення покинутого стану
+CACHE_SIZE = 10000              # Ключів у кеші пам'яті
+PURGE_EVERY = 1000              # Записів між очищеннями простроченого
+BUSY_TIMEOUT_MS = 5000          # Очікування блокування файлу іншим процесом
+
+StateType = Optional[Union[str, State]]
+
+# ===== СЕРІАЛІЗАЦІЯ =====
+
+def _pack(data: Dict[str, Any]) -> bytes:
+    if MSGPACK_AVAILABLE:
+        return msgpack.packb(data, use_bin_type=True)
+    return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+def _unpack(raw: Optional[bytes]) -> Dict[str, Any]:
+    if not raw:
+        return {}
+    if MSGPACK_AVAILABLE:
+        try:
+            return msgpack.unpackb(raw, raw=False)
+        except Exception:
+            pass  # Запис зроблено до встановлення msgpack
+    return json.loads(raw)
+
+def _state_name(state: StateType) -> Optional[str]:
+    return state.state if isinstance(state, State) else state
+
+def _key(key: StorageKey) -> str:
+    """Рядковий ключ; необов'язкові поля StorageKey залежать від версії aiogram"""
+    parts = [key.bot_id, key.chat_id, key.user_id,
+             getattr(key, "thread_id", None) or "",
+             getattr(key, "business_connection_id", None) or "",
+             key.destiny]
+    return ":".join(str(part) for part in parts)
+
+# ===== SQLITE =====
+
+class SQLiteStorage(BaseStorage):
+    """
+    FSM у локальному SQLite (WAL, synchronous=NORMAL)
+
+    Один процес - одне сховище: кеш у пам'яті завжди актуальний, бо всі
+    записи проходять через нього. Воркери RUN_MODE=scaled отримують власні
+    файли (create_fsm_storage(partition=...)): користувач завжди потрапляє
+    до того самого воркера, тож спільний стан не потрібен. Спільний стан
+    між процесами - RedisStorage.
+
+    TTL рахується від останнього звернення: читання подовжує його, але пише
+    на диск не частіше, ніж раз на половину TTL, щоб get_state не став
+    записом на кожне оновлення.
+    """
+
+    def __init__(self, path: Union[str, Path], state_ttl: int = DEFAULT_STATE_TTL,
+                 cache_size: int = CACHE_SIZE):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.state_ttl = state_ttl
+        self.cache_size = cache_size
+
+        # Кеш: ключ -> [стан, дані, expires_at]
+        self._cache: Dict[str, List[Any]] = {}
+        self._writes = 0
+
+        self._db = sqlite3.connect(str(self.path), isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS fsm ("
+            "key TEXT PRIMARY KEY, state TEXT, data BLOB, expires_at REAL NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_fsm_expires ON fsm (expires_at)")
+        self.purge_expired()
+
+    def _expires_at(self) -> float:
+        return time.time() + self.state_ttl
+
+    def _load(self, key: str) -> List[Any]:
+        entry = self._cache.get(key)
+        if entry is None:
+            row = self._db.execute(
+                "SELECT state, data, expires_at FROM fsm WHERE key = ?", (key,)
+            ).fetchone()
+            entry = [row[0], _unpack(row[1]), row[2]] if row else [None, {}, 0.0]
+            self._remember(key, entry)
+
+        if entry[2] and entry[2] < time.time():
+            # Покинутий стан - як ніби його не було
+            entry[0], entry[1], entry[2] = None, {}, 0.0
+        return entry
+
+    def _touch(self, key: str, entry: List[Any]) -> List[Any]:
+        """Подовження TTL при читанні (запис лише після половини TTL)"""
+        now = time.time()
+        if entry[2] and entry[2] - now < self.state_ttl / 2:
+            entry[2] = now + self.state_ttl
+            self._db.execute("UPDATE fsm SET expires_at = ? WHERE key = ?", (entry[2], key))
+        return entry
+
+    def _remember(self, key: str, entry: List[Any]) -> None:
+        self._cache[key] = entry
+        if len(self._cache) > self.cache_size:
+            del self._cache[next(iter(self._cache))]
+
+    def _store(self, key: str, entry: List[Any]) -> None:
+        if entry[0] is None and not entry[1]:
+            # Порожній запис не зберігаємо
+            self._db.execute("DELETE FROM fsm WHERE key = ?", (key,))
+            self._cache.pop(key, None)
+        else:
+            entry[2] = self._expires_at()
+            self._db.execute(
+                "INSERT INTO fsm (key, state, data, expires_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET state = excluded.state, data = excluded.data, "
+                "expires_at = excluded.expires_at",
+                (key, entry[0], _pack(entry[1]), entry[2])
+            )
+
+        self._writes += 1
+        if self._writes % PURGE_EVERY == 0:
+            self.purge_expired()
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        storage_key = _key(key)
+        entry = self._load(storage_key)
+        entry[0] = _state_name(state)
+        self._store(storage_key, entry)
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        storage_key = _key(key)
+        return self._touch(storage_key, self._load(storage_key))[0]
+
+    async def set_data(self, key: StorageKey, data: Dict[str, Any]) -> None:
+        storage_key = _key(key)
+        entry = self._load(storage_key)
+        entry[1] = dict(data)
+        self._store(storage_key, entry)
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        storage_key = _key(key)
+        return dict(self._touch(storage_key, self._load(storage_key))[1])
+
+    def purge_expired(self) -> int:
+        """Видалення покинутих станів"""
+        now = time.time()
+        removed = self._db.execute("DELETE FROM fsm WHERE expires_at < ?", (now,)).rowcount
+        for key in [key for key, entry in self._cache.items() if entry[2] and entry[2] < now]:
+            del self._cache[key]
+        if removed:
+            logger.info(f"💾 FSM: видалено {removed} покинутих станів")
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        stored = self._db.execute("SELECT COUNT(*) FROM fsm").fetchone()[0]
+        return {"backend": "sqlite", "stored": stored, "cached": len(self._cache),
+                "writes": self._writes, "msgpack": MSGPACK_AVAILABLE}
+
+    async def close(self) -> None:
+        try:
+            self._db.execute("PRAGMA optimize")
+            self._db.close()
+        except sqlite3.ProgrammingError:
+            pass  # Вже закрито
+
+# ===== ФАБРИКА =====
+
+def worker_storage_path(path: Union[str, Path], partition: Optional[int]) -> Path:
+    """Файл FSM воркера партиції: fsm.sqlite3 -> fsm.worker2.sqlite3"""
+    path = Path(path)
+    if partition is None:
+        return path
+    return path.with_name(f"{path.stem}.worker{partition}{path.suffix}")
+
+def create_fsm_storage(partition: Optional[int] = None) -> BaseStorage:
+    """Сховище FSM за налаштуваннями: redis / sqlite / memory
+
+    partition - індекс воркера RUN_MODE=scaled; SQLite тоді у власному файлі.
+    """
+    try:
+        from config.settings import FSM_STORAGE, FSM_STORAGE_PATH, FSM_STATE_TTL, REDIS_URL
+    except ImportError:
+        FSM_STORAGE, FSM_STORAGE_PATH, FSM_STATE_TTL, REDIS_URL = (
+            "sqlite", Path("data") / "fsm.sqlite3", DEFAULT_STATE_TTL, None
+        )
+
+    storage = None
+    if FSM_STORAGE == "redis" and REDIS_URL:
+        try:
+            from aiogram.fsm.storage.redis import RedisStorage
+            storage = RedisStorage.from_url(REDIS_URL, state_ttl=FSM_STATE_TTL, data_ttl=FSM_STATE_TTL)
+        except Exception as e:
+            logger.warning(f"⚠️ Redis FSM недоступний: {e}")
+
+    if storage is None and FSM_STORAGE in ("sqlite", "redis"):
+        try:
+            storage = SQLiteStorage(worker_storage_path(FSM_STORAGE_PATH, partition), state_ttl=FSM_STATE_TTL)
+        except Exception as e:
+            logger.warning(f"⚠️ SQLite FSM недоступний: {e}")
+
+    if storage is None:
+        storage = MemoryStorage()
+
+    logger.info(f"💾 FSM сховище: {type(storage).__name__}")
+    return storage
+
+# ===== ЕКСПОРТ =====
+__all__ = ['SQLiteStorage', 'create_fsm_storage', 'worker_storage_path', 'MSGPACK_AVAILABLE']
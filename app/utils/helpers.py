@@ -14,6 +14,7 @@
 
 import re
 import json
+import time
 import logging
 import asyncio
 import hashlib
@@ -23,6 +24,9 @@ from pathlib import Path
 import random
 import string
 
+from .content_filter import get_content_filter
+from .rate_limiter import gcra, MemoryRateLimiter
+
 logger = logging.getLogger(__name__)
 
 # ===== КОНСТАНТИ =====
@@ -271,7 +275,7 @@ def is_valid_content_length(text: str, min_length: int = 10, max_length: int = 2
 
 def contains_profanity(text: str) -> bool:
     """
-    Простий фільтр ненормативної лексики
+    Фільтр ненормативної лексики (автомат Ахо–Корасік, див. content_filter)
     
     Args:
         text: Текст для перевірки
@@ -279,24 +283,15 @@ def contains_profanity(text: str) -> bool:
     Returns:
         True якщо знайдено нецензурні слова
     """
-    # Базовий список слів (можна розширити)
-    profanity_words = [
-        # Тут будуть слова для фільтрації
-        # Для демо використовуємо загальні patterns
-    ]
-    
-    text_lower = text.lower()
-    
-    for word in profanity_words:
-        if word in text_lower:
-            return True
-    
-    return False
+    return get_content_filter().contains_profanity(text)
 
 def is_spam_content(text: str, user_history: List[str] = None) -> bool:
     """
     Перевірка на спам
     
+    Повтори символів, капс, спам-маркери та дублікати з історії
+    перевіряються за один прохід по тексту.
+    
     Args:
         text: Текст для перевірки
         user_history: Історія повідомлень користувача
@@ -304,22 +299,7 @@ def is_spam_content(text: str, user_history: List[str] = None) -> bool:
     Returns:
         True якщо контент схожий на спам
     """
-    # Перевірка на повторення символів
-    if re.search(r'(.)\1{5,}', text):  # 6+ однакових символів підряд
-        return True
-    
-    # Перевірка на занадто багато великих літер
-    upper_count = sum(1 for char in text if char.isupper())
-    if len(text) > 10 and (upper_count / len(text)) > 0.7:
-        return True
-    
-    # Перевірка на повторення в історії
-    if user_history:
-        for prev_text in user_history[-5:]:  # Останні 5 повідомлень
-            if text.lower() == prev_text.lower():
-                return True
-    
-    return False
+    return get_content_filter().is_spam(text, user_history)
 
 # ===== СТАТИСТИЧНІ ФУНКЦІЇ =====
 
@@ -415,41 +395,32 @@ def generate_content_hash(text: str) -> str:
     normalized = clean_text(text.lower())
     return hashlib.md5(normalized.encode('utf-8')).hexdigest()
 
+# Локальний limiter для викликів без зовнішнього сховища
+_LOCAL_RATE_LIMITER = MemoryRateLimiter()
+
 def is_rate_limited(user_id: int, action: str, limit: int, window_seconds: int, 
-                   storage: Dict[str, List] = None) -> bool:
+                   storage: Dict[str, List[int]] = None) -> bool:
     """
-    Перевірка rate limiting для користувача
+    Перевірка rate limiting для користувача (GCRA)
     
     Args:
         user_id: ID користувача
         action: Тип дії
         limit: Ліміт дій
         window_seconds: Часове вікно в секундах
-        storage: Зовнішнє сховище для зберігання даних
+        storage: Зовнішнє сховище стану (за замовчуванням - спільний limiter)
     
     Returns:
         True якщо досягнуто ліміт
     """
-    if storage is None:
-        storage = {}
-    
     key = f"{user_id}_{action}"
-    now = datetime.now()
     
-    if key not in storage:
-        storage[key] = []
-    
-    # Очищення старих записів
-    cutoff_time = now - timedelta(seconds=window_seconds)
-    storage[key] = [timestamp for timestamp in storage[key] if timestamp > cutoff_time]
-    
-    # Перевірка ліміту
-    if len(storage[key]) >= limit:
-        return True
+    if storage is None:
+        return not _LOCAL_RATE_LIMITER.check(key, limit, window_seconds)
     
-    # Додавання нового запису
-    storage[key].append(now)
-    return False
+    now = int(time.monotonic() * 1000)
+    result, storage[key] = gcra(storage.get(key), now, limit, window_seconds * 1000)
+    return not result.allowed
 
 def sanitize_user_input(text: str) -> str:
     """
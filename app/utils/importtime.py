@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⏱️ ЗВІТ ПРО ЧАС ІМПОРТІВ ⏱️
+
+Що сповільнює холодний старт:
+✅ Запуск окремого інтерпретатора з -X importtime для модулів старту
+✅ Топ модулів за власним та накопиченим часом імпорту
+✅ Сумарний час по пакетах верхнього рівня (aiogram, sqlalchemy, config, ...)
+
+Використання:
+    python -m utils.importtime                  # модулі старту бота
+    python -m utils.importtime handlers.duel_handlers --top 30
+"""
+
+import os
+import re
+import sys
+import argparse
+import subprocess
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Sequence
+
+# Що імпортується до початку polling
+STARTUP_MODULES = [
+    "aiogram",
+    "main",
+    "handlers",
+    "handlers.lazy",
+    "middlewares",
+    "utils.fsm_storage",
+    "database",
+    "services.automated_scheduler",
+]
+
+APP_DIR = Path(__file__).resolve().parent.parent
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+class ImportEntry(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+def parse_importtime(output: str) -> List[ImportEntry]:
+    """Розбір stderr від python -X importtime"""
+    entries = []
+    for line in output.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            entries.append(ImportEntry(module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return entries
+
+def collect_importtime(modules: Sequence[str] = STARTUP_MODULES) -> List[ImportEntry]:
+    """Імпорт модулів у чистому інтерпретаторі з -X importtime"""
+    code = "\n".join(
+        f"try:\n    import {module}\nexcept Exception:\n    pass" for module in modules
+    )
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(APP_DIR), os.getenv("PYTHONPATH")])))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=str(APP_DIR), env=env, capture_output=True, text=True
+    )
+    return parse_importtime(result.stderr)
+
+def format_report(entries: List[ImportEntry], top: int = 20) -> str:
+    """Текстовий звіт: разом, пакети, найповільніші модулі"""
+    total_us = sum(entry.self_us for entry in entries)
+
+    packages: Dict[str, int] = defaultdict(int)
+    for entry in entries:
+        packages[entry.module.split(".", 1)[0]] += entry.self_us
+
+    lines = [f"⏱️ Імпорт: {total_us / 1000:.1f} мс, модулів: {len(entries)}", "", "📦 Пакети:"]
+    for package, us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]:
+        lines.append(f"  {us / 1000:8.1f} мс  {package}")
+
+    lines += ["", "🐢 Модулі (власний час):"]
+    for entry in sorted(entries, key=lambda entry: entry.self_us, reverse=True)[:top]:
+        lines.append(f"  {entry.self_us / 1000:8.1f} мс  {entry.module}")
+
+    lines += ["", "🌳 Модулі верхнього рівня (з залежностями):"]
+    for entry in sorted((e for e in entries if e.depth == 0), key=lambda e: e.cumulative_us, reverse=True)[:top]:
+        lines.append(f"  {entry.cumulative_us / 1000:8.1f} мс  {entry.module}")
+
+    return "\n".join(lines)
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Звіт про час імпортів при старті бота")
+    parser.add_argument("modules", nargs="*", help="Модулі (за замовчуванням - модулі старту)")
+    parser.add_argument("--top", type=int, default=20, help="Рядків у кожному розділі")
+    args = parser.parse_args()
+
+    entries = collect_importtime(args.modules or STARTUP_MODULES)
+    if not entries:
+        print("❌ Немає даних -X importtime")
+        return 1
+    print(format_report(entries, args.top))
+    return 0
+
+# ===== ЕКСПОРТ =====
+__all__ = ['ImportEntry', 'parse_importtime', 'collect_importtime', 'format_report', 'STARTUP_MODULES']
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🔒 ЛІДЕР ПЛАНУВАЛЬНИКА 🔒
+
+Кілька реплік бота - кожна фонова задача виконується один раз:
+✅ Вибір лідера через PostgreSQL advisory lock (блокування сесії тримає окреме з'єднання)
+✅ Файлове блокування (flock) для кількох процесів на одному хості
+✅ Лідер тримає блокування, поки живий; резервні репліки періодично пробують його взяти
+✅ Перед кожною задачею лідера блокування перевіряється ще раз (обрив з'єднання між спробами)
+✅ Падіння лідера звільняє блокування автоматично (закрите з'єднання / файл)
+✅ Задачі лідера обгортаються leader_only, локальні (буфери процесу) - ні
+"""
+
+import os
+import asyncio
+import hashlib
+import logging
+import functools
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    from config.settings import JOB_LOCK_BACKEND, JOB_LOCK_PATH, LEADER_RETRY_SECONDS
+except ImportError:
+    JOB_LOCK_BACKEND, JOB_LOCK_PATH, LEADER_RETRY_SECONDS = "auto", Path("data") / "scheduler.lock", 15
+
+# fcntl є тільки на POSIX
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    fcntl = None
+    FCNTL_AVAILABLE = False
+
+LEADER_LOCK_NAME = "bobik:scheduler-leader"
+
+def lock_key(name: str) -> int:
+    """Стабільний 64-бітний ключ advisory lock з назви"""
+    return int.from_bytes(hashlib.blake2b(name.encode("utf-8"), digest_size=8).digest(), "big", signed=True)
+
+# ===== БЛОКУВАННЯ =====
+
+class AdvisoryLock:
+    """pg_try_advisory_lock на окремому з'єднанні (живе, поки тримається блокування)"""
+
+    backend = "postgres"
+
+    def __init__(self, name: str):
+        self.name = name
+        self.key = lock_key(name)
+        self._connection = None
+
+    def try_acquire(self) -> bool:
+        from sqlalchemy import text
+
+        if self._connection is not None:
+            return self._alive()
+
+        from database import database
+        if database.engine is None:
+            return False
+
+        connection = database.engine.connect()
+        try:
+            acquired = connection.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": self.key}).scalar()
+            connection.commit()  # Блокування сесії лишається, транзакція - ні
+        except Exception:
+            connection.close()
+            raise
+        if not acquired:
+            connection.close()
+            return False
+        self._connection = connection
+        return True
+
+    def _alive(self) -> bool:
+        """Перевірка з'єднання: обрив = блокування вже втрачено"""
+        from sqlalchemy import text
+        try:
+            self._connection.execute(text("SELECT 1"))
+            self._connection.commit()
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ З'єднання блокування {self.name} втрачено: {e}")
+            try:
+                self._connection.invalidate()
+            except Exception:
+                pass
+            self._connection = None
+            return False
+
+    def release(self) -> None:
+        if self._connection is None:
+            return
+        from sqlalchemy import text
+        try:
+            self._connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": self.key})
+            self._connection.commit()
+        except Exception as e:
+            logger.warning(f"⚠️ Звільнення блокування {self.name}: {e}")
+        finally:
+            self._connection.close()
+            self._connection = None
+
+class FileLock:
+    """flock на файлі: один власник серед процесів хоста"""
+
+    backend = "file"
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._fd: Optional[int] = None
+
+    def try_acquire(self) -> bool:
+        if self._fd is not None:
+            return True
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(str(self.path), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+
+        # PID лідера - для діагностики
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self._fd = fd
+        return True
+
+    def release(self) -> None:
+        if self._fd is None:
+            return
+        try:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+class NoLock:
+    """Одна репліка: завжди лідер"""
+
+    backend = "none"
+
+    def try_acquire(self) -> bool:
+        return True
+
+    def release(self) -> None:
+        pass
+
+def create_leader_lock(backend: str = JOB_LOCK_BACKEND):
+    """Блокування лідера за налаштуваннями: auto обирає postgres для PostgreSQL, інакше file"""
+    if backend == "auto":
+        try:
+            from database.database import get_database_url
+            backend = "postgres" if get_database_url().startswith("postgresql") else "file"
+        except ImportError:
+            backend = "file"
+
+    if backend == "postgres":
+        return AdvisoryLock(LEADER_LOCK_NAME)
+    if backend == "file":
+        if FCNTL_AVAILABLE:
+            return FileLock(JOB_LOCK_PATH)
+        logger.warning("⚠️ fcntl недоступний - файлове блокування вимкнено")
+    return NoLock()
+
+# ===== ЛІДЕР =====
+
+class SchedulerLeader:
+    """Лідерство репліки: тримається, поки процес живий"""
+
+    def __init__(self, lock=None, retry_seconds: int = LEADER_RETRY_SECONDS):
+        self.lock = lock or create_leader_lock()
+        self.retry_seconds = retry_seconds
+        self.is_leader = False
+        self._task: Optional[asyncio.Task] = None
+        self._try_lock = asyncio.Lock()
+
+    async def _try(self) -> None:
+        # Одна спроба за раз: таймер і задачі не відкривають паралельних з'єднань
+        async with self._try_lock:
+            try:
+                leader = await asyncio.to_thread(self.lock.try_acquire)
+            except Exception as e:
+                logger.warning(f"⚠️ Блокування лідера недоступне: {e}")
+                leader = False
+
+            if leader != self.is_leader:
+                if leader:
+                    logger.info(f"👑 Ця репліка - лідер планувальника ({self.lock.backend}, PID {os.getpid()})")
+                else:
+                    logger.warning("🔒 Лідерство втрачено - фонові задачі виконує інша репліка")
+            self.is_leader = leader
+
+    async def start(self) -> None:
+        """Перша спроба - до запуску задач, далі - у фоні"""
+        if self._task is not None:
+            return
+        await self._try()
+        if not self.is_leader:
+            logger.info("🔒 Лідер планувальника - інша репліка, ця чекає в резерві")
+        self._task = asyncio.create_task(self._run(), name="scheduler_leader")
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.retry_seconds)
+            await self._try()
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.is_leader:
+            await asyncio.to_thread(self.lock.release)
+            self.is_leader = False
+
+    def leader_only(self, job: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        """Обгортка задачі планувальника: на резервних репліках - пропуск"""
+        @functools.wraps(job)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            # Блокування могло зникнути після останньої спроби таймера
+            await self._try()
+            if not self.is_leader:
+                logger.debug(f"🔒 {job.__name__}: пропуск, виконує лідер")
+                return None
+            return await job(*args, **kwargs)
+        return wrapper
+
+# ===== ГЛОБАЛЬНИЙ ЛІДЕР =====
+
+_leader: Optional[SchedulerLeader] = None
+
+def get_scheduler_leader() -> SchedulerLeader:
+    """Один лідер на процес для всіх планувальників"""
+    global _leader
+    if _leader is None:
+        _leader = SchedulerLeader()
+    return _leader
+
+# ===== ЕКСПОРТ =====
+__all__ = [
+    'AdvisoryLock', 'FileLock', 'NoLock', 'SchedulerLeader',
+    'create_leader_lock', 'get_scheduler_leader', 'lock_key'
+]
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⌨️ КЕШ INLINE-КЛАВІАТУР ⌨️
+
+Клавіатури не перебудовуються на кожне повідомлення:
+✅ Статичні клавіатури (без параметрів) будуються один раз і спільні для всіх
+✅ Параметризовані (ID контенту, лічильники голосів) - LRU за аргументами
+✅ JSON клавіатури серіалізується один раз і повторно використовується сесією бота
+✅ Моделі aiogram незмінні (frozen), тому спільний екземпляр безпечний
+"""
+
+import json
+import logging
+import functools
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAXSIZE = 4096          # Параметризованих клавіатур у LRU
+
+Builder = TypeVar("Builder", bound=Callable[..., Any])
+
+class KeyboardCache:
+    """Статичні клавіатури + LRU параметризованих + кеш їх JSON"""
+
+    __slots__ = ("maxsize", "_static", "_lru", "_json", "hits", "misses")
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE):
+        self.maxsize = maxsize
+        self._static: Dict[Hashable, Any] = {}
+        self._lru: "OrderedDict[Hashable, Any]" = OrderedDict()
+        # id(markup) -> JSON (None - ще не серіалізовано); тільки для клавіатур з кешу
+        self._json: Dict[int, Optional[str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, build: Callable[[], Any], static: bool = False) -> Any:
+        """Клавіатура з кешу або побудована build()"""
+        store = self._static if static else self._lru
+        markup = store.get(key)
+        if markup is not None:
+            self.hits += 1
+            if not static:
+                self._lru.move_to_end(key)
+            return markup
+
+        self.misses += 1
+        markup = build()
+        store[key] = markup
+        self._json[id(markup)] = None
+
+        if not static and len(self._lru) > self.maxsize:
+            _, evicted = self._lru.popitem(last=False)
+            self._json.pop(id(evicted), None)
+        return markup
+
+    def cached(self, builder: Builder) -> Builder:
+        """
+        Декоратор для функцій-конструкторів клавіатур
+
+        Виклик без аргументів - статична клавіатура, з аргументами - запис у LRU.
+        Аргументи мають бути hashable.
+        """
+        name = f"{builder.__module__}.{builder.__qualname__}"
+
+        @functools.wraps(builder)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not args and not kwargs:
+                return self.get(name, builder, static=True)
+            key = (name, args, tuple(sorted(kwargs.items())))
+            return self.get(key, lambda: builder(*args, **kwargs))
+
+        wrapper.uncached = builder
+        return wrapper
+
+    def serialized(self, markup: Any, serialize: Optional[Callable[[Any], str]] = None) -> Optional[str]:
+        """
+        JSON клавіатури з кешу; None - клавіатура побудована поза кешем
+
+        serialize(markup) викликається один раз на клавіатуру - сесія бота
+        передає серіалізацію aiogram (prepare_value), за замовчуванням
+        model_dump без None-полів.
+        """
+        key = id(markup)
+        if key not in self._json:
+            return None
+        data = self._json[key]
+        if data is None:
+            data = serialize(markup) if serialize else json.dumps(markup.model_dump(exclude_none=True))
+            self._json[key] = data
+        return data
+
+    def clear(self) -> None:
+        self._static.clear()
+        self._lru.clear()
+        self._json.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "static": len(self._static),
+            "parameterized": len(self._lru),
+            "maxsize": self.maxsize,
+            "serialized": sum(1 for data in self._json.values() if data is not None),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total * 100, 1) if total else 0.0,
+        }
+
+# ===== ГЛОБАЛЬНИЙ КЕШ =====
+
+keyboard_cache = KeyboardCache()
+
+def cached_keyboard(builder: Builder) -> Builder:
+    """Декоратор конструктора клавіатури через глобальний кеш"""
+    return keyboard_cache.cached(builder)
+
+def get_keyboard_cache() -> KeyboardCache:
+    return keyboard_cache
+
+# ===== ЕКСПОРТ =====
+__all__ = ['KeyboardCache', 'keyboard_cache', 'cached_keyboard', 'get_keyboard_cache']
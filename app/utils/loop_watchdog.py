@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🐕 СТОРОЖ EVENT LOOP 🐕
+
+Пошук синхронних викликів, що блокують бота:
+✅ Heartbeat-задача постійно міряє затримку event loop
+✅ Окремий потік помічає зависання і знімає стек головного потоку під час блокування
+✅ Місце блокування (файл:рядок функції з коду бота) + корутина, що виконувалась
+✅ Агрегація по місцях: кількість, сумарна та максимальна затримка
+✅ Звіт у логи та адмін-команду /loopstats
+"""
+
+import os
+import sys
+import html
+import time
+import asyncio
+import logging
+import threading
+import traceback
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    from config.settings import LOOP_WATCHDOG_ENABLED, LOOP_LAG_THRESHOLD_MS
+except ImportError:
+    LOOP_WATCHDOG_ENABLED, LOOP_LAG_THRESHOLD_MS = True, 100
+
+HEARTBEAT_INTERVAL = 0.05       # Секунд між вимірами затримки
+SAMPLES_KEPT = 2048             # Вимірів для перцентилів
+STACK_DEPTH = 12                # Кадрів стека у звіті
+
+APP_DIR = str(Path(__file__).resolve().parent.parent)
+
+# ===== ЗНІМОК СТЕКА =====
+
+def _is_app_frame(filename: str) -> bool:
+    filename = os.path.abspath(filename)
+    return filename.startswith(APP_DIR) and "site-packages" not in filename and not filename.endswith("loop_watchdog.py")
+
+def _blocking_site(stack: List[traceback.FrameSummary]) -> str:
+    """Найглибший кадр з коду бота - там і стоїть синхронний виклик"""
+    for frame in reversed(stack):
+        if _is_app_frame(frame.filename):
+            return f"{os.path.relpath(frame.filename, APP_DIR)}:{frame.lineno} {frame.name}"
+    frame = stack[-1] if stack else None
+    return f"{Path(frame.filename).name}:{frame.lineno} {frame.name}" if frame else "невідомо"
+
+def _task_name(loop: asyncio.AbstractEventLoop) -> str:
+    """Корутина поточної задачі loop (читання словника задач - безпечне з іншого потоку)"""
+    try:
+        task = asyncio.current_task(loop)
+    except RuntimeError:
+        return "-"
+    if task is None:
+        return "callback"
+    coro = task.get_coro()
+    return f"{task.get_name()} ({getattr(coro, '__qualname__', coro)})"
+
+# ===== СТОРОЖ =====
+
+class LoopWatchdog:
+    """Вимір затримки event loop і пошук блокуючих викликів"""
+
+    def __init__(self, threshold_ms: int = LOOP_LAG_THRESHOLD_MS, interval: float = HEARTBEAT_INTERVAL):
+        self.threshold = threshold_ms / 1000
+        self.interval = interval
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+        self._last_beat = time.monotonic()
+        # Знімок стека поточного зависання: (місце, корутина, стек)
+        self._pending: Optional[Tuple[str, str, List[str]]] = None
+        self._lock = threading.Lock()
+
+        self._samples: Deque[float] = deque(maxlen=SAMPLES_KEPT)
+        self._sites: Dict[str, Dict[str, Any]] = {}
+        self.stalls = 0
+        self.max_lag = 0.0
+        self.started_at: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Запуск з event loop (heartbeat-задача + потік-спостерігач)"""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self.started_at = time.time()
+        self._stopped.clear()
+
+        self._task = self._loop.create_task(self._heartbeat(), name="loop_watchdog")
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+        logger.info(f"🐕 Сторож event loop: поріг {self.threshold * 1000:.0f} мс")
+
+    async def stop(self) -> None:
+        self._stopped.set()
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._thread:
+            self._thread.join(timeout=1)
+
+    # ===== ВИМІР =====
+
+    async def _heartbeat(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._last_beat = now
+
+            lag = max(0.0, now - expected)
+            self._samples.append(lag)
+            if lag >= self.threshold:
+                self._record(lag)
+
+    def _watch(self) -> None:
+        """Потік-спостерігач: стек головного потоку, поки loop стоїть"""
+        captured_for = None
+        while not self._stopped.wait(self.threshold / 2):
+            beat = self._last_beat
+            if captured_for == beat:
+                continue  # Це зависання вже знято
+            if time.monotonic() - beat < self.interval + self.threshold:
+                continue
+
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            stack = traceback.extract_stack(frame)
+            with self._lock:
+                self._pending = (
+                    _blocking_site(stack),
+                    _task_name(self._loop),
+                    traceback.format_list(stack[-STACK_DEPTH:]),
+                )
+            captured_for = beat
+
+    def _record(self, lag: float) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, None
+        site, task, stack = pending or ("не знято (коротке блокування)", "-", [])
+
+        self.stalls += 1
+        self.max_lag = max(self.max_lag, lag)
+
+        entry = self._sites.get(site)
+        if entry is None:
+            entry = self._sites[site] = {"site": site, "count": 0, "total": 0.0, "max": 0.0}
+        entry["count"] += 1
+        entry["total"] += lag
+        entry["max"] = max(entry["max"], lag)
+        entry["task"] = task
+        entry["stack"] = stack
+        entry["last"] = time.time()
+
+        logger.warning(f"🐕 Event loop заблоковано на {lag * 1000:.0f} мс: {site} [{task}]")
+        if stack and entry["count"] == 1:
+            logger.warning("🐕 Стек блокування:\n" + "".join(stack))
+
+    # ===== ЗВІТ =====
+
+    def _percentile(self, samples: List[float], percent: float) -> float:
+        if not samples:
+            return 0.0
+        return samples[min(len(samples) - 1, int(len(samples) * percent / 100))]
+
+    def get_stats(self) -> Dict[str, Any]:
+        samples = sorted(self._samples)
+        return {
+            "running": self.running,
+            "threshold_ms": self.threshold * 1000,
+            "stalls": self.stalls,
+            "max_lag_ms": round(self.max_lag * 1000, 1),
+            "p50_ms": round(self._percentile(samples, 50) * 1000, 1),
+            "p99_ms": round(self._percentile(samples, 99) * 1000, 1),
+            "sites": len(self._sites),
+        }
+
+    def top_sites(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Місця блокування за сумарною затримкою"""
+        return sorted(self._sites.values(), key=lambda entry: entry["total"], reverse=True)[:limit]
+
+    def format_report(self, limit: int = 10) -> str:
+        stats = self.get_stats()
+        lines = [
+            f"🐕 <b>EVENT LOOP</b>",
+            f"Затримка: p50 {stats['p50_ms']} мс, p99 {stats['p99_ms']} мс, макс {stats['max_lag_ms']} мс",
+            f"Блокувань понад {stats['threshold_ms']:.0f} мс: {stats['stalls']}",
+        ]
+        sites = self.top_sites(limit)
+        if sites:
+            lines.append("")
+            lines.append("🐢 <b>Місця блокування:</b>")
+            for entry in sites:
+                lines.append(
+                    f"• <code>{html.escape(entry['site'])}</code>\n"
+                    f"  {entry['count']}× разом {entry['total'] * 1000:.0f} мс, "
+                    f"макс {entry['max'] * 1000:.0f} мс [{html.escape(entry['task'])}]"
+                )
+        return "\n".join(lines)
+
+    def reset(self) -> None:
+        self._samples.clear()
+        self._sites.clear()
+        self.stalls = 0
+        self.max_lag = 0.0
+
+# ===== ГЛОБАЛЬНИЙ СТОРОЖ =====
+
+_watchdog: Optional[LoopWatchdog] = None
+
+def get_loop_watchdog() -> LoopWatchdog:
+    global _watchdog
+    if _watchdog is None:
+        _watchdog = LoopWatchdog()
+    return _watchdog
+
+def start_loop_watchdog() -> Optional[LoopWatchdog]:
+    """Запуск сторожа, якщо увімкнено в налаштуваннях"""
+    if not LOOP_WATCHDOG_ENABLED:
+        return None
+    watchdog = get_loop_watchdog()
+    watchdog.start()
+    return watchdog
+
+# ===== ЕКСПОРТ =====
+__all__ = ['LoopWatchdog', 'get_loop_watchdog', 'start_loop_watchdog']
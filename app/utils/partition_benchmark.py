@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+📊 БЕНЧМАРК ПАРТИЦІЮВАННЯ (ОФЛАЙН) 📊
+
+Пропускна здатність ingress -> воркери залежно від кількості процесів:
+✅ Синтетичні оновлення від багатьох користувачів, розподіл user_id % N
+✅ Воркер імітує роботу хендлера (CPU на кожне оновлення)
+✅ Час до повної обробки (flush) та прискорення відносно одного воркера
+
+Використання:
+    python -m utils.partition_benchmark
+    python -m utils.partition_benchmark --workers 1 2 4 8 --updates 20000 --work-ms 0.5
+"""
+
+import sys
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+import multiprocessing
+from typing import Any, Dict, List
+
+from utils.partitioning import PartitionRouter, PartitionServer
+
+# ===== ВОРКЕР =====
+
+def _burn(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+def _worker(index: int, ipc_dir: str, work_ms: float) -> None:
+    async def handle(update: Dict[str, Any]) -> None:
+        _burn(work_ms / 1000)
+
+    async def serve() -> None:
+        await PartitionServer(index, handle, ipc_dir).serve_forever()
+
+    asyncio.run(serve())
+
+# ===== ВИМІР =====
+
+def _updates(count: int, users: int) -> List[Dict[str, Any]]:
+    rng = random.Random(42)
+    user_ids = [rng.randrange(1, 10 ** 10) for _ in range(users)]
+    return [
+        {"update_id": update_id, "message": {
+            "message_id": update_id, "date": 0, "text": "/meme",
+            "chat": {"id": user_id, "type": "private"},
+            "from": {"id": user_id, "is_bot": False, "first_name": "Тест"},
+        }}
+        for update_id, user_id in enumerate((rng.choice(user_ids) for _ in range(count)), 1)
+    ]
+
+async def measure(workers: int, updates: List[Dict[str, Any]], work_ms: float) -> Dict[str, float]:
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory(prefix="bobik-ipc-") as ipc_dir:
+        processes = [context.Process(target=_worker, args=(index, ipc_dir, work_ms), daemon=True)
+                     for index in range(workers)]
+        for process in processes:
+            process.start()
+
+        router = PartitionRouter(workers, ipc_dir)
+        try:
+            await router.flush()  # З'єднання з усіма воркерами до старту відліку
+            started = time.perf_counter()
+            for update in updates:
+                await router.forward(update)
+            await router.flush()
+            elapsed = time.perf_counter() - started
+        finally:
+            await router.close()
+            for process in processes:
+                process.terminate()
+                process.join()
+
+    return {"workers": workers, "elapsed": elapsed, "per_second": len(updates) / elapsed,
+            "skew": max(router.forwarded) / (len(updates) / workers)}
+
+def format_report(results: List[Dict[str, float]], updates: int, work_ms: float) -> str:
+    lines = [f"📊 {updates} оновлень, {work_ms} мс CPU на оновлення", ""]
+    base = results[0]["per_second"] if results else 0
+    for result in results:
+        lines.append(
+            f"  воркерів {result['workers']:>2}: {result['per_second']:8.0f} онов./с  "
+            f"x{result['per_second'] / base:.2f}  (перекіс партицій {result['skew']:.2f})"
+        )
+    lines += ["", f"🖥️ Ядер CPU: {multiprocessing.cpu_count()} - прискорення обмежене кількістю ядер"]
+    return "\n".join(lines)
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Офлайн бенчмарк партиціювання оновлень")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="Кількості воркерів")
+    parser.add_argument("--updates", type=int, default=10000, help="Оновлень на замір")
+    parser.add_argument("--users", type=int, default=5000, help="Різних користувачів")
+    parser.add_argument("--work-ms", type=float, default=0.5, help="CPU хендлера на оновлення, мс")
+    args = parser.parse_args()
+
+    updates = _updates(args.updates, args.users)
+    results = [asyncio.run(measure(workers, updates, args.work_ms)) for workers in args.workers]
+    print(format_report(results, args.updates, args.work_ms))
+    return 0
+
+# ===== ЕКСПОРТ =====
+__all__ = ['measure', 'format_report']
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🧩 ПАРТИЦІЮВАННЯ ОНОВЛЕНЬ ЗА КОРИСТУВАЧЕМ 🧩
+
+Основа горизонтального масштабування (без залежності від aiogram):
+✅ Партиція = user_id % N: користувач завжди потрапляє в той самий процес
+   (FSM, кеші користувачів, seen-множини реакцій лишаються локальними та актуальними)
+✅ Локальний IPC: Unix-сокет на воркер (TCP localhost там, де Unix-сокетів немає),
+   кадри з 4-байтовою довжиною
+✅ У воркері оновлення одного користувача виконуються строго по черзі,
+   різних користувачів - паралельно
+✅ Порожній кадр - flush: воркер відповідає, коли все надіслане раніше оброблено
+"""
+
+import json
+import socket
+import struct
+import asyncio
+import logging
+from collections import deque
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# orjson опціональний - без нього stdlib json
+try:
+    import orjson
+
+    def json_loads(data: Union[bytes, str]) -> Any:
+        return orjson.loads(data)
+
+    def json_dumps(value: Any) -> bytes:
+        return orjson.dumps(value)
+except ImportError:
+    orjson = None
+
+    def json_loads(data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+    def json_dumps(value: Any) -> bytes:
+        return json.dumps(value, ensure_ascii=False).encode("utf-8")
+
+IPC_TCP_BASE_PORT = 47800       # Порти воркерів без Unix-сокетів: база + номер
+DEFAULT_CONCURRENCY = 100       # Одночасних обробок у воркері
+DEFAULT_MAX_PENDING = 10000     # Оновлень у черзі воркера до зупинки читання
+
+_HEADER = struct.Struct(">I")
+
+Address = Tuple[str, Any]
+
+# ===== ПАРТИЦІЯ =====
+
+def extract_user_id(update: Dict[str, Any]) -> int:
+    """
+    Ключ партиції з сирого оновлення Telegram
+
+    from / user об'єкта оновлення, інакше чат (канали, опитування без автора);
+    0 - оновлення без користувача та чату.
+    """
+    for key, value in update.items():
+        if key == "update_id" or not isinstance(value, dict):
+            continue
+        user = value.get("from") or value.get("user")
+        if isinstance(user, dict) and "id" in user:
+            return user["id"]
+        chat = value.get("chat")
+        if chat is None and isinstance(value.get("message"), dict):
+            chat = value["message"].get("chat")  # callback_query без from
+        if isinstance(chat, dict) and "id" in chat:
+            return chat["id"]
+    return 0
+
+def partition_for(update: Dict[str, Any], partitions: int) -> int:
+    return abs(extract_user_id(update)) % partitions
+
+# ===== IPC =====
+
+def worker_address(index: int, ipc_dir: Union[str, Path]) -> Address:
+    if hasattr(socket, "AF_UNIX"):
+        return ("unix", str(Path(ipc_dir) / f"worker-{index}.sock"))
+    return ("tcp", ("127.0.0.1", IPC_TCP_BASE_PORT + index))
+
+async def open_connection(address: Address) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    kind, target = address
+    if kind == "unix":
+        return await asyncio.open_unix_connection(target)
+    return await asyncio.open_connection(*target)
+
+async def start_server(address: Address, callback) -> asyncio.AbstractServer:
+    kind, target = address
+    if kind == "unix":
+        path = Path(target)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists():
+            path.unlink()  # Сокет попереднього запуску
+        return await asyncio.start_unix_server(callback, str(path))
+    return await asyncio.start_server(callback, *target)
+
+def encode_frame(payload: bytes) -> bytes:
+    return _HEADER.pack(len(payload)) + payload
+
+async def read_frame(reader: asyncio.StreamReader) -> Optional[bytes]:
+    """Наступний кадр; None - з'єднання закрито"""
+    try:
+        header = await reader.readexactly(_HEADER.size)
+        return await reader.readexactly(_HEADER.unpack(header)[0])
+    except asyncio.IncompleteReadError:
+        return None
+
+# ===== ПОСЛІДОВНІСТЬ ПО КЛЮЧУ =====
+
+class KeyedSerialExecutor:
+    """Черга на ключ: порядок у межах ключа, паралельність між ключами"""
+
+    def __init__(self, handler: Callable[[Any], Awaitable[Any]],
+                 concurrency: int = DEFAULT_CONCURRENCY, max_pending: int = DEFAULT_MAX_PENDING):
+        self.handler = handler
+        self.max_pending = max_pending
+        self.pending = 0
+        self.processed = 0
+        self.failed = 0
+
+        self._queues: Dict[int, Deque[Any]] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._room = asyncio.Event()
+        self._room.set()
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    async def submit(self, key: int, item: Any) -> None:
+        """Додавання в чергу ключа; при переповненні чекає (зворотний тиск на читання)"""
+        while self.pending >= self.max_pending:
+            self._room.clear()
+            await self._room.wait()
+
+        self.pending += 1
+        self._idle.clear()
+        queue = self._queues.get(key)
+        if queue is not None:
+            queue.append(item)
+            return
+
+        self._queues[key] = deque([item])
+        task = asyncio.create_task(self._drain(key))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _drain(self, key: int) -> None:
+        queue = self._queues[key]
+        try:
+            while queue:
+                item = queue.popleft()
+                async with self._semaphore:
+                    try:
+                        await self.handler(item)
+                        self.processed += 1
+                    except Exception as e:
+                        self.failed += 1
+                        logger.error(f"❌ Обробка оновлення (ключ {key}): {e}")
+                self.pending -= 1
+                self._room.set()
+        finally:
+            del self._queues[key]
+            if not self._queues:
+                self._idle.set()
+
+    async def join(self) -> None:
+        """Очікування обробки всього, що вже в чергах"""
+        await self._idle.wait()
+
+# ===== ВОРКЕР =====
+
+class PartitionServer:
+    """Сервер партиції у процесі-воркері: кадри з ingress -> handler(update)"""
+
+    def __init__(self, index: int, handler: Callable[[Dict[str, Any]], Awaitable[Any]],
+                 ipc_dir: Union[str, Path], concurrency: int = DEFAULT_CONCURRENCY,
+                 max_pending: int = DEFAULT_MAX_PENDING):
+        self.index = index
+        self.address = worker_address(index, ipc_dir)
+        self.executor = KeyedSerialExecutor(handler, concurrency, max_pending)
+        self.received = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        self._server = await start_server(self.address, self._on_connection)
+        logger.info(f"🧩 Воркер {self.index} слухає {self.address[1]}")
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def _on_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                payload = await read_frame(reader)
+                if payload is None:
+                    break
+                if not payload:
+                    await self.executor.join()
+                    writer.write(encode_frame(b""))
+                    await writer.drain()
+                    continue
+
+                try:
+                    update = json_loads(payload)
+                except ValueError as e:
+                    logger.warning(f"⚠️ Воркер {self.index}: некоректний кадр: {e}")
+                    continue
+                self.received += 1
+                await self.executor.submit(extract_user_id(update), update)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        await self.executor.join()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"index": self.index, "received": self.received, "processed": self.executor.processed,
+                "failed": self.executor.failed, "pending": self.executor.pending}
+
+# ===== INGRESS =====
+
+class PartitionRouter:
+    """Ingress-сторона: одне з'єднання на воркер, кадри йдуть у порядку надходження"""
+
+    def __init__(self, partitions: int, ipc_dir: Union[str, Path], connect_timeout: float = 30.0):
+        self.partitions = partitions
+        self.addresses = [worker_address(index, ipc_dir) for index in range(partitions)]
+        self.connect_timeout = connect_timeout
+        self.forwarded: List[int] = [0] * partitions
+
+        self._connections: Dict[int, Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = {}
+        self._locks = [asyncio.Lock() for _ in range(partitions)]
+
+    async def _connection(self, index: int) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        connection = self._connections.get(index)
+        if connection is not None:
+            return connection
+
+        async with self._locks[index]:
+            connection = self._connections.get(index)
+            if connection is not None:
+                return connection
+
+            deadline = asyncio.get_running_loop().time() + self.connect_timeout
+            while True:
+                try:
+                    connection = await open_connection(self.addresses[index])
+                    break
+                except (ConnectionError, FileNotFoundError, OSError):
+                    if asyncio.get_running_loop().time() > deadline:
+                        raise
+                    await asyncio.sleep(0.1)  # Воркер ще стартує або перезапускається
+
+            self._connections[index] = connection
+            return connection
+
+    def _drop(self, index: int) -> None:
+        connection = self._connections.pop(index, None)
+        if connection is not None:
+            connection[1].close()
+
+    async def send(self, index: int, payload: bytes) -> None:
+        """Кадр воркеру; обрив - одна спроба з новим з'єднанням"""
+        for attempt in (1, 2):
+            _, writer = await self._connection(index)
+            try:
+                writer.write(encode_frame(payload))
+                await writer.drain()
+                return
+            except ConnectionError:
+                self._drop(index)
+                if attempt == 2:
+                    raise
+
+    async def forward(self, update: Union[Dict[str, Any], bytes]) -> int:
+        """Оновлення у партицію його користувача; повертає номер партиції"""
+        if isinstance(update, (bytes, bytearray)):
+            payload, update = bytes(update), json_loads(update)
+            if not isinstance(update, dict):
+                raise ValueError("Оновлення має бути JSON-об'єктом")
+        else:
+            payload = json_dumps(update)
+        index = partition_for(update, self.partitions)
+        await self.send(index, payload)
+        self.forwarded[index] += 1
+        return index
+
+    async def flush(self) -> None:
+        """Очікування, поки всі воркери оброблять надіслане"""
+        async def flush_one(index: int) -> None:
+            reader, _ = await self._connection(index)
+            await self.send(index, b"")
+            if await read_frame(reader) is None:
+                raise ConnectionError(f"Воркер {index} закрив з'єднання")
+        await asyncio.gather(*(flush_one(index) for index in range(self.partitions)))
+
+    async def close(self) -> None:
+        for index in list(self._connections):
+            self._drop(index)
+
+# ===== ЕКСПОРТ =====
+__all__ = [
+    'extract_user_id', 'partition_for', 'worker_address',
+    'KeyedSerialExecutor', 'PartitionServer', 'PartitionRouter',
+    'encode_frame', 'read_frame', 'json_loads', 'json_dumps'
+]
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🏆 ТАБЛИЦЯ РАНГІВ 🏆
+
+Єдине джерело порогів рангів:
+✅ Ранги за балами з settings.RANK_REQUIREMENTS, ранги дуелістів за рейтингом
+✅ Пороги сортуються один раз при імпорті, пошук через bisect - O(log k)
+✅ Векторизований пошук для масових задач та лідербордів (numpy, якщо є)
+✅ SQL CASE для перерахунку рангів одним UPDATE
+"""
+
+import logging
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# numpy опціональний - без нього векторний пошук іде через bisect
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+DEFAULT_RANK_REQUIREMENTS = {
+    "🤡 Новачок": 0,
+    "😄 Сміхун": 100,
+    "😂 Гуморист": 250,
+    "🎭 Комік": 500,
+    "👑 Мастер Рофлу": 1000,
+    "🏆 Король Гумору": 2500,
+    "🌟 Легенда Мемів": 5000,
+    "🚀 Гумористичний Геній": 10000,
+}
+
+DUEL_RANK_REQUIREMENTS = {
+    "🥉 Стажер": 0,
+    "🎯 Новачок": 1000,
+    "🔥 Досвідчений": 1200,
+    "⚡ Професіонал": 1400,
+    "⭐ Експерт": 1600,
+    "🏆 Майстер": 1800,
+    "👑 Гранд-майстер": 2000,
+}
+
+class RankTable:
+    """Відсортована таблиця порогів з пошуком рангу за значенням"""
+
+    __slots__ = ("thresholds", "names", "_index", "_np_thresholds", "_np_names")
+
+    def __init__(self, requirements: Dict[str, int]):
+        ordered = sorted(requirements.items(), key=lambda item: item[1])
+        self.thresholds: Tuple[int, ...] = tuple(points for _, points in ordered)
+        self.names: Tuple[str, ...] = tuple(name for name, _ in ordered)
+        self._index = {name: position for position, name in enumerate(self.names)}
+
+        if NUMPY_AVAILABLE:
+            self._np_thresholds = np.asarray(self.thresholds, dtype=np.int64)
+            self._np_names = np.asarray(self.names, dtype=object)
+        else:
+            self._np_thresholds = self._np_names = None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @property
+    def default(self) -> str:
+        return self.names[0]
+
+    def position(self, value: int) -> int:
+        """Індекс рангу (0 - найнижчий)"""
+        return max(bisect_right(self.thresholds, value or 0) - 1, 0)
+
+    def position_of(self, name: str) -> Optional[int]:
+        """Індекс рангу за назвою (None для невідомих назв)"""
+        return self._index.get(name)
+
+    def rank_for(self, value: int) -> str:
+        """Ранг для значення"""
+        return self.names[self.position(value)]
+
+    def next_rank(self, value: int) -> Optional[Tuple[str, int]]:
+        """
+        Наступний ранг
+
+        Returns:
+            (назва, скільки ще потрібно) або None на максимальному ранзі
+        """
+        position = bisect_right(self.thresholds, value or 0)
+        if position >= len(self.thresholds):
+            return None
+        return self.names[position], self.thresholds[position] - (value or 0)
+
+    def positions(self, values: Iterable[int]) -> Sequence[int]:
+        """Векторний індекс рангів для масиву значень"""
+        if NUMPY_AVAILABLE:
+            array = np.asarray(values if isinstance(values, np.ndarray) else list(values), dtype=np.int64)
+            return np.maximum(np.searchsorted(self._np_thresholds, array, side="right") - 1, 0)
+        return [self.position(value) for value in values]
+
+    def ranks_for(self, values: Iterable[int]) -> List[str]:
+        """Векторний пошук рангів (масові задачі, лідерборди)"""
+        positions = self.positions(values)
+        if NUMPY_AVAILABLE:
+            return self._np_names[positions].tolist()
+        return [self.names[position] for position in positions]
+
+    def case(self, column):
+        """
+        SQL вираз рангу для колонки
+
+        CASE WHEN col >= max THEN '...' ... ELSE найнижчий END
+        """
+        from sqlalchemy import case, func
+
+        value = func.coalesce(column, 0)
+        return case(
+            *[
+                (value >= threshold, name)
+                for threshold, name in zip(reversed(self.thresholds[1:]), reversed(self.names[1:]))
+            ],
+            else_=self.default
+        )
+
+def _load_requirements() -> Dict[str, int]:
+    try:
+        from config.settings import RANK_REQUIREMENTS
+        return dict(RANK_REQUIREMENTS)
+    except ImportError:
+        return dict(DEFAULT_RANK_REQUIREMENTS)
+
+# ===== СПІЛЬНІ ТАБЛИЦІ =====
+
+POINT_RANKS = RankTable(_load_requirements())
+DUEL_RANKS = RankTable(DUEL_RANK_REQUIREMENTS)
+
+RANK_THRESHOLDS = POINT_RANKS.thresholds
+RANK_NAMES = POINT_RANKS.names
+DEFAULT_RANK = POINT_RANKS.default
+
+def rank_for(points: int) -> str:
+    """Ранг за балами"""
+    return POINT_RANKS.rank_for(points)
+
+def next_rank(points: int) -> Optional[Tuple[str, int]]:
+    """Наступний ранг за балами: (назва, скільки балів потрібно) або None"""
+    return POINT_RANKS.next_rank(points)
+
+def ranks_for(points: Iterable[int]) -> List[str]:
+    """Ранги для масиву балів"""
+    return POINT_RANKS.ranks_for(points)
+
+def rank_case(points_column):
+    """SQL CASE рангу для колонки балів"""
+    return POINT_RANKS.case(points_column)
+
+def duel_rank_for(rating: int) -> str:
+    """Ранг дуеліста за рейтингом"""
+    return DUEL_RANKS.rank_for(rating)
+
+# ===== ЕКСПОРТ =====
+__all__ = [
+    'RankTable', 'POINT_RANKS', 'DUEL_RANKS',
+    'RANK_THRESHOLDS', 'RANK_NAMES', 'DEFAULT_RANK',
+    'rank_for', 'next_rank', 'ranks_for', 'rank_case', 'duel_rank_for'
+]
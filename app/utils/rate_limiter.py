@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⏱️ RATE LIMITER (GCRA) ⏱️
+
+Обмеження частоти дій користувачів:
+✅ GCRA - рівномірне вікно без списку міток часу
+✅ Два цілих числа на ключ (TAT та час останнього попередження)
+✅ Колесо таймерів для видалення неактивних ключів
+✅ Redis бекенд (Lua скрипт) для кількох процесів бота
+"""
+
+import time
+import logging
+from typing import Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Redis опціональний
+try:
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    aioredis = None
+    REDIS_AVAILABLE = False
+
+# ===== КОНСТАНТИ =====
+
+WHEEL_SLOTS = 64               # Кількість слотів колеса
+WHEEL_TICK_MS = 1000           # Ширина слота (мс)
+REDIS_KEY_PREFIX = "ratelimit:"
+
+
+def _now_ms() -> int:
+    return int(time.monotonic() * 1000)
+
+
+class RateLimitResult:
+    """Результат перевірки ліміту"""
+
+    __slots__ = ("allowed", "retry_after", "remaining", "notify")
+
+    def __init__(self, allowed: bool, retry_after: float = 0.0, remaining: int = 0, notify: bool = False):
+        self.allowed = allowed
+        self.retry_after = retry_after    # Секунд до наступної дозволеної дії
+        self.remaining = remaining        # Скільки дій ще доступно без очікування
+        self.notify = notify              # Перша відмова в цьому вікні - варто попередити
+
+    def __bool__(self) -> bool:
+        return self.allowed
+
+    def __repr__(self) -> str:
+        if self.allowed:
+            return f"<RateLimitResult allowed remaining={self.remaining}>"
+        return f"<RateLimitResult denied retry_after={self.retry_after:.1f}s>"
+
+
+def gcra(state: Optional[List[int]], now: int, limit: int, period_ms: int,
+         cost: int = 1) -> Tuple[RateLimitResult, List[int]]:
+    """
+    Один крок GCRA
+
+    Args:
+        state: [TAT, notice] або None для нового ключа
+        now: Поточний час (мс)
+        limit: Кількість дій за період
+        period_ms: Період (мс)
+        cost: Вага дії
+
+    Returns:
+        (результат, новий стан)
+    """
+    interval = period_ms / limit
+    tat, notice = state if state else (now, 0)
+    tat = max(tat, now)
+
+    new_tat = tat + interval * cost
+    allow_at = new_tat - period_ms
+
+    if now < allow_at:
+        notify = now >= notice
+        retry_after = (allow_at - now) / 1000
+        return (
+            RateLimitResult(False, retry_after=retry_after, notify=notify),
+            [tat, int(allow_at) if notify else notice]
+        )
+
+    remaining = int((now - allow_at) / interval + 1e-9) if interval else limit
+    return RateLimitResult(True, remaining=remaining), [int(new_tat), notice]
+
+
+class TimerWheel:
+    """
+    Колесо таймерів для видалення ключів
+
+    Ключ потрапляє в слот за часом закінчення; при повороті колеса
+    ключі з простроченим станом видаляються, решта переноситься.
+    """
+
+    def __init__(self, slots: int = WHEEL_SLOTS, tick_ms: int = WHEEL_TICK_MS):
+        self.slots: List[Set[str]] = [set() for _ in range(slots)]
+        self.tick_ms = tick_ms
+        self.current_tick: Optional[int] = None
+
+    def schedule(self, key: str, expires_at: int) -> None:
+        tick = max(expires_at // self.tick_ms, self.current_tick or 0)
+        self.slots[tick % len(self.slots)].add(key)
+
+    def advance(self, now: int, storage: Dict[str, List[int]]) -> int:
+        """
+        Поворот колеса до поточного часу
+
+        Returns:
+            Кількість видалених ключів
+        """
+        now_tick = now // self.tick_ms
+        if self.current_tick is None:
+            self.current_tick = now_tick
+            return 0
+
+        evicted = 0
+        steps = min(now_tick - self.current_tick, len(self.slots))
+        for offset in range(1, steps + 1):
+            slot = self.slots[(self.current_tick + offset) % len(self.slots)]
+            if not slot:
+                continue
+            keys = list(slot)
+            slot.clear()
+            for key in keys:
+                state = storage.get(key)
+                if state is None:
+                    continue
+                expires_at = max(state[0], state[1])
+                if expires_at <= now:
+                    del storage[key]
+                    evicted += 1
+                else:
+                    self.slots[(expires_at // self.tick_ms) % len(self.slots)].add(key)
+
+        self.current_tick = now_tick
+        return evicted
+
+
+class MemoryRateLimiter:
+    """In-memory GCRA limiter для одного процесу"""
+
+    backend = "memory"
+
+    def __init__(self, slots: int = WHEEL_SLOTS, tick_ms: int = WHEEL_TICK_MS):
+        self._storage: Dict[str, List[int]] = {}
+        self._wheel = TimerWheel(slots, tick_ms)
+
+    def __len__(self) -> int:
+        return len(self._storage)
+
+    def check(self, key: str, limit: int, period: float, cost: int = 1) -> RateLimitResult:
+        """Синхронна перевірка та облік дії"""
+        now = _now_ms()
+        self._wheel.advance(now, self._storage)
+
+        result, state = gcra(self._storage.get(key), now, limit, int(period * 1000), cost)
+        is_new = key not in self._storage
+        self._storage[key] = state
+
+        if is_new:
+            self._wheel.schedule(key, max(state))
+        return result
+
+    def peek(self, key: str, limit: int, period: float) -> RateLimitResult:
+        """Перевірка без обліку дії"""
+        now = _now_ms()
+        result, _ = gcra(self._storage.get(key), now, limit, int(period * 1000))
+        return result
+
+    async def hit(self, key: str, limit: int, period: float, cost: int = 1) -> RateLimitResult:
+        return self.check(key, limit, period, cost)
+
+    async def probe(self, key: str, limit: int, period: float) -> RateLimitResult:
+        return self.peek(key, limit, period)
+
+    async def reset(self, key: str) -> None:
+        self._storage.pop(key, None)
+
+    def get_stats(self) -> Dict[str, object]:
+        return {"backend": self.backend, "keys": len(self._storage)}
+
+
+# Атомарний GCRA на стороні Redis: HASH {tat, notice} + PEXPIRE замість колеса
+_REDIS_GCRA_SCRIPT = """
+local now = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+local period = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local commit = tonumber(ARGV[5])
+
+local interval = period / limit
+local state = redis.call('HMGET', KEYS[1], 'tat', 'notice')
+local tat = tonumber(state[1]) or now
+local notice = tonumber(state[2]) or 0
+if tat < now then tat = now end
+
+local new_tat = tat + interval * cost
+local allow_at = new_tat - period
+
+if now < allow_at then
+    local notify = 0
+    if now >= notice then
+        notify = 1
+        if commit == 1 then
+            redis.call('HSET', KEYS[1], 'tat', tat, 'notice', math.floor(allow_at))
+            redis.call('PEXPIRE', KEYS[1], math.ceil(allow_at - now) + period)
+        end
+    end
+    return {0, math.ceil(allow_at - now), 0, notify}
+end
+
+if commit == 1 then
+    redis.call('HSET', KEYS[1], 'tat', math.floor(new_tat), 'notice', notice)
+    redis.call('PEXPIRE', KEYS[1], math.ceil(new_tat - now) + 1)
+end
+return {1, 0, math.floor((now - allow_at) / interval), 0}
+"""
+
+
+class RedisRateLimiter:
+    """GCRA limiter зі спільним станом в Redis"""
+
+    backend = "redis"
+
+    def __init__(self, redis_url: str, prefix: str = REDIS_KEY_PREFIX):
+        if not REDIS_AVAILABLE:
+            raise RuntimeError("Пакет redis не встановлено")
+        self._redis = aioredis.from_url(redis_url)
+        self._script = self._redis.register_script(_REDIS_GCRA_SCRIPT)
+        self._prefix = prefix
+
+    async def _run(self, key: str, limit: int, period: float, cost: int, commit: int) -> RateLimitResult:
+        # Час епохи - однакова шкала для всіх процесів бота
+        now = int(time.time() * 1000)
+        allowed, retry_ms, remaining, notify = await self._script(
+            keys=[self._prefix + key],
+            args=[now, limit, int(period * 1000), cost, commit]
+        )
+        return RateLimitResult(bool(allowed), retry_after=retry_ms / 1000,
+                               remaining=int(remaining), notify=bool(notify))
+
+    async def hit(self, key: str, limit: int, period: float, cost: int = 1) -> RateLimitResult:
+        return await self._run(key, limit, period, cost, 1)
+
+    async def probe(self, key: str, limit: int, period: float) -> RateLimitResult:
+        return await self._run(key, limit, period, 1, 0)
+
+    async def reset(self, key: str) -> None:
+        await self._redis.delete(self._prefix + key)
+
+    async def close(self) -> None:
+        await self._redis.close()
+
+    def get_stats(self) -> Dict[str, object]:
+        return {"backend": self.backend}
+
+
+# ===== СПІЛЬНИЙ ЕКЗЕМПЛЯР =====
+
+_rate_limiter = None
+
+
+def get_rate_limiter():
+    """Спільний limiter: Redis якщо налаштовано, інакше пам'ять процесу"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        try:
+            from config.settings import REDIS_URL, RATE_LIMIT_BACKEND
+        except ImportError:
+            REDIS_URL, RATE_LIMIT_BACKEND = None, "memory"
+
+        if RATE_LIMIT_BACKEND == "redis" and REDIS_URL:
+            try:
+                _rate_limiter = RedisRateLimiter(REDIS_URL)
+            except Exception as e:
+                logger.warning(f"⚠️ Redis rate limiter недоступний: {e}")
+
+        if _rate_limiter is None:
+            _rate_limiter = MemoryRateLimiter()
+
+        logger.info(f"⏱️ Rate limiter: {_rate_limiter.backend}")
+    return _rate_limiter
+
+
+# ===== ЕКСПОРТ =====
+__all__ = [
+    'RateLimitResult', 'TimerWheel', 'MemoryRateLimiter', 'RedisRateLimiter',
+    'gcra', 'get_rate_limiter', 'REDIS_AVAILABLE'
+]
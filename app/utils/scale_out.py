@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+📈 РЕЖИМ МАСШТАБУВАННЯ (RUN_MODE=scaled) 📈
+
+Один процес-ingress + N процесів-воркерів:
+✅ Ingress - тонкий webhook-приймач: перевірка секрету, партиція за user_id, кадр воркеру
+✅ Воркер - повний бот (хендлери, FSM, кеші) без polling, оновлення через IPC
+✅ Воркер, що впав, перезапускається; ingress відповідає 503, поки партиція недоступна
+   (Telegram повторить доставку)
+✅ Фонові задачі виконує лише лідер серед воркерів (utils.job_locks)
+"""
+
+import asyncio
+import logging
+import multiprocessing
+from typing import Any, Dict, List, Optional
+
+from utils.partitioning import PartitionRouter, PartitionServer
+
+logger = logging.getLogger(__name__)
+
+try:
+    from config.settings import (
+        BOT_TOKEN, SCALE_WORKERS, SCALE_IPC_DIR, MAX_CONCURRENT_REQUESTS,
+        WEBHOOK_URL, WEBHOOK_PATH, WEBHOOK_HOST, WEBHOOK_PORT, WEBHOOK_SECRET
+    )
+except ImportError:
+    import os
+    from pathlib import Path
+    BOT_TOKEN = os.getenv("BOT_TOKEN")
+    SCALE_WORKERS, SCALE_IPC_DIR, MAX_CONCURRENT_REQUESTS = os.cpu_count() or 2, Path("data") / "ipc", 100
+    WEBHOOK_URL, WEBHOOK_PATH, WEBHOOK_HOST, WEBHOOK_PORT, WEBHOOK_SECRET = None, "/webhook", "0.0.0.0", 8000, None
+
+SUPERVISE_INTERVAL = 5          # Секунд між перевірками воркерів
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+# ===== ВОРКЕР =====
+
+async def serve_partition(index: int, bot, dp) -> None:
+    """Оновлення партиції -> dispatcher воркера"""
+    async def handle(update: Dict[str, Any]) -> None:
+        await dp.feed_raw_update(bot, update)
+
+    server = PartitionServer(index, handle, SCALE_IPC_DIR, concurrency=MAX_CONCURRENT_REQUESTS)
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+def _worker_main(index: int) -> None:
+    """Точка входу процесу-воркера"""
+    from main import AutomatedUkrainianTelegramBot
+    logging.basicConfig(level=logging.INFO, format=f'%(asctime)s - worker-{index} - %(name)s - %(levelname)s - %(message)s')
+    try:
+        asyncio.run(AutomatedUkrainianTelegramBot().run_partition_worker(index))
+    except KeyboardInterrupt:
+        pass
+
+# ===== INGRESS =====
+
+def create_ingress_app(router: PartitionRouter, secret: Optional[str] = WEBHOOK_SECRET):
+    """aiohttp-застосунок, що приймає webhook і розподіляє оновлення"""
+    from aiohttp import web
+
+    async def handle_update(request: "web.Request") -> "web.Response":
+        if secret and request.headers.get(SECRET_HEADER) != secret:
+            return web.Response(status=401)
+
+        try:
+            await router.forward(await request.read())
+        except ValueError:
+            return web.Response(status=400)
+        except (ConnectionError, OSError) as e:
+            logger.warning(f"⚠️ Партиція недоступна: {e}")
+            return web.Response(status=503)  # Telegram повторить доставку
+        return web.Response()
+
+    async def handle_health(request: "web.Request") -> "web.Response":
+        return web.json_response({"partitions": router.partitions, "forwarded": router.forwarded})
+
+    app = web.Application()
+    app.router.add_post(WEBHOOK_PATH, handle_update)
+    app.router.add_get("/health", handle_health)
+    return app
+
+async def set_webhook() -> None:
+    """Реєстрація webhook у Telegram (WEBHOOK_URL - публічна адреса ingress)"""
+    if not WEBHOOK_URL:
+        logger.warning("⚠️ WEBHOOK_URL не задано - webhook не змінено")
+        return
+
+    from aiogram import Bot
+    from utils.bot_session import create_bot_session
+
+    url = WEBHOOK_URL.rstrip("/") + WEBHOOK_PATH
+    async with Bot(token=BOT_TOKEN, session=create_bot_session()) as bot:
+        await bot.set_webhook(url, secret_token=WEBHOOK_SECRET)
+    logger.info(f"🔗 Webhook встановлено на {WEBHOOK_URL}")
+
+# ===== СУПЕРВІЗОР =====
+
+class WorkerSupervisor:
+    """Процеси-воркери: запуск, перезапуск після падіння, зупинка"""
+
+    def __init__(self, workers: int = SCALE_WORKERS):
+        self.workers = max(1, workers)
+        self._context = multiprocessing.get_context("spawn")
+        self.processes: List[Optional[multiprocessing.Process]] = [None] * self.workers
+        self.restarts = 0
+
+    def _spawn(self, index: int) -> None:
+        # Не daemon: воркеру потрібні власні дочірні процеси (пул cpu)
+        process = self._context.Process(target=_worker_main, args=(index,), name=f"worker-{index}")
+        process.start()
+        self.processes[index] = process
+
+    def start(self) -> None:
+        for index in range(self.workers):
+            self._spawn(index)
+        logger.info(f"📈 Запущено {self.workers} воркерів")
+
+    async def supervise(self) -> None:
+        while True:
+            await asyncio.sleep(SUPERVISE_INTERVAL)
+            for index, process in enumerate(self.processes):
+                if process is not None and not process.is_alive():
+                    logger.error(f"❌ Воркер {index} завершився (код {process.exitcode}) - перезапуск")
+                    self.restarts += 1
+                    self._spawn(index)
+
+    def stop(self) -> None:
+        for process in self.processes:
+            if process is not None and process.is_alive():
+                process.terminate()
+        for process in self.processes:
+            if process is not None:
+                process.join(timeout=10)
+
+async def run_scaled(workers: int = SCALE_WORKERS) -> None:
+    """Ingress + воркери до зупинки процесу"""
+    from aiohttp import web
+
+    supervisor = WorkerSupervisor(workers)
+    supervisor.start()
+    router = PartitionRouter(supervisor.workers, SCALE_IPC_DIR)
+
+    runner = web.AppRunner(create_ingress_app(router))
+    await runner.setup()
+    site = web.TCPSite(runner, WEBHOOK_HOST, WEBHOOK_PORT)
+    supervise_task = asyncio.create_task(supervisor.supervise(), name="worker_supervisor")
+    try:
+        await site.start()
+        logger.info(f"📈 Ingress слухає {WEBHOOK_HOST}:{WEBHOOK_PORT}, партицій {supervisor.workers}")
+        await set_webhook()
+        await asyncio.Event().wait()
+    finally:
+        supervise_task.cancel()
+        await runner.cleanup()
+        await router.close()
+        await asyncio.to_thread(supervisor.stop)
+
+# ===== ЕКСПОРТ =====
+__all__ = ['run_scaled', 'serve_partition', 'create_ingress_app', 'WorkerSupervisor']
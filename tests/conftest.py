@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""
+🧪 Спільні фікстури тестів
+
+Код бота живе в app/ і імпортується як пакети верхнього рівня (database, services, utils).
+"""
+
+import sys
+import logging
+from pathlib import Path
+
+import pytest
+
+APP_DIR = Path(__file__).resolve().parents[1] / "app"
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
+
+@pytest.fixture
+def sqlite_db(tmp_path, monkeypatch):
+    """Тимчасова файлова SQLite з повною схемою замість БД бота"""
+    pytest.importorskip("sqlalchemy")
+    from sqlalchemy.orm import sessionmaker
+    from database import database
+    from database.models import Base
+
+    engine = database.create_db_engine(f"sqlite:///{tmp_path / 'bot.db'}")
+    engine.echo = False  # DB_ECHO у розробці засмічує вивід тестів
+    monkeypatch.setattr(database, "engine", engine)
+    monkeypatch.setattr(database, "SessionLocal", sessionmaker(bind=engine, expire_on_commit=False))
+    monkeypatch.setattr(database, "DATABASE_AVAILABLE", True)
+    Base.metadata.create_all(engine)
+    database.ensure_schema_upgrades()
+    logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
+
+    yield engine
+    engine.dispose()
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""
+🧪 Масові операції адмінки на SQLite
+"""
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+def _add_users(engine, rows):
+    from sqlalchemy import insert
+    from database.models import User
+
+    with engine.begin() as connection:
+        connection.execute(insert(User.__table__), rows)
+
+def test_recalculate_user_ranks_reports_rank_ups(sqlite_db):
+    from services.admin_services import BulkActionService
+    from utils.ranks import POINT_RANKS
+
+    newbie = POINT_RANKS.rank_for(0)
+    top = POINT_RANKS.rank_for(10 ** 6)
+    _add_users(sqlite_db, [
+        {"id": 1, "first_name": "Без змін", "points": 0, "rank": newbie},
+        {"id": 2, "first_name": "Підвищення", "points": 10 ** 6, "rank": newbie},
+        {"id": 3, "first_name": "Зниження", "points": 0, "rank": top},
+    ])
+
+    result = BulkActionService.recalculate_user_ranks()
+
+    assert result["total_users"] == 3
+    assert result["updated_ranks"] == 2
+    assert result["rank_ups"] == {2: top}
+
+    # Повторний запуск нічого не змінює
+    assert BulkActionService.recalculate_user_ranks()["updated_ranks"] == 0
+
+def test_build_rank_up_notifications():
+    from services.admin_services import BulkActionService
+
+    messages = BulkActionService.build_rank_up_notifications({42: "👑 Мастер Рофлу"})
+    assert list(messages) == [42]
+    assert "👑 Мастер Рофлу" in messages[42]
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+🧪 Планувальник на резервній репліці: спільні задачі пропускаються, власні дельти зберігаються
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from services import automated_scheduler
+from services.automated_scheduler import AutomatedScheduler
+from utils.job_locks import SchedulerLeader
+
+class StandbyLock:
+    backend = "test"
+
+    def try_acquire(self) -> bool:
+        return False
+
+    def release(self) -> None:
+        pass
+
+class RecordingScheduler:
+    """Замість APScheduler: лише запам'ятовує зареєстровані задачі"""
+
+    timezone = None
+
+    def __init__(self):
+        self.jobs = {}
+
+    def add_job(self, func, trigger, id, **kwargs):
+        self.jobs[id] = func
+
+@pytest.fixture
+def standby_scheduler(monkeypatch):
+    monkeypatch.setattr(automated_scheduler, "IntervalTrigger", lambda **kwargs: ("interval", kwargs))
+    monkeypatch.setattr(automated_scheduler, "CronTrigger", lambda **kwargs: ("cron", kwargs))
+
+    scheduler = AutomatedScheduler(bot=None, db_available=True)
+    scheduler.leader = SchedulerLeader(StandbyLock(), retry_seconds=3600)
+    scheduler.scheduler = RecordingScheduler()
+    scheduler._register_jobs()
+    return scheduler
+
+def test_standby_replica_flushes_its_own_rollup_deltas(sqlite_db, standby_scheduler, monkeypatch):
+    from sqlalchemy import select
+    from database.models import DailyStats
+    from services import rollups, trending
+
+    recalculated = []
+    monkeypatch.setattr(trending, "recalculate_trending_scores", lambda: recalculated.append(True))
+
+    rollups._counters.drain()  # Дельти інших тестів у пам'яті процесу
+    rollups.record_event("content_submitted", 1)
+    rollups.record_event("content_submitted", 2)
+
+    jobs = standby_scheduler.scheduler.jobs
+
+    async def scenario():
+        await standby_scheduler.leader.start()
+        try:
+            await jobs["trending_scores"]()
+            await jobs["rollup_flush"]()
+            return standby_scheduler.leader.is_leader
+        finally:
+            await standby_scheduler.leader.stop()
+
+    assert asyncio.run(scenario()) is False
+    assert recalculated == []           # Спільна задача - тільки на лідері
+
+    with sqlite_db.connect() as connection:
+        submitted = connection.execute(select(DailyStats.content_submitted)).scalar()
+    assert submitted == 2               # Дельти резервної репліки не загубились
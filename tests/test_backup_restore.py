@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+🧪 Відновлення з бекапу: злиття з конфліктом хешу та перебудова індексів
+"""
+
+import asyncio
+from pathlib import Path
+
+def _indexes(engine):
+    from sqlalchemy import text
+
+    with engine.connect() as connection:
+        return dict(connection.execute(text(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = 'content' AND sql IS NOT NULL"
+        )).all())
+
+def test_merge_clears_hash_owned_by_another_row(sqlite_db, tmp_path, monkeypatch):
+    from sqlalchemy import delete, insert, select
+    from database.models import Content, User
+    from services import admin_services
+    from services.admin_services import BackupService
+    from services.backup_restore import MODE_MERGE, restore_backup
+
+    content = Content.__table__
+    monkeypatch.setattr(admin_services, "_backup_dir", lambda: tmp_path / "backups")
+    with sqlite_db.begin() as connection:
+        connection.execute(insert(User.__table__), [{"id": 1, "first_name": "Автор"}])
+        connection.execute(insert(content), [
+            {"id": 1, "text": "Жарт", "author_id": 1, "status": "approved", "content_hash": "a" * 32},
+            {"id": 2, "text": "Інший", "author_id": 1, "status": "pending", "content_hash": "b" * 32},
+        ])
+
+    manifest = BackupService.stream_backup("ndjson", "gzip")
+    indexes_before = _indexes(sqlite_db)
+
+    # Після бекапу жарт видалили і подали знову під новим id
+    with sqlite_db.begin() as connection:
+        connection.execute(delete(content).where(content.c.id == 1))
+        connection.execute(insert(content), [
+            {"id": 3, "text": "Жарт", "author_id": 1, "status": "pending", "content_hash": "a" * 32},
+        ])
+
+    report = asyncio.run(restore_backup(Path(manifest["path"]), mode=MODE_MERGE))
+    assert report["tables"]["content"] == 2
+
+    with sqlite_db.connect() as connection:
+        hashes = dict(connection.execute(select(content.c.id, content.c.content_hash)).all())
+    assert hashes == {1: None, 2: "b" * 32, 3: "a" * 32}
+
+    # Індекси з моделей і SCHEMA_INDEXES перебудовані з тими самими визначеннями
+    indexes_after = _indexes(sqlite_db)
+    assert "WHERE" in indexes_after["idx_content_pending"]
+    assert set(indexes_after) == set(indexes_before)
+
+def test_secondary_indexes_include_schema_indexes(monkeypatch):
+    from sqlalchemy.dialects import sqlite
+    from database import database
+    from services.backup_restore import build_plan, _secondary_indexes
+
+    monkeypatch.setattr(database, "SCHEMA_INDEXES", database.SCHEMA_INDEXES + [
+        "CREATE INDEX IF NOT EXISTS idx_content_reports ON content (reports) WHERE reports > 0",
+    ])
+    plan = build_plan({"tables": {"content": {"columns": ["id", "text"], "rows": 0}}})
+    indexes = dict(_secondary_indexes(plan, sqlite.dialect()))
+
+    assert "idx_content_reports" in indexes
+    assert "idx_content_pending" in indexes
+    assert "idx_content_hash" not in indexes  # Унікальний лишається під час завантаження
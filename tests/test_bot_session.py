@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+🧪 HTTP сесія бота: JSON клавіатур з кешу у запиті до Bot API
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiogram")
+
+from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
+from aiogram.methods import SendMessage
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+
+from utils import bot_session
+from utils.bot_session import BotSession
+from utils.keyboards import KeyboardCache
+
+TOKEN = "123456:TEST"
+
+def _keyboard(content_id: int) -> InlineKeyboardMarkup:
+    return InlineKeyboardMarkup(inline_keyboard=[[
+        InlineKeyboardButton(text="👍 Подобається", callback_data=f"r:like:{content_id}"),
+        InlineKeyboardButton(text="🔗 Сайт", url="https://example.com"),
+    ]])
+
+@pytest.fixture
+def cache(monkeypatch):
+    fresh = KeyboardCache()
+    monkeypatch.setattr(bot_session, "keyboard_cache", fresh)
+    return fresh
+
+def _fields(form):
+    return {options["name"]: value for options, _, value in form._fields}
+
+def test_cached_keyboard_json_matches_aiogram(cache):
+    markup = cache.get(("test", 1), lambda: _keyboard(1))
+    method = SendMessage(chat_id=1, text="Жарт", reply_markup=markup)
+    session = BotSession()
+    bot = Bot(TOKEN, session=session)
+
+    first = _fields(session.build_form_data(bot, method))
+    second = _fields(session.build_form_data(bot, SendMessage(chat_id=2, text="Жарт", reply_markup=markup)))
+    reference = _fields(AiohttpSession(json_loads=session.json_loads, json_dumps=session.json_dumps)
+                        .build_form_data(bot, method))
+
+    assert first == reference
+    assert second["reply_markup"] is first["reply_markup"]  # Серіалізовано один раз
+    assert cache.get_stats()["serialized"] == 1
+
+def test_keyboard_outside_cache_is_serialized_by_aiogram(cache):
+    session = BotSession()
+    form = _fields(session.build_form_data(Bot(TOKEN, session=session),
+                                           SendMessage(chat_id=1, text="Жарт", reply_markup=_keyboard(2))))
+    assert "r:like:2" in form["reply_markup"]
+    assert cache.get_stats()["serialized"] == 0
+
+def test_cached_json_is_what_gets_sent(cache):
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+
+    received = []
+
+    async def handle(request):
+        received.append(dict(await request.post()))
+        return web.json_response({"ok": True, "result": {
+            "message_id": 1, "date": 0, "chat": {"id": 1, "type": "private"}, "text": "ok"
+        }})
+
+    async def scenario():
+        app = web.Application()
+        app.router.add_route("POST", "/{tail:.*}", handle)
+        async with TestServer(app) as server:
+            api = TelegramAPIServer.from_base(str(server.make_url("")).rstrip("/"))
+            markup = cache.get(("test", 3), lambda: _keyboard(3))
+            async with Bot(TOKEN, session=BotSession(api=api)) as bot:
+                for chat_id in (1, 2):
+                    await bot.send_message(chat_id, "Жарт", reply_markup=markup)
+            return markup
+
+    markup = asyncio.run(scenario())
+    cached = cache.serialized(markup)
+    assert [request["reply_markup"] for request in received] == [cached, cached]
+    assert [request["chat_id"] for request in received] == ["1", "2"]
+    assert cache.get_stats()["serialized"] == 1
+
+# ===== JSON ТА З'ЄДНАННЯ =====
+
+def test_json_codec_prefers_orjson(monkeypatch):
+    import json
+
+    orjson = pytest.importorskip("orjson")
+    codec = bot_session.get_json_codec()
+    assert codec["json_loads"] is orjson.loads
+
+    data = {"text": "Жарт 😂", "id": 1}
+    dumped = codec["json_dumps"](data)
+    assert isinstance(dumped, str) and "Жарт 😂" in dumped  # UTF-8 без \u-екранування
+    assert json.loads(dumped) == data
+
+    monkeypatch.setattr(bot_session, "ORJSON_AVAILABLE", False)
+    assert bot_session.get_json_codec() == {"json_dumps": json.dumps, "json_loads": json.loads}
+
+def test_session_uses_codec_and_parses_responses():
+    session = BotSession()
+    codec = bot_session.get_json_codec()
+    assert session.json_dumps is codec["json_dumps"]
+    assert session.json_loads is codec["json_loads"]
+
+    bot = Bot(TOKEN, session=session)
+    method = SendMessage(chat_id=1, text="Жарт")
+    content = '{"ok":true,"result":{"message_id":7,"date":0,"chat":{"id":1,"type":"private"},"text":"Жарт"}}'
+    response = session.check_response(bot=bot, method=method, status_code=200, content=content)
+    assert response.result.message_id == 7
+
+def test_connector_keeps_aiogram_defaults():
+    """Ліміт, keep-alive та кеш DNS не змінюються - бенчмарк не показав від них виграшу"""
+    settings = lambda session: {key: value for key, value in session._connector_init.items() if key != "ssl"}
+    assert settings(BotSession()) == settings(AiohttpSession())
+    assert BotSession(limit=20)._connector_init["limit"] == 20
+    assert bot_session.create_bot_session()._connector_init["ttl_dns_cache"] == 3600
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+🧪 Callback дані: ліміт 64 байти, base36, старі формати кнопок і маршрутизація
+"""
+
+import asyncio
+
+import pytest
+
+from utils.callback_data import (
+    MAX_CALLBACK_BYTES, CallbackCodec, CallbackRouter, encode_int, decode_int,
+    CONTENT_REACTION, MODERATION, DUEL_VOTE
+)
+
+INT64_MAX = 2 ** 63 - 1
+
+class Callback:
+    def __init__(self, data):
+        self.data = data
+
+def test_base36_round_trip():
+    for value in (0, 35, 36, 123456789, INT64_MAX, -INT64_MAX):
+        assert decode_int(encode_int(value)) == value
+    assert len(encode_int(INT64_MAX)) == 13
+
+def test_int64_ids_fit_telegram_limit():
+    data = DUEL_VOTE.pack(INT64_MAX, "a")
+    assert len(data.encode("utf-8")) <= MAX_CALLBACK_BYTES
+    assert DUEL_VOTE.unpack(data.partition(":")[2]) == (INT64_MAX, "a")
+
+    wide = CallbackCodec("w", "Wide", first=int, second=int, third=int, fourth=int)
+    assert len(wide.pack(INT64_MAX, INT64_MAX, INT64_MAX, INT64_MAX)) <= MAX_CALLBACK_BYTES
+
+def test_pack_rejects_oversized_data():
+    codec = CallbackCodec("t", "Text", text=str)
+    with pytest.raises(ValueError):
+        codec.pack("я" * 32)  # 64 байти тексту + префікс
+
+def test_payload_round_trip_keeps_separator_in_last_field():
+    codec = CallbackCodec("n", "Note", note_id=int, text=str)
+    data = codec.pack(40, "a:b:c")
+    assert data == "n:14:a:b:c"
+    assert codec.unpack(data.partition(":")[2]) == (40, "a:b:c")
+
+def test_unpack_rejects_wrong_field_count():
+    with pytest.raises(ValueError):
+        MODERATION.unpack("approve")
+
+def test_invalid_codecs():
+    with pytest.raises(ValueError):
+        CallbackCodec("a:b", "Bad")
+    with pytest.raises(TypeError):
+        CallbackCodec("f", "Bad", value=float)
+
+def test_legacy_reaction_buttons_decode():
+    pytest.importorskip("aiogram")
+    from handlers.content_handlers import content_callbacks, callback_react_content
+
+    route = content_callbacks.resolve("like_content:123")
+    assert route.handler is callback_react_content
+    assert route.payload == CONTENT_REACTION.struct("like", 123)
+
+    # Новий формат веде до того самого хендлера
+    route = content_callbacks.resolve(CONTENT_REACTION.pack("love", 123))
+    assert route.handler is callback_react_content
+    assert route.payload == ("love", 123)
+
+def test_legacy_moderation_buttons_decode():
+    pytest.importorskip("aiogram")
+    from handlers.moderation_handlers import moderation_callbacks, callback_moderation_action
+
+    route = moderation_callbacks.resolve("approve:42")
+    assert route.handler is callback_moderation_action
+    assert route.payload == MODERATION.struct("approve", 42)
+    assert moderation_callbacks.resolve(MODERATION.pack("reject", 42)).payload == ("reject", 42)
+    # approve_trusted - точне значення, а не префікс approve
+    assert moderation_callbacks.resolve("approve_trusted").payload is None
+
+def test_exact_value_wins_over_prefix():
+    router = CallbackRouter("test")
+
+    @router.route(MODERATION)
+    async def by_prefix(callback, action):
+        return "prefix"
+
+    @router.exact("mod:approve:1")
+    async def by_value(callback):
+        return "exact"
+
+    assert router.resolve("mod:approve:1").handler is by_value
+    assert router.resolve("mod:approve:2").handler is by_prefix
+    assert router.resolve("mod:approve:zz!") is None  # Некоректний base36
+    assert router.resolve("unknown:1") is None
+    assert router.resolve("plain") is None
+    assert router.resolve(None) is None
+
+def test_filter_and_dispatch_inject_only_declared_arguments():
+    router = CallbackRouter("test")
+    calls = []
+
+    @router.route(MODERATION)
+    async def with_state(callback, action, state, raw_state):
+        calls.append((action, state, raw_state))
+
+    @router.exact("plain")
+    async def with_bot(callback, bot):
+        calls.append(bot)
+
+    context = {"state": "fsm", "bot": "bot", "raw_state": "Duel:waiting", "event_chat": "chat"}
+
+    async def scenario():
+        for data in (MODERATION.pack("skip", 5), "plain"):
+            matched = router.filter(Callback(data))
+            await router.dispatch(Callback(data), **matched, **context)
+
+    asyncio.run(scenario())
+    assert calls == [(("skip", 5), "fsm", "Duel:waiting"), "bot"]
+    assert router.filter(Callback("nothing")) is False
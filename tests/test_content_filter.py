@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+🧪 Фільтр контенту: автомат Ахо–Корасік, межі слів та спам-посилання
+"""
+
+import pytest
+
+from utils.content_filter import AhoCorasickMatcher, ContentFilter, load_wordlist, normalize_text
+
+@pytest.fixture(scope="module")
+def content_filter():
+    return ContentFilter(load_wordlist())
+
+def test_matcher_finds_overlapping_patterns_in_one_pass():
+    matcher = AhoCorasickMatcher()
+    for pattern in ("he", "she", "hers"):
+        matcher.add_pattern(pattern)
+    matcher.compile()
+
+    assert [pattern for pattern, _ in matcher.find_all("hers")] == [normalize_text("he"), normalize_text("hers")]
+    assert [pattern for pattern, _ in matcher.find_all("ushers")] == []  # Збіги не з початку слова
+    assert matcher.find_all("she") == [(normalize_text("she"), "profanity")]
+
+@pytest.mark.parametrize("text", [
+    "Ти Ребане", "застрахуйте авто", "Психуй менше", "Жарт про казино та ставки",
+    "www", "Надіслав це о 10:30, у www розділі", "Сусіди знову сваряться",
+])
+def test_ordinary_text_passes(content_filter, text):
+    result = content_filter.check(text)
+    assert not result.has_profanity, result.profanity
+    assert not result.is_spam, result.spam_markers
+
+@pytest.mark.parametrize("text", [
+    "Пиздець котику", "х.у.й", "ХУЄВО", "Ах ти с.у.к.а", "fu*ck you",
+    "Вони заєбали", "xyй", "бл-ять", "5hit happens",
+])
+def test_profanity_is_caught_through_obfuscation(content_filter, text):
+    assert content_filter.check(text).has_profanity
+
+@pytest.mark.parametrize("text, marker", [
+    ("дивись www.example.com", "www.example.com"),
+    ("Заробіток тут: https://spam.example/join", "https://spam.example/join"),
+    ("Підписуйся t.me/spamchannel", "t.me/spamchannel"),
+])
+def test_links_are_spam(content_filter, text, marker):
+    result = content_filter.check(text)
+    assert result.is_spam
+    assert result.spam_markers == [marker]
+
+def test_spam_heuristics(content_filter):
+    assert content_filter.is_spam("Аааааааа це смішно")
+    assert content_filter.is_spam("ЦЕ ДУЖЕ СМІШНИЙ ЖАРТ")
+    assert content_filter.is_spam("Той самий жарт", ["той самий ЖАРТ"])
+    assert not content_filter.is_spam("Той самий жарт", ["інший жарт"])
+
+@pytest.mark.parametrize("text", [
+    "Пиздець котику, пиздець", "х.у.й та сука", "Ти Ребане", "fu*ck you www.example.com",
+])
+def test_check_uses_same_matches_as_find_all(content_filter, text):
+    expected = list(dict.fromkeys(pattern for pattern, _ in content_filter.matcher.find_all(text)))
+    assert content_filter.check(text).profanity == expected
+
+def test_submission_repeating_recent_history_is_rejected(sqlite_db):
+    pytest.importorskip("aiogram")
+    import asyncio
+    from datetime import datetime, timedelta
+    from sqlalchemy import insert
+    from database.models import Content, User
+    from handlers.content_handlers import check_content_filter, get_submission_history
+
+    now = datetime.utcnow()
+    with sqlite_db.begin() as connection:
+        connection.execute(insert(User.__table__), [{"id": 1, "first_name": "Автор"}, {"id": 2, "first_name": "Інший"}])
+        connection.execute(insert(Content.__table__), [
+            {"id": 1, "text": "Старий жарт про кота", "author_id": 1, "created_at": now - timedelta(days=2)},
+            {"id": 2, "text": "Жарт про програміста", "author_id": 1, "created_at": now - timedelta(hours=1)},
+            {"id": 3, "text": "Чужий жарт про тещу", "author_id": 2, "created_at": now},
+        ])
+
+    history = asyncio.run(get_submission_history(1))
+    assert history == ["Старий жарт про кота", "Жарт про програміста"]
+
+    assert check_content_filter("жарт ПРО програміста", history) is not None
+    assert check_content_filter("Чужий жарт про тещу", history) is None
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+🧪 database.services: імпорт модуля та функції поверх SQLite
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+def _seed(engine, users=(), content=()):
+    from sqlalchemy import insert
+    from database.models import Content, User
+
+    with engine.begin() as connection:
+        if users:
+            connection.execute(insert(User.__table__), list(users))
+        if content:
+            connection.execute(insert(Content.__table__), list(content))
+
+def test_rank_helpers_use_rank_table():
+    from database.services import get_next_rank_points, get_rank_by_points
+    from utils.ranks import POINT_RANKS, rank_for
+
+    for points in (0, 99, 550, 10 ** 6):
+        assert get_rank_by_points(points) == rank_for(points)
+
+    next_rank = POINT_RANKS.next_rank(550)
+    assert get_next_rank_points(550) == 550 + next_rank[1]
+    assert get_rank_by_points(get_next_rank_points(550)) != get_rank_by_points(550)
+
+def test_daily_best_content_prefers_trending(sqlite_db):
+    from database.services import get_daily_best_content
+
+    assert asyncio.run(get_daily_best_content()) is None
+
+    _seed(sqlite_db, users=[{"id": 1, "first_name": "Автор"}], content=[
+        {"id": 1, "text": "Слабкий", "author_id": 1, "status": "approved", "rating_score": 1.0},
+        {"id": 2, "text": "Найкращий", "author_id": 1, "status": "approved", "rating_score": 9.0},
+        {"id": 3, "text": "На модерації", "author_id": 1, "status": "pending", "rating_score": 50.0},
+    ])
+    best = asyncio.run(get_daily_best_content())
+    assert best["id"] == 2
+
+def test_weekly_stats_come_from_rollups(sqlite_db):
+    from database.services import create_duel, finish_duel, generate_weekly_stats, vote_in_duel
+    from services import rollups
+
+    rollups._counters.drain()  # Дельти інших тестів у пам'яті процесу
+    _seed(sqlite_db, users=[
+        {"id": 1, "first_name": "Переможець"}, {"id": 2, "first_name": "Суперник"}, {"id": 3, "first_name": "Глядач"},
+    ], content=[
+        {"id": 1, "text": "Жарт тижня", "author_id": 1, "status": "approved", "rating_score": 7.0},
+        {"id": 2, "text": "Інший жарт", "author_id": 2, "status": "approved", "rating_score": 1.0},
+    ])
+
+    async def scenario():
+        duel = await create_duel(1, 2)
+        await vote_in_duel(duel["id"], 3, "content1")
+        await finish_duel(duel["id"])
+        return await generate_weekly_stats()
+
+    stats = asyncio.run(scenario())
+    assert "error" not in stats
+    assert stats["duels_completed"] == 1
+    assert stats["total_votes"] == 1
+    assert (stats["top_duelist"], stats["top_wins"]) == ("Переможець", 1)
+    assert stats["top_content"] == "Жарт тижня"
+
+def test_read_only_readers_use_replica(sqlite_db, tmp_path):
+    import sqlite3
+    import time
+    from database.replica import connect_replica, get_replica_router
+    from database.services import (
+        get_active_users_for_broadcast, get_all_users_for_broadcast, get_broadcast_statistics, mark_user_inactive
+    )
+
+    _seed(sqlite_db, users=[
+        {"id": 1, "first_name": "Оля", "last_name": "Коваль", "points": 120},
+        {"id": 2, "first_name": "Петро", "last_name": None, "points": 5},
+    ])
+
+    # Репліка - знімок основної БД на цей момент
+    replica_path = tmp_path / "replica.db"
+    source, target = sqlite3.connect(tmp_path / "bot.db"), sqlite3.connect(replica_path)
+    source.backup(target)
+    source.close(), target.close()
+
+    router = connect_replica(f"sqlite:///{replica_path}")
+    try:
+        router.engine.echo = False
+        router.healthy, router.checked_at = True, time.monotonic()
+
+        _seed(sqlite_db, users=[{"id": 3, "first_name": "Новий"}])  # Тільки на основній
+        asyncio.run(mark_user_inactive(2))                              # Запис - на основну
+
+        everyone = asyncio.run(get_all_users_for_broadcast())
+        assert sorted(user["id"] for user in everyone) == [1, 2]
+        assert {user["id"]: user["full_name"] for user in everyone}[1] == "Оля Коваль"
+        assert [user["id"] for user in asyncio.run(get_active_users_for_broadcast())] == [1, 2]
+
+        stats = asyncio.run(get_broadcast_statistics())
+        assert "error" not in stats
+        assert stats["total_users"] == 2
+        assert get_replica_router().replica_reads >= 3
+    finally:
+        connect_replica(None)
+
+    # Без репліки - основна БД з новим користувачем і вимкненими сповіщеннями
+    assert sorted(user["id"] for user in asyncio.run(get_all_users_for_broadcast())) == [1, 3]
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+🧪 Дуелі: створення, голосування, завершення та лічильники дуелістів на SQLite
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+def _seed(engine):
+    from sqlalchemy import insert
+    from database.models import Content, User
+
+    with engine.begin() as connection:
+        connection.execute(insert(User.__table__), [
+            {"id": 1, "first_name": "Автор A"}, {"id": 2, "first_name": "Автор B"},
+            {"id": 3, "first_name": "Глядач"}, {"id": 4, "first_name": "Глядач 2"},
+        ])
+        connection.execute(insert(Content.__table__), [
+            {"id": 10, "text": "Жарт A", "author_id": 1, "status": "approved", "content_type": "joke"},
+            {"id": 11, "text": "Жарт B", "author_id": 2, "status": "approved", "content_type": "joke"},
+        ])
+
+def test_duel_lifecycle(sqlite_db):
+    from database.models import DuelStatus
+    from database.services import (
+        create_duel, finish_duel, get_active_duels, get_duel_by_id, get_user_active_duels,
+        get_user_duel_stats, vote_in_duel
+    )
+
+    _seed(sqlite_db)
+
+    async def scenario():
+        duel = await create_duel(10, 11, min_votes=2)
+        assert duel["status"] is DuelStatus.ACTIVE
+        assert [d["id"] for d in await get_active_duels()] == [duel["id"]]
+        assert [d["id"] for d in await get_user_active_duels(2)] == [duel["id"]]
+
+        assert await vote_in_duel(duel["id"], 3, "content1") == {"success": True}
+        assert (await vote_in_duel(duel["id"], 3, "content2"))["error"] == "already_voted"
+        assert await vote_in_duel(duel["id"], 4, "content1") == {"success": True}
+        assert (await vote_in_duel(999, 4, "content1"))["error"] == "not_found"
+
+        loaded = await get_duel_by_id(duel["id"])
+        assert (loaded["content1_votes"], loaded["content2_votes"]) == (2, 0)
+        assert loaded["content1"]["text"] == "Жарт A"
+
+        result = await finish_duel(duel["id"])
+        assert (result["winner_id"], result["loser_id"]) == (1, 2)
+        assert await finish_duel(duel["id"]) is None  # Повторне завершення нічого не зараховує
+        assert (await vote_in_duel(duel["id"], 1, "content2"))["error"] == "duel_finished"
+        assert (await get_duel_by_id(duel["id"]))["status"] is DuelStatus.COMPLETED
+        assert await get_active_duels() == []
+
+        winner, loser = await get_user_duel_stats(1), await get_user_duel_stats(2)
+        assert (winner["wins"], winner["total_duels"], winner["win_streak"]) == (1, 1, 1)
+        assert loser["losses"] == 1
+        assert winner["rating"] + loser["rating"] == 2000
+
+    asyncio.run(scenario())
+
+def test_backfill_matches_live_counters(sqlite_db):
+    from sqlalchemy import select
+    from database.models import User
+    from database.services import create_duel, finish_duel, vote_in_duel
+    from services.duel_stats import backfill_duel_stats
+
+    _seed(sqlite_db)
+
+    async def play():
+        for voter, side in ((3, "content2"), (4, "content1")):
+            duel = await create_duel(10, 11)
+            await vote_in_duel(duel["id"], voter, side)
+            await finish_duel(duel["id"])
+
+    asyncio.run(play())
+
+    def counters():
+        with sqlite_db.connect() as connection:
+            return connection.execute(
+                select(User.id, User.duels_won, User.duels_lost, User.duel_rating).order_by(User.id)
+            ).all()
+
+    live = counters()
+    assert backfill_duel_stats() == {"duels": 2, "users": 2}
+    assert counters() == live
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+🧪 Індекс дублікатів: MinHash/LSH, точні хеші та частковий idx_content_hash
+"""
+
+import asyncio
+
+import pytest
+
+from utils.duplicate_index import DuplicateIndex, estimate_similarity, minhash_signature, shingles
+
+JOKE = "Приходить програміст у кафе і замовляє нуль кави, потім мінус одну каву, потім мільйон кав"
+PARAPHRASE = "Приходить програміст у кафе і замовляє нуль кави, потім мінус одну каву, потім мільярд кав"
+OTHER = "Чому бегемоти не грають у шахи? Бо в них лапи завеликі для фігур на дошці"
+
+def test_signature_is_stable_and_similarity_tracks_overlap():
+    assert minhash_signature(shingles(JOKE)) == minhash_signature(shingles(JOKE))
+    same = estimate_similarity(minhash_signature(shingles(JOKE)), minhash_signature(shingles(JOKE)))
+    close = estimate_similarity(minhash_signature(shingles(JOKE)), minhash_signature(shingles(PARAPHRASE)))
+    far = estimate_similarity(minhash_signature(shingles(JOKE)), minhash_signature(shingles(OTHER)))
+    assert same == 1.0
+    assert far < 0.2 < close
+
+def test_index_finds_exact_and_near_duplicates():
+    index = DuplicateIndex(threshold=0.5)
+    index.add(1, JOKE)
+    index.add(2, OTHER)
+
+    exact = index.check("  " + JOKE.upper() + "  ")
+    assert (exact.content_id, exact.exact) == (1, True)
+
+    near = index.check(PARAPHRASE)
+    assert (near.content_id, near.exact) == (1, False)
+    assert near.similarity >= 0.5
+
+    assert index.check("Зовсім інший текст про котів і собак, що живуть разом") is None
+
+def test_remove_forgets_hash_and_buckets():
+    index = DuplicateIndex(threshold=0.5)
+    index.add(1, JOKE)
+    index.remove(1)
+
+    assert 1 not in index
+    assert index.check(JOKE) is None
+    assert index.check(PARAPHRASE) is None
+
+# ===== ЧАСТКОВИЙ УНІКАЛЬНИЙ ІНДЕКС =====
+
+def test_schema_upgrade_makes_hash_index_partial(sqlite_db):
+    from sqlalchemy import text
+    from database import database
+
+    with sqlite_db.begin() as connection:
+        connection.execute(text("DROP INDEX idx_content_hash"))
+        connection.execute(text("CREATE UNIQUE INDEX idx_content_hash ON content (content_hash)"))
+
+    database.ensure_schema_upgrades()
+
+    with sqlite_db.connect() as connection:
+        definition = database._index_definition(connection, "idx_content_hash")
+    assert "WHERE" in definition.upper() and "rejected" in definition
+
+def test_rejected_content_can_be_submitted_again(sqlite_db, monkeypatch):
+    from sqlalchemy import insert
+    from database.database import add_content_for_moderation
+    from database.models import User
+    from services import moderation_queue
+    from services.moderation_queue import ModerationQueue, resolve_content
+    from utils import duplicate_index
+
+    monkeypatch.setattr(moderation_queue, "_moderation_queue", ModerationQueue())
+    monkeypatch.setattr(duplicate_index, "_duplicate_index", DuplicateIndex())
+    with sqlite_db.begin() as connection:
+        connection.execute(insert(User.__table__), [{"id": 1, "first_name": "Автор"}])
+
+    async def scenario():
+        first = await add_content_for_moderation(1, JOKE)
+        assert await add_content_for_moderation(1, JOKE) is None  # Точний дублікат у черзі
+        assert duplicate_index.get_duplicate_index().check(JOKE).content_id == first.id
+
+        _, status = await resolve_content(first.id, admin_id=100, approved=False)
+        assert status == "ok"
+        assert duplicate_index.get_duplicate_index().check(JOKE) is None
+
+        second = await add_content_for_moderation(1, JOKE)
+        assert second is not None and second.id != first.id
+
+    asyncio.run(scenario())
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+🧪 Керовані пули виконавців та бекап у процесі-воркері
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from utils.executors import ManagedPool, PoolBusyError
+
+def test_thread_pool_rejects_when_full():
+    pool = ManagedPool("test-io", "thread", workers=1, queue_size=0)
+    release = threading.Event()
+
+    async def scenario():
+        running = asyncio.ensure_future(pool.run(release.wait, 5))
+        await asyncio.sleep(0.05)
+        with pytest.raises(PoolBusyError):
+            await pool.run(sum, [1, 2])
+        release.set()
+        assert await running is True
+        assert await pool.run(sum, [1, 2]) == 3
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        pool.shutdown()
+
+    stats = pool.get_stats()
+    assert stats["rejected"] == 1
+    assert stats["completed"] == 2
+    assert stats["in_flight"] == 0
+
+def test_backup_runs_in_process_pool(sqlite_db, tmp_path, monkeypatch):
+    """BackupService.create_backup пікл-ується і виконується в spawn-процесі з власним engine"""
+    from sqlalchemy import insert
+    from database.models import User
+    from services.admin_services import BackupService
+
+    with sqlite_db.begin() as connection:
+        connection.execute(insert(User.__table__), [
+            {"id": user_id, "first_name": f"Користувач {user_id}", "points": user_id}
+            for user_id in range(1, 1501)
+        ])
+
+    # Процес-воркер читає налаштування з оточення та пише бекап відносно cwd
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    monkeypatch.setenv("SQLITE_DB_PATH", str(tmp_path / "bot.db"))
+    monkeypatch.chdir(tmp_path)
+
+    pool = ManagedPool("test-cpu", "process", workers=1)
+    reports = []
+    try:
+        manifest = asyncio.run(pool.run(BackupService.create_backup, False, progress=reports.append))
+    finally:
+        pool.shutdown()
+
+    assert manifest["tables"]["users"]["rows"] == 1500
+    assert (tmp_path / manifest["path"]).is_dir()
+    assert pool.get_stats()["completed"] == 1
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+🧪 Сховище FSM: збереження після перезапуску, TTL, очищення та файли воркерів
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiogram")
+
+from aiogram.fsm.storage.base import StorageKey
+
+from utils import fsm_storage
+from utils.fsm_storage import SQLiteStorage, worker_storage_path
+
+KEY = StorageKey(bot_id=1, chat_id=10, user_id=10)
+
+class Clock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(fsm_storage.time, "time", clock)
+    return clock
+
+def run(coro):
+    return asyncio.run(coro)
+
+def test_state_survives_reopen(tmp_path):
+    path = tmp_path / "fsm.sqlite3"
+    storage = SQLiteStorage(path)
+    run(storage.set_state(KEY, "ContentSubmission:waiting_text"))
+    run(storage.set_data(KEY, {"type": "joke", "text": "Привіт"}))
+    run(storage.close())
+
+    reopened = SQLiteStorage(path)
+    assert run(reopened.get_state(KEY)) == "ContentSubmission:waiting_text"
+    assert run(reopened.get_data(KEY)) == {"type": "joke", "text": "Привіт"}
+    run(reopened.close())
+
+def test_busy_timeout_is_set(tmp_path):
+    storage = SQLiteStorage(tmp_path / "fsm.sqlite3")
+    assert storage._db.execute("PRAGMA busy_timeout").fetchone()[0] == fsm_storage.BUSY_TIMEOUT_MS
+    run(storage.close())
+
+def test_expired_state_is_gone_after_reopen(tmp_path, clock):
+    path = tmp_path / "fsm.sqlite3"
+    storage = SQLiteStorage(path, state_ttl=60)
+    run(storage.set_state(KEY, "Duel:waiting"))
+    run(storage.close())
+
+    clock.now += 61
+    reopened = SQLiteStorage(path, state_ttl=60)
+    assert run(reopened.get_state(KEY)) is None
+    assert run(reopened.get_data(KEY)) == {}
+    run(reopened.close())
+
+def test_set_data_after_expiry_starts_clean(tmp_path, clock):
+    storage = SQLiteStorage(tmp_path / "fsm.sqlite3", state_ttl=60)
+    run(storage.set_state(KEY, "Duel:waiting"))
+    run(storage.set_data(KEY, {"old": 1}))
+
+    clock.now += 61
+    run(storage.set_data(KEY, {"new": 2}))
+
+    # Старий стан і дані не воскресають разом з новим записом
+    assert run(storage.get_state(KEY)) is None
+    assert run(storage.get_data(KEY)) == {"new": 2}
+    row = storage._db.execute("SELECT state, expires_at FROM fsm").fetchone()
+    assert row == (None, clock.now + 60)
+    run(storage.close())
+
+def test_reads_extend_ttl_after_half_of_it(tmp_path, clock):
+    storage = SQLiteStorage(tmp_path / "fsm.sqlite3", state_ttl=60)
+    run(storage.set_state(KEY, "Moderation:reviewing"))
+    expires = storage._db.execute("SELECT expires_at FROM fsm").fetchone()[0]
+
+    clock.now += 10
+    assert run(storage.get_state(KEY)) == "Moderation:reviewing"
+    # Менше половини TTL минуло - читання не пише на диск
+    assert storage._db.execute("SELECT expires_at FROM fsm").fetchone()[0] == expires
+
+    clock.now += 40
+    run(storage.get_data(KEY))
+    assert storage._db.execute("SELECT expires_at FROM fsm").fetchone()[0] == clock.now + 60
+
+    # Активний користувач не втрачає стан, хоча від запису минуло більше TTL
+    clock.now += 40
+    assert run(storage.get_state(KEY)) == "Moderation:reviewing"
+    run(storage.close())
+
+def test_purge_removes_only_expired(tmp_path, clock):
+    storage = SQLiteStorage(tmp_path / "fsm.sqlite3", state_ttl=60)
+    stale = StorageKey(bot_id=1, chat_id=20, user_id=20)
+    run(storage.set_state(stale, "Duel:waiting"))
+
+    clock.now += 30
+    run(storage.set_state(KEY, "Duel:waiting"))
+
+    clock.now += 31
+    assert storage.purge_expired() == 1
+    assert storage.get_stats()["stored"] == 1
+    assert run(storage.get_state(KEY)) == "Duel:waiting"
+    run(storage.close())
+
+def test_empty_entry_is_deleted(tmp_path):
+    storage = SQLiteStorage(tmp_path / "fsm.sqlite3")
+    run(storage.set_state(KEY, "Duel:waiting"))
+    run(storage.set_state(KEY, None))
+    assert storage.get_stats()["stored"] == 0
+    run(storage.close())
+
+def test_scaled_workers_get_own_files(tmp_path, monkeypatch):
+    from config import settings
+
+    path = tmp_path / "fsm.sqlite3"
+    monkeypatch.setattr(settings, "FSM_STORAGE", "sqlite")
+    monkeypatch.setattr(settings, "FSM_STORAGE_PATH", path)
+
+    assert worker_storage_path(path, None) == path
+    storage = fsm_storage.create_fsm_storage(partition=2)
+    assert storage.path == tmp_path / "fsm.worker2.sqlite3"
+    run(storage.close())
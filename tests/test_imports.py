@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""
+🧪 Імпорт модулів: сервіси та обробники, що пов'язані між собою, імпортуються без помилок
+"""
+
+import importlib
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+MODULES = [
+    "database", "database.models", "database.database", "database.queries",
+    "database.replica", "database.services", "database.sqlite_writer",
+    "services.admin_services", "services.backup_restore", "services.broadcast_system",
+    "services.duel_stats", "services.moderation_queue", "services.reactions", "services.rollups",
+    "utils.content_filter", "utils.duplicate_index", "utils.executors", "utils.rate_limiter",
+]
+
+HANDLERS = [
+    "handlers.admin_panel_handlers", "handlers.content_handlers",
+    "handlers.duel_handlers", "handlers.moderation_handlers",
+]
+
+@pytest.mark.parametrize("name", MODULES)
+def test_module_imports(name):
+    module = importlib.import_module(name)
+    for exported in getattr(module, "__all__", ()):
+        assert hasattr(module, exported), f"{name}.__all__: {exported}"
+
+@pytest.mark.parametrize("name", HANDLERS)
+def test_handler_imports(name):
+    pytest.importorskip("aiogram")
+    module = importlib.import_module(name)
+    for exported in getattr(module, "__all__", ()):
+        assert hasattr(module, exported), f"{name}.__all__: {exported}"
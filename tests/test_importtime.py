@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+🧪 Звіт про час імпортів: розбір -X importtime і формування звіту
+"""
+
+from utils.importtime import ImportEntry, collect_importtime, format_report, parse_importtime
+
+SAMPLE = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 | _io
+import time:       300 |        300 |   aiogram.types
+import time:      1500 |       2100 | aiogram
+Traceback (most recent call last):
+import time:       800 |        800 | config.settings
+"""
+
+def test_parse_importtime_reads_depth_and_times():
+    assert parse_importtime(SAMPLE) == [
+        ImportEntry("_io", 120, 120, 0),
+        ImportEntry("aiogram.types", 300, 300, 1),
+        ImportEntry("aiogram", 1500, 2100, 0),
+        ImportEntry("config.settings", 800, 800, 0),
+    ]
+
+def test_format_report_groups_packages_and_sorts():
+    report = format_report(parse_importtime(SAMPLE), top=2)
+    lines = report.splitlines()
+
+    assert lines[0] == "⏱️ Імпорт: 2.7 мс, модулів: 4"
+    packages = lines[lines.index("📦 Пакети:") + 1:lines.index("📦 Пакети:") + 3]
+    assert packages == ["       1.8 мс  aiogram", "       0.8 мс  config"]
+    top_level = lines[lines.index("🌳 Модулі верхнього рівня (з залежностями):") + 1:]
+    assert top_level == ["       2.1 мс  aiogram", "       0.8 мс  config.settings"]
+
+def test_collect_importtime_runs_clean_interpreter():
+    # Модуль, що не імпортується, не зупиняє збір решти
+    entries = collect_importtime(["module_that_does_not_exist", "json"])
+    modules = {entry.module for entry in entries}
+
+    assert {"json", "json.decoder"} <= modules
+    assert all(entry.cumulative_us >= entry.self_us for entry in entries)
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+🧪 Лідер планувальника: файлове блокування, leader_only та втрата блокування між задачами
+"""
+
+import os
+import asyncio
+
+import pytest
+
+from utils.job_locks import FCNTL_AVAILABLE, FileLock, SchedulerLeader
+
+class SwitchLock:
+    """Блокування, яке тест забирає та повертає"""
+
+    backend = "test"
+
+    def __init__(self, held: bool):
+        self.held = held
+        self.attempts = 0
+        self.released = False
+
+    def try_acquire(self) -> bool:
+        self.attempts += 1
+        return self.held
+
+    def release(self) -> None:
+        self.released = True
+
+@pytest.mark.skipif(not FCNTL_AVAILABLE, reason="flock тільки на POSIX")
+def test_file_lock_is_exclusive_between_holders(tmp_path):
+    path = tmp_path / "scheduler.lock"
+    first, second = FileLock(path), FileLock(path)
+
+    assert first.try_acquire()
+    assert first.try_acquire()          # Повторна спроба власника - без нового файлу
+    assert not second.try_acquire()
+    assert path.read_text() == str(os.getpid())
+
+    first.release()
+    assert second.try_acquire()
+    assert not first.try_acquire()
+    second.release()
+
+@pytest.mark.skipif(not FCNTL_AVAILABLE, reason="flock тільки на POSIX")
+def test_file_lock_is_freed_when_holder_closes(tmp_path):
+    path = tmp_path / "scheduler.lock"
+    holder, standby = FileLock(path), FileLock(path)
+    assert holder.try_acquire()
+
+    # Процес лідера впав: дескриптор закрито без LOCK_UN
+    os.close(holder._fd)
+    holder._fd = None
+
+    assert standby.try_acquire()
+    standby.release()
+
+def test_leader_only_skips_jobs_on_standby():
+    calls = []
+
+    async def recalculate():
+        calls.append("run")
+        return "done"
+
+    async def scenario():
+        leader = SchedulerLeader(SwitchLock(held=False), retry_seconds=3600)
+        await leader.start()
+        try:
+            return await leader.leader_only(recalculate)(), leader.is_leader
+        finally:
+            await leader.stop()
+
+    assert asyncio.run(scenario()) == (None, False)
+    assert calls == []
+
+def test_leader_rechecks_lock_before_each_job():
+    lock = SwitchLock(held=True)
+    calls = []
+
+    async def recalculate():
+        calls.append("run")
+        return "done"
+
+    async def scenario():
+        leader = SchedulerLeader(lock, retry_seconds=3600)
+        await leader.start()
+        job = leader.leader_only(recalculate)
+        try:
+            first = await job()
+            lock.held = False           # Блокування втрачено до наступної спроби таймера
+            second = await job()
+            lock.held = True            # Резервна репліка перехоплює лідерство на задачі
+            third = await job()
+            return first, second, third
+        finally:
+            await leader.stop()
+
+    assert asyncio.run(scenario()) == ("done", None, "done")
+    assert calls == ["run", "run"]
+    assert lock.attempts == 4
+    assert lock.released
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+🧪 Ліниві хендлери: фільтри заглушок, імпорт при першому використанні, запасний core-роутер
+"""
+
+import sys
+import types
+import asyncio
+import importlib
+
+import pytest
+
+pytest.importorskip("aiogram")
+
+from aiogram import Bot, Dispatcher, Router
+from aiogram.filters import Command
+from aiogram.types import Update
+
+from handlers.lazy import LAZY_MODULES, LazyRouter
+
+def message_update(text: str, update_id: int = 1) -> Update:
+    return Update.model_validate({
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id, "date": 0, "text": text,
+            "chat": {"id": 10, "type": "private"},
+            "from": {"id": 10, "is_bot": False, "first_name": "Тест"},
+        },
+    })
+
+def callback_update(data: str, update_id: int = 1) -> Update:
+    return Update.model_validate({
+        "update_id": update_id,
+        "callback_query": {
+            "id": str(update_id), "chat_instance": "1", "data": data,
+            "from": {"id": 10, "is_bot": False, "first_name": "Тест"},
+        },
+    })
+
+@pytest.fixture
+def fake_module(monkeypatch):
+    """Модуль хендлерів у sys.modules, що рахує реєстрації"""
+    module = types.ModuleType("fake_feature_handlers")
+    module.registrations = 0
+
+    def register(router: Router):
+        module.registrations += 1
+
+        @router.message(Command("hello"))
+        async def hello(message):
+            return "feature:hello"
+
+        @router.callback_query(lambda callback: callback.data == "ping:1")
+        async def ping(callback):
+            return "feature:ping"
+
+    module.register = register
+    monkeypatch.setitem(sys.modules, module.__name__, module)
+    return module
+
+def build_dispatcher(*stubs: LazyRouter) -> Dispatcher:
+    """Заглушки, а після них - core-роутер, як у register_all_handlers"""
+    dp = Dispatcher()
+    for stub in stubs:
+        dp.include_router(stub)
+
+    core = Router(name="core")
+
+    @core.message()
+    async def fallback(message):
+        return f"core:{message.text}"
+
+    dp.include_router(core)
+    return dp
+
+def feed(dp: Dispatcher, *updates: Update):
+    async def scenario():
+        bot = Bot("42:TEST")
+        try:
+            return [await dp.feed_update(bot, update) for update in updates]
+        finally:
+            await bot.session.close()
+    return asyncio.run(scenario())
+
+class Text:
+    def __init__(self, text):
+        self.text = text
+
+class Data:
+    def __init__(self, data):
+        self.data = data
+
+def test_message_filter_matching():
+    stub = LazyRouter("x", "register", commands=["duel"], command_prefixes=["approve_"],
+                      texts=["📊 Статистика"], states=["DuelStates"])
+
+    assert stub._match_message(Text("/duel"))
+    assert stub._match_message(Text("/Duel@bobik_bot extra"))
+    assert stub._match_message(Text("/approve_15"))
+    assert stub._match_message(Text("📊 Статистика"))
+    assert stub._match_message(Text("будь-що"), raw_state="DuelStates:waiting_opponent")
+    assert not stub._match_message(Text("/duels"))
+    assert not stub._match_message(Text("статистика"))
+    assert not stub._match_message(Text(None))
+    assert not stub._match_message(Text("текст"), raw_state="ContentSubmissionStates:waiting")
+
+def test_callback_filter_matching():
+    stub = LazyRouter("x", "register", callbacks=["create_duel"], callback_prefixes=["dv:"])
+
+    assert stub._match_callback(Data("create_duel"))
+    assert stub._match_callback(Data("dv:1:a"))
+    assert not stub._match_callback(Data("create_duel_now"))
+    assert not stub._match_callback(Data("dw:1"))
+    assert not stub._match_callback(Data(None))
+
+def test_module_is_imported_on_first_use_only(fake_module):
+    stub = LazyRouter(fake_module.__name__, "register", commands=["hello"], callback_prefixes=["ping:"])
+    dp = build_dispatcher(stub)
+
+    # Оновлення, що не підходить заглушці, не імпортує модуль
+    assert feed(dp, message_update("привіт")) == ["core:привіт"]
+    assert stub.target is None and fake_module.registrations == 0
+
+    results = feed(dp, message_update("/hello", 2), callback_update("ping:1", 3), message_update("/hello", 4))
+    assert results == ["feature:hello", "feature:ping", "feature:hello"]
+    assert fake_module.registrations == 1
+
+def test_unhandled_update_falls_through_to_core(fake_module):
+    # Префікс підходить, але справжній хендлер модуля його не обробляє
+    stub = LazyRouter(fake_module.__name__, "register", commands=["hello"], command_prefixes=["hel"])
+    dp = build_dispatcher(stub)
+
+    assert feed(dp, message_update("/help")) == ["core:/help"]
+    assert stub.target is not None
+
+def test_broken_module_falls_through_to_core():
+    stub = LazyRouter("handlers.does_not_exist", "register", commands=["hello"])
+    dp = build_dispatcher(stub)
+
+    assert feed(dp, message_update("/hello"), message_update("/hello", 2)) == ["core:/hello", "core:/hello"]
+    assert stub.failed and stub.target is None
+
+@pytest.mark.parametrize("spec", LAZY_MODULES, ids=[spec["module"] for spec in LAZY_MODULES])
+def test_lazy_modules_expose_register_functions(spec):
+    pytest.importorskip("sqlalchemy")
+    module = importlib.import_module(spec["module"])
+    assert callable(getattr(module, spec["register"]))
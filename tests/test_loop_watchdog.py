@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+🧪 Сторож event loop: зависання понад поріг, місце блокування та звіт
+"""
+
+import time
+import asyncio
+
+from utils.loop_watchdog import LoopWatchdog
+
+def blocking_call(seconds: float) -> None:
+    time.sleep(seconds)
+
+def run_with_watchdog(watchdog: LoopWatchdog, *blocks: float) -> None:
+    async def scenario():
+        watchdog.start()
+        try:
+            await asyncio.sleep(0.05)
+            for seconds in blocks:
+                blocking_call(seconds)
+                await asyncio.sleep(0.05)  # Heartbeat фіксує затримку після блокування
+        finally:
+            await watchdog.stop()
+    asyncio.run(scenario())
+
+def test_stall_above_threshold_is_recorded_with_site():
+    watchdog = LoopWatchdog(threshold_ms=100, interval=0.01)
+    run_with_watchdog(watchdog, 0.3)
+
+    stats = watchdog.get_stats()
+    assert stats["stalls"] == 1
+    assert stats["max_lag_ms"] >= 250
+    site = watchdog.top_sites()[0]
+    assert site["site"].endswith("blocking_call")
+    assert "test_loop_watchdog.py" in site["site"]
+    assert "blocking_call" in watchdog.format_report()
+    assert not watchdog.running
+
+def test_short_blocks_below_threshold_are_ignored():
+    watchdog = LoopWatchdog(threshold_ms=200, interval=0.01)
+    run_with_watchdog(watchdog, 0.03, 0.05)
+
+    assert watchdog.get_stats()["stalls"] == 0
+    assert watchdog.top_sites() == []
+    assert watchdog.get_stats()["p99_ms"] >= 20  # Затримки виміряно, але вони нижче порогу
+
+def test_reset_clears_sites():
+    watchdog = LoopWatchdog(threshold_ms=50, interval=0.01)
+    run_with_watchdog(watchdog, 0.15)
+    assert watchdog.get_stats()["stalls"] == 1
+
+    watchdog.reset()
+    assert watchdog.get_stats()["stalls"] == 0
+    assert watchdog.top_sites() == []
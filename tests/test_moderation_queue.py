@@ -0,0 +1,313 @@
+# -*- coding: utf-8 -*-
+"""
+🧪 Черга модерації: пріоритети, оренда та рішення через БД
+"""
+
+import os
+import time
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from services import moderation_queue
+from services.moderation_queue import ModerationItem, ModerationQueue
+
+@pytest.fixture
+def queue(monkeypatch):
+    """Порожня черга процесу замість спільної"""
+    fresh = ModerationQueue(lease_seconds=60)
+    monkeypatch.setattr(moderation_queue, "_moderation_queue", fresh)
+    return fresh
+
+def _item(content_id, hours_ago=0.0, reputation=0.0, reports=0):
+    created_at = datetime(2026, 1, 1, 12) - timedelta(hours=hours_ago)
+    return ModerationItem(content_id, author_id=1, text=f"Жарт {content_id}",
+                          created_at=created_at, reputation=reputation, reports=reports)
+
+# ===== ПРІОРИТЕТИ ТА ОРЕНДА =====
+
+def test_claim_order_follows_age_reputation_and_reports():
+    fresh = ModerationQueue()
+    fresh.add(_item(1))
+    fresh.add(_item(2, hours_ago=3))
+    fresh.add(_item(3, reputation=1.0))      # +4 години пріоритету
+    fresh.add(_item(4))
+    fresh.report(4, 1)                        # +6 годин пріоритету
+
+    order = [fresh.claim(admin_id, now=0).id for admin_id in range(100, 104)]
+    assert order == [4, 3, 2, 1]
+    assert fresh.claim(200, now=0) is None
+
+def test_claim_is_exclusive_and_lease_expires():
+    fresh = ModerationQueue(lease_seconds=60)
+    fresh.add(_item(1))
+
+    assert fresh.claim(100, now=0).id == 1
+    assert fresh.claim(100, now=10).id == 1   # Повторний запит - той самий елемент
+    assert fresh.claim(200, now=10) is None
+    assert fresh.take(1, 200, now=10) is None  # Чужа оренда
+
+    assert fresh.claim(200, now=61).id == 1   # Оренда першого закінчилась
+    assert fresh.take(1, 200, now=62).id == 1
+    assert len(fresh) == 0
+
+def test_release_with_skip_hides_item_from_that_admin_only():
+    fresh = ModerationQueue()
+    fresh.add(_item(1, hours_ago=1))
+    fresh.add(_item(2))
+
+    assert fresh.claim(100, now=0).id == 1
+    assert fresh.release(1, 100, skip=True)
+    assert fresh.claim(100, now=0).id == 2
+    assert fresh.claim(200, now=0).id == 1
+
+def test_take_many_reports_items_locked_by_others():
+    fresh = ModerationQueue()
+    for content_id in (1, 2, 3):
+        fresh.add(_item(content_id, hours_ago=content_id))
+    leased = fresh.claim(200, now=0)
+
+    taken, locked = fresh.take_many([1, 2, 3, 99], 100, now=0)
+    assert sorted(item.id for item in taken) == sorted({1, 2, 3} - {leased.id})
+    assert locked == [leased.id]
+
+@pytest.fixture
+def local_timezone_behind_utc():
+    """Локальний час процесу на 5 годин позаду UTC"""
+    if not hasattr(time, "tzset"):
+        pytest.skip("tzset недоступний")
+    previous = os.environ.get("TZ")
+    os.environ["TZ"] = "Etc/GMT+5"
+    time.tzset()
+    yield
+    if previous is None:
+        os.environ.pop("TZ", None)
+    else:
+        os.environ["TZ"] = previous
+    time.tzset()
+
+def test_db_and_local_items_share_utc_clock(sqlite_db, queue, local_timezone_behind_utc):
+    from datetime import timezone
+    from sqlalchemy import insert
+    from database.models import Content, User
+
+    # БД зберігає naive UTC; елемент з БД на годину старший за локальний
+    with sqlite_db.begin() as connection:
+        connection.execute(insert(User.__table__), [{"id": 1, "first_name": "Автор"}])
+        connection.execute(insert(Content.__table__), [{
+            "id": 1, "text": "Жарт з БД", "author_id": 1, "status": "pending",
+            "created_at": datetime.utcnow() - timedelta(hours=1),
+        }])
+    moderation_queue.load_pending_from_db()
+    local = queue.add(ModerationItem(2, author_id=1, text="Жарт без БД"))
+    aware = queue.add(ModerationItem(3, author_id=1, text="Жарт з tzinfo",
+                                     created_at=datetime.now(timezone.utc) - timedelta(minutes=30)))
+
+    assert local.created_at.tzinfo is None
+    assert abs(local.created_at - datetime.utcnow()) < timedelta(minutes=1)
+    assert aware.created_at.tzinfo is None
+    assert [queue.claim(100 + admin).id for admin in range(3)] == [1, 3, 2]
+
+# ===== РІШЕННЯ ЧЕРЕЗ БД =====
+
+def _seed_pending(engine, *content_ids):
+    from sqlalchemy import insert
+    from database.models import Content, User
+
+    with engine.begin() as connection:
+        connection.execute(insert(User.__table__), [{"id": 1, "first_name": "Автор"}])
+        connection.execute(insert(Content.__table__), [
+            {"id": content_id, "text": f"Жарт {content_id}", "author_id": 1, "status": "pending"}
+            for content_id in content_ids
+        ])
+
+def _status(engine, content_id):
+    from sqlalchemy import select
+    from database.models import Content
+
+    with engine.connect() as connection:
+        return connection.execute(select(Content.status).where(Content.id == content_id)).scalar()
+
+def test_resolve_falls_back_to_db_for_items_of_other_workers(sqlite_db, queue):
+    """Масштабований режим: елемент у черзі іншого воркера, рішення - умовним UPDATE у БД"""
+    from services.moderation_queue import resolve_content
+
+    _seed_pending(sqlite_db, 7)
+    assert 7 not in queue
+
+    item, status = asyncio.run(resolve_content(7, admin_id=100, approved=True))
+    assert status == "ok"
+    assert (item.id, item.author_id, item.author_name) == (7, 1, "Автор")
+    assert _status(sqlite_db, 7) == "approved"
+
+    assert asyncio.run(resolve_content(7, admin_id=101, approved=False)) == (None, "processed")
+    assert _status(sqlite_db, 7) == "approved"
+    assert asyncio.run(resolve_content(404, admin_id=100, approved=True)) == (None, "not_found")
+
+class _FakeBot:
+    def __init__(self):
+        self.sent = []
+
+    async def send_message(self, chat_id, text, **kwargs):
+        self.sent.append((chat_id, text))
+
+class _FakeMessage:
+    def __init__(self, bot, user_id):
+        self.bot = bot
+        self.from_user = type("User", (), {"id": user_id})()
+        self.answers = []
+
+    async def answer(self, text, **kwargs):
+        self.answers.append(text)
+
+def test_single_approve_uses_bulk_path_and_notifies_with_broadcasts_off(sqlite_db, queue, monkeypatch):
+    pytest.importorskip("aiogram")
+    from sqlalchemy import select
+    from database.models import User
+    from handlers import moderation_handlers
+    from services import broadcast_system
+
+    monkeypatch.setattr(broadcast_system, "_broadcast_system", None)
+    _seed_pending(sqlite_db, 5)
+    bot = _FakeBot()
+
+    async def scenario():
+        system = broadcast_system.get_broadcast_system(bot)
+        system.enabled = False  # BROADCAST_ENABLED=false вимикає лише масові розсилки
+        message = _FakeMessage(bot, user_id=100)
+        await moderation_handlers.approve_content(message, 5)
+        await asyncio.gather(*system._background_tasks)
+        return message
+
+    message = asyncio.run(scenario())
+
+    assert "схвалено" in message.answers[-1]
+    assert _status(sqlite_db, 5) == "approved"
+    with sqlite_db.connect() as connection:
+        points, approved = connection.execute(
+            select(User.points, User.jokes_approved).where(User.id == 1)
+        ).first()
+    assert approved == 1
+    assert points > 0
+    assert [chat_id for chat_id, _ in bot.sent] == [1]
+
+# ===== ОДИН ШЛЯХ РІШЕННЯ =====
+
+def _user(engine, user_id):
+    from sqlalchemy import select
+    from database.models import User
+
+    with engine.connect() as connection:
+        return connection.execute(
+            select(User.points, User.rank, User.jokes_approved).where(User.id == user_id)
+        ).one()
+
+def test_bulk_approval_updates_rank_in_same_statement(sqlite_db, queue):
+    from sqlalchemy import update
+    from database.models import User
+    from services.moderation_queue import bulk_resolve_content
+    from utils.ranks import rank_for
+
+    _seed_pending(sqlite_db, 1, 2)
+    with sqlite_db.begin() as connection:
+        connection.execute(update(User).where(User.id == 1).values(points=90, rank=rank_for(90)))
+
+    result = asyncio.run(bulk_resolve_content([1, 2], admin_id=100, approved=True))
+    assert result["processed"] == 2
+
+    points, rank, approved = _user(sqlite_db, 1)
+    assert approved == 2
+    assert rank == rank_for(points) != rank_for(90)
+
+def test_failed_rewards_roll_back_statuses_and_restore_queue(sqlite_db, queue, monkeypatch):
+    from services.moderation_queue import bulk_resolve_content, load_item_from_db
+
+    _seed_pending(sqlite_db, 3)
+    queue.add(load_item_from_db(3))
+
+    def broken(*args, **kwargs):
+        raise RuntimeError("збій нарахування")
+    monkeypatch.setattr(moderation_queue, "_reward_authors", broken)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(bulk_resolve_content([3], admin_id=100, approved=True))
+
+    assert _status(sqlite_db, 3) == "pending"  # Статус відкочено разом з балами
+    assert 3 in queue
+    assert _user(sqlite_db, 1).points == 0
+
+def test_reject_goes_through_same_resolver(sqlite_db, queue, monkeypatch):
+    pytest.importorskip("aiogram")
+    from handlers import moderation_handlers
+    from services import broadcast_system
+    from services.moderation_queue import load_item_from_db
+
+    calls = []
+    original = moderation_queue.bulk_resolve_content
+
+    async def spy(*args, **kwargs):
+        calls.append(args)
+        return await original(*args, **kwargs)
+
+    monkeypatch.setattr(moderation_queue, "bulk_resolve_content", spy)
+    monkeypatch.setattr(broadcast_system, "_broadcast_system", None)
+    _seed_pending(sqlite_db, 8)
+    queue.add(load_item_from_db(8))
+    bot = _FakeBot()
+
+    async def scenario():
+        system = broadcast_system.get_broadcast_system(bot)
+        message = _FakeMessage(bot, user_id=100)
+        await moderation_handlers.reject_content(message, 8, "Баян")
+        await asyncio.gather(*system._background_tasks)
+        return message
+
+    message = asyncio.run(scenario())
+
+    assert calls == [([8], 100, False, "Баян")]
+    assert _status(sqlite_db, 8) == "rejected"
+    assert 8 not in queue
+    assert "відхилено" in message.answers[-1]
+    assert [chat_id for chat_id, _ in bot.sent] == [1]
+    assert "Баян" in bot.sent[0][1]
+
+def test_current_claim_does_not_lease(queue):
+    queue.add(_item(1))
+    assert queue.current_claim(100) is None
+    assert queue.get(1).lease_owner is None
+
+    claimed = queue.claim(100)
+    assert queue.current_claim(100) is claimed
+    assert queue.current_claim(200) is None
+
+def test_finish_moderation_releases_only_existing_lease(queue, monkeypatch):
+    pytest.importorskip("aiogram")
+    from handlers import moderation_handlers
+
+    monkeypatch.setattr(moderation_handlers, "is_admin", lambda user_id: True)
+
+    queue.add(_item(1))
+    queue.add(_item(2, hours_ago=1))
+    monkey_message = type("Message", (), {})()
+    edited = []
+
+    async def edit_text(text, **kwargs):
+        edited.append(text)
+
+    async def answer(*args, **kwargs):
+        pass
+
+    monkey_message.edit_text = edit_text
+    callback = type("Callback", (), {"from_user": type("User", (), {"id": 100})(),
+                                     "message": monkey_message, "answer": staticmethod(answer)})()
+
+    before = (list(queue._heap), dict(queue._claims))
+    asyncio.run(moderation_handlers.callback_finish_moderation(callback))
+    assert (list(queue._heap), dict(queue._claims)) == before  # Без оренди - черга не змінилась
+
+    claimed = queue.claim(callback.from_user.id)
+    asyncio.run(moderation_handlers.callback_finish_moderation(callback))
+    assert claimed.lease_owner is None
+    assert queue.current_claim(callback.from_user.id) is None
+    assert len(edited) == 2
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+🧪 Партиціювання: стабільний ключ користувача та доставка оновлень своєму воркеру через IPC
+"""
+
+import asyncio
+
+import pytest
+
+from utils.partitioning import (
+    PartitionRouter, PartitionServer, extract_user_id, json_dumps, partition_for
+)
+
+def message(user_id: int, update_id: int, text: str = "привіт") -> dict:
+    return {
+        "update_id": update_id,
+        "message": {"message_id": update_id, "date": 0, "text": text,
+                    "chat": {"id": user_id, "type": "private"},
+                    "from": {"id": user_id, "is_bot": False, "first_name": "Тест"}},
+    }
+
+def test_partition_key_comes_from_user_or_chat():
+    assert extract_user_id(message(42, 1)) == 42
+    assert extract_user_id({"update_id": 2, "callback_query": {"id": "1", "from": {"id": 7}}}) == 7
+    # callback_query без from - чат повідомлення з кнопкою
+    assert extract_user_id({"update_id": 3, "callback_query": {"id": "1", "message": {"chat": {"id": 9}}}}) == 9
+    assert extract_user_id({"update_id": 4, "channel_post": {"chat": {"id": -100123}}}) == -100123
+    assert extract_user_id({"update_id": 5, "poll": {"id": "p", "question": "?"}}) == 0
+
+def test_partition_is_stable_and_independent_of_update():
+    # Звичайна арифметика, а не hash(): однакова в усіх процесах і після перезапуску
+    assert [partition_for(message(user_id, 1), 4) for user_id in (0, 1, 5, 123456789, 2 ** 40 + 3)] == [0, 1, 1, 1, 3]
+    assert partition_for({"update_id": 1, "channel_post": {"chat": {"id": -100123}}}, 4) == 3
+    assert {partition_for(message(555, update_id, f"текст {update_id}"), 3) for update_id in range(20)} == {0}
+
+def test_updates_reach_owning_worker_in_order(tmp_path):
+    partitions = 3
+    users = [10, 11, 12, 13, 14, 100]
+
+    async def scenario():
+        received = {index: [] for index in range(partitions)}
+
+        def handler_for(index):
+            async def handle(update):
+                await asyncio.sleep(0)  # Інші оновлення встигають втрутитись
+                received[index].append((extract_user_id(update), update["update_id"]))
+            return handle
+
+        servers = [PartitionServer(index, handler_for(index), tmp_path) for index in range(partitions)]
+        for server in servers:
+            await server.start()
+        router = PartitionRouter(partitions, tmp_path, connect_timeout=5)
+        try:
+            update_id = 0
+            for _ in range(5):
+                for user_id in users:
+                    update_id += 1
+                    payload = message(user_id, update_id)
+                    # Ingress пересилає сирі байти webhook без повторної серіалізації
+                    await router.forward(json_dumps(payload) if update_id % 2 else payload)
+            await router.flush()
+            return received, list(router.forwarded), [server.get_stats() for server in servers]
+        finally:
+            await router.close()
+            for server in servers:
+                await server.close()
+
+    received, forwarded, stats = asyncio.run(scenario())
+
+    for index, updates in received.items():
+        assert {user_id for user_id, _ in updates} == {user for user in users if user % partitions == index}
+        for user_id in users:
+            ids = [update_id for owner, update_id in updates if owner == user_id]
+            assert ids == sorted(ids)  # Порядок у межах користувача
+    assert forwarded == [len(received[index]) for index in range(partitions)]
+    assert sum(forwarded) == 5 * len(users)
+    assert all(entry["failed"] == 0 and entry["pending"] == 0 for entry in stats)
+
+def test_forward_rejects_non_object_payload(tmp_path):
+    async def scenario():
+        router = PartitionRouter(2, tmp_path, connect_timeout=0.1)
+        try:
+            with pytest.raises(ValueError):
+                await router.forward(b"[1, 2]")
+        finally:
+            await router.close()
+
+    asyncio.run(scenario())
+
+def test_ingress_forwards_to_worker_and_reports_errors(tmp_path):
+    pytest.importorskip("aiohttp")
+    from aiohttp.test_utils import TestClient, TestServer
+    from utils.scale_out import SECRET_HEADER, WEBHOOK_PATH, create_ingress_app
+
+    async def scenario():
+        received = []
+
+        async def handle(update):
+            received.append(update["update_id"])
+
+        worker = PartitionServer(0, handle, tmp_path)
+        await worker.start()
+        router = PartitionRouter(2, tmp_path, connect_timeout=0.2)
+        client = TestClient(TestServer(create_ingress_app(router, secret="s3cret")))
+        await client.start_server()
+        try:
+            headers = {SECRET_HEADER: "s3cret"}
+            statuses = [
+                (await client.post(WEBHOOK_PATH, json=message(4, 1))).status,                      # без секрету
+                (await client.post(WEBHOOK_PATH, json=message(4, 2), headers=headers)).status,     # воркер 0
+                (await client.post(WEBHOOK_PATH, data=b"not json", headers=headers)).status,
+                (await client.post(WEBHOOK_PATH, json=message(5, 3), headers=headers)).status,     # воркер 1 не запущено
+            ]
+            for _ in range(100):
+                if received:
+                    break
+                await asyncio.sleep(0.01)
+            await worker.close()
+            return statuses, received
+        finally:
+            await client.close()
+            await router.close()
+
+    statuses, received = asyncio.run(scenario())
+    assert statuses == [401, 200, 400, 503]
+    assert received == [2]
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+🧪 Реєстр гарячих запитів: lambda_stmt з різними параметрами, облік викликів, бенчмарк
+"""
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+def _seed(engine):
+    from sqlalchemy import insert
+    from database.models import Content, User
+
+    with engine.begin() as connection:
+        connection.execute(insert(User.__table__), [
+            {"id": user_id, "first_name": f"Користувач {user_id}", "points": user_id * 10}
+            for user_id in range(1, 6)
+        ])
+        connection.execute(insert(Content.__table__), [
+            {"id": 1, "text": "Жарт", "author_id": 1, "status": "approved", "content_type": "joke"},
+            {"id": 2, "text": "Мем", "author_id": 2, "status": "approved", "content_type": "meme"},
+            {"id": 3, "text": "Чернетка", "author_id": 3, "status": "pending", "content_type": "meme"},
+        ])
+
+def test_cached_statements_bind_new_parameters(sqlite_db):
+    """Конструкція кешована, але значення із замикання щоразу нові"""
+    from sqlalchemy.orm import Session
+    from database.queries import run_query
+
+    _seed(sqlite_db)
+    with Session(sqlite_db) as session:
+        names = [run_query(session, "user_by_id", user_id=user_id).one().first_name for user_id in (1, 4)]
+        assert names == ["Користувач 1", "Користувач 4"]
+        assert run_query(session, "user_by_id", user_id=99).first() is None
+
+        assert [row.id for row in run_query(session, "leaderboard", limit=2)] == [5, 4]
+        assert [row.id for row in run_query(session, "leaderboard", limit=3)] == [5, 4, 3]
+
+        assert run_query(session, "content_by_id", content_id=2).one().text == "Мем"
+        for _ in range(5):
+            assert run_query(session, "random_content", content_type="meme").one().id == 2
+            assert run_query(session, "random_content").one().id in (1, 2)
+
+def test_query_stats_count_calls(sqlite_db):
+    from sqlalchemy.orm import Session
+    from database.queries import get_query_stats, reset_query_stats, run_query
+
+    _seed(sqlite_db)
+    reset_query_stats()
+    with Session(sqlite_db) as session:
+        for user_id in range(1, 4):
+            run_query(session, "user_by_id", user_id=user_id).all()
+
+    stats = get_query_stats()
+    assert stats["user_by_id"]["calls"] == 3
+    assert stats["leaderboard"] == {"calls": 0, "cpu_us": 0.0}
+    reset_query_stats()
+
+def test_insert_ratings_statement_skips_existing_votes(sqlite_db):
+    from database.queries import insert_ratings_statement
+
+    _seed(sqlite_db)
+    statement = insert_ratings_statement(sqlite_db.dialect.name)
+    assert insert_ratings_statement(sqlite_db.dialect.name) is statement
+
+    rows = [{"user_id": 1, "content_id": 1, "rating_type": "like"}]
+    with sqlite_db.begin() as connection:
+        assert len(connection.execute(statement, rows).all()) == 1
+    with sqlite_db.begin() as connection:
+        assert connection.execute(statement, rows).all() == []
+
+def test_benchmark_runs_on_temporary_sqlite(tmp_path):
+    from utils.query_benchmark import format_report, measure
+
+    results = measure(f"sqlite:///{tmp_path / 'bench.db'}", calls=20, users_count=50, content_count=20)
+    assert [result["query"] for result in results] == ["user_by_id", "content_by_id", "leaderboard", "random_content"]
+    assert all(result["registry_us"] > 0 for result in results)
+    assert "user_by_id" in format_report(results, 20, "sqlite")
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+🧪 Rate limiter: крок GCRA, попередження раз на вікно та колесо таймерів
+"""
+
+import pytest
+
+from utils import rate_limiter
+from utils.rate_limiter import MemoryRateLimiter, TimerWheel, gcra
+
+def test_gcra_allows_burst_then_spaces_actions():
+    state, results = None, []
+    for _ in range(4):
+        result, state = gcra(state, 0, limit=3, period_ms=1000)
+        results.append(result)
+
+    assert [result.allowed for result in results] == [True, True, True, False]
+    assert [result.remaining for result in results[:3]] == [2, 1, 0]
+    assert results[3].retry_after == pytest.approx(0.333, abs=0.01)
+
+    # Через інтервал (period / limit) звільняється рівно одна дія
+    result, state = gcra(state, 340, limit=3, period_ms=1000)
+    assert result.allowed and result.remaining == 0
+
+def test_gcra_notifies_once_per_denial_window():
+    state = None
+    for _ in range(2):
+        _, state = gcra(state, 0, limit=2, period_ms=1000)
+
+    first, state = gcra(state, 0, limit=2, period_ms=1000)
+    second, state = gcra(state, 100, limit=2, period_ms=1000)
+    assert not first.allowed and first.notify
+    assert not second.allowed and not second.notify
+
+def test_gcra_cost_consumes_several_actions():
+    result, state = gcra(None, 0, limit=5, period_ms=1000, cost=5)
+    assert result.allowed and result.remaining == 0
+    assert not gcra(state, 0, limit=5, period_ms=1000)[0].allowed
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [10_000]
+    monkeypatch.setattr(rate_limiter, "_now_ms", lambda: now[0])
+    return now
+
+def test_memory_limiter_peek_does_not_consume(clock):
+    limiter = MemoryRateLimiter()
+    assert limiter.check("user:1", 1, 1.0)
+    assert not limiter.peek("user:1", 1, 1.0)
+    assert not limiter.check("user:1", 1, 1.0)
+    assert limiter.check("user:2", 1, 1.0)  # Ключі незалежні
+
+    clock[0] += 1000
+    assert limiter.peek("user:1", 1, 1.0)
+    assert limiter.check("user:1", 1, 1.0)
+
+def test_timer_wheel_evicts_idle_keys(clock):
+    limiter = MemoryRateLimiter(slots=8, tick_ms=100)
+    for user_id in range(50):
+        limiter.check(f"user:{user_id}", 5, 1.0)
+    assert len(limiter) == 50
+
+    clock[0] += 100
+    limiter.check("user:active", 5, 1.0)
+    assert len(limiter) == 51  # TAT (+200 мс) ще попереду
+
+    clock[0] += 1000
+    limiter.check("user:active", 5, 1.0)
+    assert len(limiter) == 1
+
+def test_timer_wheel_reschedules_keys_that_are_still_limited():
+    wheel = TimerWheel(slots=4, tick_ms=100)
+    storage = {"user:1": [1000, 0]}
+    wheel.advance(0, storage)
+    wheel.schedule("user:1", 100)
+
+    assert wheel.advance(200, storage) == 0  # TAT ще попереду - ключ переноситься
+    assert "user:1" in storage
+    assert wheel.advance(1100, storage) == 1
+    assert storage == {}
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+🧪 Буфер реакцій: пачкове збереження та ізоляція зіпсованих рядків
+"""
+
+import asyncio
+
+import pytest
+
+from services import reactions
+from services.reactions import MAX_FLUSH_ATTEMPTS, ReactionService
+
+@pytest.fixture
+def fake_store(monkeypatch):
+    """persist_reactions, що падає на пачках з "отруєним" content_id"""
+    stored, calls = [], []
+    poisoned = {13}
+
+    def persist(batch):
+        calls.append(len(batch))
+        if any(content_id in poisoned for _, content_id, _, _ in batch):
+            raise RuntimeError("bad row")
+        stored.extend(batch)
+        return len(batch)
+
+    monkeypatch.setattr(reactions, "persist_reactions", persist)
+    return stored, calls
+
+def test_failing_batch_keeps_good_rows_and_forgets_dropped(fake_store):
+    stored, calls = fake_store
+    service = ReactionService(flush_size=10 ** 6)
+
+    async def scenario():
+        for content_id in range(1, 21):
+            assert await service.react(1, content_id, "like")
+        results = [await service.flush() for _ in range(MAX_FLUSH_ATTEMPTS)]
+        return results
+
+    results = asyncio.run(scenario())
+
+    # Перші спроби повертають пачку в буфер, остання ділить її навпіл
+    assert results[:-1] == [0] * (MAX_FLUSH_ATTEMPTS - 1)
+    assert results[-1] == 19
+    assert sorted(content_id for _, content_id, _, _ in stored) == [i for i in range(1, 21) if i != 13]
+    assert service.get_stats()["dropped"] == 1
+    assert service.get_stats()["buffered"] == 0
+
+    # Відкинута реакція забута - її можна поставити знову, збережені - ні
+    assert not service.has_reacted(1, 13)
+    assert service.has_reacted(1, 12)
+    assert len(calls) < 20 + MAX_FLUSH_ATTEMPTS  # Поділ навпіл, а не рядок за рядком
+
+def test_transient_failure_retries_whole_batch(fake_store, monkeypatch):
+    stored, _ = fake_store
+    service = ReactionService(flush_size=10 ** 6)
+    outage = [True]
+    persist = reactions.persist_reactions
+
+    def flaky(batch):
+        if outage[0]:
+            raise RuntimeError("db down")
+        return persist(batch)
+
+    monkeypatch.setattr(reactions, "persist_reactions", flaky)
+
+    async def scenario():
+        await service.react(1, 1, "like")
+        await service.react(2, 1, "dislike")
+        assert await service.flush() == 0
+        outage[0] = False
+        return await service.flush()
+
+    assert asyncio.run(scenario()) == 2
+    assert len(stored) == 2
+    assert service.get_stats()["dropped"] == 0
+
+def test_persist_reactions_counts_only_new_rows(sqlite_db):
+    from datetime import datetime
+    from sqlalchemy import insert, select
+    from database.models import Content, User
+
+    with sqlite_db.begin() as connection:
+        connection.execute(insert(User.__table__), [{"id": 1, "first_name": "A"}, {"id": 2, "first_name": "B"}])
+        connection.execute(insert(Content.__table__), [{"id": 1, "text": "Жарт", "author_id": 1, "status": "approved"}])
+
+    now = datetime.utcnow()
+    assert reactions.persist_reactions([(1, 1, "like", now), (2, 1, "dislike", now)]) == 2
+    assert reactions.persist_reactions([(1, 1, "like", now)]) == 0  # Вже є в БД
+
+    with sqlite_db.connect() as connection:
+        likes, dislikes = connection.execute(select(Content.likes, Content.dislikes).where(Content.id == 1)).first()
+    assert (likes, dislikes) == (1, 1)
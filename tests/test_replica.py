@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+🧪 Репліка для читання: запобіжник відставання, use_primary та фонова перевірка
+"""
+
+import time
+import asyncio
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from database import replica
+from database.replica import HEARTBEAT_TABLE, ReplicaRouter, read_only, replica_session_factory, use_primary
+
+@pytest.fixture
+def router(sqlite_db, tmp_path, monkeypatch):
+    """Репліка - окремий SQLite-файл; мітки копіюються вручну, як при реплікації"""
+    router = ReplicaRouter(f"sqlite:///{tmp_path / 'replica.db'}", max_lag=5, check_interval=0.01)
+    router.engine.echo = False
+    router.ensure_heartbeat_table()
+    with router.engine.begin() as connection:
+        connection.exec_driver_sql(f"CREATE TABLE {HEARTBEAT_TABLE} (id INTEGER PRIMARY KEY, beat_at FLOAT NOT NULL)")
+    monkeypatch.setattr(replica, "_router", router)
+    yield router
+    router.dispose()
+
+def replicate(router, primary_engine):
+    with primary_engine.connect() as connection:
+        beat = connection.exec_driver_sql(f"SELECT beat_at FROM {HEARTBEAT_TABLE}").scalar()
+    with router.engine.begin() as connection:
+        connection.exec_driver_sql(f"DELETE FROM {HEARTBEAT_TABLE}")
+        connection.exec_driver_sql(f"INSERT INTO {HEARTBEAT_TABLE} (id, beat_at) VALUES (1, ?)", (beat,))
+
+@read_only
+def report_factory():
+    return replica_session_factory()
+
+def test_high_lag_falls_back_to_primary(router, sqlite_db, monkeypatch):
+    assert not router.check()          # Першої мітки ще не було
+    replicate(router, sqlite_db)
+    assert router.check() and router.lag == 0.0
+    assert report_factory() is router.SessionLocal
+
+    # Мітки більше не доходять до репліки
+    started = time.time()
+    monkeypatch.setattr(replica.time, "time", lambda: started + 60)
+    assert not router.check()
+    assert router.lag >= 55
+    assert report_factory() is None
+    assert router.get_stats()["primary_fallbacks"] == 1
+
+def test_use_primary_pins_reads_inside_read_only(router):
+    router.healthy = True
+
+    assert replica_session_factory() is None            # Без @read_only - основна
+    assert report_factory() is router.SessionLocal
+
+    with use_primary():
+        assert report_factory() is None
+
+    @use_primary()
+    @read_only
+    def pinned():
+        return replica_session_factory()
+
+    assert pinned() is None
+    assert report_factory() is router.SessionLocal
+
+def test_session_factory_reads_only_cached_flag(router, monkeypatch):
+    def fail():
+        raise AssertionError("перевірка репліки в get_db_session")
+
+    monkeypatch.setattr(router, "check", fail)
+    router.healthy = True
+    assert report_factory() is router.SessionLocal
+    router.healthy = False
+    assert report_factory() is None
+
+def test_background_monitor_updates_flag(router, sqlite_db):
+    async def scenario():
+        router.start()
+        try:
+            while router.checked_at == 0:
+                await asyncio.sleep(0.01)
+            replicate(router, sqlite_db)
+            deadline = time.monotonic() + 5
+            while not router.healthy and time.monotonic() < deadline:
+                await asyncio.sleep(0.01)
+            return router.healthy
+        finally:
+            await router.stop()
+
+    assert asyncio.run(scenario())
+    assert not router.running
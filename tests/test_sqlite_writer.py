@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+🧪 Вбудований SQLite: прагми, пачки єдиного писаря та ізоляція записів SAVEPOINT
+"""
+
+import asyncio
+
+import pytest
+
+from database.sqlite_writer import SQLiteWriter, sqlite_path
+
+def test_sqlite_path_from_url(tmp_path):
+    assert sqlite_path(f"sqlite:///{tmp_path}/bot.db?timeout=5") == tmp_path / "bot.db"
+    assert sqlite_path("sqlite:///:memory:") is None
+    assert sqlite_path("sqlite://") is None
+
+def test_engine_connections_use_wal(sqlite_db):
+    from sqlalchemy import text
+
+    with sqlite_db.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert connection.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+
+def test_concurrent_writes_share_batches_and_fail_alone(tmp_path):
+    pytest.importorskip("aiosqlite")
+    path = tmp_path / "writer.db"
+
+    async def scenario():
+        writer = SQLiteWriter(path, batch_size=50)
+        await writer.start()
+        try:
+            await writer.execute("CREATE TABLE counters (id INTEGER PRIMARY KEY, value INTEGER NOT NULL)")
+            await writer.execute("INSERT INTO counters (id, value) VALUES (1, 0)")
+
+            async def broken(db):
+                await db.execute("UPDATE counters SET value = value + 1000 WHERE id = 1")
+                raise ValueError("збій одного запису")
+
+            writes = [writer.execute("UPDATE counters SET value = value + 1 WHERE id = 1") for _ in range(120)]
+            writes.insert(60, writer.submit(broken))
+            results = await asyncio.gather(*writes, return_exceptions=True)
+            return results, writer.get_stats()
+        finally:
+            await writer.stop()
+
+    results, stats = asyncio.run(scenario())
+
+    errors = [result for result in results if isinstance(result, Exception)]
+    assert len(errors) == 1 and isinstance(errors[0], ValueError)
+    assert results.count(1) == 120
+    assert stats["writes"] == 122 and stats["failed"] == 1
+    assert stats["batches"] < 20  # Сотня записів - кілька commit, а не сотня
+
+    import sqlite3
+    with sqlite3.connect(path) as connection:
+        # Частковий запис невдалої операції відкочено до SAVEPOINT
+        assert connection.execute("SELECT value FROM counters").fetchone()[0] == 120
+        assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+def test_update_user_points_goes_through_writer(sqlite_db, tmp_path):
+    from sqlalchemy import insert, select
+    from database import database
+    from database.models import User
+    from database.sqlite_writer import get_sqlite_writer, start_sqlite_writer, stop_sqlite_writer
+    from utils.ranks import rank_for
+
+    pytest.importorskip("aiosqlite")
+    with sqlite_db.begin() as connection:
+        connection.execute(insert(User.__table__), [{"id": 1, "first_name": "Автор", "points": 0}])
+
+    async def scenario():
+        writer = await start_sqlite_writer(f"sqlite:///{tmp_path / 'bot.db'}")
+        try:
+            assert get_sqlite_writer() is writer
+            results = await asyncio.gather(*(database.update_user_points(1, 10) for _ in range(50)))
+            results.append(await database.update_user_points(404, 10))
+            return results, writer.get_stats()
+        finally:
+            await stop_sqlite_writer()
+
+    results, stats = asyncio.run(scenario())
+    assert results == [True] * 50 + [False]
+    assert stats["writes"] == 51 and stats["batches"] < 51
+
+    with sqlite_db.connect() as connection:
+        points, rank = connection.execute(select(User.points, User.rank).where(User.id == 1)).one()
+    assert points == 500
+    assert rank == rank_for(500)